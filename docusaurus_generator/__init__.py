@@ -1,8 +1,9 @@
 """
 Docusaurus Generator - A tool to generate Docusaurus documentation from repository content.
 """
-from .generator import DocusaurusGenerator
+from .generator import DocusaurusGenerator, generate_site
+from .writer import MemoryWriter, OutputWriter
 
 __version__ = "0.1.0"
 
-__all__ = ["DocusaurusGenerator"]
\ No newline at end of file
+__all__ = ["DocusaurusGenerator", "MemoryWriter", "OutputWriter", "generate_site"]
\ No newline at end of file
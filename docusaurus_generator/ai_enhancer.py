@@ -1,57 +1,423 @@
 """
 AI enhancement functionality for documentation content.
 """
+import time
 import logging
-from typing import Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
+from .utils import AtomicFileWriter, write_file_atomic
+from .resilience import LLMResilience
+from .cache import GeneratorCache, hash_text
+from .writer import OutputWriter
+from .block_diff import (
+    MarkerStripper,
+    changed_hunks,
+    join_blocks,
+    mark_blocks,
+    parse_marked,
+    reused_blocks,
+    split_blocks,
+    split_frontmatter,
+    strip_markers,
+)
 
-def enhance_with_ai(content: str, section_name: str, model: str, logger: logging.Logger) -> str:
+
+SECTION_PROMPTS = {
+    'overview': "Enhance this project overview to be more comprehensive and user-friendly while maintaining accuracy. Add clear sections for features, use cases, and key concepts if they're not already present: ",
+    'installation': "Improve this installation guide by adding clear prerequisites, troubleshooting tips, and platform-specific instructions while maintaining accuracy: ",
+    'api': "Enhance this API documentation by adding more detailed descriptions, usage examples, and parameter explanations while maintaining technical accuracy: ",
+    'guides': "Improve these guides by adding more context, best practices, and common pitfalls while maintaining accuracy: ",
+    'contributing': "Enhance these contributing guidelines by adding more specific examples, workflow descriptions, and best practices while maintaining accuracy: ",
+    'changelog': "Improve this changelog by adding more context and grouping related changes while maintaining accuracy: ",
+    'deployment': "Enhance this deployment documentation with more detailed steps, prerequisites, and troubleshooting while maintaining accuracy: ",
+    'architecture': "Improve this architecture documentation by adding more context, design decisions, and component relationships while maintaining accuracy: ",
+    'testing': "Enhance this testing documentation by adding more specific examples, test strategies, and coverage goals while maintaining accuracy: ",
+    'security': "Improve this security documentation by adding more best practices, common vulnerabilities, and mitigation strategies while maintaining accuracy: ",
+    'index.js': "Generate an engaging and informative homepage that clearly communicates the purpose of the documentation site and guides users to key sections: ",
+    'HomepageFeatures': "Generate a set of appealing homepage feature blocks that highlight quick start instructions, main features, and repository links with inviting language: "
+}
+
+DEFAULT_PROMPT = "Enhance this documentation while maintaining accuracy: "
+
+BLOCK_INSTRUCTIONS = (
+    "The content is divided into blocks, each introduced by a marker line such as <!-- block:3 -->. "
+    "Keep every marker line exactly as it is and put the enhanced text for each block directly after its marker. "
+)
+
+HUNK_INSTRUCTIONS = (
+    "Only enhance the marked blocks. The surrounding context is provided for reference "
+    "and must not be repeated in your answer. "
+)
+
+# Cache namespace holding the per-block source and enhanced output of each section
+AI_CACHE_NAMESPACE = 'ai_enhancement'
+
+# Model used when the ``ai`` configuration enables enhancement without naming one
+DEFAULT_MODEL = 'openai/gpt-4o'
+
+# Number of unchanged neighbouring blocks sent as context with each changed hunk
+CONTEXT_BLOCKS = 1
+
+
+def configured_model(config: Optional[Dict]) -> Optional[str]:
+    """
+    The model the ``ai`` configuration enables.
+
+    Args:
+        config: Optional configuration dictionary
+
+    Returns:
+        ``ai.model`` if ``ai.enabled`` is set, otherwise None
+    """
+    ai_config = (config or {}).get('ai') or {}
+    if not ai_config.get('enabled', False):
+        return None
+    return ai_config.get('model') or DEFAULT_MODEL
+
+
+def enhance_with_ai(content: str, section_name: str, model: str, logger: logging.Logger,
+                    output_path: Optional[str] = None,
+                    metrics: Optional[Dict[str, Dict[str, float]]] = None,
+                    resilience: Optional[LLMResilience] = None,
+                    cache: Optional[GeneratorCache] = None,
+                    writer: Optional[OutputWriter] = None) -> str:
     """
     Enhance documentation content using AI.
-    
+
+    When an output path is given, tokens are streamed into a temporary file
+    next to it as they arrive and the file is renamed into place once the
+    response is complete. If enhancement fails the original content is
+    written instead, so the output path always ends up populated.
+
+    When a cache is given, the source and enhanced text of every block are
+    kept between runs and only blocks that changed since the previous run are
+    resubmitted, together with a little surrounding context. The results are
+    patched into the previously enhanced document.
+
     Args:
         content: Original content to enhance
         section_name: Name of the section being enhanced
         model: AI model to use
         logger: Logger instance
-    
+        output_path: Optional file to stream the enhanced content into
+        metrics: Optional dictionary receiving per-section streaming timings
+        resilience: Optional resilience layer providing retries and circuit breaking
+        cache: Optional cache enabling diff-aware re-enhancement
+        writer: Optional output writer that skips unchanged files and counts writes
+
     Returns:
         Enhanced content string
     """
+    write = writer.write if writer else write_file_atomic
+    open_output = writer.open if writer else AtomicFileWriter
+
     if not model:
+        if output_path:
+            write(output_path, content)
         return content
 
+    prompt = SECTION_PROMPTS.get(section_name, DEFAULT_PROMPT)
+
     try:
-        prompts = {
-            'overview': "Enhance this project overview to be more comprehensive and user-friendly while maintaining accuracy. Add clear sections for features, use cases, and key concepts if they're not already present: ",
-            'installation': "Improve this installation guide by adding clear prerequisites, troubleshooting tips, and platform-specific instructions while maintaining accuracy: ",
-            'api': "Enhance this API documentation by adding more detailed descriptions, usage examples, and parameter explanations while maintaining technical accuracy: ",
-            'guides': "Improve these guides by adding more context, best practices, and common pitfalls while maintaining accuracy: ",
-            'contributing': "Enhance these contributing guidelines by adding more specific examples, workflow descriptions, and best practices while maintaining accuracy: ",
-            'changelog': "Improve this changelog by adding more context and grouping related changes while maintaining accuracy: ",
-            'deployment': "Enhance this deployment documentation with more detailed steps, prerequisites, and troubleshooting while maintaining accuracy: ",
-            'architecture': "Improve this architecture documentation by adding more context, design decisions, and component relationships while maintaining accuracy: ",
-            'testing': "Enhance this testing documentation by adding more specific examples, test strategies, and coverage goals while maintaining accuracy: ",
-            'security': "Improve this security documentation by adding more best practices, common vulnerabilities, and mitigation strategies while maintaining accuracy: ",
-            'index.js': "Generate an engaging and informative homepage that clearly communicates the purpose of the documentation site and guides users to key sections: ",
-            'HomepageFeatures': "Generate a set of appealing homepage feature blocks that highlight quick start instructions, main features, and repository links with inviting language: "
-        }
+        from .cli import stream_content
+    except ImportError:
+        logger.warning(f"Could not import stream_content function. Using original content.")
+        stream_content = None
 
-        prompt = prompts.get(section_name, "Enhance this documentation while maintaining accuracy: ")
-        
-        # In actual implementation, this would call the AI model:
-        # The following code is a placeholder. You should replace it with actual AI model integration.
+    def run(request: str, path: Optional[str], prefix: str = '',
+            transform: Optional[Callable[[], MarkerStripper]] = None) -> Optional[str]:
+        def attempt() -> Optional[str]:
+            return _consume_stream(
+                stream_content(request, model),
+                section_name,
+                logger,
+                path,
+                metrics,
+                prefix=prefix,
+                transform=transform() if transform else None,
+                open_output=open_output
+            )
+        if resilience is not None:
+            return resilience.call(model.split('/', 1)[0], attempt)
+        return attempt()
+
+    enhanced_content = None
+    if stream_content is not None:
         try:
-            from .cli import generate_content
-            enhanced_content = generate_content(prompt + content, model)
-            if enhanced_content:
-                return enhanced_content
-        except ImportError:
-            logger.warning(f"Could not import generate_content function. Using original content.")
-            
-        logger.warning(f"AI enhancement not implemented or failed for {section_name}. Using original content.")
-        return content
-            
-    except Exception as e:
-        logger.warning(f"Error during AI enhancement for {section_name}: {str(e)}")
-        return content  # Return original content if enhancement fails
\ No newline at end of file
+            if cache is not None:
+                enhanced_content = _enhance_incrementally(
+                    content, section_name, model, prompt, run, logger, output_path, cache, write
+                )
+            else:
+                enhanced_content = run(prompt + content, output_path)
+        except Exception as e:
+            logger.warning(f"Error during AI enhancement for {section_name}: {str(e)}")
+
+    if enhanced_content:
+        return enhanced_content
+
+    logger.warning(f"AI enhancement not implemented or failed for {section_name}. Using original content.")
+    if output_path:
+        write(output_path, content)
+    return content  # Return original content if enhancement fails
+
+
+def _enhance_incrementally(content: str, section_name: str, model: str, prompt: str,
+                           run: Callable[..., Optional[str]], logger: logging.Logger,
+                           output_path: Optional[str], cache: GeneratorCache,
+                           write: Callable[[str, str], bool] = write_file_atomic) -> Optional[str]:
+    """
+    Enhance only the blocks that changed since the previous run.
+
+    Frontmatter is kept out of the request and preserved verbatim. Without a
+    usable previous run (or after the model or prompt changed) the whole
+    document is sent once with block markers so later runs can map the
+    response back to individual blocks.
+
+    Args:
+        content: Original content to enhance
+        section_name: Name of the section being enhanced
+        model: AI model to use
+        prompt: Section prompt
+        run: Function sending a request and returning the raw response
+        logger: Logger instance
+        output_path: Optional file receiving the enhanced content
+        cache: Cache holding the previous run's blocks
+        write: Function writing the finished document to the output path
+
+    Returns:
+        Enhanced content, or None if the model produced nothing
+    """
+    frontmatter, body = split_frontmatter(content)
+    blocks = split_blocks(body)
+    if not blocks:
+        return None
+
+    hashes = [hash_text(block) for block in blocks]
+    prompt_hash = hash_text(f"{model}\n{prompt}")
+    previous = cache.get(AI_CACHE_NAMESPACE, section_name)
+
+    if not previous or previous.get('prompt') != prompt_hash:
+        response = run(
+            prompt + BLOCK_INSTRUCTIONS + mark_blocks(blocks),
+            output_path,
+            prefix=frontmatter,
+            transform=MarkerStripper
+        )
+        if not response:
+            return None
+        parsed = parse_marked(response)
+        enhanced_blocks = [parsed.get(i) or None for i in range(len(blocks))]
+        document = frontmatter + strip_markers(response)
+        _store_blocks(cache, section_name, prompt_hash, blocks, hashes, enhanced_blocks, document)
+        return document
+
+    old_hashes = [
+        block['hash'] if block.get('enhanced') is not None else None
+        for block in previous.get('blocks', [])
+    ]
+    if old_hashes == hashes and previous.get('document'):
+        logger.info(f"AI enhancement for {section_name} reused: no blocks changed")
+        if output_path:
+            write(output_path, previous['document'])
+        return previous['document']
+
+    enhanced_blocks: List[Optional[str]] = [None] * len(blocks)
+    for new_index, old_index in reused_blocks(old_hashes, hashes).items():
+        enhanced_blocks[new_index] = previous['blocks'][old_index]['enhanced']
+
+    hunks = changed_hunks(old_hashes, hashes)
+    changed = sum(end - start for start, end in hunks)
+    logger.info(
+        f"AI enhancement for {section_name}: {len(blocks) - changed} of {len(blocks)} blocks unchanged, "
+        f"resubmitting {changed} block(s) in {len(hunks)} hunk(s)"
+    )
+
+    for start, end in hunks:
+        try:
+            parsed = parse_marked(run(_hunk_request(prompt, blocks, start, end), None) or '')
+        except Exception as e:
+            logger.warning(f"Error enhancing blocks {start}-{end - 1} of {section_name}: {str(e)}")
+            parsed = {}
+        for index in range(start, end):
+            enhanced_blocks[index] = parsed.get(index) or None
+
+    document = frontmatter + join_blocks([
+        enhanced if enhanced is not None else source
+        for source, enhanced in zip(blocks, enhanced_blocks)
+    ])
+    if output_path:
+        write(output_path, document)
+    _store_blocks(cache, section_name, prompt_hash, blocks, hashes, enhanced_blocks, document)
+    return document
+
+
+def _hunk_request(prompt: str, blocks: List[str], start: int, end: int) -> str:
+    """Build the request re-enhancing blocks ``start`` to ``end`` with their context."""
+    before = blocks[max(0, start - CONTEXT_BLOCKS):start]
+    after = blocks[end:end + CONTEXT_BLOCKS]
+    request = prompt + BLOCK_INSTRUCTIONS + HUNK_INSTRUCTIONS
+    if before:
+        request += "\n\nContext before:\n\n" + '\n\n'.join(before)
+    request += "\n\nBlocks to enhance:\n\n" + mark_blocks(blocks[start:end], start)
+    if after:
+        request += "\n\nContext after:\n\n" + '\n\n'.join(after)
+    return request
+
+
+def plan_requests(content: str, section_name: str, model: str,
+                  cache: Optional[GeneratorCache] = None) -> List[Tuple[str, str]]:
+    """
+    List the requests ``enhance_with_ai`` would send for a section, without sending them.
+
+    Args:
+        content: Original content to enhance
+        section_name: Name of the section being enhanced
+        model: AI model to use
+        cache: Optional cache enabling diff-aware re-enhancement
+
+    Returns:
+        (request, source text the response replaces) pairs; empty when the
+        previous enhancement is reused
+    """
+    prompt = SECTION_PROMPTS.get(section_name, DEFAULT_PROMPT)
+    if cache is None:
+        return [(prompt + content, content)]
+
+    _, body = split_frontmatter(content)
+    blocks = split_blocks(body)
+    if not blocks:
+        return []
+
+    hashes = [hash_text(block) for block in blocks]
+    previous = cache.get(AI_CACHE_NAMESPACE, section_name)
+    if not previous or previous.get('prompt') != hash_text(f"{model}\n{prompt}"):
+        return [(prompt + BLOCK_INSTRUCTIONS + mark_blocks(blocks), body)]
+
+    old_hashes = [
+        block['hash'] if block.get('enhanced') is not None else None
+        for block in previous.get('blocks', [])
+    ]
+    if old_hashes == hashes and previous.get('document'):
+        return []
+    return [(_hunk_request(prompt, blocks, start, end), '\n\n'.join(blocks[start:end]))
+            for start, end in changed_hunks(old_hashes, hashes)]
+
+
+def _store_blocks(cache: GeneratorCache, section_name: str, prompt_hash: str, blocks: List[str],
+                  hashes: List[str], enhanced_blocks: List[Optional[str]], document: str) -> None:
+    """Record a section's blocks so the next run can diff against them."""
+    cache.set(AI_CACHE_NAMESPACE, section_name, {
+        'prompt': prompt_hash,
+        'document': document,
+        'blocks': [
+            {'hash': block_hash, 'source': source, 'enhanced': enhanced}
+            for source, block_hash, enhanced in zip(blocks, hashes, enhanced_blocks)
+        ],
+    })
+
+
+def _consume_stream(tokens: Iterable[str], section_name: str, logger: logging.Logger,
+                    output_path: Optional[str],
+                    metrics: Optional[Dict[str, Dict[str, float]]],
+                    prefix: str = '',
+                    transform: Optional[MarkerStripper] = None,
+                    open_output: Callable[[str], AtomicFileWriter] = AtomicFileWriter) -> Optional[str]:
+    """
+    Collect streamed tokens, writing them incrementally and recording timings.
+
+    Args:
+        tokens: Token iterator from the model provider
+        section_name: Name of the section being enhanced
+        logger: Logger instance
+        output_path: Optional file to stream tokens into
+        metrics: Optional dictionary receiving the section's timings
+        prefix: Text written to the file ahead of the streamed tokens
+        transform: Optional filter applied to tokens before they are written
+        open_output: Function opening the atomic writer for the output path
+
+    Returns:
+        The complete, untransformed response, or None if no tokens were produced
+    """
+    start = time.monotonic()
+    first_token_at = None
+    collected = []
+
+    writer = open_output(output_path) if output_path else None
+    try:
+        if writer and prefix:
+            writer.write(prefix)
+        for token in tokens:
+            if first_token_at is None:
+                first_token_at = time.monotonic()
+                logger.debug(f"First AI token for {section_name} after {first_token_at - start:.2f}s")
+            collected.append(token)
+            if writer:
+                writer.write(transform.feed(token) if transform else token)
+        if writer and transform:
+            writer.write(transform.flush())
+    except Exception:
+        if writer:
+            writer.discard()
+        raise
+
+    if not collected:
+        if writer:
+            writer.discard()
+        return None
+
+    if writer:
+        writer.commit()
+
+    end = time.monotonic()
+    _record_metrics(metrics, section_name, logger, first_token_at - start, len(collected),
+                    end - first_token_at, end - start)
+
+    return ''.join(collected)
+
+
+def _record_metrics(metrics: Optional[Dict[str, Dict[str, float]]], section_name: str,
+                    logger: logging.Logger, time_to_first_token: float, tokens: int, generation_time: float,
+                    total_latency: float) -> None:
+    """
+    Record streaming timings for a request, accumulating over a section's requests.
+
+    Args:
+        metrics: Dictionary receiving the timings, or None
+        section_name: Name of the section being enhanced
+        logger: Logger instance
+        time_to_first_token: Seconds until the first token arrived
+        tokens: Number of tokens received
+        generation_time: Seconds between the first and last token
+        total_latency: Seconds for the whole request
+    """
+    section_metrics = {
+        'time_to_first_token': time_to_first_token,
+        'tokens': tokens,
+        'generation_time': generation_time,
+        'total_latency': total_latency,
+        'requests': 1,
+        'latencies': [total_latency],
+    }
+    if metrics is not None and section_name in metrics:
+        previous = metrics[section_name]
+        section_metrics = {
+            'time_to_first_token': previous['time_to_first_token'],
+            'tokens': previous['tokens'] + tokens,
+            'generation_time': previous['generation_time'] + generation_time,
+            'total_latency': previous['total_latency'] + total_latency,
+            'requests': previous['requests'] + 1,
+            'latencies': previous.get('latencies', []) + [total_latency],
+        }
+    section_metrics['tokens_per_second'] = (
+        section_metrics['tokens'] / section_metrics['generation_time']
+        if section_metrics['generation_time'] > 0 else float(section_metrics['tokens'])
+    )
+    if metrics is not None:
+        metrics[section_name] = section_metrics
+
+    logger.info(
+        f"AI enhanced {section_name}: first token after {time_to_first_token:.2f}s, "
+        f"{tokens} tokens at {section_metrics['tokens_per_second']:.1f} tokens/s, "
+        f"total {total_latency:.2f}s"
+    )
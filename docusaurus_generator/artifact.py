@@ -0,0 +1,130 @@
+"""
+Reproducible, compressed tar artifacts of a generated site.
+
+Entries are written in a fixed order with fixed timestamps, owners and
+permissions, and gzip headers carry no timestamp, so the same site always
+produces the same bytes and artifacts deduplicate in content-addressed
+stores. The archive is compressed as a stream: it is never held in memory
+as a whole and can be written to a pipe. zstd compression needs the
+optional ``zstandard`` package.
+"""
+import io
+import os
+import gzip
+import tarfile
+import logging
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple, Union
+
+from .utils import AtomicFileWriter
+
+
+# File name suffixes to the compression they select
+ARTIFACT_SUFFIXES = {
+    '.tar.zst': 'zst',
+    '.tzst': 'zst',
+    '.tar.gz': 'gz',
+    '.tgz': 'gz',
+    '.tar': None,
+}
+
+# Timestamp of every entry, overridable with SOURCE_DATE_EPOCH
+DEFAULT_MTIME = 0
+
+
+def artifact_compression(path: str) -> Optional[str]:
+    """
+    Select the compression of an artifact from its file name.
+
+    Args:
+        path: Artifact file name, e.g. 'site.tar.zst'
+
+    Returns:
+        'zst', 'gz' or None for an uncompressed tar
+
+    Raises:
+        ValueError: If the name has no supported suffix
+    """
+    for suffix, compression in ARTIFACT_SUFFIXES.items():
+        if path.lower().endswith(suffix):
+            return compression
+    raise ValueError(f"Unsupported artifact name {path}; use one of {', '.join(ARTIFACT_SUFFIXES)}")
+
+
+def walk_files(root: str, prefix: str = '') -> Iterator[Tuple[str, bytes]]:
+    """
+    Read the files below a directory, e.g. a built site, in path order.
+
+    Args:
+        root: Directory to read
+        prefix: Prefix of the yielded paths, e.g. 'build/'
+
+    Yields:
+        (prefixed relative path with forward slashes, content)
+    """
+    paths = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            paths.append(os.path.relpath(os.path.join(directory, name), root).replace(os.sep, '/'))
+    for rel_path in sorted(paths):
+        with open(os.path.join(root, *rel_path.split('/')), 'rb') as f:
+            yield prefix + rel_path, f.read()
+
+
+def _compressor(raw: BinaryIO, compression: Optional[str], level: Optional[int]):
+    if compression == 'gz':
+        # No file name or timestamp in the header, so identical content gives identical bytes
+        return gzip.GzipFile(filename='', mode='wb', fileobj=raw, mtime=0,
+                             compresslevel=9 if level is None else level)
+    if compression == 'zst':
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("zstd artifacts need the zstandard package (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=3 if level is None else level).stream_writer(raw, closefd=False)
+    return None
+
+
+def write_artifact(target: Union[str, BinaryIO], files: Iterable[Tuple[str, bytes]],
+                   compression: Optional[str] = None, logger: Optional[logging.Logger] = None,
+                   level: Optional[int] = None) -> int:
+    """
+    Write files to a reproducible tar artifact.
+
+    Args:
+        target: Artifact path, or a binary file object such as a pipe
+        files: (relative path with forward slashes, content) pairs, in a
+            deterministic order such as the path order of
+            ``OutputWriter.output_files``; they are consumed one at a time
+        compression: 'zst', 'gz' or None; derived from the name when target is a path
+        logger: Optional logger instance
+        level: Optional compression level
+
+    Returns:
+        Number of entries written
+    """
+    if isinstance(target, str):
+        compression = artifact_compression(target)
+        with AtomicFileWriter(target, 'wb') as raw:
+            return write_artifact(raw, files, compression, logger, level)
+
+    mtime = int(os.environ.get('SOURCE_DATE_EPOCH', DEFAULT_MTIME))
+    compressor = _compressor(target, compression, level)
+    stream = compressor if compressor is not None else target
+    count = 0
+    try:
+        with tarfile.open(fileobj=stream, mode='w|', format=tarfile.PAX_FORMAT) as tar:
+            for rel_path, data in files:
+                info = tarfile.TarInfo(rel_path)
+                info.size = len(data)
+                info.mtime = mtime
+                info.mode = 0o644
+                info.uid = info.gid = 0
+                info.uname = info.gname = ''
+                tar.addfile(info, io.BytesIO(data))
+                count += 1
+    finally:
+        if compressor is not None:
+            compressor.close()
+    if logger:
+        logger.info(f"Wrote artifact with {count} files")
+    return count
@@ -0,0 +1,65 @@
+"""
+Static assets referenced by the generated pages.
+
+Only files that pages actually reference are copied, to
+``static/assets/<name>-<id><ext>``, where the id is the start of the file's
+git blob id. Files sharing a name therefore never collide, identical files
+are stored once, and the pages of versioned docs share assets with the
+current docs whenever the content is the same.
+"""
+import os
+import re
+import hashlib
+import logging
+import posixpath
+from typing import Iterable
+
+
+ASSETS_DIR = 'assets'
+
+# Characters of the blob id kept in asset names
+ASSET_ID_LENGTH = 12
+
+# Responsive variants written next to an image, e.g. logo-1a2b3c4d5e6f-480w.png
+_VARIANT = re.compile(r'-\d+w(\.[^.]+)$')
+
+
+def git_blob_id(path: str) -> str:
+    """Compute the id git gives a file's content, without starting git."""
+    digest = hashlib.sha1()
+    digest.update(f"blob {os.path.getsize(path)}\0".encode('ascii'))
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def asset_name(rel_path: str, blob_id: str) -> str:
+    """Collision-free file name of an asset, e.g. ``docs/img/Logo.PNG`` -> ``Logo-1a2b3c4d5e6f.png``."""
+    stem, ext = posixpath.splitext(posixpath.basename(rel_path))
+    stem = re.sub(r'[^\w.-]+', '-', stem).strip('-') or 'asset'
+    return f"{stem}-{blob_id[:ASSET_ID_LENGTH]}{ext.lower()}"
+
+
+def remove_stale_assets(output_dir: str, names: Iterable[str], writer, logger: logging.Logger) -> None:
+    """
+    Remove assets no page references any more.
+
+    Args:
+        output_dir: Directory where documentation is generated
+        names: Names of the assets still referenced
+        writer: OutputWriter holding the outputs
+        logger: Logger instance
+    """
+    assets_dir = os.path.join(output_dir, 'static', ASSETS_DIR)
+    keep = set(names)
+    removed = 0
+    for entry in writer.listdir(assets_dir):
+        if entry in keep or _VARIANT.sub(r'\1', entry) in keep:
+            continue
+        path = os.path.join(assets_dir, entry)
+        if not writer.isdir(path):
+            writer.remove(path)
+            removed += 1
+    if removed:
+        logger.info(f"Removed {removed} unreferenced asset(s)")
@@ -0,0 +1,183 @@
+"""
+Block-level diffing of documentation content for incremental AI enhancement.
+"""
+import re
+import difflib
+from typing import Dict, List, Optional, Tuple
+
+
+MARKER_TEMPLATE = "<!-- block:{} -->"
+MARKER_PATTERN = re.compile(r'^\s*<!-- block:(\d+) -->\s*$', re.MULTILINE)
+
+_FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+
+
+def split_frontmatter(content: str) -> Tuple[str, str]:
+    """
+    Separate leading YAML frontmatter from the body.
+
+    Args:
+        content: Page content
+
+    Returns:
+        (frontmatter including its delimiters and trailing blank line, body)
+    """
+    if content.startswith('---\n'):
+        end = content.find('\n---\n', 4)
+        if end != -1:
+            split_at = end + len('\n---\n')
+            while content[split_at:split_at + 1] == '\n':
+                split_at += 1
+            return content[:split_at], content[split_at:]
+    return '', content
+
+
+def split_blocks(content: str) -> List[str]:
+    """
+    Split content into blocks separated by blank lines.
+
+    Fenced code blocks are kept whole even if they contain blank lines.
+
+    Args:
+        content: Markdown (or other text) content
+
+    Returns:
+        List of non-empty blocks without surrounding blank lines
+    """
+    blocks = []
+    current = []
+    in_fence = False
+
+    for line in content.split('\n'):
+        if _FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        if not in_fence and not line.strip():
+            if current:
+                blocks.append('\n'.join(current))
+                current = []
+            continue
+        current.append(line)
+
+    if current:
+        blocks.append('\n'.join(current))
+    return blocks
+
+
+def join_blocks(blocks: List[str]) -> str:
+    """Join blocks back into a document."""
+    return '\n\n'.join(blocks) + '\n'
+
+
+def mark_blocks(blocks: List[str], start: int = 0) -> str:
+    """
+    Prefix each block with a numbered marker line.
+
+    Args:
+        blocks: Blocks to mark
+        start: Index of the first block
+
+    Returns:
+        Marked text
+    """
+    return '\n\n'.join(
+        f"{MARKER_TEMPLATE.format(start + i)}\n{block}" for i, block in enumerate(blocks)
+    )
+
+
+def parse_marked(response: str) -> Dict[int, str]:
+    """
+    Split a marked model response back into blocks.
+
+    Args:
+        response: Model response containing marker lines
+
+    Returns:
+        Mapping of block index to enhanced text
+    """
+    result = {}
+    matches = list(MARKER_PATTERN.finditer(response))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(response)
+        result[int(match.group(1))] = response[match.end():end].strip('\n')
+    return result
+
+
+def strip_markers(text: str) -> str:
+    """Remove marker lines from text."""
+    return MARKER_PATTERN.sub('', text).replace('\n\n\n', '\n\n')
+
+
+class MarkerStripper:
+    """
+    Streaming filter removing marker lines from model output.
+
+    Text is passed through line by line, so output can still be written
+    incrementally while markers never reach the destination file.
+    """
+
+    def __init__(self):
+        self._pending = ''
+
+    def feed(self, token: str) -> str:
+        """
+        Consume a token and return the text that is safe to emit.
+
+        Args:
+            token: Next piece of model output
+
+        Returns:
+            Complete lines with marker lines removed
+        """
+        self._pending += token
+        cut = self._pending.rfind('\n')
+        if cut == -1:
+            return ''
+        complete, self._pending = self._pending[:cut + 1], self._pending[cut + 1:]
+        return ''.join(
+            line for line in complete.splitlines(True) if not MARKER_PATTERN.match(line)
+        )
+
+    def flush(self) -> str:
+        """Return any remaining text once the stream has ended."""
+        remaining, self._pending = self._pending, ''
+        return '' if MARKER_PATTERN.match(remaining) else remaining
+
+
+def changed_hunks(old_hashes: List[Optional[str]], new_hashes: List[str]) -> List[Tuple[int, int]]:
+    """
+    Find ranges of new blocks that differ from the previous version.
+
+    Args:
+        old_hashes: Block hashes from the previous run; None marks blocks that
+            have no reusable enhancement and must be resubmitted
+        new_hashes: Block hashes of the current content
+
+    Returns:
+        List of (start, end) index ranges into the new blocks
+    """
+    matcher = difflib.SequenceMatcher(a=old_hashes, b=new_hashes, autojunk=False)
+    hunks = []
+    for tag, _, _, j1, j2 in matcher.get_opcodes():
+        if tag in ('replace', 'insert') and j2 > j1:
+            hunks.append((j1, j2))
+    return hunks
+
+
+def reused_blocks(old_hashes: List[Optional[str]], new_hashes: List[str]) -> Dict[int, int]:
+    """
+    Map unchanged new block indices to their index in the previous version.
+
+    Args:
+        old_hashes: Block hashes from the previous run
+        new_hashes: Block hashes of the current content
+
+    Returns:
+        Mapping of new block index to old block index
+    """
+    matcher = difflib.SequenceMatcher(a=old_hashes, b=new_hashes, autojunk=False)
+    mapping = {}
+    for tag, i1, _, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for offset in range(j2 - j1):
+                mapping[j1 + offset] = i1 + offset
+    return mapping
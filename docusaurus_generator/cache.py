@@ -0,0 +1,202 @@
+"""
+Persistent cache shared by the generators across runs.
+"""
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Iterable, Optional, Set
+
+from .utils import write_file_atomic
+
+
+CACHE_DIR_NAME = '.docusaurus_generator_cache'
+
+
+def hash_text(text: str) -> str:
+    """
+    Hash text content.
+
+    Args:
+        text: Text to hash
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def hash_file(path: str, chunk_size: int = 1 << 16) -> str:
+    """
+    Hash a file's content without reading it into memory at once.
+
+    Args:
+        path: Path to the file
+        chunk_size: Number of bytes read per chunk
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class GeneratorCache:
+    """
+    JSON-backed key/value cache split into namespaces.
+
+    Each namespace is stored as one JSON file in the cache directory, loaded on
+    first use and written back by ``flush``. Lookups are counted per namespace
+    so cache effectiveness can be reported. Namespaces keyed by content
+    hashes gain a key whenever a file changes; ``prune`` drops the keys a run
+    did not use, so they do not grow without bound.
+    """
+
+    def __init__(self, cache_dir: Optional[str], logger: logging.Logger, read_only: bool = False):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache files, or None to keep the
+                cache in memory only
+            logger: Logger instance
+            read_only: Keep changes in memory only, e.g. for a dry run
+        """
+        self.cache_dir = cache_dir
+        self.logger = logger
+        self.read_only = read_only
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._namespaces: Dict[str, Dict[str, Any]] = {}
+        self._dirty = set()
+        # Keys looked up or stored since the last prune, by namespace
+        self._touched: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    def _path(self, namespace: str) -> str:
+        return os.path.join(self.cache_dir, f"{namespace}.json")
+
+    def _load(self, namespace: str) -> Dict[str, Any]:
+        if namespace not in self._namespaces:
+            data = {}
+            path = self._path(namespace) if self.cache_dir else None
+            if path and os.path.exists(path):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except Exception as e:
+                    self.logger.warning(f"Ignoring unreadable cache file {path}: {str(e)}")
+                    data = {}
+            self._namespaces[namespace] = data
+        return self._namespaces[namespace]
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """
+        Look up a cached value.
+
+        Args:
+            namespace: Cache namespace
+            key: Key within the namespace
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or the default
+        """
+        with self._lock:
+            data = self._load(namespace)
+            if key in data:
+                self.hits[namespace] = self.hits.get(namespace, 0) + 1
+                self._touched.setdefault(namespace, set()).add(key)
+                return data[key]
+            self.misses[namespace] = self.misses.get(namespace, 0) + 1
+            return default
+
+    def keys(self, namespace: str) -> Set[str]:
+        """Keys stored in a namespace, e.g. to skip work in worker processes; not counted as lookups."""
+        with self._lock:
+            return set(self._load(namespace))
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """
+        Store a JSON-serializable value.
+
+        Args:
+            namespace: Cache namespace
+            key: Key within the namespace
+            value: Value to store
+        """
+        with self._lock:
+            self._load(namespace)[key] = value
+            self._touched.setdefault(namespace, set()).add(key)
+            self._dirty.add(namespace)
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove a key from a namespace if present."""
+        with self._lock:
+            data = self._load(namespace)
+            if key in data:
+                del data[key]
+                self._dirty.add(namespace)
+
+    def prune(self, namespaces: Iterable[str]) -> None:
+        """
+        Drop the keys not used since the last prune, typically once at the end of a run.
+
+        Namespaces not used at all are left alone, since the work that reads
+        them may simply have been skipped, e.g. for a section whose page was
+        reused.
+
+        Args:
+            namespaces: Namespaces keyed by content, whose unused keys are stale
+        """
+        with self._lock:
+            for namespace in namespaces:
+                touched = self._touched.get(namespace)
+                if not touched:
+                    continue
+                data = self._load(namespace)
+                stale = [key for key in data if key not in touched]
+                for key in stale:
+                    del data[key]
+                if stale:
+                    self._dirty.add(namespace)
+                    self.logger.debug(f"Pruned {len(stale)} unused entries from cache namespace {namespace}")
+            self._touched.clear()
+
+    def flush(self) -> None:
+        """Write modified namespaces back to disk."""
+        with self._lock:
+            if self.read_only or not self.cache_dir:
+                return
+            for namespace in sorted(self._dirty):
+                try:
+                    write_file_atomic(
+                        self._path(namespace),
+                        json.dumps(self._namespaces[namespace], sort_keys=True)
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Error writing cache namespace {namespace}: {str(e)}")
+            self._dirty.clear()
+
+    def hit_rate(self, namespace: Optional[str] = None) -> Optional[float]:
+        """
+        Fraction of lookups that were hits.
+
+        Args:
+            namespace: Namespace to report on, or None for all namespaces
+
+        Returns:
+            Hit rate between 0 and 1, or None if there were no lookups
+        """
+        with self._lock:
+            if namespace is None:
+                hits = sum(self.hits.values())
+                total = hits + sum(self.misses.values())
+            else:
+                hits = self.hits.get(namespace, 0)
+                total = hits + self.misses.get(namespace, 0)
+        return hits / total if total else None
@@ -5,7 +5,8 @@ import os
 import sys
 import logging
 import argparse
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterator
 
 
 def setup_logging(verbose: bool = False) -> logging.Logger:
@@ -30,120 +31,149 @@ def setup_logging(verbose: bool = False) -> logging.Logger:
 
 
 def generate_content(prompt: str, model: str) -> Optional[str]:
-    model_provider, model_name = model.split('/')
-    
-    if model_provider == "openai":
-        collected_response = []
-        for token in generate_with_openai(prompt, model_name):
-            if token is not None:
-                #print(token, end='', flush=True)
-                collected_response.append(token)
-            else:
-                print("\nError occurred during generation.")
-        print()  # Print a newline at the end
-        return ''.join(collected_response)
-    elif model_provider == "azure":
-        #collected_response = []
-        #for token in generate_with_azure(prompt, model_name):
-        #    if token is not None:
-        #        print(token, end='', flush=True)
-        #        collected_response.append(token)
-        #    else:
-        #        print("\nError occurred during generation.")
-        #print()  # Print a newline at the end
-        return generate_with_azure(prompt, model_name)
-    elif model_provider == "ollama":
-        return generate_with_ollama(prompt, model_name)
-    else:
-        logging.error(f"Unsupported model provider: {model_provider}")
+    """
+    Generate a complete response from the configured model provider.
+    
+    Args:
+        prompt: Prompt to send to the model
+        model: Model identifier in "provider/model" form (e.g., "openai/gpt-4o")
+        
+    Returns:
+        Generated text, or None if generation failed or produced nothing
+    """
+    try:
+        collected_response = list(stream_content(prompt, model))
+    except Exception as e:
+        logging.error(f"Error occurred during generation with {model}: {str(e)}")
         return None
+    return ''.join(collected_response) if collected_response else None
 
 
-def generate_with_azure(prompt: str, model_name: str) -> Optional[str]:
+def stream_content(prompt: str, model: str) -> Iterator[str]:
+    """
+    Stream generated tokens from the configured model provider.
+    
+    Every provider is consumed in streaming mode so callers can write output
+    as soon as the first token arrives. Provider errors propagate to the
+    caller so they can be retried (see resilience.LLMResilience).
+    
+    Args:
+        prompt: Prompt to send to the model
+        model: Model identifier in "provider/model" form (e.g., "openai/gpt-4o")
+        
+    Yields:
+        Generated tokens in arrival order
+        
+    Raises:
+        ValueError: If the model provider is not supported
+    """
+    model_provider, model_name = model.split('/', 1)
+    
+    providers = {
+        'openai': generate_with_openai,
+        'azure': generate_with_azure,
+        'ollama': generate_with_ollama,
+    }
+    
+    provider = providers.get(model_provider)
+    if provider is None:
+        raise ValueError(f"Unsupported model provider: {model_provider}")
+    
+    yield from provider(prompt, model_name)
+
+
+@lru_cache(maxsize=None)
+def _azure_client():
+    """Create the Azure OpenAI client once; it is reused by every request of the process."""
     from azure.identity import ClientSecretCredential, get_bearer_token_provider
     from openai import AzureOpenAI
     from dotenv import load_dotenv
-    import numpy as np
     
-    try:
-        load_dotenv()
+    load_dotenv()
 
-        APIM_SUBSCRIPTION_KEY = os.getenv("APIM_SUBSCRIPTION_KEY")
-        default_headers = {}
-        if APIM_SUBSCRIPTION_KEY != None:
-            # only set this if the APIM API requires a subscription...
-            default_headers["Ocp-Apim-Subscription-Key"] = APIM_SUBSCRIPTION_KEY 
+    APIM_SUBSCRIPTION_KEY = os.getenv("APIM_SUBSCRIPTION_KEY")
+    default_headers = {}
+    if APIM_SUBSCRIPTION_KEY != None:
+        # only set this if the APIM API requires a subscription...
+        default_headers["Ocp-Apim-Subscription-Key"] = APIM_SUBSCRIPTION_KEY 
 
-        # Set up authority and credentials for Azure authentication
-        credential = ClientSecretCredential(
-            tenant_id=os.getenv("AZURE_TENANT_ID"),
-            client_id=os.getenv("AZURE_CLIENT_ID"),
-            client_secret=os.getenv("AZURE_CLIENT_SECRET"),
-            authority="https://login.microsoftonline.com",
-        )
+    # Set up authority and credentials for Azure authentication
+    credential = ClientSecretCredential(
+        tenant_id=os.getenv("AZURE_TENANT_ID"),
+        client_id=os.getenv("AZURE_CLIENT_ID"),
+        client_secret=os.getenv("AZURE_CLIENT_SECRET"),
+        authority="https://login.microsoftonline.com",
+    )
 
-        token_provider = get_bearer_token_provider(credential, "https://cognitiveservices.azure.com/.default")
+    token_provider = get_bearer_token_provider(credential, "https://cognitiveservices.azure.com/.default")
 
-        client = AzureOpenAI(
-            # azure_ad_token=access_token.token,
-            azure_ad_token_provider=token_provider,
-            api_version=os.getenv("API_VERSION"),
-            azure_endpoint=os.getenv("API_ENDPOINT"),
-            default_headers=default_headers,
-        )
+    return AzureOpenAI(
+        # azure_ad_token=access_token.token,
+        azure_ad_token_provider=token_provider,
+        api_version=os.getenv("API_VERSION"),
+        azure_endpoint=os.getenv("API_ENDPOINT"),
+        default_headers=default_headers,
+        # Retries are handled by resilience.LLMResilience
+        max_retries=0,
+    )
 
-        completion = client.chat.completions.create(
-            messages = [
-                {
-                    "role": "system",
-                    "content": "As a SLIM Best Practice User, your role is to understand, apply, and implement the best practices for Software Lifecycle Improvement and Modernization (SLIM) within your software projects. You should aim to optimize your software development processes, enhance the quality of your software products, and ensure continuous improvement across all stages of the software lifecycle.",
-                },
-                {
-                    "role": "user",
-                    "content": prompt,
-                }
-            ],
-            model=model_name
-        )
-        return completion.choices[0].message.content
-    except Exception as e:
-        print(f"An error occurred running on Azure model: {str(e)}")
-        return None
 
+def generate_with_azure(prompt: str, model_name: str) -> Iterator[str]:
+    client = _azure_client()
 
-def generate_with_openai(prompt: str, model_name: str) -> Optional[str]:
+    completion = client.chat.completions.create(
+        messages = [
+            {
+                "role": "system",
+                "content": "As a SLIM Best Practice User, your role is to understand, apply, and implement the best practices for Software Lifecycle Improvement and Modernization (SLIM) within your software projects. You should aim to optimize your software development processes, enhance the quality of your software products, and ensure continuous improvement across all stages of the software lifecycle.",
+            },
+            {
+                "role": "user",
+                "content": prompt,
+            }
+        ],
+        model=model_name,
+        stream=True
+    )
+    for chunk in completion:
+        # Azure sends content filter results as chunks without choices
+        if chunk.choices and chunk.choices[0].delta.content is not None:
+            yield chunk.choices[0].delta.content
+
+
+@lru_cache(maxsize=None)
+def _openai_client():
+    """Create the OpenAI client once; it is reused by every request of the process."""
     from openai import OpenAI
     from dotenv import load_dotenv
     load_dotenv()
-    try:    
-        client = OpenAI(api_key = os.getenv('OPENAI_API_KEY'))
-        response = client.chat.completions.create(
-            model=model_name,
-            messages=[{"role": "user", "content": prompt}],
-            stream=True
-        )
-        for chunk in response:
-            if chunk.choices[0].delta.content is not None:
-                yield chunk.choices[0].delta.content
-    except Exception as e:
-        print(f"An error occurred running OpenAI model: {e}")
-        yield None
+    # Retries are handled by resilience.LLMResilience
+    return OpenAI(api_key = os.getenv('OPENAI_API_KEY'), max_retries=0)
+
 
-def generate_with_ollama(prompt: str, model_name: str) -> Optional[str]:
+def generate_with_openai(prompt: str, model_name: str) -> Iterator[str]:
+    client = _openai_client()
+    response = client.chat.completions.create(
+        model=model_name,
+        messages=[{"role": "user", "content": prompt}],
+        stream=True
+    )
+    for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content is not None:
+            yield chunk.choices[0].delta.content
+
+def generate_with_ollama(prompt: str, model_name: str) -> Iterator[str]:
     import ollama
 
-    try:
-        response = ollama.chat(model=model_name, messages=[
-        {
-            'role': 'user',
-            'content': prompt,
-        },
-        ])
-        #print(response['message']['content'])
-        return (response['message']['content'])
-    except Exception as e:
-        logging.error(f"Error running Ollama model: {e}")
-        return None
+    response = ollama.chat(model=model_name, messages=[
+    {
+        'role': 'user',
+        'content': prompt,
+    },
+    ], stream=True)
+    for chunk in response:
+        if chunk['message']['content']:
+            yield chunk['message']['content']
 
     #try:
     #    response = subprocess.run(['ollama', 'run', model_name, prompt], capture_output=True, text=True, check=True)
@@ -166,7 +196,8 @@ def parse_arguments() -> Dict[str, Any]:
     
     parser.add_argument(
         'repo_path',
-        help='Path to the repository'
+        nargs='?',
+        help='Path to the repository (not used with --serve)'
     )
     
     parser.add_argument(
@@ -184,7 +215,66 @@ def parse_arguments() -> Dict[str, Any]:
     
     parser.add_argument(
         '--use-ai',
-        help='Enable AI enhancement with specified model (e.g., "openai/gpt-4o")'
+        help='Enable AI enhancement with specified model (e.g., "openai/gpt-4o"); '
+             'overrides ai.enabled and ai.model in the configuration'
+    )
+    
+    parser.add_argument(
+        '--no-ai',
+        action='store_true',
+        help='Disable AI enhancement even if the configuration enables it'
+    )
+    
+    parser.add_argument(
+        '--versions',
+        nargs='+',
+        metavar='REF',
+        help='Also generate versioned docs for these git tags or branches, newest first'
+    )
+    
+    parser.add_argument(
+        '--plan',
+        nargs='?',
+        const='text',
+        choices=['text', 'json'],
+        help='Build the pages in memory and report sizes, stale outputs and estimated AI tokens, '
+             'cost and time without writing anything'
+    )
+    
+    parser.add_argument(
+        '--metrics-file',
+        metavar='PATH',
+        help='Write run metrics in the OpenMetrics text format to this file (overrides metrics.textfile)'
+    )
+    
+    parser.add_argument(
+        '--artifact',
+        metavar='PATH',
+        help='Also write the generated files to a reproducible .tar.zst, .tar.gz or .tar artifact '
+             '("-" for a gzip-compressed tar on stdout)'
+    )
+    
+    parser.add_argument(
+        '--build',
+        action='store_true',
+        help='Build the static site after installing dependencies; with --artifact the build is archived too'
+    )
+    
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run a local HTTP/JSON server that queues generation jobs and keeps caches warm between them'
+    )
+    
+    parser.add_argument(
+        '--host',
+        help='Interface the server listens on (defaults to server.host, 127.0.0.1)'
+    )
+    
+    parser.add_argument(
+        '--port',
+        type=int,
+        help='Port the server listens on (defaults to server.port, 8765)'
     )
     
     parser.add_argument(
@@ -206,7 +296,12 @@ def parse_arguments() -> Dict[str, Any]:
         help='Start Docusaurus development server after generation'
     )
     
-    return vars(parser.parse_args())
+    args = parser.parse_args()
+    if not args.serve and not args.repo_path:
+        parser.error('the repo_path argument is required unless --serve is given')
+    if args.no_ai and args.use_ai:
+        parser.error('--use-ai and --no-ai cannot be combined')
+    return vars(args)
 
 
 def main() -> int:
@@ -228,11 +323,29 @@ def main() -> int:
         import yaml
         try:
             with open(args['config'], 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.safe_load(f) or {}
         except Exception as e:
             logger.error(f"Error loading configuration: {str(e)}")
             return 1
     
+    if args['metrics_file']:
+        config['metrics'] = dict(config.get('metrics') or {}, textfile=args['metrics_file'])
+    
+    if args['no_ai']:
+        config['ai'] = dict(config.get('ai') or {}, enabled=False)
+    
+    if args['serve']:
+        from .server import serve
+        serve(config, logger, args['host'], args['port'])
+        return 0
+    
+    if args['plan']:
+        import json
+        from .planner import format_plan, plan_run
+        plan = plan_run(args['repo_path'], args['output_dir'], config, args['use_ai'], logger)
+        print(json.dumps(plan, indent=2) if args['plan'] == 'json' else format_plan(plan))
+        return 0
+    
     # Import DocusaurusGenerator locally to avoid circular imports
     from .generator import DocusaurusGenerator
     
@@ -241,13 +354,17 @@ def main() -> int:
         repo_path=args['repo_path'],
         output_dir=args['output_dir'],
         config=config,
-        use_ai=args['use_ai']
+        use_ai=args['use_ai'],
+        versions=args['versions']
     )
     
     # Generate documentation and optionally install and start
+    artifact = sys.stdout.buffer if args['artifact'] == '-' else args['artifact']
     success = generator.setup_and_start(
-        install=args['install'],
-        start=args['start']
+        install=args['install'] or args['build'],
+        start=args['start'],
+        build=args['build'],
+        artifact=artifact
     )
     
     return 0 if success else 1
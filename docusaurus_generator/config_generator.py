@@ -2,20 +2,21 @@
 Docusaurus configuration generation functionality.
 """
 import os
-import re
-import git
-import json
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional
-import shutil
+
+from .writer import OutputWriter
+from .project_info import resolve_project_info
 
 class DocusaurusConfigGenerator:
     """
     Generator for Docusaurus configuration files.
     """
     
-    def __init__(self, repo_path: str, output_dir: str, config: Dict, logger: logging.Logger):
+    def __init__(self, repo_path: str, output_dir: str, config: Dict, logger: logging.Logger,
+                 writer: Optional[OutputWriter] = None, project_info: Optional[Dict[str, str]] = None,
+                 versions: Optional[List[str]] = None):
         """
         Initialize the configuration generator.
         
@@ -24,107 +25,29 @@ class DocusaurusConfigGenerator:
             output_dir: Directory where documentation should be generated
             config: Configuration dictionary
             logger: Logger instance
+            writer: Optional output writer shared with the other generators
+            project_info: Optional project metadata resolved once for all generators
+            versions: Optional names of the versioned docs, newest first
         """
         self.repo_path = repo_path
         self.output_dir = output_dir
         self.config = config
         self.logger = logger
-
-
-    def _extract_project_info(self) -> dict:
-        """Extract project information from repository and package files."""
-        # Extract project name from repository
-        project_name = os.path.basename(self.repo_path)
-        repo_name = project_name
-        description = f"{project_name} Documentation"
-        repo_url = ""
-        org_name = ""
-        
-        # Try to find more details in package.json if it exists
-        project_info = self._extract_package_json_info(project_name, description, repo_url)
-        project_name = project_info["project_name"]
-        description = project_info["description"]
-        repo_url = project_info["repo_url"]
-        
-        # Extract organization and repo name from git if available
-        git_info = self._extract_git_info(org_name, repo_name, repo_url)
-        org_name = git_info["org_name"]
-        repo_name = git_info["repo_name"]
-        repo_url = git_info["repo_url"]
-        
-        return {
-            "project_name": project_name,
-            "repo_name": repo_name,
-            "description": description,
-            "repo_url": repo_url,
-            "org_name": org_name
-        }
-
-    def _extract_package_json_info(self, project_name, description, repo_url):
-        """Extract information from package.json if it exists."""
-        package_json = os.path.join(self.repo_path, 'package.json')
-        if os.path.exists(package_json):
-            try:
-                with open(package_json, 'r') as f:
-                    package_data = json.load(f)
-                    if 'name' in package_data:
-                        project_name = package_data['name']
-                    if 'description' in package_data:
-                        description = package_data['description']
-                    if 'repository' in package_data:
-                        repo_url = self._extract_repo_url_from_package(package_data)
-            except Exception as e:
-                self.logger.warning(f"Error reading package.json: {str(e)}")
-        
-        return {
-            "project_name": project_name,
-            "description": description,
-            "repo_url": repo_url
-        }
-
-    def _extract_repo_url_from_package(self, package_data):
-        """Extract repository URL from package data."""
-        if isinstance(package_data['repository'], str):
-            return package_data['repository']
-        elif isinstance(package_data['repository'], dict) and 'url' in package_data['repository']:
-            return package_data['repository']['url']
-        return ""
-
-    def _extract_git_info(self, org_name, repo_name, repo_url):
-        """Extract organization and repo information from git."""
-        try:
-            repo = git.Repo(self.repo_path)
-            for remote in repo.remotes:
-                for url in remote.urls:
-                    # Extract org and repo from common git URL formats
-                    match = re.search(r'github\.com[:/]([^/]+)/([^/.]+)', url)
-                    if match:
-                        org_name = match.group(1)
-                        repo_name = match.group(2)
-                        repo_url = f"https://github.com/{org_name}/{repo_name}"
-                        break
-        except Exception as e:
-            self.logger.warning(f"Error extracting git information: {str(e)}")
-        
-        return {
-            "org_name": org_name,
-            "repo_name": repo_name,
-            "repo_url": repo_url
-        }
+        self.writer = writer or OutputWriter(output_dir, logger)
+        self.project_info = project_info
+        self.versions = versions or []
 
     def _create_supporting_files(self, project_info):
         """Create supporting files for the Docusaurus site."""
-        self._create_custom_css_file()
+        # src/css/custom.css is owned by ContentGenerator.generate_homepage
         self._create_logo_files()
 
     def _create_logo_files(self):
         """Create logo and favicon files."""
         img_dir = os.path.join(self.output_dir, 'static', 'img')
-        os.makedirs(img_dir, exist_ok=True)
         
         # Create a placeholder logo file
-        with open(os.path.join(img_dir, 'logo.svg'), 'w') as f:
-            f.write("""<svg width="200" height="200" viewBox="0 0 200 200" xmlns="http://www.w3.org/2000/svg">
+        self.writer.write(os.path.join(img_dir, 'logo.svg'), """<svg width="200" height="200" viewBox="0 0 200 200" xmlns="http://www.w3.org/2000/svg">
     <rect width="200" height="200" fill="#4183c4"/>
     <text x="50%" y="50%" dominant-baseline="middle" text-anchor="middle" fill="white" font-family="Arial" font-size="40">
         DOCS
@@ -132,30 +55,11 @@ class DocusaurusConfigGenerator:
     </svg>""")
         
         # Create a placeholder favicon
-        shutil.copy(
+        self.writer.copy(
             os.path.join(img_dir, 'logo.svg'),
             os.path.join(img_dir, 'favicon.svg')
         )
 
-    def _create_custom_css_file(self):
-        """Create the custom CSS file."""
-        os.makedirs(os.path.join(self.output_dir, 'src', 'css'), exist_ok=True)
-        with open(os.path.join(self.output_dir, 'src', 'css', 'custom.css'), 'w') as f:
-            f.write("""
-    /* Your custom styles */
-    :root {
-    --ifm-color-primary: #4183c4;
-    --ifm-color-primary-dark: #3a75b0;
-    --ifm-color-primary-darker: #336699;
-    --ifm-color-primary-darkest: #2d5986;
-    --ifm-color-primary-light: #5191d3;
-    --ifm-color-primary-lighter: #639fdb;
-    --ifm-color-primary-lightest: #75ade2;
-    --ifm-code-font-size: 95%;
-    }
-    """)
-            
-
     def generate_docusaurus_config(self) -> None:
         """
         Generate the docusaurus.config.js file for the documentation site.
@@ -163,13 +67,14 @@ class DocusaurusConfigGenerator:
         self.logger.debug("Starting docusaurus config generation")
         
         # Extract project information
-        project_info = self._extract_project_info()
+        project_info = self.project_info or resolve_project_info(self.repo_path, None, self.logger)
         
         # Generate the complete config file
         config_path = os.path.join(self.output_dir, 'docusaurus.config.js')
         
         repo_name = project_info["repo_name"]
-        description = project_info["description"]
+        # The description can come from README prose; keep the JS string valid
+        description = project_info["description"].replace('\\', '\\\\').replace('"', '\\"')
         org_name = project_info["org_name"]
         repo_url = project_info["repo_url"]
         
@@ -205,7 +110,10 @@ class DocusaurusConfigGenerator:
         {{
             docs: {{
             sidebarPath: require.resolve('./sidebars.js'),
-            routeBasePath: "/",
+            routeBasePath: "/",{'''
+            showLastUpdateTime: true,
+            showLastUpdateAuthor: true,''' if self.config.get('git_metadata', {}).get('enabled', True) else ''}{'''
+            lastVersion: "current",''' if self.versions else ''}
             }},
             theme: {{
             customCss: require.resolve('./src/css/custom.css'),
@@ -237,6 +145,15 @@ class DocusaurusConfigGenerator:
             label: "API",
             position: "left",
             }},
+            {'''{
+            type: "docsVersionDropdown",
+            position: "right",
+            },''' if self.versions else ''}
+            {'''{
+            to: "/search",
+            label: "Search",
+            position: "right",
+            },''' if self.config.get('search', {}).get('enabled', True) else ''}
             {f'''{{
             href: "{repo_url}",
             label: "GitHub",
@@ -267,8 +184,7 @@ class DocusaurusConfigGenerator:
     }};
     """
         
-        with open(config_path, 'w') as f:
-            f.write(config_content)
+        self.writer.write(config_path, config_content)
         
         # Create supporting files
         self._create_supporting_files(project_info)
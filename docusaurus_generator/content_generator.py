@@ -4,15 +4,232 @@ Content generation functionality for Docusaurus documentation.
 import os
 import re
 import git
+import time
 import yaml
+import io
 import json
 import logging
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import shutil
 
 from .ai_enhancer import enhance_with_ai
+from .resilience import LLMResilience
+from .cache import CACHE_DIR_NAME, GeneratorCache, hash_text
+from .repo_index import RepoIndex
+from .project_tree import DirectoryNode, build_tree, render_tree
+from .testing_inventory import build_test_inventory, is_test_file, render_test_inventory
+from .lockfiles import analyze_lockfiles, render_dependency_summary
+from .manifests import MANIFESTS, read_manifests, render_manifests
+from .writer import OutputWriter
+from .project_info import resolve_project_info
+from .images import ImageOptimizer
+from .search_index import STOPWORDS, heading_anchor, update_search_index
+from .git_metadata import collect_file_history, last_update
+from .symbols import SOURCE_EXTENSIONS, SymbolIndex, link_symbols
+from .packages import (PACKAGE_SECTIONS, detect_packages, package_fingerprint, package_of,
+                       package_slugs)
+from .links import LINK_REPORT_NAME, LinkIndex, mark_repo_links
+from .assets import git_blob_id
+from .sections import (DEFAULT_POSITION, SECTIONS_CACHE_NAMESPACE, SectionBudget, file_states, input_fingerprint,
+                       load_plugins, run_plugins, section_settings)
+
+
+# Collapsible project tree that fetches static/data/project-tree.json on first expand
+PROJECT_TREE_COMPONENT = '''import React, {useState} from 'react';
+import useBaseUrl from '@docusaurus/useBaseUrl';
+
+function formatSize(size) {
+  const units = ['B', 'KB', 'MB', 'GB'];
+  let value = size;
+  let unit = 0;
+  while (value >= 1024 && unit < units.length - 1) {
+    value /= 1024;
+    unit += 1;
+  }
+  return unit === 0 ? `${value} B` : `${value.toFixed(1)} ${units[unit]}`;
+}
+
+function TreeNode({node}) {
+  const [open, setOpen] = useState(false);
+  if (!node.children) {
+    return <li>{node.name}</li>;
+  }
+  return (
+    <li>
+      <details onToggle={(event) => setOpen(event.currentTarget.open)}>
+        <summary>
+          {node.name}/ <small>({node.files} files, {formatSize(node.size)})</small>
+        </summary>
+        {open && (
+          <ul>
+            {node.children.map((child) => (
+              <TreeNode key={child.name} node={child} />
+            ))}
+          </ul>
+        )}
+      </details>
+    </li>
+  );
+}
+
+export default function ProjectTree() {
+  const url = useBaseUrl('/data/project-tree.json');
+  const [tree, setTree] = useState(null);
+  const [error, setError] = useState(null);
+
+  const load = () => {
+    if (tree || error) {
+      return;
+    }
+    fetch(url)
+      .then((response) => response.json())
+      .then(setTree)
+      .catch((err) => setError(String(err)));
+  };
+
+  return (
+    <details onToggle={(event) => event.currentTarget.open && load()}>
+      <summary>Browse the full project tree</summary>
+      {error && <p>Could not load the project tree: {error}</p>}
+      {!error && !tree && <p>Loading…</p>}
+      {tree && (
+        <ul>
+          <TreeNode node={tree} />
+        </ul>
+      )}
+    </details>
+  );
+}
+'''
+
+# Search box that loads the index manifest, then all shards on the first query
+SEARCH_COMPONENT = '''import React, {useEffect, useRef, useState} from 'react';
+import Link from '@docusaurus/Link';
+import useBaseUrl from '@docusaurus/useBaseUrl';
+
+const STOPWORDS = new Set(__STOPWORDS__);
+
+function tokenize(text) {
+  return (text.toLowerCase().match(/[a-z0-9][a-z0-9_]*/g) || [])
+    .filter((term) => term.length > 1 && !STOPWORDS.has(term));
+}
+
+function search(shards, query) {
+  const terms = tokenize(query);
+  if (terms.length === 0) {
+    return [];
+  }
+  const results = [];
+  shards.forEach((shard) => {
+    const scores = new Map();
+    terms.forEach((term, position) => {
+      // The last term may still be being typed, so match it as a prefix
+      const keys = position === terms.length - 1
+        ? Object.keys(shard.terms).filter((key) => key.startsWith(term))
+        : [term];
+      keys.forEach((key) => {
+        const postings = shard.terms[key] || [];
+        for (let i = 0; i < postings.length; i += 2) {
+          const doc = postings[i];
+          const score = scores.get(doc) || {score: 0, matched: new Set()};
+          score.score += postings[i + 1];
+          score.matched.add(position);
+          scores.set(doc, score);
+        }
+      });
+    });
+    scores.forEach(({score, matched}, doc) => {
+      if (matched.size === terms.length) {
+        results.push({score, page: shard.title, ...shard.docs[doc]});
+      }
+    });
+  });
+  return results.sort((a, b) => b.score - a.score).slice(0, 20);
+}
+
+export default function SearchBox() {
+  const baseUrl = useBaseUrl('/search/');
+  const siteUrl = useBaseUrl('/');
+  const [query, setQuery] = useState('');
+  const [results, setResults] = useState([]);
+  const [error, setError] = useState(null);
+  const shards = useRef(null);
+
+  const loadShards = () => {
+    if (!shards.current) {
+      shards.current = fetch(`${baseUrl}manifest.json`)
+        .then((response) => response.json())
+        .then((manifest) => Promise.all(
+          Object.values(manifest.shards).map((entry) =>
+            fetch(`${baseUrl}${entry.file}`).then((response) => response.json()))
+        ))
+        .catch((err) => {
+          // Forget the failed load so the next query tries again
+          shards.current = null;
+          throw err;
+        });
+    }
+    return shards.current;
+  };
+
+  useEffect(() => {
+    if (!query.trim()) {
+      setResults([]);
+      return;
+    }
+    loadShards()
+      .then((loaded) => {
+        setError(null);
+        setResults(search(loaded, query));
+      })
+      .catch((err) => setError(String(err)));
+  }, [query]);
+
+  return (
+    <div>
+      <input
+        type="search"
+        className="navbar__search-input"
+        placeholder="Search the documentation"
+        value={query}
+        onFocus={() => loadShards().catch(() => {})}
+        onChange={(event) => setQuery(event.target.value)}
+      />
+      {error && <p>Could not load the search index: {error}</p>}
+      <ul>
+        {results.map((result) => (
+          <li key={result.url}>
+            <Link to={`${siteUrl}${result.url.slice(1)}`}>
+              {result.page === result.title ? result.title : `${result.page} › ${result.title}`}
+            </Link>
+            {result.snippet && <p>{result.snippet}</p>}
+          </li>
+        ))}
+      </ul>
+    </div>
+  );
+}
+'''
+
+SEARCH_PAGE = '''import React from 'react';
+import Layout from '@theme/Layout';
+import SearchBox from '@site/src/components/SearchBox';
+
+export default function Search() {
+  return (
+    <Layout title="Search">
+      <main className="container margin-vert--lg">
+        <h1>Search</h1>
+        <SearchBox />
+      </main>
+    </Layout>
+  );
+}
+'''
 
 
 class ContentGenerator:
@@ -20,7 +237,26 @@ class ContentGenerator:
     Generator for Docusaurus content files.
     """
     
-    def __init__(self, repo_path: str, output_dir: str, use_ai: Optional[str], logger: logging.Logger):
+    # Directories whose Markdown files make up the guides page
+    GUIDE_DIRS = ('docs', 'doc', 'guides', 'tutorials')
+    
+    # Documents embedded in a page, the first one found in each list
+    ARCHITECTURE_DOCS = ('ARCHITECTURE.md', 'docs/architecture.md', 'docs/design.md')
+    TESTING_DOCS = ('TESTING.md', 'docs/testing.md')
+    SECURITY_DOCS = ('SECURITY.md', '.github/SECURITY.md', 'docs/security.md')
+    
+    # Deployment configuration by category; directories end with a slash
+    DEPLOYMENT_FILES = {
+        'Docker': ['Dockerfile', 'docker-compose.yml'],
+        'Kubernetes': ['.kubernetes/', 'k8s/'],
+        'CI/CD': ['.github/workflows/', '.gitlab-ci.yml', 'Jenkinsfile'],
+        'Scripts': ['deploy.sh', 'deploy.py']
+    }
+    
+    def __init__(self, repo_path: str, output_dir: str, use_ai: Optional[str], logger: logging.Logger,
+                 config: Optional[Dict] = None, writer: Optional[OutputWriter] = None,
+                 project_info: Optional[Dict[str, str]] = None, cache: Optional[GeneratorCache] = None,
+                 git_history: Optional[Dict[str, Dict]] = None, ai_resilience: Optional[LLMResilience] = None):
         """
         Initialize the content generator.
         
@@ -29,12 +265,98 @@ class ContentGenerator:
             output_dir: Directory where documentation should be generated
             use_ai: Optional AI model to use for enhanced documentation
             logger: Logger instance
+            config: Optional configuration dictionary
+            writer: Optional output writer shared with the other generators
+            project_info: Optional project metadata; resolved on first use if omitted
+            cache: Optional cache shared with other generators; opened from the
+                output directory if omitted
+            git_history: Optional last commit per file; read from the repository if omitted
+            ai_resilience: Optional resilience layer shared between runs; built
+                from the ``ai`` configuration if omitted
         """
         self.repo_path = repo_path
         self.output_dir = output_dir
         self.use_ai = use_ai
         self.logger = logger
-
+        self.config = config or {}
+        
+        # Skips rewriting files whose content did not change
+        self.writer = writer or OutputWriter(output_dir, logger)
+        
+        # Streaming timings for each AI-enhanced section
+        self.ai_metrics: Dict[str, Dict[str, float]] = {}
+        
+        # Retries, adaptive concurrency and circuit breaking for AI providers
+        self.ai_resilience = None
+        if use_ai:
+            self.ai_resilience = ai_resilience or LLMResilience.from_config(self.config.get('ai'), self.logger)
+        
+        # One walk of the repository shared by the section walkers
+        self.repo_index = RepoIndex(self.repo_path, self.logger, exclude_paths=[self.output_dir])
+        
+        # Results kept between runs, e.g. previously enhanced blocks; in memory
+        # only when the outputs are, unless a cache directory is configured
+        default_cache_dir = None if self.writer.in_memory else os.path.join(self.output_dir, CACHE_DIR_NAME)
+        self.cache = cache or GeneratorCache(self.config.get('cache_dir') or default_cache_dir, self.logger)
+        
+        self._project_info = project_info
+        self._git_history = git_history
+        self._package_dirs: Optional[List[str]] = None
+        self._symbol_index: Optional[SymbolIndex] = None
+        # API budget spent scanning sources for the symbol index, which other sections may build first
+        self._symbol_budget = SectionBudget()
+        # Sections run concurrently, so shared state is resolved under a lock
+        self._lazy_lock = threading.RLock()
+        
+        # Enabled built-in and installed sections, by name in generation order
+        self.plugins = load_plugins(self.config, self.logger)
+        
+        # Time, file and output limits of each section, from its last generation
+        self.budgets: Dict[str, SectionBudget] = {}
+        
+        # Doc id prefix of this generator's pages, and path of its root in the repository, set for sub-packages
+        self.page_prefix = ''
+        self.source_prefix = ''
+        
+        # Prefix of this generator's page-keyed cache entries, set for versioned docs
+        self.cache_prefix = ''
+        
+        # Sub-packages documented by generate_all_sections, for the sidebar
+        self.packages: List[Dict] = []
+        
+        # Seconds spent building each section, the packages and the links
+        self.timings: Dict[str, float] = {}
+        
+        # Assets referenced by the pages, by asset name, mapped to their source file;
+        # None until links are rewritten, in which case every image is copied
+        self.assets: Optional[Dict[str, str]] = None
+        
+        # Recompresses copied and generated images, skipping unchanged ones
+        self.image_optimizer = ImageOptimizer(self.cache, self.writer, self.logger, self.config.get('images'))
+
+    @property
+    def project_info(self) -> Dict[str, str]:
+        """Project name, description and repository details, resolved once."""
+        with self._lazy_lock:
+            if self._project_info is None:
+                self._project_info = resolve_project_info(self.repo_path, self.cache, self.logger)
+        return self._project_info
+
+    @property
+    def git_history(self) -> Dict[str, Dict]:
+        """Latest commit time and author per file, from one git log pass."""
+        with self._lazy_lock:
+            if self._git_history is None:
+                self._git_history = collect_file_history(self.repo_path, self.cache, self.logger)
+        return self._git_history
+
+    @property
+    def package_dirs(self) -> List[str]:
+        """Relative directories of the repository's sub-packages."""
+        if self._package_dirs is None:
+            enabled = self.config.get('packages', {}).get('enabled', True)
+            self._package_dirs = detect_packages(self.repo_index) if enabled else []
+        return self._package_dirs
 
     def generate_all_sections(self) -> Dict[str, Optional[str]]:
         """
@@ -43,50 +365,247 @@ class ContentGenerator:
         Returns:
             A dictionary of section names mapped to their content.
         """
-        # Create the docs directory
         docs_dir = os.path.join(self.output_dir, 'docs')
-        os.makedirs(docs_dir, exist_ok=True)
-        
-        sections = {
-            'overview': self._generate_overview(),
-            'installation': self._generate_installation(),
-            'api': self._generate_api(),
-            'guides': self._generate_guides(),
-            'contributing': self._generate_contributing(),
-            'changelog': self._generate_changelog(),
-            'deployment': self._generate_deployment(),
-            'architecture': self._generate_architecture(),
-            'testing': self._generate_testing(),
-            'security': self._generate_security()
-        }
+        sections, pages = self.build_pages()
+        
+        ai_jobs = []
+        for page_id, content in pages.items():
+            # Updated path to include docs directory
+            file_path = os.path.join(docs_dir, *f"{page_id}.md".split('/'))
+            
+            if self.use_ai and page_id in sections:
+                ai_jobs.append((page_id, content, file_path))
+                continue
+            
+            self.writer.write(file_path, content)
+            
+            if page_id in sections:
+                self.logger.info(f"Generated {page_id} documentation")
+        
+        if ai_jobs:
+            self._enhance_sections(ai_jobs)
+        
+        # Pages of sections turned off in the configuration
+        for name in self.config.get('sections') or {}:
+            file_path = os.path.join(docs_dir, f"{name}.md")
+            if name not in self.plugins and self.writer.exists(file_path):
+                self.writer.remove(file_path)
+                self.logger.info(f"Removed {name} documentation; the section is disabled")
+        
+        self.logger.info("Generated index.md as main entry point")
+        
+        if self.config.get('search', {}).get('enabled', True):
+            self._update_search_index(docs_dir, sections)
+                
+        return sections
 
-        for section_name, content in sections.items():
-            if content:
-                if self.use_ai:
-                    content = enhance_with_ai(content, section_name, self.use_ai, self.logger)
+    def build_pages(self) -> Tuple[Dict[str, Optional[str]], Dict[str, str]]:
+        """
+        Generate every page in memory, ready to be written.
+        
+        Sections, the index and the package pages are generated and their
+        links rewritten. Only side outputs such as the link report go through
+        the writer, so with a ``DryRunWriter`` nothing is written.
+        
+        Returns:
+            (section name to content or None, doc id to content of every page)
+        """
+        docs_dir = os.path.join(self.output_dir, 'docs')
+        
+        sections = self.generate_sections()
+        started = time.monotonic()
+        self.generate_packages(docs_dir)
+        self.timings['packages'] = time.monotonic() - started
+        
+        # Create an index.md file to serve as the main entry point
+        pages = {name: content for name, content in sections.items() if content}
+        pages['index'] = self.generate_index(sections)
+        for package in self.packages:
+            for section in package['sections']:
+                pages[f"packages/{package['slug']}/{section}"] = package['pages'][section]
+        
+        # Point links between embedded files at their pages and check them all
+        links_config = self.config.get('links', {})
+        if links_config.get('enabled', True):
+            started = time.monotonic()
+            pages, link_index = self.rewrite_links(pages, self.repo_index.files)
+            self.timings['links'] = time.monotonic() - started
+            self.assets = {name: self.repo_index.abspath(path) for name, path in link_index.assets.items()}
+            report = link_index.report()
+            report_name = links_config.get('report', LINK_REPORT_NAME)
+            if report_name:
+                self.writer.write_json(os.path.join(self.output_dir, report_name), report, indent=2)
+            if report['broken']:
+                self.logger.warning(f"{len(report['broken'])} of {report['checked']} links are broken; "
+                                    f"they were reduced to plain text")
+                for problem in report['broken']:
+                    self.logger.debug(f"Broken link in {problem['page']}.md:{problem['line']}: "
+                                      f"{problem['target']} ({problem['reason']})")
+        
+        return sections, pages
+
+    def generate_packages(self, docs_dir: str) -> List[Dict]:
+        """
+        Generate a docs subtree under ``docs/packages/`` for every sub-package.
+        
+        Packages are generated on a thread pool. Each keeps its pages in its
+        own cache namespace together with a fingerprint of its files, so only
+        packages with changed files are generated again.
+        
+        Args:
+            docs_dir: The docs directory
+            
+        Returns:
+            One entry per package with its 'slug', 'name', 'dir', generated
+            'sections' and their 'pages', which are left to the caller to write
+        """
+        packages_dir = os.path.join(docs_dir, 'packages')
+        self.packages = []
+        if self.package_dirs:
+            config_hash = hash_text(json.dumps(self.config, sort_keys=True, default=str))
+            workers = self.config.get('packages', {}).get('workers')
+            slugs = package_slugs(self.package_dirs)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                self.packages = list(executor.map(
+                    lambda rel_dir: self._generate_package(rel_dir, slugs[rel_dir], packages_dir, config_hash),
+                    self.package_dirs
+                ))
+            self.cache.flush()
+        
+        # Remove the subtrees of packages that no longer exist
+        current = {package['slug'] for package in self.packages}
+        for entry in self.writer.listdir(packages_dir):
+            if entry not in current and self.writer.isdir(os.path.join(packages_dir, entry)):
+                self.writer.remove(os.path.join(packages_dir, entry))
+                self.logger.info(f"Removed documentation of deleted package {entry}")
+        
+        return self.packages
+
+    def _generate_package(self, rel_dir: str, slug: str, packages_dir: str, config_hash: str) -> Dict:
+        """Generate or reuse one package's pages, removing pages it no longer has."""
+        prefix = rel_dir + '/'
+        files = [path for path in self.repo_index.files if package_of(path, self.package_dirs) == rel_dir]
+        history = {}
+        if self.config.get('git_metadata', {}).get('enabled', True):
+            history = {path[len(prefix):]: entry for path, entry in self.git_history.items()
+                       if path.startswith(prefix)}
+        
+        namespace = f"package_{slug}"
+        fingerprint = package_fingerprint(self.repo_index, files, history, config_hash)
+        cached = self.cache.get(namespace, 'pages')
+        if cached and cached['fingerprint'] == fingerprint:
+            name, pages = cached['name'], cached['pages']
+        else:
+            generator = ContentGenerator(self.repo_index.abspath(rel_dir), self.output_dir, None, self.logger,
+                                         self.config, self.writer, self.project_info, self.cache, history)
+            generator.page_prefix = f"packages/{slug}/"
+            generator.source_prefix = prefix
+            generator.cache_prefix = self.cache_prefix
+            pages = {section: generator.generate_section(section) for section in PACKAGE_SECTIONS
+                     if section in generator.plugins}
+            name = next((manifest['name'] for entries in read_manifests(generator.repo_path, self.logger).values()
+                         for manifest in entries if manifest['name']), os.path.basename(rel_dir))
+            if not any(budget.timed_out for budget in generator.budgets.values()):
+                self.cache.set(namespace, 'pages', {'fingerprint': fingerprint, 'name': name, 'pages': pages})
+            self.logger.info(f"Generated documentation for package {name}")
+        
+        package_dir = os.path.join(packages_dir, slug)
+        for section in PACKAGE_SECTIONS:
+            path = os.path.join(package_dir, f"{section}.md")
+            if not pages.get(section) and self.writer.exists(path):
+                self.writer.remove(path)
+        
+        return {
+            'slug': slug,
+            'name': name,
+            'dir': rel_dir,
+            'sections': [section for section in PACKAGE_SECTIONS if pages.get(section)],
+            'pages': pages,
+        }
 
-                # Updated path to include docs directory
-                file_path = os.path.join(docs_dir, f"{section_name}.md")
-                with open(file_path, 'w') as f:
-                    f.write(content)
+    def generate_sections(self) -> Dict[str, Optional[str]]:
+        """
+        Generate every section without writing it.
+        
+        Sections are run by ``run_plugins``: independent ones concurrently and
+        each after the sections it depends on. A section whose declared input
+        files, dependencies and configuration are unchanged since the last run
+        reuses its previous page, as long as the declared outputs it wrote
+        then still exist.
+        
+        Returns:
+            Section name to content, or None for sections with nothing to show
+        """
+        plugins_config = self.config.get('plugins', {})
+        incremental = plugins_config.get('incremental', True)
+        if incremental:
+            config_hash = hash_text(json.dumps(self.config, sort_keys=True, default=str))
+            files = file_states(self.repo_index, list(self.repo_index.files))
+            history = self.git_history if self.config.get('git_metadata', {}).get('enabled', True) else {}
+        else:
+            # Resolved once here rather than by the first section that needs it
+            self.repo_index.files
+        
+        def run(plugin, dependencies: Dict[str, Optional[str]]) -> Optional[str]:
+            started = time.monotonic()
+            fingerprint = None
+            if incremental:
+                fingerprint = input_fingerprint(plugin, files, history, config_hash, dependencies)
+                cached = self.cache.get(SECTIONS_CACHE_NAMESPACE, plugin.name)
+                if cached and cached['fingerprint'] == fingerprint:
+                    # Only the declared outputs the section wrote last time, e.g. optional data files
+                    outputs = [os.path.join(self.output_dir, *path.split('/'))
+                               for path in cached.get('outputs', plugin.outputs)]
+                    if all(map(self.writer.exists, outputs)):
+                        for path in outputs:
+                            self.writer.record(path, False)
+                        self.timings[plugin.name] = time.monotonic() - started
+                        self.logger.debug(f"Reused {plugin.name} documentation; its inputs are unchanged")
+                        return cached['content']
+            content = self.generate_section(plugin.name, dependencies)
+            # A page cut short for lack of time may be complete next run
+            if fingerprint is not None and not self.budgets[plugin.name].timed_out:
+                outputs = [path for path in plugin.outputs
+                           if self.writer.recorded(os.path.join(self.output_dir, *path.split('/')))]
+                self.cache.set(SECTIONS_CACHE_NAMESPACE, plugin.name,
+                               {'fingerprint': fingerprint, 'content': content, 'outputs': outputs})
+            self.timings[plugin.name] = time.monotonic() - started
+            return content
+        
+        sections = run_plugins(self.plugins, run, self.logger, plugins_config.get('workers'))
+        self.cache.flush()
+        return sections
 
-                self.logger.info(f"Generated {section_name} documentation")
+    def generate_section(self, name: str, dependencies: Optional[Dict[str, Optional[str]]] = None) -> Optional[str]:
+        """
+        Generate one documentation section without writing it.
         
-        # Create an index.md file to serve as the main entry point
-        project_name = os.path.basename(self.repo_path)
+        The section runs within the budget configured for it; a page over
+        budget is truncated and ends with a notice.
         
-        # Try to get a better description from README or package.json
-        description = f"{project_name} documentation"
-        readme_path = self._find_file("README.md")
-        if readme_path:
-            with open(readme_path, 'r') as f:
-                readme_content = f.read()
-                # Extract the first paragraph as a description
-                match = re.search(r'#.*?\n\n(.*?)\n\n', readme_content, re.DOTALL)
-                if match:
-                    description = match.group(1).strip()
-        
-        index_content = self._format_page(
+        Args:
+            name: Section name, one of ``plugins``
+            dependencies: Content of the sections the section depends on
+            
+        Returns:
+            The page content, or None if the repository has nothing for the section
+        """
+        budget = self.budgets[name] = SectionBudget.from_settings(section_settings(self.config, name))
+        content = self.plugins[name].generate(self, dependencies or {})
+        if content is not None:
+            content = budget.finish(content)
+        if budget.exceeded:
+            self.logger.warning(f"Section {self.page_prefix}{name} exceeded its budget "
+                                f"({', '.join(budget.exceeded)}); the page was truncated")
+        return content
+
+    def generate_index(self, sections: Dict[str, Optional[str]]) -> str:
+        """Generate the index page linking to the generated sections."""
+        project_name = self.project_info['project_name']
+        # The description may be the README's first paragraph
+        description = self._mark_links(self.project_info['description'], os.path.join(self.repo_path, 'README.md'))
+        
+        return self._format_page(
             title="Home",
             content=f"""# {project_name.title()} Documentation
 
@@ -94,7 +613,7 @@ class ContentGenerator:
 
     ## Getting Started
 
-    - [Overview](overview.md)
+    {'- [Overview](overview.md)' if sections.get('overview') else ''}
     {'- [Installation](installation.md)' if sections.get('installation') else ''}
     {'- [API Documentation](api.md)' if sections.get('api') else ''}
 
@@ -109,13 +628,130 @@ class ContentGenerator:
                 'slug': '/',
             }
         )
-        with open(os.path.join(docs_dir, 'index.md'), 'w') as f:
-            f.write(index_content)
+
+    def rewrite_links(self, pages: Dict[str, str], files: List[str], revision: str = 'HEAD',
+                      asset_ids: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, str], LinkIndex]:
+        """
+        Point the links of embedded repository files at the pages documenting them.
         
-        self.logger.info("Generated index.md as main entry point")
-                
-        return sections
+        All pages are indexed first, then each page is rewritten in one pass;
+        links that cannot be resolved are recorded in the returned index.
+        
+        Args:
+            pages: Content of every page by doc id
+            files: Relative paths of the repository's files
+            revision: Commit that undocumented files are linked at on GitHub
+            asset_ids: Optional git blob id per file; files in the working tree
+                are hashed when they are referenced if omitted
+            
+        Returns:
+            The rewritten pages and the index with the link report and the referenced assets
+        """
+        repo_url = self.project_info.get('repo_url', '')
+        blob_url = None
+        if repo_url.startswith('https://github.com/'):
+            blob_url = f"{repo_url.rstrip('/')}/blob/{revision}"
+        
+        def asset_id(path: str) -> Optional[str]:
+            if asset_ids is not None:
+                return asset_ids.get(path)
+            try:
+                return git_blob_id(self.repo_index.abspath(path))
+            except OSError as e:
+                self.logger.warning(f"Could not read asset {path}: {str(e)}")
+                return None
+        
+        link_index = LinkIndex(pages, files, self._doc_locations(files), blob_url, asset_id)
+        return {page_id: link_index.rewrite(page_id, content) for page_id, content in pages.items()}, link_index
+
+    def _doc_locations(self, files: List[str]) -> Dict[str, Tuple[str, str]]:
+        """Doc id and anchor of the page each repository file is documented on."""
+        roots = [('', '')] + [(package['dir'] + '/', f"packages/{package['slug']}/") for package in self.packages]
+        package_dirs = [package['dir'] for package in self.packages]
+        locations = {}
+        for root, page_prefix in roots:
+            members = [path[len(root):] for path in files
+                       if path.startswith(root) and package_of(path, package_dirs) == (root[:-1] or None)]
+            # Files found anywhere, the one closest to the root being embedded
+            for name, section in (('README.md', 'overview'), ('CONTRIBUTING.md', 'contributing'),
+                                  ('CHANGELOG.md', 'changelog')):
+                matches = [path for path in members if path.rsplit('/', 1)[-1] == name]
+                if matches:
+                    locations[root + min(matches, key=lambda path: (path.count('/'), path))] = (page_prefix + section, '')
+            member_set = set(members)
+            for documents, section in ((self.ARCHITECTURE_DOCS, 'architecture'), (self.TESTING_DOCS, 'testing'),
+                                       (self.SECURITY_DOCS, 'security')):
+                found = [path for path in documents if path in member_set]
+                if found:
+                    locations[root + found[0]] = (page_prefix + section, '')
+            for lang, names in MANIFESTS.items():
+                for name in names:
+                    if name in member_set:
+                        locations.setdefault(root + name, (page_prefix + 'installation',
+                                                           heading_anchor(f"{lang} Installation")))
+            for names in self.DEPLOYMENT_FILES.values():
+                for name in names:
+                    if name.endswith('/'):
+                        for path in members:
+                            if path.startswith(name):
+                                locations.setdefault(root + path, (page_prefix + 'deployment', ''))
+                    elif name in member_set:
+                        locations[root + name] = (page_prefix + 'deployment', heading_anchor(name))
+            for path in members:
+                if path.endswith(SOURCE_EXTENSIONS):
+                    locations.setdefault(root + path, (page_prefix + 'api', heading_anchor(path)))
+                elif path.split('/', 1)[0] in self.GUIDE_DIRS and path.endswith(('.md', '.rst')):
+                    locations.setdefault(root + path, (page_prefix + 'guides', heading_anchor(path)))
+        return locations
+
+    def _mark_links(self, content: str, path: str) -> str:
+        """Resolve the relative links of an embedded file, to be linked by ``rewrite_links``."""
+        if not self.config.get('links', {}).get('enabled', True):
+            return content
+        return mark_repo_links(content, self.source_prefix + self._relpath(path))
+
+    def _update_search_index(self, docs_dir: str, sections: Dict[str, Optional[str]]) -> None:
+        """Index the pages as written, including AI enhancements, and write the search UI."""
+        pages = {}
+        page_ids = ['index'] + [name for name, content in sections.items() if content]
+        page_ids += [f"packages/{package['slug']}/{section}"
+                     for package in self.packages for section in package['sections']]
+        for page_id in page_ids:
+            content = self.writer.read(os.path.join(docs_dir, *f"{page_id}.md".split('/')))
+            if content is None:
+                self.logger.warning(f"Could not index {page_id}.md: it was not written")
+                continue
+            pages[page_id] = content.decode('utf-8')
+        
+        update_search_index(self.output_dir, pages, self.writer, self.logger)
+        
+        component = SEARCH_COMPONENT.replace('__STOPWORDS__', json.dumps(sorted(STOPWORDS)))
+        self.writer.write(os.path.join(self.output_dir, 'src', 'components', 'SearchBox', 'index.js'), component)
+        self.writer.write(os.path.join(self.output_dir, 'src', 'pages', 'search.js'), SEARCH_PAGE)
 
+    def _enhance_sections(self, jobs: List[Tuple[str, str, str]]) -> None:
+        """
+        Enhance sections with AI concurrently, streaming each into its page.
+        
+        The thread pool is sized for the maximum concurrency; the resilience
+        layer's adaptive limiter decides how many requests are actually in flight.
+        
+        Args:
+            jobs: (section name, content, output path) tuples
+        """
+        def enhance(job: Tuple[str, str, str]) -> str:
+            section_name, content, file_path = job
+            enhance_with_ai(content, section_name, self.use_ai, self.logger,
+                            output_path=file_path, metrics=self.ai_metrics,
+                            resilience=self.ai_resilience, cache=self.cache, writer=self.writer)
+            return section_name
+        
+        with ThreadPoolExecutor(max_workers=self.ai_resilience.max_concurrency) as executor:
+            for section_name in executor.map(enhance, jobs):
+                self.logger.info(f"Generated {section_name} documentation")
+        
+        self.cache.flush()
+        self.logger.info(f"AI request outcomes: {self.ai_resilience.summary()}")
 
     def generate_homepage(self):
         """
@@ -123,20 +759,22 @@ class ContentGenerator:
         Creates a comprehensive homepage with hero banner, features section, and calls to action
         based on the template provided.
         """
-        # Create necessary directories
+        # Output directories; the writer creates them
         pages_dir = os.path.join(self.output_dir, 'src', 'pages')
         components_dir = os.path.join(self.output_dir, 'src', 'components')
         features_dir = os.path.join(components_dir, 'HomepageFeatures')
         css_dir = os.path.join(self.output_dir, 'src', 'css')
         
-        os.makedirs(pages_dir, exist_ok=True)
-        os.makedirs(features_dir, exist_ok=True)
-        os.makedirs(css_dir, exist_ok=True)
-        
         # Extract project information
-        project_name = os.path.basename(self.repo_path)
-        repo_url = f"https://github.com/{project_name}"
-        description = f"{project_name} documentation and resources."
+        project_name = self.project_info['project_name']
+        repo_url = self.project_info['repo_url']
+        description = self.project_info['description']
+        repo_link = f'''
+            <li>
+                <Link to="{repo_url}" className={{styles.link}}>
+                GitHub Repository
+                </Link>
+            </li>''' if repo_url else ''
         
         # Create index.js for homepage with hero banner and sections
         index_js_content = f'''import clsx from 'clsx';
@@ -247,12 +885,7 @@ class ContentGenerator:
         <section className={{styles.learnMore}}>
         <div className="container">
             <h2 className="sectionTitle">Learn More</h2>
-            <ul className={{styles.learnMoreList}}>
-            <li>
-                <Link to="{repo_url}" className={{styles.link}}>
-                GitHub Repository
-                </Link>
-            </li>
+            <ul className={{styles.learnMoreList}}>{repo_link}
             <li>
                 <Link to="/docs/faqs" className={{styles.link}}>
                 Frequently Asked Questions
@@ -648,30 +1281,35 @@ class ContentGenerator:
     }
     '''
 
-        # Write files
-        with open(os.path.join(pages_dir, 'index.js'), 'w') as f:
-            f.write(index_js_content)
-        
-        with open(os.path.join(pages_dir, 'index.module.css'), 'w') as f:
-            f.write(index_module_css)
-        
-        with open(os.path.join(features_dir, 'index.js'), 'w') as f:
-            f.write(homepage_features_content)
-        
-        with open(os.path.join(features_dir, 'styles.module.css'), 'w') as f:
-            f.write(homepage_features_styles)
-        
-        with open(os.path.join(css_dir, 'custom.css'), 'w') as f:
-            f.write(custom_css)
+        # Write files, streaming AI-enhanced versions of the components if enabled.
+        # Components are enhanced as whole files: block diffs split on blank lines
+        # and insert Markdown comments, which are not valid JSX.
+        if self.use_ai:
+            enhance_with_ai(index_js_content, 'index.js', self.use_ai, self.logger,
+                            output_path=os.path.join(pages_dir, 'index.js'), metrics=self.ai_metrics,
+                            resilience=self.ai_resilience, writer=self.writer)
+            enhance_with_ai(homepage_features_content, 'HomepageFeatures', self.use_ai, self.logger,
+                            output_path=os.path.join(features_dir, 'index.js'), metrics=self.ai_metrics,
+                            resilience=self.ai_resilience, writer=self.writer)
+        else:
+            self.writer.write(os.path.join(pages_dir, 'index.js'), index_js_content)
+            self.writer.write(os.path.join(features_dir, 'index.js'), homepage_features_content)
+        
+        self.writer.write(os.path.join(pages_dir, 'index.module.css'), index_module_css)
+        self.writer.write(os.path.join(features_dir, 'styles.module.css'), homepage_features_styles)
+        self.writer.write(os.path.join(css_dir, 'custom.css'), custom_css)
         
         # Create static image placeholder directory
         img_dir = os.path.join(self.output_dir, 'static', 'img')
-        os.makedirs(img_dir, exist_ok=True)
+        
+        # Existing images are kept as they are, but still counted as part of the site
+        for name in ('logo.svg', '200x200.png', '800x400.png', 'favicon.ico'):
+            if self.writer.exists(os.path.join(img_dir, name)):
+                self.writer.record(os.path.join(img_dir, name), False)
         
         # Create a placeholder logo file if it doesn't exist
-        if not os.path.exists(os.path.join(img_dir, 'logo.svg')):
-            with open(os.path.join(img_dir, 'logo.svg'), 'w') as f:
-                f.write(f'''<svg width="200" height="200" viewBox="0 0 200 200" xmlns="http://www.w3.org/2000/svg">
+        if not self.writer.exists(os.path.join(img_dir, 'logo.svg')):
+            self.writer.write(os.path.join(img_dir, 'logo.svg'), f'''<svg width="200" height="200" viewBox="0 0 200 200" xmlns="http://www.w3.org/2000/svg">
         <rect width="200" height="200" fill="#005b96"/>
         <text x="50%" y="50%" dominant-baseline="middle" text-anchor="middle" fill="white" font-family="Arial" font-size="40">
             {project_name[0:1].upper()}
@@ -681,61 +1319,27 @@ class ContentGenerator:
         # Create placeholder image files if they don't exist
         for size in ['200x200', '800x400']:
             width, height = map(int, size.split('x'))
-            if not os.path.exists(os.path.join(img_dir, f'{size}.png')):
+            if not self.writer.exists(os.path.join(img_dir, f'{size}.png')):
                 self._create_placeholder_image(os.path.join(img_dir, f'{size}.png'), width, height)
         
         # Create favicon if it doesn't exist
-        if not os.path.exists(os.path.join(img_dir, 'favicon.ico')):
-            shutil.copy(
+        if not self.writer.exists(os.path.join(img_dir, 'favicon.ico')):
+            self.writer.copy(
                 os.path.join(img_dir, 'logo.svg'),
                 os.path.join(img_dir, 'favicon.ico')
             )
         
-        if self.use_ai:
-            # Enhance files with AI if enabled
-            with open(os.path.join(pages_dir, 'index.js'), 'r') as f:
-                enhanced_index = enhance_with_ai(f.read(), 'index.js', self.use_ai, self.logger)
-                with open(os.path.join(pages_dir, 'index.js'), 'w') as f_out:
-                    f_out.write(enhanced_index)
-            
-            with open(os.path.join(features_dir, 'index.js'), 'r') as f:
-                enhanced_features = enhance_with_ai(f.read(), 'HomepageFeatures', self.use_ai, self.logger)
-                with open(os.path.join(features_dir, 'index.js'), 'w') as f_out:
-                    f_out.write(enhanced_features)
-        
         self.logger.info(f"Generated enhanced homepage with title, subtitle, and documentation links")
 
     def _create_placeholder_image(self, filepath, width, height):
         """Create a simple placeholder image."""
-        try:
-            # Try to use PIL if available
-            from PIL import Image, ImageDraw, ImageFont
-            img = Image.new('RGB', (width, height), color=(240, 240, 240))
-            draw = ImageDraw.Draw(img)
-            
-            # Add text with dimensions
-            text = f"{width}×{height}"
-            try:
-                font = ImageFont.truetype("arial.ttf", 20)
-            except IOError:
-                font = ImageFont.load_default()
-            
-            text_width, text_height = draw.textbbox((0, 0), text, font=font)[2:4]
-            text_position = ((width - text_width) // 2, (height - text_height) // 2)
-            draw.text(text_position, text, fill=(100, 100, 100), font=font)
-            
-            # Draw a border
-            draw.rectangle([(0, 0), (width-1, height-1)], outline=(200, 200, 200))
-            
-            img.save(filepath)
-        except ImportError:
+        if not self.image_optimizer.placeholder(filepath, width, height):
             # If PIL is not available, create an empty file
-            with open(filepath, 'wb') as f:
-                f.write(b'')
+            self.writer.write(filepath, b'')
             self.logger.warning(f"PIL not available, created empty placeholder at {filepath}")
 
-    def generate_sidebar(self, sections: Dict[str, Optional[str]]) -> None:
-        """Generate sidebar configuration."""
+    def sidebar_items(self, sections: Dict[str, Optional[str]]) -> List[Dict]:
+        """Sidebar entries for the generated sections, in display order."""
         sidebar_items = []
         
         # Add main index as the first entry
@@ -745,37 +1349,38 @@ class ContentGenerator:
             'label': 'Home'
         })
         
-        # First add overview if it exists
-        if sections.get('overview') is not None:
-            sidebar_items.append({
-                'type': 'doc',
-                'id': 'overview',
-                'label': 'Overview'
-            })
+        # Then the sections by their plugins' positions, equal positions by name
+        def position(section: str) -> Tuple[int, str]:
+            plugin = self.plugins.get(section)
+            return (plugin.position if plugin else DEFAULT_POSITION, section)
         
-        # Then add other sections in a specific order
-        important_sections = ['installation', 'architecture', 'api']
-        for section in important_sections:
-            if sections.get(section) is not None:
+        for section in sorted(sections, key=position):
+            if sections[section] is not None:
+                plugin = self.plugins.get(section)
                 sidebar_items.append({
                     'type': 'doc',
                     'id': section,
-                    'label': section.title()
+                    'label': plugin.title() if plugin else section.title()
                 })
         
-        # Add remaining sections
-        additional_sections = [s for s in sections.keys() if s not in ['overview'] + important_sections]
-        for section in sorted(additional_sections):
-            if sections.get(section) is not None:
+        # One category per sub-package
+        for package in self.packages:
+            if package['sections']:
                 sidebar_items.append({
-                    'type': 'doc',
-                    'id': section,
-                    'label': section.title()
+                    'type': 'category',
+                    'label': package['name'],
+                    'collapsed': True,
+                    'items': [f"packages/{package['slug']}/{section}" for section in package['sections']]
                 })
         
+        return sidebar_items
+
+    def generate_sidebar(self, sections: Dict[str, Optional[str]]) -> None:
+        """Generate sidebar configuration."""
+        sidebar_items = self.sidebar_items(sections)
                 
         # Write sidebar configuration as JavaScript
-        with open(os.path.join(self.output_dir, 'sidebars.js'), 'w') as f:
+        with io.StringIO() as f:
             f.write("/** @type {import('@docusaurus/plugin-content-docs').SidebarsConfig} */\n")
             f.write("module.exports = {\n")
             f.write("  docs: [\n")
@@ -802,6 +1407,8 @@ class ContentGenerator:
             
             f.write("  ],\n")
             f.write("};\n")
+            
+            self.writer.write(os.path.join(self.output_dir, 'sidebars.js'), f.getvalue())
 
 
     def _generate_overview(self) -> Optional[str]:
@@ -812,137 +1419,176 @@ class ContentGenerator:
             
         with open(readme_path, 'r') as f:
             content = f.read()
+        content = self._mark_links(content, readme_path)
+        content = self._link_symbols(content, f"{self.page_prefix}overview")
             
         return self._format_page(
             title="Overview",
             content=content,
             frontmatter={
                 'id': 'overview',
-            }
+            },
+            sources=[self._relpath(readme_path)]
         )
 
     def _generate_installation(self) -> Optional[str]:
         """Generate installation guide."""
         install_content = []
+        sources = []
         
         # Check README installation section
         readme = self._find_file("README.md")
         if readme:
+            sources.append(self._relpath(readme))
             with open(readme, 'r') as f:
                 content = f.read()
                 install_section = self._extract_section(content, "Installation", "Usage")
                 if install_section:
-                    install_content.append(install_section)
+                    install_content.append(self._mark_links(install_section, readme))
 
                 
-        # Check for package files
-        package_files = {
-            'Python': ['requirements.txt', 'setup.py'],
-            'Node.js': ['package.json'],
-            'Java': ['pom.xml'],
-            'Ruby': ['Gemfile']
-        }
-        
-        for lang, files in package_files.items():
-            for file in files:
-                if os.path.exists(os.path.join(self.repo_path, file)):
-                    install_content.append(f"\n## {lang} Installation\n")
-                    with open(os.path.join(self.repo_path, file), 'r') as f:
-                        install_content.append(f"```\n{f.read()}\n```")
+        # Summarize package manifests; verbatim copies are opt-in
+        manifests = read_manifests(self.repo_path, self.logger)
+        for lang, entries in manifests.items():
+            sources.extend(entry['file'] for entry in entries)
+            install_content.append(f"\n## {lang} Installation\n")
+            install_content.append(render_manifests(entries))
+
+        if self.config.get('installation', {}).get('verbatim', False):
+            for lang, files in MANIFESTS.items():
+                for file in files:
+                    if os.path.exists(os.path.join(self.repo_path, file)):
+                        install_content.append(f"\n### {file}\n")
+                        with open(os.path.join(self.repo_path, file), 'r') as f:
+                            install_content.append(f"```\n{f.read()}\n```")
         
         if not install_content:
             return None
             
         return self._format_page(
             title="Installation",
-            content="\n\n".join(install_content)
+            content="\n\n".join(install_content),
+            sources=sources
         )
 
     def _generate_api(self) -> Optional[str]:
         """Generate API documentation from source files."""
         api_content = []
-        source_extensions = {'.py', '.js', '.java', '.cpp', '.h'}
-        
-        # Skip certain directories that shouldn't be documented
-        skip_dirs = {'node_modules', '.git', '__pycache__', 'build', 'dist', 'venv', 'env'}
-        
-        for root, dirs, files in os.walk(self.repo_path):
-            # Skip directories that shouldn't be documented
-            dirs[:] = [d for d in dirs if d not in skip_dirs]
+        sources = []
+        page_id = f"{self.page_prefix}api"
+        
+        # The symbol index only holds the sources the API budget allowed
+        symbol_index = self.symbol_index
+        self._budget('api').include(self._symbol_budget)
+        for relative_path, entry in symbol_index.files.items():
+            api_content.append(f"\n## {relative_path}\n")
+            sources.append(relative_path)
+            if entry is None:
+                continue
             
-            for file in files:
-                if any(file.endswith(ext) for ext in source_extensions):
-                    relative_path = os.path.relpath(os.path.join(root, file), self.repo_path)
-                    api_content.append(f"\n## {relative_path}\n")
-                    
-                    try:
-                        with open(os.path.join(root, file), 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            
-                        # Extract classes and functions
-                        classes = re.findall(r'class\s+(\w+)', content)
-                        functions = re.findall(r'def\s+(\w+)\s*\(', content)
-                        
-                        if classes:
-                            api_content.append("\n### Classes\n")
-                            api_content.extend(f"- `{cls}`" for cls in classes)
-                        
-                        if functions:
-                            api_content.append("\n### Functions\n")
-                            api_content.extend(f"- `{func}()`" for func in functions)
-                    except UnicodeDecodeError:
-                        self.logger.warning(f"Could not read file {relative_path} due to encoding issues")
+            for heading, names in (("Classes", entry['classes']), ("Types", entry.get('types', [])),
+                                   ("Functions", entry['functions'])):
+                if not names:
+                    continue
+                api_content.append(f"\n### {heading}\n")
+                suffix = "()" if heading == "Functions" else ""
+                for name in names:
+                    summary = entry['summaries'].get(name)
+                    if summary:
+                        summary = self._link_symbols(summary, page_id)
+                    api_content.append(f"- `{name}{suffix}`" + (f": {summary}" if summary else ""))
         
         if not api_content:
             return None
             
         return self._format_page(
             title="API",
-            content="\n".join(api_content)
+            content="\n".join(api_content),
+            sources=sources
         )
 
+    @property
+    def symbol_index(self) -> SymbolIndex:
+        """Symbols of the source files on the API page, parsing only files changed since the last run."""
+        with self._lazy_lock:
+            if self._symbol_index is None:
+                index = SymbolIndex(self.cache, f"{self.page_prefix}api", self.logger,
+                                    f"{self.cache_prefix}{self.page_prefix}api")
+            
+                # Skip certain directories that shouldn't be documented
+                skip_dirs = {'node_modules', '.git', '__pycache__', 'build', 'dist', 'venv', 'env'}
+            
+                # Sub-packages get their own API page
+                package_dirs = set(self.package_dirs)
+            
+                def sources():
+                    for root, dirs, names in os.walk(self.repo_path):
+                        # Skip directories that shouldn't be documented
+                        dirs[:] = [d for d in dirs
+                                   if d not in skip_dirs and self._relpath(os.path.join(root, d)) not in package_dirs]
+                    
+                        for file in names:
+                            if file.endswith(SOURCE_EXTENSIONS):
+                                yield self._relpath(os.path.join(root, file)), os.path.join(root, file)
+            
+                # The API budget bounds the scan itself, so sources beyond it are never read
+                self._symbol_budget = SectionBudget.from_settings(section_settings(self.config, 'api'))
+                index.build(self._symbol_budget.take(sources()), self.config.get('symbols', {}).get('workers'))
+                index.save()
+                self._symbol_index = index
+        return self._symbol_index
+
+    def _link_symbols(self, content: str, page_id: str) -> str:
+        """Link backticked references to symbols on the API page."""
+        if 'api' not in self.plugins or not self.config.get('symbols', {}).get('link', True):
+            return content
+        return link_symbols(content, self.symbol_index.resolve, page_id)
+
 
     def _generate_guides(self) -> Optional[str]:
         """Generate user guides from docs directory."""
         guides_content = []
-        docs_dirs = ['docs', 'doc', 'guides', 'tutorials']
-        
-        # Process each directory
-        for docs_dir in docs_dirs:
-            dir_path = os.path.join(self.repo_path, docs_dir)
-            if not os.path.exists(dir_path):
-                continue
+        sources = []
+        
+        def guide_files():
+            # Markdown files of each docs directory
+            for docs_dir in self.GUIDE_DIRS:
+                dir_path = os.path.join(self.repo_path, docs_dir)
+                if not os.path.exists(dir_path):
+                    continue
+                for root, _, files in os.walk(dir_path):
+                    for file in files:
+                        if file.endswith(('.md', '.rst')):
+                            yield os.path.join(root, file)
+        
+        for file_path in self._budget('guides').take(guide_files()):
+            rel_path = os.path.relpath(file_path, self.repo_path)
+            sources.append(self._relpath(file_path))
+            
+            try:
+                # Read the file
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
                 
-            # Process each markdown file in the directory
-            for root, _, files in os.walk(dir_path):
-                for file in files:
-                    if not file.endswith(('.md', '.rst')):
-                        continue
-                        
-                    file_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(file_path, self.repo_path)
-                    
-                    try:
-                        # Read the file
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        
-                        # Process the content through our MDX sanitizer
-                        content = self._sanitize_for_mdx(content)
-                        
-                        # Add file info header
-                        file_header = f"## {rel_path}\n\n"
-                        guides_content.append(file_header + content)
-                    except Exception as e:
-                        print(f"Error processing file {file_path}: {str(e)}")
-                        guides_content.append(f"## {rel_path}\n\n*File could not be processed due to an error.*")
+                # Process the content through our MDX sanitizer
+                content = self._mark_links(content, file_path)
+                content = self._sanitize_for_mdx(content)
+                content = self._link_symbols(content, f"{self.page_prefix}guides")
+                
+                # Add file info header
+                file_header = f"## {rel_path}\n\n"
+                guides_content.append(file_header + content)
+            except Exception as e:
+                print(f"Error processing file {file_path}: {str(e)}")
+                guides_content.append(f"## {rel_path}\n\n*File could not be processed due to an error.*")
         
         if not guides_content:
             return None
             
         return self._format_page(
             title="Guides",
-            content="\n\n---\n\n".join(guides_content)
+            content="\n\n---\n\n".join(guides_content),
+            sources=sources
         )
 
     def _sanitize_for_mdx(self, content: str) -> str:
@@ -1002,16 +1648,19 @@ class ContentGenerator:
             
         return self._format_page(
             title="Contributing",
-            content=content
+            content=self._mark_links(content, contributing_file),
+            sources=[self._relpath(contributing_file)]
         )
 
     def _generate_changelog(self) -> Optional[str]:
         """Generate changelog from CHANGELOG.md and git history."""
         changelog_content = []
+        sources = []
         
         # Check for CHANGELOG file
         changelog_file = self._find_file("CHANGELOG.md")
         if changelog_file:
+            sources.append(self._relpath(changelog_file))
             with open(changelog_file, 'r') as f:
                 changelog_content.append(f.read())
         
@@ -1044,9 +1693,14 @@ class ContentGenerator:
                     for commit in commits:
                         date = datetime.fromtimestamp(commit.committed_date).strftime('%Y-%m-%d')
                         changelog_content.append(f"- {date}: {commit.summary}")
+                    # The page changes with every commit
+                    sources = list(self.git_history)
             else:
                 self.logger.warning("Could not determine default branch. Skipping git history.")
                 
+        except git.InvalidGitRepositoryError:
+            # Not a working copy, e.g. a snapshot of a past version
+            self.logger.debug(f"No git repository at {self.repo_path}, skipping git history")
         except Exception as e:
             self.logger.warning(f"Error getting git history: {str(e)}")
         
@@ -1055,27 +1709,24 @@ class ContentGenerator:
             
         return self._format_page(
             title="Changelog",
-            content="\n\n".join(changelog_content)
+            content="\n\n".join(changelog_content),
+            sources=sources
         )
         
     def _generate_deployment(self) -> Optional[str]:
         """Generate deployment documentation."""
         deployment_content = []
+        sources = []
         
         # Check for deployment-related files
-        deployment_files = {
-            'Docker': ['Dockerfile', 'docker-compose.yml'],
-            'Kubernetes': ['.kubernetes/', 'k8s/'],
-            'CI/CD': ['.github/workflows/', '.gitlab-ci.yml', 'Jenkinsfile'],
-            'Scripts': ['deploy.sh', 'deploy.py']
-        }
-        
-        for category, files in deployment_files.items():
+        for category, files in self.DEPLOYMENT_FILES.items():
             found_files = []
             for file in files:
                 file_path = os.path.join(self.repo_path, file)
                 if os.path.exists(file_path):
                     found_files.append(file)
+                    sources.extend(path for path in self.repo_index.files
+                                   if path == file or path.startswith(file.rstrip('/') + '/'))
                     if os.path.isfile(file_path):
                         with open(file_path, 'r') as f:
                             deployment_content.append(f"\n### {file}\n```\n{f.read()}\n```")
@@ -1089,7 +1740,8 @@ class ContentGenerator:
             
         return self._format_page(
             title="Deployment",
-            content="\n".join(deployment_content)
+            content="\n".join(deployment_content),
+            sources=sources
         )
 
     def _generate_architecture(self) -> Optional[str]:
@@ -1097,92 +1749,88 @@ class ContentGenerator:
         architecture_content = []
         
         # Check for architecture documentation files
-        arch_files = ['ARCHITECTURE.md', 'docs/architecture.md', 'docs/design.md']
-        
-        for file in arch_files:
+        for file in self.ARCHITECTURE_DOCS:
             file_path = os.path.join(self.repo_path, file)
             if os.path.exists(file_path):
                 with open(file_path, 'r') as f:
                     architecture_content.append(f.read())
                 break
         
-        # Add project structure
+        # Add project structure, collapsing deep or crowded directories
+        arch_config = self.config.get('architecture', {})
+        tree = build_tree(self.repo_index, os.path.basename(os.path.abspath(self.repo_path)))
+        
         architecture_content.append("\n## Project Structure\n")
         architecture_content.append("```")
-        
-        exclude_dirs = {'.git', '__pycache__', 'node_modules', 'build', 'dist'}
-        
-        for root, dirs, files in os.walk(self.repo_path):
-            # Skip excluded directories
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            
-            level = root.replace(self.repo_path, '').count(os.sep)
-            indent = ' ' * 4 * level
-            architecture_content.append(f"{indent}{os.path.basename(root)}/")
-            
-            subindent = ' ' * 4 * (level + 1)
-            for f in sorted(files):
-                architecture_content.append(f"{subindent}{f}")
-        
+        architecture_content.append(render_tree(
+            tree,
+            max_depth=arch_config.get('max_depth', 4),
+            max_entries=arch_config.get('max_entries', 30)
+        ))
         architecture_content.append("```")
         
+        if arch_config.get('emit_json', False):
+            self._write_project_tree(tree)
+            architecture_content.append("\nimport ProjectTree from '@site/src/components/ProjectTree';\n")
+            architecture_content.append("<ProjectTree />")
+        
         return self._format_page(
             title="Architecture",
-            content="\n".join(architecture_content)
+            content="\n".join(architecture_content),
+            sources=list(self.repo_index.files)
         )
 
+    def _write_project_tree(self, tree: DirectoryNode) -> None:
+        """Write the full project tree as JSON along with the component that lazily loads it."""
+        data_dir = os.path.join(self.output_dir, 'static', 'data')
+        component_dir = os.path.join(self.output_dir, 'src', 'components', 'ProjectTree')
+        
+        self.writer.write_json(os.path.join(data_dir, 'project-tree.json'), tree.to_dict(), separators=(',', ':'))
+        self.writer.write(os.path.join(component_dir, 'index.js'), PROJECT_TREE_COMPONENT)
+
     def _generate_testing(self) -> Optional[str]:
         """Generate testing documentation."""
         testing_content = []
+        sources = []
         
         # Check for testing documentation
-        test_docs = ['TESTING.md', 'docs/testing.md']
-        for doc in test_docs:
+        for doc in self.TESTING_DOCS:
             doc_path = os.path.join(self.repo_path, doc)
             if os.path.exists(doc_path):
+                sources.append(doc)
                 with open(doc_path, 'r') as f:
                     testing_content.append(f.read())
                 break
         
-        # Find test directories and files
-        test_markers = ['test', 'tests', 'spec', 'specs']
-        test_files = []
-        
-        for root, _, files in os.walk(self.repo_path):
-            if any(marker in root.lower() for marker in test_markers):
-                rel_path = os.path.relpath(root, self.repo_path)
-                test_files.extend([
-                    (rel_path, f) for f in files 
-                    if f.endswith(('.py', '.js', '.ts', '.java', '.cpp'))
-                ])
-        
-        if test_files:
-            testing_content.append("\n## Test Structure\n")
-            current_dir = None
-            
-            for dir_path, file in sorted(test_files):
-                if dir_path != current_dir:
-                    current_dir = dir_path
-                    testing_content.append(f"\n### {dir_path}/\n")
-                testing_content.append(f"- {file}")
+        # Count tests per file, reusing counts for files whose content is unchanged
+        test_files = self._budget('testing').take(path for path in self.repo_index.files if is_test_file(path))
+        inventory = build_test_inventory(self.repo_index, self.cache, self.logger, paths=test_files)
+        
+        if inventory:
+            sources.extend(inventory)
+            testing_content.append("\n## Test Inventory\n")
+            testing_content.append(render_test_inventory(inventory))
+            self.cache.flush()
         
         if not testing_content:
             return None
             
         return self._format_page(
             title="Testing",
-            content="\n".join(testing_content)
+            content="\n".join(testing_content),
+            sources=sources
         )
         
     def _generate_security(self) -> Optional[str]:
         """Generate security documentation."""
         security_content = []
+        sources = []
         
         # Check for security documentation
-        security_files = ['SECURITY.md', '.github/SECURITY.md', 'docs/security.md']
-        for file in security_files:
+        for file in self.SECURITY_DOCS:
             file_path = os.path.join(self.repo_path, file)
             if os.path.exists(file_path):
+                sources.append(file)
                 with open(file_path, 'r') as f:
                     security_content.append(f.read())
                 break
@@ -1190,7 +1838,6 @@ class ContentGenerator:
         # Check for security-related configurations
         security_configs = {
             'Authentication': ['.env.example', 'config/auth.*'],
-            'Dependencies': ['package-lock.json', 'requirements.txt', 'Gemfile.lock'],
             'CI Security': [
                 '.github/workflows/codeql-analysis.yml',
                 '.github/workflows/security.yml',
@@ -1208,20 +1855,33 @@ class ContentGenerator:
                 security_content.append(f"\n## {category}\n")
                 security_content.append(f"Security configurations found in: {', '.join(found_files)}")
         
+        # Summarize locked dependencies, streaming lockfiles and caching by their hash
+        lockfile_summaries = analyze_lockfiles(self.repo_path, self.cache, self.logger)
+        if lockfile_summaries:
+            sources.extend(lockfile_summaries)
+            security_content.append("\n## Dependencies\n")
+            security_content.append(render_dependency_summary(lockfile_summaries))
+            self.cache.flush()
+        
         if not security_content:
             return None
             
         return self._format_page(
             title="Security",
-            content="\n".join(security_content)
+            content="\n".join(security_content),
+            sources=sources
         )
         
+    def _budget(self, name: str) -> SectionBudget:
+        """Budget of a section being generated, or an unlimited one when it is built directly."""
+        return self.budgets.get(name) or SectionBudget()
+
     def _find_file(self, filename: str) -> Optional[str]:
-        """Find a file in the repository."""
-        for root, _, files in os.walk(self.repo_path):
-            if filename in files:
-                return os.path.join(root, filename)
-        return None
+        """Find a file in the repository, preferring the one closest to the root."""
+        matches = [path for path in self.repo_index.files if path.rsplit('/', 1)[-1] == filename]
+        if not matches:
+            return None
+        return self.repo_index.abspath(min(matches, key=lambda path: (path.count('/'), path)))
 
     def _extract_section(self, content: str, start: str, end: str) -> Optional[str]:
         """Extract content between two headers."""
@@ -1229,8 +1889,19 @@ class ContentGenerator:
         match = re.search(pattern, content, re.DOTALL)
         return match.group(0).strip() if match else None
 
-    def _format_page(self, title: str, content: str, frontmatter: Dict = None) -> str:
-        """Format a documentation page with frontmatter."""
+    def _relpath(self, path: str) -> str:
+        """Path relative to the repository root with forward slashes, as git reports it."""
+        return os.path.relpath(path, self.repo_path).replace(os.sep, '/')
+
+    def _format_page(self, title: str, content: str, frontmatter: Dict = None,
+                     sources: Optional[List[str]] = None) -> str:
+        """
+        Format a documentation page with frontmatter.
+        
+        When the page's source files are given, the time and author of the most
+        recent commit touching any of them are added as ``last_update``, so
+        Docusaurus does not have to run git for every page during the build.
+        """
         # Normalize the ID to match Docusaurus conventions (lowercase with spaces converted to hyphens)
         normalized_id = title.lower().replace(' ', '-')
         
@@ -1241,5 +1912,10 @@ class ContentGenerator:
             **(frontmatter or {})
         }
         
+        if sources and self.config.get('git_metadata', {}).get('enabled', True):
+            updated = last_update(self.git_history, sources)
+            if updated:
+                fm['last_update'] = updated
+        
         frontmatter_yaml = yaml.dump(fm, default_flow_style=False)
         return f"---\n{frontmatter_yaml}---\n\n{content}"
\ No newline at end of file
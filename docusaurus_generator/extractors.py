@@ -0,0 +1,394 @@
+"""
+API extractors for the languages listed on the API page.
+
+Extractors are registered per file extension with ``register_extractor``.
+The ones for JavaScript/TypeScript, Java and C/C++ work on a light token
+stream, with comments and string literals removed, rather than a full
+parser. This is enough to find the declarations a reader looks for at a
+fraction of a parser's cost.
+"""
+import re
+import ast
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+Extractor = Callable[[str, str], Dict]
+
+# File extension to extractor, filled by register_extractor
+EXTRACTORS: Dict[str, Extractor] = {}
+
+_SKIPPED = r'//[^\n]*|/\*.*?\*/|"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|`(?:[^`\\]|\\.)*`'
+_TOKEN = r'[A-Za-z_$][\w$]*|::|=>|\S'
+_C_LIKE_TOKEN = re.compile(rf'(?P<skip>{_SKIPPED})|(?P<token>{_TOKEN})', re.DOTALL)
+_C_TOKEN = re.compile(rf'(?P<skip>{_SKIPPED}|^[ \t]*#(?:[^\n\\]|\\.)*)|(?P<token>{_TOKEN})', re.DOTALL | re.MULTILINE)
+_IDENTIFIER = re.compile(r'[A-Za-z_$]')
+
+_JS_DECLARATIONS = {'function': 'functions', 'class': 'classes', 'interface': 'types', 'type': 'types',
+                    'enum': 'types'}
+_JAVA_TYPES = {'class', 'interface', 'enum', 'record'}
+_JAVA_NOT_METHODS = {'if', 'for', 'while', 'switch', 'catch', 'synchronized', 'return', 'new', 'throw'}
+_C_NOT_FUNCTIONS = {'if', 'for', 'while', 'switch', 'return', 'sizeof', 'defined', 'else', 'case',
+                    'do', 'static_assert', 'decltype', 'alignof', 'operator'}
+
+
+def register_extractor(*extensions: str) -> Callable[[Extractor], Extractor]:
+    """
+    Register an extractor for file extensions.
+
+    An extractor takes the file's dotted module name and its source and
+    returns a dictionary with 'classes', 'functions' and optionally 'types'
+    (names in source order), 'symbols' ([qualified name, kind] pairs) and
+    'summaries' (name to short description).
+
+    Args:
+        *extensions: File extensions including the dot, e.g. '.ts'
+
+    Returns:
+        Decorator registering the function
+    """
+    def decorator(extractor: Extractor) -> Extractor:
+        for extension in extensions:
+            EXTRACTORS[extension] = extractor
+        return extractor
+    return decorator
+
+
+def extractor_for(rel_path: str) -> Optional[Extractor]:
+    """Return the extractor registered for a file's extension, if any."""
+    return EXTRACTORS.get('.' + rel_path.rsplit('.', 1)[-1].lower()) if '.' in rel_path else None
+
+
+def tokenize_c_like(source: str, directives: bool = False) -> List[str]:
+    """
+    Split C-family source into identifiers and punctuation.
+
+    Comments and string, character and template literals are dropped, as are
+    preprocessor lines when ``directives`` is set.
+
+    Args:
+        source: Source code
+        directives: Whether lines starting with '#' are preprocessor directives
+
+    Returns:
+        Tokens in source order
+    """
+    pattern = _C_TOKEN if directives else _C_LIKE_TOKEN
+    return [match.group('token') for match in pattern.finditer(source) if match.group('token')]
+
+
+def _entry() -> Dict:
+    return {'classes': [], 'functions': [], 'types': [], 'symbols': [], 'summaries': {}}
+
+
+def _add(entry: Dict, group: str, scope: str, name: str) -> None:
+    if name not in entry[group]:
+        entry[group].append(name)
+    kind = {'classes': 'class', 'functions': 'function', 'types': 'type'}[group]
+    qualified = f"{scope}.{name}" if scope else name
+    if [qualified, kind] not in entry['symbols']:
+        entry['symbols'].append([qualified, kind])
+
+
+def _matching(tokens: List[str], start: int, opening: str, closing: str) -> int:
+    """Index just past the bracket closing the one at ``start``."""
+    depth = 0
+    for i in range(start, len(tokens)):
+        if tokens[i] == opening:
+            depth += 1
+        elif tokens[i] == closing:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return len(tokens)
+
+
+def _public_scope(blocks: List[List[str]]) -> bool:
+    """Whether declarations in the innermost C++ block are publicly visible."""
+    return all(block[2] == 'public' for block in blocks if block[0] == 'class')
+
+
+def _summary(node: ast.AST) -> Optional[str]:
+    docstring = ast.get_docstring(node)
+    if not docstring:
+        return None
+    return docstring.strip().split('\n\n', 1)[0].replace('\n', ' ')
+
+
+@register_extractor('.py')
+def extract_python(module: str, source: str) -> Dict:
+    """
+    Extract the classes and functions of a Python module with ``ast``.
+
+    Methods and nested definitions are qualified by their enclosing scopes,
+    and the first paragraph of each docstring is kept as its summary.
+    """
+    tree = ast.parse(source)
+    entry = _entry()
+
+    def visit(body, scope: str) -> None:
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                kind = 'class'
+                entry['classes'].append(node.name)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = 'function'
+                entry['functions'].append(node.name)
+            else:
+                continue
+            qualified = f"{scope}.{node.name}"
+            entry['symbols'].append([qualified, kind])
+            summary = _summary(node)
+            if summary:
+                entry['summaries'][node.name] = summary
+            visit(node.body, qualified)
+
+    visit(tree.body, module)
+    return entry
+
+
+@register_extractor('.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx')
+def extract_javascript(module: str, source: str) -> Dict:
+    """
+    Extract the exports of a JavaScript or TypeScript module.
+
+    Covers ES module exports (declarations and ``export { ... }`` lists),
+    CommonJS ``module.exports`` and ``exports.name``, and the public methods
+    of exported classes.
+    """
+    tokens = tokenize_c_like(source)
+    entry = _entry()
+    declared: Dict[str, str] = {}
+    exports: List[Tuple[str, str]] = []
+    class_bodies: List[Tuple[str, int]] = []
+
+    def declaration(at: int) -> Optional[Tuple[Optional[str], str, int]]:
+        """(group, name, index after the name) of a declaration starting at ``at``."""
+        while at < len(tokens) and tokens[at] in ('async', 'abstract', 'declare', 'default'):
+            at += 1
+        if at + 1 >= len(tokens):
+            return None
+        keyword = tokens[at]
+        if keyword in _JS_DECLARATIONS:
+            name_at = at + 2 if tokens[at + 1] == '*' else at + 1
+            if name_at < len(tokens) and _IDENTIFIER.match(tokens[name_at]):
+                return _JS_DECLARATIONS[keyword], tokens[name_at], name_at + 1
+        elif keyword in ('const', 'let', 'var') and _IDENTIFIER.match(tokens[at + 1]):
+            # Only bindings to functions are API; other values are left out
+            value = tokens[at + 2:at + 40]
+            value = value[:value.index(';')] if ';' in value else value
+            return ('functions' if 'function' in value or '=>' in value else None), tokens[at + 1], at + 2
+        return None
+
+    def object_keys(start: int) -> Tuple[List[str], int]:
+        """Keys of the object or export list opening at ``start``, and the index after it."""
+        end = _matching(tokens, start, '{', '}')
+        body = tokens[start + 1:end - 1]
+        keys = []
+        for k, token in enumerate(body):
+            if _IDENTIFIER.match(token) and (k == 0 or body[k - 1] in (',', 'type')) and token != 'type':
+                alias = body[k + 2] if body[k + 1:k + 2] == ['as'] and k + 2 < len(body) else token
+                keys.append((token, alias))
+        return keys, end
+
+    depth = 0
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if class_bodies and class_bodies[-1][1] == depth:
+                class_bodies.pop()
+        elif class_bodies and depth == class_bodies[-1][1] + 1:
+            # Methods: name(...) followed by a body or a return type annotation
+            if _IDENTIFIER.match(token) and tokens[i + 1:i + 2] == ['('] \
+                    and token not in ('constructor', 'if', 'for', 'while', 'switch') \
+                    and tokens[i - 1] not in ('#', 'private', 'protected', '.'):
+                after = _matching(tokens, i + 1, '(', ')')
+                if tokens[after:after + 1] in (['{'], [':']):
+                    _add(entry, 'functions', f"{module}.{class_bodies[-1][0]}", token)
+                i = after
+                continue
+        elif depth == 0:
+            if token == 'export' and tokens[i + 1:i + 2] == ['{']:
+                keys, i = object_keys(i + 1)
+                exports.extend(keys)
+                continue
+            if token == 'module' and tokens[i + 1:i + 4] == ['.', 'exports', '=']:
+                if tokens[i + 4:i + 5] == ['{']:
+                    keys, i = object_keys(i + 4)
+                    exports.extend((name, name) for name, _ in keys)
+                    continue
+                if i + 4 < len(tokens) and _IDENTIFIER.match(tokens[i + 4]):
+                    exports.append((tokens[i + 4], tokens[i + 4]))
+            elif token == 'exports' and tokens[i + 1:i + 2] == ['.'] and tokens[i + 3:i + 4] == ['=']:
+                exports.append((tokens[i + 2], tokens[i + 2]))
+            else:
+                exported = token == 'export'
+                found = declaration(i + 1 if exported else i)
+                if found:
+                    group, name, i = found
+                    if group:
+                        declared[name] = group
+                        if exported:
+                            _add(entry, group, module, name)
+                    if group == 'classes' and exported:
+                        # Record methods once the class body opens
+                        class_bodies.append((name, depth))
+                    continue
+        i += 1
+
+    for name, alias in exports:
+        if alias != 'default':
+            _add(entry, declared.get(name, 'functions'), module, alias)
+    return entry
+
+
+@register_extractor('.java')
+def extract_java(module: str, source: str) -> Dict:
+    """
+    Extract the public types and methods of a Java source file.
+
+    Names are qualified by the package declaration rather than the file path.
+    """
+    tokens = tokenize_c_like(source)
+    entry = _entry()
+
+    package = ''
+    if tokens[:1] == ['package']:
+        end = tokens.index(';') if ';' in tokens else len(tokens)
+        package = ''.join(tokens[1:end])
+
+    # Enclosing types: (qualified name, body depth, is interface, is public)
+    types: List[Tuple[str, int, bool, bool]] = []
+    statement: List[str] = []
+    depth = 0
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token in (';', '{', '}'):
+            if token == '{':
+                depth += 1
+            elif token == '}':
+                depth -= 1
+                if types and types[-1][1] > depth:
+                    types.pop()
+            statement = []
+        elif token in _JAVA_TYPES and i + 1 < len(tokens) and _IDENTIFIER.match(tokens[i + 1]) \
+                and statement[-1:] != ['.'] and (not types or depth == types[-1][1]):
+            name = tokens[i + 1]
+            scope = types[-1][0] if types else package
+            member_of_interface = bool(types) and types[-1][2]
+            public = ('public' in statement or member_of_interface) and all(t[3] for t in types)
+            if public:
+                _add(entry, 'classes', scope, name)
+            while i < len(tokens) and tokens[i] != '{':
+                i += 1
+            depth += 1
+            types.append((f"{scope}.{name}" if scope else name, depth, token == 'interface', public))
+            statement = []
+        elif token == '(' and types and depth == types[-1][1] and statement \
+                and _IDENTIFIER.match(statement[-1]) and statement[-1] not in _JAVA_NOT_METHODS \
+                and '=' not in statement and statement[-2:-1] not in (['@'], ['new'], ['.']):
+            name = statement[-1]
+            qualified, _, interface, public = types[-1]
+            if public and len(statement) > 1 and name != qualified.rsplit('.', 1)[-1] \
+                    and ('public' in statement or (interface and 'private' not in statement)):
+                _add(entry, 'functions', qualified, name)
+            i = _matching(tokens, i, '(', ')')
+            statement.append(')')
+            continue
+        else:
+            statement.append(token)
+        i += 1
+    return entry
+
+
+@register_extractor('.h', '.hh', '.hpp', '.hxx', '.c', '.cc', '.cpp', '.cxx')
+def extract_c_family(module: str, source: str) -> Dict:
+    """
+    Extract the declarations of a C or C++ file.
+
+    Classes, structs, enums and non-static functions at namespace scope are
+    found along with the public methods of classes. Function bodies are skipped, and
+    out-of-line member definitions (``Type::name(...)``) are left to the
+    header declaring them. Names are qualified by their namespaces.
+    """
+    tokens = tokenize_c_like(source, directives=True)
+    entry = _entry()
+
+    # Open blocks: [kind, qualified name, access], kind being 'namespace', 'class' or 'other'
+    blocks: List[List[str]] = []
+    statement: List[str] = []
+    pending: Optional[List[str]] = None
+
+    def scope() -> str:
+        for block in reversed(blocks):
+            if block[0] != 'other':
+                return block[1]
+        return ''
+
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        declaring = all(block[0] != 'other' for block in blocks)
+        if token == '{':
+            if pending and declaring:
+                blocks.append(pending)
+            elif statement[:1] == ['extern'] and declaring:
+                # extern "C" { ... } keeps its declarations at the enclosing scope
+                blocks.append(['namespace', scope(), 'public'])
+            else:
+                blocks.append(['other', '', ''])
+            pending = None
+            statement = []
+        elif token in ('}', ';'):
+            if token == '}' and blocks:
+                blocks.pop()
+            pending = None
+            statement = []
+        elif not declaring:
+            pass
+        elif token == ':' and blocks and blocks[-1][0] == 'class' \
+                and statement in (['public'], ['private'], ['protected']):
+            blocks[-1][2] = statement[0]
+            statement = []
+        elif token == 'namespace':
+            name = tokens[i + 1] if i + 1 < len(tokens) and _IDENTIFIER.match(tokens[i + 1]) else ''
+            outer = scope()
+            pending = ['namespace', f"{outer}.{name}" if outer and name else name or outer, 'public']
+            statement.append(token)
+        elif token in ('class', 'struct', 'union', 'enum') and 'typedef' not in statement \
+                and 'friend' not in statement and 'template' not in statement[-1:] and statement[-1:] != ['enum']:
+            at = i + 2 if tokens[i + 1:i + 2] in (['class'], ['struct']) else i + 1
+            name = tokens[at] if at < len(tokens) else ''
+            if _IDENTIFIER.match(name) and tokens[at + 1:at + 2] in (['{'], [':'], ['final']) and _public_scope(blocks):
+                outer = scope()
+                _add(entry, 'types' if token == 'enum' else 'classes', outer, name)
+                if token == 'enum':
+                    pending = None
+                else:
+                    pending = ['class', f"{outer}.{name}" if outer else name,
+                               'private' if token == 'class' else 'public']
+            statement.append(token)
+        elif token == '(' and len(statement) > 1 and re.match(r'[A-Za-z_]', statement[-1]) \
+                and statement[-1] not in _C_NOT_FUNCTIONS and '=' not in statement and ':' not in statement \
+                and statement[-2] not in ('::', '.', '->', '~', 'return', 'new') \
+                and 'typedef' not in statement and 'friend' not in statement:
+            name = statement[-1]
+            after = _matching(tokens, i, '(', ')')
+            class_name = blocks[-1][1].rsplit('.', 1)[-1] if blocks and blocks[-1][0] == 'class' else None
+            # static at namespace scope means internal linkage; on a member it is still API
+            internal = 'static' in statement and class_name is None
+            if tokens[after:after + 1] in (['{'], [';'], ['const'], ['noexcept'], ['override'], ['final'],
+                                           ['->'], ['='], ['throw']) \
+                    and _public_scope(blocks) and name != class_name and not internal:
+                _add(entry, 'functions', scope(), name)
+            statement.append('(')
+            i = after
+            continue
+        else:
+            statement.append(token)
+        i += 1
+    return entry
@@ -2,13 +2,36 @@
 Main DocusaurusGenerator class for generating Docusaurus documentation from repository content.
 """
 import os
+import time
 import logging
+import itertools
 import shutil
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, List, Optional, Union
 
+from .ai_enhancer import configured_model
 from .config_generator import DocusaurusConfigGenerator
 from .content_generator import ContentGenerator
-from .utils import setup_docusaurus, copy_static_assets, start_docusaurus_server
+from .versions import VERSIONS_CACHE_NAMESPACE, VersionedDocsGenerator, version_name
+from .writer import MemoryWriter, OutputWriter
+from .assets import remove_stale_assets
+from .artifact import walk_files, write_artifact
+from .cache import GeneratorCache
+from .git_metadata import GIT_METADATA_CACHE_NAMESPACE
+from .images import IMAGE_CACHE_NAMESPACE
+from .lockfiles import LOCKFILE_CACHE_NAMESPACE
+from .project_info import PROJECT_INFO_CACHE_NAMESPACE
+from .testing_inventory import TEST_CACHE_NAMESPACE
+from .resilience import LLMResilience
+from .metrics import collect_run_metrics, export_metrics
+from . import utils
+
+
+# Cache namespaces keyed by content hashes or commits, whose entries unused by a run are dropped
+PRUNED_CACHE_NAMESPACES = (PROJECT_INFO_CACHE_NAMESPACE, TEST_CACHE_NAMESPACE, LOCKFILE_CACHE_NAMESPACE,
+                           IMAGE_CACHE_NAMESPACE, GIT_METADATA_CACHE_NAMESPACE, VERSIONS_CACHE_NAMESPACE)
+
+# Virtual output directory of sites generated in memory; nothing is created there
+MEMORY_OUTPUT_DIR = os.path.join(os.sep, 'docusaurus-site')
 
 
 class DocusaurusGenerator:
@@ -22,7 +45,9 @@ class DocusaurusGenerator:
         """
         return super(DocusaurusGenerator, cls).__new__(cls)
     
-    def __init__(self, repo_path: str, output_dir: str, config: Optional[Dict] = None, use_ai: Optional[str] = None):
+    def __init__(self, repo_path: str, output_dir: str, config: Optional[Dict] = None, use_ai: Optional[str] = None,
+                 versions: Optional[List[str]] = None, writer: Optional[OutputWriter] = None,
+                 cache: Optional[GeneratorCache] = None, ai_resilience: Optional[LLMResilience] = None):
         """
         Initialize the documentation generator.
         
@@ -30,16 +55,21 @@ class DocusaurusGenerator:
             repo_path: Path to the repository
             output_dir: Directory where documentation should be generated
             config: Optional configuration dictionary
-            use_ai: Optional AI model to use for enhanced documentation (e.g., "openai/gpt-4o")
+            use_ai: Optional AI model to use for enhanced documentation (e.g., "openai/gpt-4o");
+                defaults to ``ai.model`` when ``ai.enabled`` is set in the configuration
+            versions: Optional git refs, newest first, to generate versioned docs for;
+                defaults to ``versions.refs`` in the configuration
+            writer: Optional output writer, e.g. a MemoryWriter to generate
+                without touching the filesystem; defaults to writing to output_dir
+            cache: Optional cache kept warm between runs, e.g. by the generation
+                server; opened from the output directory if omitted
+            ai_resilience: Optional AI resilience layer shared between runs
         """
         self.repo_path = repo_path
         self.output_dir = output_dir
         self.config = config or {}
-        self.use_ai = use_ai
-        
-        # Initialize directories
-        os.makedirs(output_dir, exist_ok=True)
-        os.makedirs(os.path.join(output_dir, 'static'), exist_ok=True)
+        self.use_ai = use_ai if use_ai is not None else configured_model(self.config)
+        self.versions = versions if versions is not None else self.config.get('versions', {}).get('refs') or []
         
         # Configure logging
         self.logger = logging.getLogger(__name__)
@@ -47,17 +77,41 @@ class DocusaurusGenerator:
         if self.use_ai:
             self.logger.info(f"AI enhancement enabled using model: {self.use_ai}")
             
+        # Shared by the generators so unchanged files are never rewritten
+        self.writer = writer or OutputWriter(self.output_dir, self.logger)
+        
+        # Initialize directories
+        self.writer.makedirs(output_dir)
+        self.writer.makedirs(os.path.join(output_dir, 'static'))
+        
         # Initialize component generators
-        self.config_generator = DocusaurusConfigGenerator(self.repo_path, self.output_dir, self.config, self.logger)
-        self.content_generator = ContentGenerator(self.repo_path, self.output_dir, self.use_ai, self.logger)
+        self.content_generator = ContentGenerator(self.repo_path, self.output_dir, self.use_ai, self.logger,
+                                                  self.config, self.writer, cache=cache,
+                                                  ai_resilience=ai_resilience)
+        
+        # Project metadata is resolved once (or read from the cache) and shared
+        self.project_info = self.content_generator.project_info
+        self.config_generator = DocusaurusConfigGenerator(self.repo_path, self.output_dir, self.config, self.logger,
+                                                          self.writer, self.project_info,
+                                                          [version_name(ref) for ref in self.versions])
 
-    def generate(self) -> bool:
+    def generate(self, artifact: Optional[Union[str, BinaryIO]] = None) -> bool:
         """
         Generate the complete Docusaurus documentation site.
         
+        Args:
+            artifact: Optional path ending in .tar.zst, .tar.gz or .tar, or a
+                binary file object receiving a gzip-compressed tar, to also
+                write the generated source tree to
+        
         Returns:
             bool: True if generation was successful, False otherwise
         """
+        started = time.monotonic()
+        success = False
+        if artifact is not None:
+            # Archived from memory instead of reading every file back
+            self.writer.keep_contents = True
         try:
             # Generate all content sections
             sections = self.content_generator.generate_all_sections()
@@ -65,48 +119,136 @@ class DocusaurusGenerator:
             # Generate sidebar configuration
             self.content_generator.generate_sidebar(sections)
             
+            # Generate docs for past versions straight from the git object database; without
+            # versions, those of earlier runs are removed. Unresolvable refs are left out.
+            versions_generator = VersionedDocsGenerator(self.repo_path, self.output_dir, self.config,
+                                                        self.logger, self.writer, self.content_generator.cache,
+                                                        self.project_info)
+            self.config_generator.versions = versions_generator.generate(self.versions)
+            version_assets = versions_generator.assets
+            
             # Generate Docusaurus configuration
             self.config_generator.generate_docusaurus_config()
             
             # Generate homepage
             self.content_generator.generate_homepage()
             
-            # Copy static assets
-            copy_static_assets(self.repo_path, self.output_dir, self.logger)
+            # Copy the static assets the pages reference
+            assets = self.content_generator.assets
+            utils.copy_static_assets(self.repo_path, self.output_dir, self.logger, self.writer,
+                                     self.content_generator.image_optimizer, assets)
+            if assets is not None:
+                remove_stale_assets(self.output_dir, set(assets) | version_assets, self.writer, self.logger)
             
-            return True
+            self.content_generator.cache.prune(PRUNED_CACHE_NAMESPACES)
+            self.content_generator.cache.flush()
+            self.logger.info(f"Output files: {self.writer.summary()}")
+            
+            if artifact is not None:
+                self.write_artifact(artifact)
+            success = True
 
         except Exception as e:
             self.logger.error(f"Documentation generation failed: {str(e)}")
-            return False
+        
+        # Failed runs are exported too, so dashboards can alert on them
+        metrics_config = self.config.get('metrics') or {}
+        if metrics_config.get('textfile') or metrics_config.get('push_url'):
+            metrics = collect_run_metrics(self, time.monotonic() - started, success, metrics_config.get('repo'))
+            export_metrics(metrics, metrics_config, self.logger)
+        return success
+    
+    def write_artifact(self, target: Union[str, BinaryIO], include_build: bool = False) -> int:
+        """
+        Write the files generated by this run to a reproducible tar artifact.
+        
+        Args:
+            target: Path ending in .tar.zst, .tar.gz or .tar, or a binary file
+                object receiving a gzip-compressed tar
+            include_build: Also add the built site, from the build directory, under build/
+            
+        Returns:
+            Number of files in the artifact
+        """
+        files = self.writer.output_files()
+        if include_build:
+            files = itertools.chain(files, walk_files(os.path.join(self.output_dir, 'build'), 'build/'))
+        return write_artifact(target, files, 'gz', self.logger)
     
-    def setup_and_start(self, install: bool = True, start: bool = True) -> bool:
+    def setup_and_start(self, install: bool = True, start: bool = True, build: bool = False,
+                        artifact: Optional[Union[str, BinaryIO]] = None) -> bool:
         """
-        Set up Docusaurus and optionally start the development server.
+        Set up Docusaurus and optionally build the site and start the development server.
         
         Args:
             install: Whether to run npm install
             start: Whether to start the development server
+            build: Whether to build the static site
+            artifact: Optional artifact path or file object (see ``generate``);
+                includes the built site when build is set
             
         Returns:
             bool: True if setup and start were successful, False otherwise
         """
+        if self.writer.in_memory and (install or start or build):
+            self.logger.error("Docusaurus can only be installed, built and started for a site written to disk")
+            return False
+        
         try:
-            # Generate documentation first
-            success = self.generate()
+            # Generate documentation first, archiving it here unless the build goes in too
+            if artifact is not None:
+                self.writer.keep_contents = True
+            success = self.generate(None if build else artifact)
             if not success:
                 return False
                 
             # Set up Docusaurus (npm install)
             if install:
-                setup_docusaurus(self.output_dir, self.logger)
+                utils.setup_docusaurus(self.output_dir, self.logger)
+            
+            # Build the static site
+            if build:
+                if not utils.build_docusaurus(self.output_dir, self.logger):
+                    return False
+                if artifact is not None:
+                    self.write_artifact(artifact, include_build=True)
             
             # Start Docusaurus server
             if start:
-                start_docusaurus_server(self.output_dir, self.logger)
+                utils.start_docusaurus_server(self.output_dir, self.logger)
                 
             return True
             
         except Exception as e:
             self.logger.error(f"Docusaurus setup and start failed: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+
+def generate_site(repo_path: str, config: Optional[Dict] = None, use_ai: Optional[str] = None,
+                  versions: Optional[List[str]] = None,
+                  previous: Optional[Dict[str, bytes]] = None) -> Optional[Dict[str, bytes]]:
+    """
+    Generate a Docusaurus site in memory, without touching the filesystem.
+    
+    The repository is read from disk, but nothing is written: the generated
+    files are returned, and the cache is kept in memory unless ``cache_dir``
+    is configured.
+    
+    Args:
+        repo_path: Path to the repository
+        config: Optional configuration dictionary
+        use_ai: Optional AI model to use for enhanced documentation (e.g., "openai/gpt-4o");
+            defaults to the ``ai`` configuration
+        versions: Optional git refs, newest first, to generate versioned docs for
+        previous: Optional files of a previous run; unchanged files are then
+            not counted as written and stale ones are removed
+        
+    Returns:
+        Mapping of path relative to the site root, with forward slashes, to
+        file content, or None if generation failed
+    """
+    writer = MemoryWriter(MEMORY_OUTPUT_DIR, logging.getLogger(__name__), previous)
+    generator = DocusaurusGenerator(repo_path, MEMORY_OUTPUT_DIR, config, use_ai, versions, writer=writer)
+    if not generator.generate():
+        return None
+    return writer.files
@@ -0,0 +1,183 @@
+"""
+Last-updated time and author of every file from a single git pass.
+
+Docusaurus's showLastUpdateTime/showLastUpdateAuthor run ``git log`` once per
+doc during the build. Instead, one streaming ``git log --name-only`` walk
+records the latest commit touching each file, and the result is cached by
+HEAD so later runs only walk the commits added since.
+"""
+import os
+import logging
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from .cache import GeneratorCache
+from .project_info import git_head
+
+
+GIT_METADATA_CACHE_NAMESPACE = 'git_metadata'
+
+_COMMIT_MARK = '\x1e'
+_FIELD_SEP = '\x1f'
+
+
+def _git(repo_path: str, *args: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        ['git', '-c', 'core.quotepath=false', *args],
+        cwd=repo_path,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding='utf-8',
+        errors='replace'
+    )
+
+
+def _is_ancestor(repo_path: str, ancestor: str, descendant: str) -> bool:
+    process = _git(repo_path, 'merge-base', '--is-ancestor', ancestor, descendant)
+    process.communicate()
+    return process.returncode == 0
+
+
+def stream_file_history(repo_path: str, revision_range: str = 'HEAD') -> Iterable[Tuple[str, int, str]]:
+    """
+    Stream (path, timestamp, author) for every file touched in a range, newest commit first.
+
+    Args:
+        repo_path: Path to the repository
+        revision_range: Revisions to walk, e.g. 'HEAD' or 'old..HEAD'
+
+    Yields:
+        Relative file path, commit timestamp and author name
+    """
+    process = _git(
+        repo_path, 'log', '--no-renames', '--name-only',
+        f'--format=format:{_COMMIT_MARK}%at{_FIELD_SEP}%an', revision_range, '--'
+    )
+    timestamp, author = 0, ''
+    try:
+        for line in process.stdout:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            if line.startswith(_COMMIT_MARK):
+                at, _, author = line[1:].partition(_FIELD_SEP)
+                timestamp = int(at or 0)
+                continue
+            yield line, timestamp, author
+    finally:
+        process.stdout.close()
+        process.wait()
+    if process.returncode:
+        raise RuntimeError(f"git log exited with status {process.returncode}")
+
+
+def _merge_history(repo_path: str, revision_range: str, files: Dict[str, Dict]) -> set:
+    """Record the latest commit of every file touched in a range; return the paths updated."""
+    updated = set()
+    for path, timestamp, author in stream_file_history(repo_path, revision_range):
+        # Commits arrive newest first, so the first one seen for a path wins
+        if path not in updated:
+            updated.add(path)
+            files[path] = {'timestamp': timestamp, 'author': author}
+    return updated
+
+
+def collect_file_history(repo_path: str, cache: Optional[GeneratorCache],
+                         logger: logging.Logger) -> Dict[str, Dict]:
+    """
+    Find the latest commit time and author of every file in the repository history.
+
+    The result is cached together with the HEAD it was computed at. When HEAD
+    has moved forward since, only the new commits are walked and merged in.
+
+    Args:
+        repo_path: Path to the repository
+        cache: Optional cache for the history
+        logger: Logger instance
+
+    Returns:
+        Mapping of relative file path to {'timestamp': int, 'author': str};
+        empty if the repository has no git history
+    """
+    head = git_head(repo_path)
+    if not head or not os.path.exists(os.path.join(repo_path, '.git')):
+        return {}
+
+    cached = cache.get(GIT_METADATA_CACHE_NAMESPACE, 'history') if cache else None
+    if cached and cached.get('head') == head:
+        return cached['files']
+
+    files: Dict[str, Dict] = {}
+    revision_range = 'HEAD'
+    if cached and cached.get('head') and _is_ancestor(repo_path, cached['head'], head):
+        files = dict(cached['files'])
+        revision_range = f"{cached['head']}..HEAD"
+
+    try:
+        updated = _merge_history(repo_path, revision_range, files)
+    except Exception as e:
+        logger.warning(f"Could not read git history: {str(e)}")
+        return cached['files'] if cached else {}
+
+    logger.debug(f"Git history: {len(updated)} files updated from {revision_range}")
+    if cache:
+        cache.set(GIT_METADATA_CACHE_NAMESPACE, 'history', {'head': head, 'files': files})
+    return files
+
+
+def file_history_at(repo_path: str, commit: str, cache: Optional[GeneratorCache],
+                    logger: logging.Logger) -> Dict[str, Dict]:
+    """
+    Find the latest commit time and author of every file as of a past commit.
+
+    Unlike ``collect_file_history`` this is cached per commit, which suits
+    release tags whose history never changes.
+
+    Args:
+        repo_path: Path to the repository
+        commit: Full commit SHA
+        cache: Optional cache for the history
+        logger: Logger instance
+
+    Returns:
+        Mapping of relative file path to {'timestamp': int, 'author': str}
+    """
+    key = f"history:{commit}"
+    cached = cache.get(GIT_METADATA_CACHE_NAMESPACE, key) if cache else None
+    if cached is not None:
+        return cached
+
+    files: Dict[str, Dict] = {}
+    try:
+        _merge_history(repo_path, commit, files)
+    except Exception as e:
+        logger.warning(f"Could not read git history at {commit[:12]}: {str(e)}")
+        return {}
+    if cache:
+        cache.set(GIT_METADATA_CACHE_NAMESPACE, key, files)
+    return files
+
+
+def last_update(history: Dict[str, Dict], sources: Iterable[str]) -> Optional[Dict[str, str]]:
+    """
+    Compute a page's last_update frontmatter from the files it was generated from.
+
+    Args:
+        history: Result of ``collect_file_history``
+        sources: Relative paths of the page's source files
+
+    Returns:
+        Dictionary with 'date' (ISO 8601) and 'author' of the most recent
+        change to any source, or None if none of the sources is in history
+    """
+    latest = None
+    for source in sources:
+        entry = history.get(source)
+        if entry and (latest is None or entry['timestamp'] > latest['timestamp']):
+            latest = entry
+    if latest is None:
+        return None
+    date = datetime.fromtimestamp(latest['timestamp'], tz=timezone.utc)
+    return {'date': date.strftime('%Y-%m-%dT%H:%M:%SZ'), 'author': latest['author']}
@@ -0,0 +1,298 @@
+"""
+Image optimization for copied and generated static assets.
+
+PNGs are recompressed losslessly with Pillow when it is installed (JPEGs only
+on request, since re-encoding them is lossy), SVGs are minified, and large images can optionally be downscaled with
+responsive width variants. Work runs on a process pool and results are cached
+by source hash, so unchanged images are never processed again.
+"""
+import io
+import os
+import re
+import base64
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import GeneratorCache, hash_file, hash_text
+
+
+IMAGE_CACHE_NAMESPACE = 'images'
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.svg')
+
+# Below this many images to process, working in-process is faster than starting workers
+PARALLEL_THRESHOLD = 4
+
+DEFAULT_IMAGE_CONFIG = {
+    'optimize': True,
+    'recompress_jpeg': False,
+    'max_dimension': None,
+    'responsive_widths': [],
+    'workers': None,
+}
+
+_SVG_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_SVG_METADATA = re.compile(r'<(metadata|sodipodi:namedview)\b.*?(?:/>|</\1>)', re.DOTALL)
+_SVG_BETWEEN_TAGS = re.compile(r'>\s+<')
+_SVG_SPACES = re.compile(r'\s{2,}')
+
+
+def minify_svg(source: str) -> str:
+    """
+    Minify SVG markup without changing how it renders.
+
+    Comments, editor metadata and whitespace between tags are removed. Text
+    inside ``<text>``, ``<style>`` and ``<script>`` elements is left alone.
+
+    Args:
+        source: SVG markup
+
+    Returns:
+        Minified markup
+    """
+    protected = []
+
+    def protect(match: re.Match) -> str:
+        protected.append(match.group(0))
+        return f"<\x00{len(protected) - 1}\x00>"
+
+    svg = re.sub(r'<(text|style|script|pre)\b.*?</\1>', protect, source, flags=re.DOTALL)
+    svg = _SVG_COMMENT.sub('', svg)
+    svg = _SVG_METADATA.sub('', svg)
+    svg = _SVG_BETWEEN_TAGS.sub('><', svg)
+    svg = _SVG_SPACES.sub(' ', svg).strip()
+    return re.sub(r'<\x00(\d+)\x00>', lambda m: protected[int(m.group(1))], svg)
+
+
+def variant_name(filename: str, width: int) -> str:
+    """Name of a responsive variant, e.g. ``screenshot-480w.png``."""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}-{width}w{ext}"
+
+
+def _save(image, fmt: str, info: Dict[str, Any]) -> bytes:
+    # Carry the source's EXIF data and colour profile over to every output
+    metadata = {key: info[key] for key in ('exif', 'icc_profile') if info.get(key)}
+    buffer = io.BytesIO()
+    if fmt == 'PNG':
+        image.save(buffer, format='PNG', optimize=True, **metadata)
+    else:
+        image.save(buffer, format='JPEG', optimize=True, progressive=True,
+                   quality='keep' if getattr(image, 'quantization', None) else 85, **metadata)
+    return buffer.getvalue()
+
+
+def optimize_image(path: str, options: Dict[str, Any]) -> List[Tuple[str, bytes]]:
+    """
+    Optimize one image. Runs in worker processes.
+
+    The main output keeps the source's file name; a recompressed raster image
+    only replaces the original bytes when it is smaller. JPEGs that are not
+    downscaled are copied as they are unless ``recompress_jpeg`` is set.
+
+    Args:
+        path: Source image path
+        options: Image configuration (see ``DEFAULT_IMAGE_CONFIG``)
+
+    Returns:
+        List of (file name, content) pairs, the main output first
+    """
+    filename = os.path.basename(path)
+    ext = os.path.splitext(filename)[1].lower()
+    with open(path, 'rb') as f:
+        original = f.read()
+
+    if not options.get('optimize', True) or ext == '.gif':
+        return [(filename, original)]
+
+    if ext == '.svg':
+        try:
+            minified = minify_svg(original.decode('utf-8')).encode('utf-8')
+        except UnicodeDecodeError:
+            return [(filename, original)]
+        return [(filename, minified if len(minified) < len(original) else original)]
+
+    try:
+        from PIL import Image
+    except ImportError:
+        return [(filename, original)]
+
+    fmt = 'PNG' if ext == '.png' else 'JPEG'
+    image = Image.open(io.BytesIO(original))
+    image.load()
+
+    outputs = []
+    max_dimension = options.get('max_dimension')
+    if max_dimension and max(image.size) > max_dimension:
+        main = image.copy()
+        main.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+        if fmt == 'JPEG' and main.mode not in ('RGB', 'L'):
+            main = main.convert('RGB')
+        outputs.append((filename, _save(main, fmt, image.info)))
+    elif fmt == 'JPEG' and not options.get('recompress_jpeg'):
+        outputs.append((filename, original))
+    else:
+        recompressed = _save(image, fmt, image.info)
+        outputs.append((filename, recompressed if len(recompressed) < len(original) else original))
+
+    width = image.size[0]
+    for variant_width in sorted(set(options.get('responsive_widths') or [])):
+        if variant_width >= width:
+            continue
+        height = max(1, round(image.size[1] * variant_width / width))
+        variant = image.resize((variant_width, height), Image.LANCZOS)
+        if fmt == 'JPEG' and variant.mode not in ('RGB', 'L'):
+            variant = variant.convert('RGB')
+        outputs.append((variant_name(filename, variant_width), _save(variant, fmt, image.info)))
+
+    return outputs
+
+
+class ImageOptimizer:
+    """
+    Optimizes images on their way into the output directory.
+    """
+
+    def __init__(self, cache: Optional[GeneratorCache], writer, logger: logging.Logger,
+                 config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the optimizer.
+
+        Args:
+            cache: Optional cache recording processed images by source hash
+            writer: OutputWriter used for the outputs
+            logger: Logger instance
+            config: Optional ``images`` configuration
+        """
+        self.cache = cache
+        self.writer = writer
+        self.logger = logger
+        self.options = dict(DEFAULT_IMAGE_CONFIG)
+        self.options.update({k: v for k, v in (config or {}).items() if v is not None})
+        self._options_hash = hash_text(repr(sorted(
+            (k, v) for k, v in self.options.items() if k != 'workers'
+        )))
+
+    def _outputs_current(self, directory: str, outputs: Dict[str, int]) -> bool:
+        return all(self.writer.size(os.path.join(directory, name)) == size for name, size in outputs.items())
+
+    def process(self, jobs: List[Tuple[str, str]]) -> None:
+        """
+        Optimize images into their targets.
+
+        Args:
+            jobs: List of (source path, target path) pairs; variants are
+                written next to the target
+        """
+        pending = []
+        for source, target in jobs:
+            try:
+                key = f"{hash_file(source)}:{self._options_hash}"
+            except OSError as e:
+                self.logger.warning(f"Error reading image {source}: {str(e)}")
+                continue
+            directory = os.path.dirname(target)
+            cached = self.cache.get(IMAGE_CACHE_NAMESPACE, key) if self.cache else None
+            if cached is not None and os.path.basename(target) in cached['outputs'] \
+                    and self._outputs_current(directory, cached['outputs']):
+                for name in cached['outputs']:
+                    self.writer.record(os.path.join(directory, name), False)
+                continue
+            pending.append((source, target, key))
+
+        if not pending:
+            return
+
+        results = None
+        if len(pending) >= PARALLEL_THRESHOLD:
+            try:
+                with ProcessPoolExecutor(max_workers=self.options.get('workers')) as executor:
+                    futures = [executor.submit(optimize_image, source, self.options) for source, _, _ in pending]
+                    results = []
+                    for future, (source, _, _) in zip(futures, pending):
+                        try:
+                            results.append(future.result())
+                        except Exception as e:
+                            self.logger.warning(f"Error optimizing image {source}: {str(e)}")
+                            results.append(None)
+            except Exception as e:
+                self.logger.warning(f"Parallel image optimization unavailable, working sequentially: {str(e)}")
+                results = None
+        if results is None:
+            results = []
+            for source, _, _ in pending:
+                try:
+                    results.append(optimize_image(source, self.options))
+                except Exception as e:
+                    self.logger.warning(f"Error optimizing image {source}: {str(e)}")
+                    results.append(None)
+
+        saved = 0
+        for (source, target, key), outputs in zip(pending, results):
+            if outputs is None:
+                # Fall back to an unmodified copy
+                try:
+                    self.writer.copy(source, target)
+                except OSError as e:
+                    self.logger.warning(f"Error copying asset {source}: {str(e)}")
+                continue
+            directory = os.path.dirname(target)
+            outputs[0] = (os.path.basename(target), outputs[0][1])
+            for name, content in outputs:
+                self.writer.write(os.path.join(directory, name), content)
+            saved += os.path.getsize(source) - len(outputs[0][1])
+            if self.cache:
+                self.cache.set(IMAGE_CACHE_NAMESPACE, key, {
+                    'outputs': {name: len(content) for name, content in outputs},
+                })
+
+        self.logger.info(f"Optimized {len(pending)} image(s), saving {max(saved, 0)} bytes")
+
+    def placeholder(self, path: str, width: int, height: int) -> bool:
+        """
+        Write a placeholder PNG showing its dimensions.
+
+        The rendered image is kept in the cache so it is only drawn once.
+
+        Args:
+            path: Destination file path
+            width: Image width
+            height: Image height
+
+        Returns:
+            True if a placeholder was written, False if Pillow is unavailable
+        """
+        key = f"placeholder:{width}x{height}"
+        cached = self.cache.get(IMAGE_CACHE_NAMESPACE, key) if self.cache else None
+        if cached is not None:
+            self.writer.write(path, base64.b64decode(cached['png']))
+            return True
+
+        try:
+            from PIL import Image, ImageDraw, ImageFont
+        except ImportError:
+            return False
+
+        img = Image.new('RGB', (width, height), color=(240, 240, 240))
+        draw = ImageDraw.Draw(img)
+
+        # Add text with dimensions
+        text = f"{width}×{height}"
+        try:
+            font = ImageFont.truetype("arial.ttf", 20)
+        except IOError:
+            font = ImageFont.load_default()
+
+        text_width, text_height = draw.textbbox((0, 0), text, font=font)[2:4]
+        text_position = ((width - text_width) // 2, (height - text_height) // 2)
+        draw.text(text_position, text, fill=(100, 100, 100), font=font)
+
+        # Draw a border
+        draw.rectangle([(0, 0), (width - 1, height - 1)], outline=(200, 200, 200))
+
+        png = _save(img, 'PNG', img.info)
+        if self.cache:
+            self.cache.set(IMAGE_CACHE_NAMESPACE, key, {'png': base64.b64encode(png).decode('ascii')})
+        self.writer.write(path, png)
+        return True
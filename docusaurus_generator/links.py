@@ -0,0 +1,314 @@
+"""
+Validation and rewriting of relative links in the generated pages.
+
+Pages embed Markdown from the repository, such as the README, the guides and
+the contributing guide. Relative links in that Markdown point at repository
+files, not at the pages the files end up in. While a page is generated,
+``mark_repo_links`` resolves these links against the embedded file and marks
+them with ``REPO_SCHEME``. Once all pages exist, ``LinkIndex`` knows every
+doc id and heading anchor. ``LinkIndex.rewrite`` then scans each page once:
+marked links are pointed at the page and anchor documenting the file, images
+at their content-addressed copy in ``static/assets/``, and links between
+pages are checked. Links that cannot be resolved are reported
+and reduced to their text, so they show up at generation time instead of in
+the Docusaurus build. Links to existing files that no page documents and
+that have no blob URL are reported but keep their original target.
+"""
+import re
+import bisect
+import posixpath
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import quote, unquote
+
+from .assets import ASSETS_DIR, asset_name
+from .block_diff import split_frontmatter
+from .search_index import heading_anchor
+
+
+# Marks links resolved to a repository path until the pages are linked
+REPO_SCHEME = 'repo:'
+
+LINK_REPORT_NAME = 'link-report.json'
+
+# Fenced and inline code are matched as a whole so links inside them are left alone
+_LINK = re.compile(
+    r'(?P<fence>^[ \t]*(?P<marker>```|~~~).*?^[ \t]*(?P=marker)[ \t]*$)'
+    r'|(?P<code>`[^`\n]+`)'
+    r'|(?P<image>!?)\[(?P<text>(?:[^\[\]\n]|\[[^\[\]\n]*\])*)\]\(\s*'
+    r'(?P<target><[^<>\n]*>|[^\s()]*(?:\([^\s()]*\)[^\s()]*)*)'
+    r'(?P<title>\s+(?:"[^"\n]*"|\'[^\'\n]*\'))?\s*\)'
+    r'|^(?P<definition>[ ]{0,3}\[[^\]\n]+\]:[ \t]*)(?P<reference><[^<>\n]*>|\S+)(?P<rest>[^\n]*)$'
+    r'|(?P<html><img\b[^>]*>)',
+    re.DOTALL | re.MULTILINE | re.IGNORECASE
+)
+_SRC = re.compile(r'(\bsrc\s*=\s*)(["\'])([^"\'\n]*)\2', re.IGNORECASE)
+_HEADING = re.compile(r'^#{1,6}[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$')
+_HEADING_ID = re.compile(r'\s*\{#([\w-]+)\}$')
+_INLINE_LINK = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+_SCHEME = re.compile(r'^[A-Za-z][A-Za-z0-9+.-]*:')
+
+
+def _is_relative(target: str) -> bool:
+    """Whether a link target is a relative path, rather than a URL, site path or anchor."""
+    return bool(target) and not target.startswith(('#', '/', '\\')) and not _SCHEME.match(target)
+
+
+def _split_target(target: str) -> Tuple[str, str]:
+    """Split a link target into its unquoted path and its fragment."""
+    if target.startswith('<') and target.endswith('>'):
+        target = target[1:-1]
+    path, _, fragment = target.partition('#')
+    return unquote(path.split('?', 1)[0]), fragment
+
+
+def _original_target(marked: str) -> str:
+    """The link target a ``REPO_SCHEME`` mark replaced, as written in the embedded file."""
+    query = marked[len(REPO_SCHEME):].partition('#')[0].partition('?')[2]
+    return unquote(query)
+
+
+def page_anchors(markdown: str) -> Set[str]:
+    """
+    Collect the heading anchors of a page as Docusaurus generates them.
+
+    Repeated headings get ``-1``, ``-2``... suffixes, and explicit ids
+    (``## Title {#custom-id}``) are honoured.
+
+    Args:
+        markdown: Page content, including frontmatter
+
+    Returns:
+        The page's anchors
+    """
+    _, body = split_frontmatter(markdown)
+    anchors: Set[str] = set()
+    counts: Dict[str, int] = {}
+    in_fence = False
+    for line in body.splitlines():
+        if line.lstrip().startswith(('```', '~~~')):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else _HEADING.match(line)
+        if not match:
+            continue
+        text = match.group(1)
+        explicit = _HEADING_ID.search(text)
+        if explicit:
+            anchors.add(explicit.group(1))
+            continue
+        anchor = heading_anchor(_INLINE_LINK.sub(r'\1', text))
+        count = counts.get(anchor, 0)
+        counts[anchor] = count + 1
+        anchors.add(f"{anchor}-{count}" if count else anchor)
+    return anchors
+
+
+def _sub_links(markdown: str, replace: Callable[[re.Match], str]) -> str:
+    """Apply ``replace`` to the links and link definitions of a document, skipping code."""
+    def dispatch(match: re.Match) -> str:
+        if match.group('fence') or match.group('code'):
+            return match.group(0)
+        return replace(match)
+    return _LINK.sub(dispatch, markdown)
+
+
+def mark_repo_links(markdown: str, source_path: str) -> str:
+    """
+    Resolve the relative links of an embedded repository file.
+
+    Each relative link, image or ``<img>`` source is rewritten to
+    ``repo:<path>?<original>[#fragment]``, with the path taken relative to the
+    repository root and the original target quoted, so it can be restored.
+    Links leaving the repository are left unchanged.
+
+    Args:
+        markdown: Content of the file
+        source_path: Path of the file relative to the repository root, with forward slashes
+
+    Returns:
+        The content with relative links marked
+    """
+    directory = posixpath.dirname(source_path)
+
+    def resolve(target: str) -> str:
+        if not _is_relative(target):
+            return target
+        path, fragment = _split_target(target)
+        resolved = posixpath.normpath(posixpath.join(directory, path))
+        if resolved == '..' or resolved.startswith('../'):
+            return target
+        if resolved == '.':
+            resolved = ''
+        marked = f"{REPO_SCHEME}{quote(resolved, safe='/')}?{quote(target, safe='/.')}"
+        return f"{marked}#{fragment}" if fragment else marked
+
+    def replace(match: re.Match) -> str:
+        if match.group('definition'):
+            return match.group('definition') + resolve(match.group('reference')) + match.group('rest')
+        if match.group('html'):
+            return _SRC.sub(lambda src: src.group(1) + src.group(2) + resolve(src.group(3)) + src.group(2),
+                            match.group('html'))
+        text = mark_repo_links(match.group('text'), source_path)
+        return f"{match.group('image')}[{text}]({resolve(match.group('target'))}{match.group('title') or ''})"
+
+    return _sub_links(markdown, replace)
+
+
+class LinkIndex:
+    """
+    Index of the generated pages and their anchors, used to link and check pages.
+    """
+
+    def __init__(self, pages: Dict[str, str], files: Iterable[str], locations: Dict[str, Tuple[str, str]],
+                 blob_url: Optional[str] = None, asset_id: Optional[Callable[[str], Optional[str]]] = None):
+        """
+        Initialize the index.
+
+        Args:
+            pages: Content of every generated page by doc id, e.g. 'packages/ui/api'
+            files: Relative paths of the repository's files
+            locations: Doc id and anchor of the page documenting a repository
+                file; an empty anchor links to the top of the page
+            blob_url: Optional URL that files not documented by any page are
+                linked under, e.g. 'https://github.com/org/repo/blob/HEAD'
+            asset_id: Function returning the git blob id of a referenced
+                image, or None if it cannot be read; see ``assets``
+        """
+        self.anchors = {page_id: page_anchors(content) for page_id, content in pages.items()}
+        self.files = set(files)
+        self.directories = {posixpath.dirname(path) for path in self.files}
+        for directory in list(self.directories):
+            while directory:
+                directory = posixpath.dirname(directory)
+                self.directories.add(directory)
+        self.locations = locations
+        self.blob_url = blob_url
+        self.asset_id = asset_id
+        # Asset name to the repository path it is copied from
+        self.assets: Dict[str, str] = {}
+        self.checked = 0
+        self.rewritten = 0
+        self.broken: List[Dict[str, object]] = []
+
+    def locate(self, path: str) -> Optional[Tuple[str, str]]:
+        """Return the page and anchor documenting a repository file or directory, if any."""
+        for candidate in (path, posixpath.join(path, 'README.md')):
+            location = self.locations.get(candidate)
+            if location is None or location[0] not in self.anchors:
+                continue
+            if not location[1] or location[1] in self.anchors[location[0]]:
+                return location
+        return None
+
+    def rewrite(self, page_id: str, markdown: str) -> str:
+        """
+        Link and check the links of one page in a single pass.
+
+        Args:
+            page_id: Doc id of the page
+            markdown: Page content
+
+        Returns:
+            The content with marked links pointed at pages, links to
+            undocumented files restored and broken links reduced to their text
+        """
+        directory = posixpath.dirname(page_id)
+        frontmatter, body = split_frontmatter(markdown)
+        first_line = frontmatter.count('\n') + 1
+        newlines = [match.start() for match in re.finditer('\n', body)]
+
+        def report(position: int, target: str, reason: str) -> None:
+            line = first_line + bisect.bisect_left(newlines, position)
+            self.broken.append({'page': page_id, 'line': line, 'target': target, 'reason': reason})
+
+        def page_link(target_page: str, anchor: str) -> str:
+            if target_page == page_id and anchor:
+                return f"#{anchor}"
+            link = posixpath.relpath(target_page + '.md', directory or '.')
+            return f"{link}#{anchor}" if anchor else link
+
+        def resolve(position: int, target: str, image: bool) -> Optional[str]:
+            """New target of a link, the target itself if it is fine, or None if it is broken."""
+            if target.startswith(REPO_SCHEME):
+                self.checked += 1
+                path, fragment = _split_target(target[len(REPO_SCHEME):])
+                if image:
+                    blob_id = self.asset_id(path) if path in self.files and self.asset_id else None
+                    if blob_id is None:
+                        report(position, path, 'missing-file')
+                        return None
+                    name = asset_name(path, blob_id)
+                    self.assets[name] = path
+                    self.rewritten += 1
+                    return f"/{ASSETS_DIR}/{quote(name)}"
+                location = self.locate(path)
+                if location:
+                    target_page, anchor = location
+                    if fragment and fragment in self.anchors[target_page]:
+                        anchor = fragment
+                    elif fragment:
+                        report(position, f"{path}#{fragment}", 'missing-anchor')
+                    self.rewritten += 1
+                    return page_link(target_page, anchor)
+                if path in self.files or path in self.directories:
+                    if self.blob_url:
+                        self.rewritten += 1
+                        url = f"{self.blob_url}/{quote(path)}"
+                        return f"{url}#{fragment}" if fragment else url
+                    # Nowhere better to point it; the original link may still work where the file is viewed
+                    report(position, path, 'undocumented-file')
+                    return _original_target(target)
+                report(position, path, 'missing-file')
+                return None
+
+            path, fragment = _split_target(target)
+            if not path and target.startswith('#'):
+                self.checked += 1
+                if fragment in self.anchors.get(page_id, ()):
+                    return target
+                report(position, target, 'missing-anchor')
+                return None
+            if image or not _is_relative(target) or not path.endswith(('.md', '.mdx')):
+                return target
+            self.checked += 1
+            target_page = posixpath.normpath(posixpath.join(directory, path.rsplit('.', 1)[0]))
+            if target_page not in self.anchors:
+                report(position, target, 'missing-page')
+                return None
+            if fragment and fragment not in self.anchors[target_page]:
+                report(position, target, 'missing-anchor')
+                return None
+            return target
+
+        def replacer(base: int) -> Callable[[re.Match], str]:
+            def replace(match: re.Match) -> str:
+                position = base + match.start()
+                if match.group('definition'):
+                    target = resolve(position, match.group('reference'), False)
+                    return '' if target is None else match.group('definition') + target + match.group('rest')
+                if match.group('html'):
+                    source = _SRC.search(match.group('html'))
+                    target = resolve(position, source.group(3), True) if source else None
+                    if target is None:
+                        return '' if source else match.group(0)
+                    return match.group('html')[:source.start(3)] + target + match.group('html')[source.end(3):]
+                image = bool(match.group('image'))
+                text = match.group('text')
+                if not image:
+                    # Linked images: [![alt](image.png)](page.md)
+                    text = _sub_links(text, replacer(base + match.start('text')))
+                target = resolve(position, match.group('target'), image)
+                if target is None:
+                    return text
+                return f"{match.group('image')}[{text}]({target}{match.group('title') or ''})"
+            return replace
+
+        return frontmatter + _sub_links(body, replacer(0))
+
+    def report(self) -> Dict[str, object]:
+        """Machine-readable summary of the checked links, broken ones sorted by page and line."""
+        return {
+            'checked': self.checked,
+            'rewritten': self.rewritten,
+            'broken': sorted(self.broken, key=lambda problem: (problem['page'], problem['line'])),
+        }
@@ -0,0 +1,534 @@
+"""
+Streaming lockfile analysis for the Security "Dependencies" section.
+
+Lockfiles are read incrementally so memory stays bounded by the number of
+distinct packages rather than the size of the file.
+"""
+import os
+import re
+import json
+import logging
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .cache import GeneratorCache, hash_file
+
+
+# Lockfiles analysed at the repository root, in display order
+LOCKFILES = {
+    'package-lock.json': 'npm',
+    'requirements.txt': 'pip',
+    'Gemfile.lock': 'Bundler',
+    'poetry.lock': 'Poetry',
+}
+
+# Manifests that decide which locked packages are direct dependencies
+COMPANION_MANIFESTS = {
+    'package-lock.json': 'package.json',
+    'poetry.lock': 'pyproject.toml',
+}
+
+LOCKFILE_CACHE_NAMESPACE = 'lockfiles'
+
+# Duplicate-version entries kept per lockfile summary
+MAX_DUPLICATES = 50
+
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_STRUCTURE = re.compile(r'["{}\[\]]')
+_WHITESPACE = ' \t\r\n'
+
+
+class _JSONStream:
+    """
+    Minimal incremental reader for a JSON document.
+
+    Only the current value plus one chunk is held in memory; consumed input
+    is dropped every time the buffer is refilled.
+    """
+
+    def __init__(self, f: IO[str], chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        """Consume the given structural character."""
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON stream")
+        self.pos += 1
+
+    def read_string(self) -> str:
+        """Read a JSON string."""
+        self.peek()
+        while True:
+            match = _STRING.match(self.buf, self.pos)
+            if match:
+                self.pos = match.end()
+                return json.loads(match.group(0))
+            if not self._fill():
+                raise ValueError("Unterminated string in JSON stream")
+
+    def read_value(self) -> Any:
+        """Decode the next complete value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill():
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                self.pos = end
+                return value
+
+    def skip_value(self) -> None:
+        """Skip the next value without decoding it."""
+        if self.peek() not in '{[':
+            self.read_value()
+            return
+
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(self.buf, self.pos)
+            if not match:
+                self.pos = len(self.buf)
+                if not self._fill():
+                    raise ValueError("Unexpected end of JSON stream")
+                continue
+            char = match.group(0)
+            if char == '"':
+                self.pos = match.start()
+                self.read_string()
+                continue
+            self.pos = match.end()
+            depth += 1 if char in '{[' else -1
+            if depth == 0:
+                return
+
+
+def iter_json_members(f: IO[str], keys: Iterable[str],
+                      chunk_size: int = 1 << 16) -> Iterator[Tuple[str, str, Any]]:
+    """
+    Stream the members of the first top-level object found under one of the keys.
+
+    Args:
+        f: Text file object positioned at the start of a JSON document
+        keys: Top-level keys whose object value should be streamed
+        chunk_size: Number of characters read at a time
+
+    Yields:
+        (top-level key, member name, member value) tuples
+    """
+    keys = set(keys)
+    stream = _JSONStream(f, chunk_size)
+    stream.expect('{')
+
+    while True:
+        char = stream.peek()
+        if char in ('}', ''):
+            return
+        if char == ',':
+            stream.pos += 1
+            continue
+
+        key = stream.read_string()
+        stream.expect(':')
+        if key in keys and stream.peek() == '{':
+            stream.pos += 1
+            while True:
+                char = stream.peek()
+                if char in ('}', ''):
+                    return
+                if char == ',':
+                    stream.pos += 1
+                    continue
+                name = stream.read_string()
+                stream.expect(':')
+                yield key, name, stream.read_value()
+        stream.skip_value()
+
+
+class _Tally:
+    """Accumulates package versions and licenses for one lockfile."""
+
+    def __init__(self, ecosystem: str, direct_names: Optional[Set[str]] = None):
+        self.ecosystem = ecosystem
+        self.direct_names = direct_names
+        self.versions: Dict[str, Set[str]] = {}
+        self.licenses: Dict[str, int] = {}
+        self.packages = 0
+        self.direct = 0
+
+    def add(self, name: str, version: Optional[str], license_name: Optional[str] = None,
+            direct: Optional[bool] = None) -> None:
+        if not name:
+            return
+        self.packages += 1
+        if direct is None:
+            direct = self.direct_names is not None and name in self.direct_names
+        if direct:
+            self.direct += 1
+        self.versions.setdefault(name, set()).add(version or '')
+        license_name = license_name or 'unknown'
+        self.licenses[license_name] = self.licenses.get(license_name, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        duplicates = {
+            name: sorted(v for v in versions if v)
+            for name, versions in sorted(self.versions.items())
+            if len([v for v in versions if v]) > 1
+        }
+        return {
+            'ecosystem': self.ecosystem,
+            'packages': self.packages,
+            'direct': self.direct,
+            'transitive': self.packages - self.direct,
+            'duplicate_count': len(duplicates),
+            'duplicates': dict(list(duplicates.items())[:MAX_DUPLICATES]),
+            'licenses': dict(sorted(self.licenses.items(), key=lambda item: (-item[1], item[0]))),
+        }
+
+
+def _license_name(value: Any) -> Optional[str]:
+    if isinstance(value, dict):
+        return value.get('type')
+    if isinstance(value, list):
+        return ' OR '.join(str(_license_name(v)) for v in value) or None
+    return value
+
+
+def _npm_direct_names(package_json: Optional[str]) -> Set[str]:
+    names = set()
+    if package_json and os.path.exists(package_json):
+        try:
+            with open(package_json, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for field in ('dependencies', 'devDependencies', 'optionalDependencies', 'peerDependencies'):
+                names.update((data.get(field) or {}).keys())
+        except Exception:
+            pass
+    return names
+
+
+def analyze_npm_lock(path: str, package_json: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Summarize a package-lock.json (lockfile versions 1 to 3).
+
+    Args:
+        path: Path to package-lock.json
+        package_json: Optional path to the package.json declaring direct dependencies
+
+    Returns:
+        Dependency summary
+    """
+    tally = _Tally('npm', _npm_direct_names(package_json))
+    root_names = None
+
+    def walk_v1(name: str, entry: Dict[str, Any], top_level: bool) -> None:
+        tally.add(name, entry.get('version'), _license_name(entry.get('license')),
+                  direct=top_level and name in tally.direct_names)
+        for child_name, child in (entry.get('dependencies') or {}).items():
+            if isinstance(child, dict):
+                walk_v1(child_name, child, False)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for key, name, entry in iter_json_members(f, ('packages', 'dependencies')):
+            if not isinstance(entry, dict):
+                continue
+            if key == 'dependencies':
+                walk_v1(name, entry, True)
+                continue
+            if name == '':
+                # The root project lists the direct dependencies
+                root_names = set()
+                for field in ('dependencies', 'devDependencies', 'optionalDependencies', 'peerDependencies'):
+                    root_names.update((entry.get(field) or {}).keys())
+                tally.direct_names = tally.direct_names | root_names
+                continue
+            if entry.get('link'):
+                continue
+            package_name = entry.get('name') or name.rsplit('node_modules/', 1)[-1]
+            top_level = name.count('node_modules/') == 1 and name.startswith('node_modules/')
+            tally.add(package_name, entry.get('version'), _license_name(entry.get('license')),
+                      direct=top_level and package_name in tally.direct_names)
+
+    return tally.summary()
+
+
+_REQUIREMENT = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._-]*)(?:\[[^\]]*\])?\s*(?:==|===|~=|>=|<=|>|<|!=)?\s*([^\s;#\\,]*)')
+
+
+def analyze_requirements(path: str) -> Dict[str, Any]:
+    """
+    Summarize a pip requirements file.
+
+    pip-compile "# via" annotations are used to tell transitive dependencies
+    from direct ones; without them every requirement counts as direct.
+
+    Args:
+        path: Path to requirements.txt
+
+    Returns:
+        Dependency summary
+    """
+    tally = _Tally('pip')
+    pending: Optional[Tuple[str, str]] = None
+    via: List[str] = []
+    in_via = False
+
+    def flush() -> None:
+        if pending:
+            direct = not via or any(v.startswith('-r') or v.startswith('-c') for v in via)
+            tally.add(pending[0].lower(), pending[1], direct=direct)
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith('#'):
+                comment = stripped.lstrip('#').strip()
+                if pending and comment.startswith('via'):
+                    in_via = True
+                    if comment[3:].strip():
+                        via.append(comment[3:].strip())
+                elif in_via and comment:
+                    via.append(comment)
+                continue
+            if not stripped or stripped.startswith('-'):
+                continue
+            if ' @ ' in stripped:
+                requirement = (stripped.split(' @ ', 1)[0].strip(), '')
+            elif '://' in stripped:
+                continue
+            else:
+                match = _REQUIREMENT.match(stripped)
+                if not match:
+                    continue
+                requirement = (match.group(1), match.group(2))
+            flush()
+            pending = requirement
+            via = []
+            in_via = False
+    flush()
+
+    return tally.summary()
+
+
+_GEM_SPEC = re.compile(r'^    (\S+) \(([^)]+)\)\s*$')
+_GEM_DEPENDENCY = re.compile(r'^  (\S+?)!?(?: \(.*\))?\s*$')
+
+
+def analyze_gemfile_lock(path: str) -> Dict[str, Any]:
+    """
+    Summarize a Gemfile.lock.
+
+    Args:
+        path: Path to Gemfile.lock
+
+    Returns:
+        Dependency summary
+    """
+    specs: List[Tuple[str, str]] = []
+    direct_names: Set[str] = set()
+    section = None
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if line and not line.startswith(' '):
+                section = line.strip()
+                continue
+            if section in ('GEM', 'GIT', 'PATH'):
+                match = _GEM_SPEC.match(line)
+                if match:
+                    specs.append((match.group(1), match.group(2)))
+            elif section == 'DEPENDENCIES':
+                match = _GEM_DEPENDENCY.match(line)
+                if match:
+                    direct_names.add(match.group(1))
+
+    tally = _Tally('Bundler', direct_names)
+    for name, version in specs:
+        tally.add(name, version)
+    return tally.summary()
+
+
+def _poetry_direct_names(pyproject: Optional[str]) -> Set[str]:
+    names: Set[str] = set()
+    if not pyproject or not os.path.exists(pyproject):
+        return names
+    section = None
+    with open(pyproject, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith('['):
+                section = stripped.strip('[]').strip()
+                continue
+            if section and (section == 'tool.poetry.dependencies'
+                            or section == 'tool.poetry.dev-dependencies'
+                            or (section.startswith('tool.poetry.group.') and section.endswith('.dependencies'))):
+                match = re.match(r'^"?([A-Za-z0-9][A-Za-z0-9._-]*)"?\s*=', stripped)
+                if match and match.group(1).lower() != 'python':
+                    names.add(match.group(1).lower().replace('_', '-'))
+    return names
+
+
+def analyze_poetry_lock(path: str, pyproject: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Summarize a poetry.lock.
+
+    Args:
+        path: Path to poetry.lock
+        pyproject: Optional path to the pyproject.toml declaring direct dependencies
+
+    Returns:
+        Dependency summary
+    """
+    tally = _Tally('Poetry', _poetry_direct_names(pyproject))
+    in_package = False
+    name = version = None
+
+    def flush() -> None:
+        if name:
+            tally.add(name.lower().replace('_', '-'), version)
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith('['):
+                if stripped == '[[package]]':
+                    flush()
+                    in_package = True
+                    name = version = None
+                else:
+                    in_package = False
+                continue
+            if not in_package:
+                continue
+            match = re.match(r'^(name|version)\s*=\s*"([^"]*)"', stripped)
+            if match:
+                if match.group(1) == 'name':
+                    name = match.group(2)
+                else:
+                    version = match.group(2)
+    flush()
+
+    return tally.summary()
+
+
+def analyze_lockfiles(repo_path: str, cache: Optional[GeneratorCache],
+                      logger: logging.Logger) -> Dict[str, Dict[str, Any]]:
+    """
+    Analyze the lockfiles at the repository root.
+
+    Summaries are cached by the hash of the lockfile and its companion manifest.
+
+    Args:
+        repo_path: Path to the repository
+        cache: Optional cache for summaries
+        logger: Logger instance
+
+    Returns:
+        Mapping of lockfile name to its dependency summary
+    """
+    summaries = {}
+
+    for lockfile in LOCKFILES:
+        path = os.path.join(repo_path, lockfile)
+        if not os.path.isfile(path):
+            continue
+
+        companion = COMPANION_MANIFESTS.get(lockfile)
+        companion_path = os.path.join(repo_path, companion) if companion else None
+        try:
+            key = f"{lockfile}:{hash_file(path)}"
+            if companion_path and os.path.isfile(companion_path):
+                key += f":{hash_file(companion_path)}"
+
+            summary = cache.get(LOCKFILE_CACHE_NAMESPACE, key) if cache else None
+            if summary is None:
+                if lockfile == 'package-lock.json':
+                    summary = analyze_npm_lock(path, companion_path)
+                elif lockfile == 'requirements.txt':
+                    summary = analyze_requirements(path)
+                elif lockfile == 'Gemfile.lock':
+                    summary = analyze_gemfile_lock(path)
+                else:
+                    summary = analyze_poetry_lock(path, companion_path)
+                if cache:
+                    cache.set(LOCKFILE_CACHE_NAMESPACE, key, summary)
+            summaries[lockfile] = summary
+        except Exception as e:
+            logger.warning(f"Error analyzing {lockfile}: {str(e)}")
+
+    return summaries
+
+
+def render_dependency_summary(summaries: Dict[str, Dict[str, Any]], max_licenses: int = 8,
+                              max_duplicates: int = 10) -> str:
+    """
+    Render lockfile summaries as compact Markdown.
+
+    Args:
+        summaries: Mapping of lockfile name to dependency summary
+        max_licenses: Licenses listed per lockfile before the rest are grouped
+        max_duplicates: Duplicated packages listed per lockfile
+
+    Returns:
+        Markdown table with license and duplicate notes
+    """
+    lines = [
+        "| Lockfile | Ecosystem | Packages | Direct | Transitive | Duplicate versions |",
+        "|---|---|---:|---:|---:|---:|",
+    ]
+    for lockfile, summary in summaries.items():
+        lines.append(
+            f"| `{lockfile}` | {summary['ecosystem']} | {summary['packages']} | {summary['direct']} | "
+            f"{summary['transitive']} | {summary['duplicate_count']} |"
+        )
+
+    for lockfile, summary in summaries.items():
+        licenses = list(summary['licenses'].items())
+        if licenses and [name for name, _ in licenses] != ['unknown']:
+            shown = ', '.join(f"{name} ({count})" for name, count in licenses[:max_licenses])
+            rest = sum(count for _, count in licenses[max_licenses:])
+            if rest:
+                shown += f", other ({rest})"
+            lines.append(f"\n**Licenses in `{lockfile}`:** {shown}")
+
+        duplicates = list(summary['duplicates'].items())[:max_duplicates]
+        if duplicates:
+            shown = ', '.join(f"`{name}` ({', '.join(versions)})" for name, versions in duplicates)
+            more = summary['duplicate_count'] - len(duplicates)
+            if more > 0:
+                shown += f" and {more} more"
+            lines.append(f"\n**Packages locked at several versions in `{lockfile}`:** {shown}")
+
+    return "\n".join(lines)
@@ -0,0 +1,459 @@
+"""
+Structured manifest reading for the Installation section.
+
+Manifests are read statically: ``setup.py`` is parsed with ``ast`` and never
+executed, and ``pom.xml`` is read with an event-based parser so large POMs do
+not have to be held as a full element tree.
+"""
+import os
+import re
+import ast
+import json
+import logging
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+# Manifests read at the repository root, grouped by the section heading they appear under
+MANIFESTS = {
+    'Python': ['pyproject.toml', 'setup.py', 'requirements.txt'],
+    'Node.js': ['package.json'],
+    'Java': ['pom.xml'],
+    'Ruby': ['Gemfile'],
+}
+
+_REQUIREMENT = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._-]*(?:\[[^\]]*\])?)\s*(.*)$')
+
+
+def _split_requirement(requirement: str) -> Tuple[str, str]:
+    """Split a PEP 508 requirement into its name and version/marker spec."""
+    match = _REQUIREMENT.match(requirement)
+    if not match:
+        return requirement.strip(), ''
+    return match.group(1), match.group(2).strip().lstrip('(').rstrip(')').strip()
+
+
+def _manifest(ecosystem: str, filename: str) -> Dict[str, Any]:
+    return {
+        'ecosystem': ecosystem,
+        'file': filename,
+        'name': None,
+        'version': None,
+        'install': [],
+        'runtime': [],
+        'dependencies': [],
+        'commands': [],
+    }
+
+
+def read_requirements(path: str) -> Dict[str, Any]:
+    """
+    Read a pip requirements file.
+
+    Args:
+        path: Path to requirements.txt
+
+    Returns:
+        Manifest summary
+    """
+    manifest = _manifest('Python', os.path.basename(path))
+    manifest['install'].append(f"pip install -r {manifest['file']}")
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.split(' #', 1)[0].strip()
+            if not line or line.startswith(('#', '-')):
+                continue
+            if ' @ ' in line:
+                name, url = line.split(' @ ', 1)
+                manifest['dependencies'].append((name.strip(), url.strip(), ''))
+            else:
+                name, spec = _split_requirement(line.rstrip('\\').strip())
+                manifest['dependencies'].append((name, spec, ''))
+
+    return manifest
+
+
+def _literal(node: ast.AST, names: Dict[str, ast.AST]) -> Any:
+    """Evaluate a literal, following module-level names; None if not static."""
+    if isinstance(node, ast.Name) and node.id in names:
+        node = names[node.id]
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return None
+
+
+def read_setup_py(path: str) -> Dict[str, Any]:
+    """
+    Read the keyword arguments of the ``setup()`` call in a setup.py without running it.
+
+    Only literal values (or module-level names bound to literals) are used.
+
+    Args:
+        path: Path to setup.py
+
+    Returns:
+        Manifest summary
+    """
+    manifest = _manifest('Python', os.path.basename(path))
+    manifest['install'].append("pip install .")
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    names = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            names[node.targets[0].id] = node.value
+
+    call = None
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            func = node.func
+            func_name = func.attr if isinstance(func, ast.Attribute) else getattr(func, 'id', '')
+            if func_name == 'setup':
+                call = node
+                break
+    if call is None:
+        return manifest
+
+    kwargs = {kw.arg: _literal(kw.value, names) for kw in call.keywords if kw.arg}
+
+    manifest['name'] = kwargs.get('name') if isinstance(kwargs.get('name'), str) else None
+    manifest['version'] = kwargs.get('version') if isinstance(kwargs.get('version'), str) else None
+    if isinstance(kwargs.get('python_requires'), str):
+        manifest['runtime'].append(f"Python {kwargs['python_requires']}")
+    for requirement in kwargs.get('install_requires') or []:
+        if isinstance(requirement, str):
+            manifest['dependencies'].append(_split_requirement(requirement) + ('',))
+    extras = kwargs.get('extras_require')
+    if isinstance(extras, dict):
+        for extra, requirements in extras.items():
+            for requirement in requirements or []:
+                if isinstance(requirement, str):
+                    manifest['dependencies'].append(_split_requirement(requirement) + (f"extra: {extra}",))
+    entry_points = kwargs.get('entry_points')
+    if isinstance(entry_points, dict):
+        for script in entry_points.get('console_scripts') or []:
+            if isinstance(script, str) and '=' in script:
+                manifest['commands'].append(script.split('=', 1)[0].strip())
+
+    return manifest
+
+
+def read_pyproject(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read PEP 621 and Poetry metadata from a pyproject.toml.
+
+    Args:
+        path: Path to pyproject.toml
+
+    Returns:
+        Manifest summary, or None if no TOML parser is available or the file
+        declares no project metadata
+    """
+    if tomllib is None:
+        return None
+
+    with open(path, 'rb') as f:
+        data = tomllib.load(f)
+
+    project = data.get('project') or {}
+    poetry = (data.get('tool') or {}).get('poetry') or {}
+    if not project and not poetry:
+        return None
+
+    manifest = _manifest('Python', os.path.basename(path))
+    manifest['name'] = project.get('name') or poetry.get('name')
+    manifest['version'] = project.get('version') or poetry.get('version')
+
+    if project:
+        manifest['install'].append("pip install .")
+        if project.get('requires-python'):
+            manifest['runtime'].append(f"Python {project['requires-python']}")
+        for requirement in project.get('dependencies') or []:
+            manifest['dependencies'].append(_split_requirement(requirement) + ('',))
+        for extra, requirements in (project.get('optional-dependencies') or {}).items():
+            for requirement in requirements:
+                manifest['dependencies'].append(_split_requirement(requirement) + (f"extra: {extra}",))
+        manifest['commands'].extend(sorted((project.get('scripts') or {}).keys()))
+    else:
+        manifest['install'].append("poetry install")
+
+    if poetry:
+        groups = [('', poetry.get('dependencies') or {}), ('dev', poetry.get('dev-dependencies') or {})]
+        groups += [(group, (spec or {}).get('dependencies') or {})
+                   for group, spec in (poetry.get('group') or {}).items()]
+        for scope, dependencies in groups:
+            for name, spec in dependencies.items():
+                if isinstance(spec, dict):
+                    spec = spec.get('version') or spec.get('git') or spec.get('path') or ''
+                if name.lower() == 'python':
+                    if not project.get('requires-python'):
+                        manifest['runtime'].append(f"Python {spec}")
+                    continue
+                manifest['dependencies'].append((name, str(spec), f"group: {scope}" if scope else ''))
+        if not project:
+            manifest['commands'].extend(sorted((poetry.get('scripts') or {}).keys()))
+
+    return manifest
+
+
+def read_package_json(path: str) -> Dict[str, Any]:
+    """
+    Read a package.json.
+
+    The install command follows the lockfile found next to it.
+
+    Args:
+        path: Path to package.json
+
+    Returns:
+        Manifest summary
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    manifest = _manifest('Node.js', os.path.basename(path))
+    manifest['name'] = data.get('name')
+    manifest['version'] = data.get('version')
+
+    directory = os.path.dirname(path)
+    if os.path.exists(os.path.join(directory, 'yarn.lock')):
+        manifest['install'].append("yarn install")
+    elif os.path.exists(os.path.join(directory, 'pnpm-lock.yaml')):
+        manifest['install'].append("pnpm install")
+    elif os.path.exists(os.path.join(directory, 'package-lock.json')):
+        manifest['install'].append("npm ci")
+    else:
+        manifest['install'].append("npm install")
+
+    for engine, spec in (data.get('engines') or {}).items():
+        manifest['runtime'].append(f"{'Node.js' if engine == 'node' else engine} {spec}")
+
+    for field, scope in (('dependencies', ''), ('peerDependencies', 'peer'),
+                         ('optionalDependencies', 'optional'), ('devDependencies', 'dev')):
+        for name, spec in (data.get(field) or {}).items():
+            manifest['dependencies'].append((name, str(spec), scope))
+
+    bin_field = data.get('bin')
+    if isinstance(bin_field, dict):
+        manifest['commands'].extend(sorted(bin_field))
+    elif isinstance(bin_field, str) and data.get('name'):
+        manifest['commands'].append(data['name'].rsplit('/', 1)[-1])
+    for script in ('build', 'start', 'test'):
+        if script in (data.get('scripts') or {}):
+            manifest['commands'].append(f"npm run {script}" if script == 'build' else f"npm {script}")
+
+    return manifest
+
+
+_POM_JAVA_PROPERTIES = ('maven.compiler.release', 'maven.compiler.source', 'java.version')
+
+
+def read_pom(path: str) -> Dict[str, Any]:
+    """
+    Read a Maven pom.xml with an event-based parser.
+
+    Only the project coordinates, the Java version properties and the direct
+    ``<dependencies>`` of the project are kept; elements are cleared as soon as
+    they have been read. Dependencies in ``<dependencyManagement>``, plugins and
+    profiles are skipped.
+
+    Args:
+        path: Path to pom.xml
+
+    Returns:
+        Manifest summary
+    """
+    manifest = _manifest('Java', os.path.basename(path))
+    manifest['install'].append("mvn install")
+
+    stack: List[str] = []
+    properties: Dict[str, str] = {}
+    dependency: Optional[Dict[str, str]] = None
+
+    for event, element in ET.iterparse(path, events=('start', 'end')):
+        tag = element.tag.rsplit('}', 1)[-1]
+        if event == 'start':
+            stack.append(tag)
+            if stack == ['project', 'dependencies', 'dependency']:
+                dependency = {}
+            continue
+
+        text = (element.text or '').strip()
+        if len(stack) == 2 and tag in ('artifactId', 'version'):
+            manifest['name' if tag == 'artifactId' else 'version'] = text
+        elif stack[:2] == ['project', 'properties'] and len(stack) == 3:
+            properties[tag] = text
+        elif dependency is not None and len(stack) == 4:
+            dependency[tag] = text
+        elif stack == ['project', 'dependencies', 'dependency'] and dependency is not None:
+            name = f"{dependency.get('groupId', '')}:{dependency.get('artifactId', '')}"
+            scope = dependency.get('scope', '')
+            if dependency.get('optional') == 'true':
+                scope = f"{scope}, optional" if scope else 'optional'
+            manifest['dependencies'].append((name, dependency.get('version', ''), scope))
+            dependency = None
+
+        stack.pop()
+        element.clear()
+
+    for prop in _POM_JAVA_PROPERTIES:
+        if properties.get(prop):
+            manifest['runtime'].append(f"Java {properties[prop]}")
+            break
+
+    def resolve(value: str) -> str:
+        return re.sub(r'\$\{([^}]+)\}', lambda m: properties.get(m.group(1), m.group(0)), value)
+
+    manifest['version'] = resolve(manifest['version']) if manifest['version'] else None
+    manifest['dependencies'] = [(name, resolve(version), scope)
+                                for name, version, scope in manifest['dependencies']]
+    return manifest
+
+
+_GEM = re.compile(r'''^gem\s+['"]([^'"]+)['"]((?:\s*,\s*['"][^'"]*['"])*)''')
+_GROUP = re.compile(r'^group\s+(.+?)\s+do\b')
+_RUBY = re.compile(r'''^ruby\s+['"]([^'"]+)['"]''')
+
+
+def read_gemfile(path: str) -> Dict[str, Any]:
+    """
+    Read a Gemfile line by line.
+
+    Args:
+        path: Path to Gemfile
+
+    Returns:
+        Manifest summary
+    """
+    manifest = _manifest('Ruby', os.path.basename(path))
+    manifest['install'].append("bundle install")
+    groups: List[str] = []
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            stripped = line.split('#', 1)[0].strip()
+            if not stripped:
+                continue
+            match = _GROUP.match(stripped)
+            if match:
+                groups.append(', '.join(g.strip().lstrip(':') for g in match.group(1).split(',')))
+                continue
+            if stripped == 'end' and groups:
+                groups.pop()
+                continue
+            match = _RUBY.match(stripped)
+            if match:
+                manifest['runtime'].append(f"Ruby {match.group(1)}")
+                continue
+            match = _GEM.match(stripped)
+            if match:
+                versions = re.findall(r'''['"]([^'"]*)['"]''', match.group(2))
+                manifest['dependencies'].append(
+                    (match.group(1), ', '.join(versions), f"group: {groups[-1]}" if groups else '')
+                )
+
+    return manifest
+
+
+_READERS = {
+    'requirements.txt': read_requirements,
+    'setup.py': read_setup_py,
+    'pyproject.toml': read_pyproject,
+    'package.json': read_package_json,
+    'pom.xml': read_pom,
+    'Gemfile': read_gemfile,
+}
+
+
+def read_manifests(repo_path: str, logger: logging.Logger) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Read the manifests at the repository root.
+
+    Args:
+        repo_path: Path to the repository
+        logger: Logger instance
+
+    Returns:
+        Mapping of ecosystem to its manifest summaries, in ``MANIFESTS`` order
+    """
+    manifests = {}
+
+    for ecosystem, filenames in MANIFESTS.items():
+        for filename in filenames:
+            path = os.path.join(repo_path, filename)
+            if not os.path.isfile(path):
+                continue
+            try:
+                manifest = _READERS[filename](path)
+            except Exception as e:
+                logger.warning(f"Error reading {filename}: {str(e)}")
+                continue
+            if manifest is not None:
+                manifests.setdefault(ecosystem, []).append(manifest)
+
+    return manifests
+
+
+def render_manifests(manifests: List[Dict[str, Any]], max_dependencies: int = 40) -> str:
+    """
+    Render the manifests of one ecosystem as compact Markdown.
+
+    Args:
+        manifests: Manifest summaries of one ecosystem
+        max_dependencies: Dependencies listed per manifest before the rest are counted
+
+    Returns:
+        Markdown with install commands, runtime requirements and dependency tables
+    """
+    lines = []
+
+    install = []
+    for manifest in manifests:
+        install.extend(c for c in manifest['install'] if c not in install)
+    if install:
+        lines.extend(["```bash", *install, "```"])
+
+    runtime = []
+    for manifest in manifests:
+        runtime.extend(r for r in manifest['runtime'] if r not in runtime)
+    if runtime:
+        lines.append(f"\n**Requires:** {', '.join(runtime)}")
+
+    commands = []
+    for manifest in manifests:
+        commands.extend(c for c in manifest['commands'] if c not in commands)
+    if commands:
+        lines.append(f"\n**Commands:** {', '.join(f'`{c}`' for c in commands)}")
+
+    for manifest in manifests:
+        dependencies = manifest['dependencies']
+        if not dependencies:
+            continue
+        title = f"`{manifest['file']}`"
+        if manifest['name']:
+            title += f" ({manifest['name']}{' ' + manifest['version'] if manifest['version'] else ''})"
+        lines.extend([
+            f"\n**Dependencies from {title}:**",
+            "",
+            "| Package | Version | Scope |",
+            "|---|---|---|",
+        ])
+        for name, version, scope in dependencies[:max_dependencies]:
+            version = version.replace('|', '\\|') if version else 'any'
+            lines.append(f"| `{name}` | `{version}` | {scope or 'runtime'} |")
+        if len(dependencies) > max_dependencies:
+            lines.append(f"| {len(dependencies) - max_dependencies} more | | |")
+
+    return "\n".join(lines)
@@ -0,0 +1,218 @@
+"""
+OpenMetrics export of generation run metrics.
+
+At the end of a run the section durations, scanned and written files, AI
+requests, latencies and tokens and cache lookups are collected into
+``RunMetrics`` and rendered in the OpenMetrics text format. The result is
+written to a textfile, e.g. for the node_exporter textfile collector, and/or
+pushed to an HTTP endpoint such as a Pushgateway. Metric names are stable;
+every sample is labelled with the repository, and per-section samples with
+the section.
+"""
+import os
+import time
+import logging
+import urllib.request
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .utils import write_file_atomic
+
+
+METRIC_PREFIX = 'docusaurus_generator'
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Upper bounds in seconds of the duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Metric name (without prefix) to (type, help); names are part of the dashboards' contract
+METRICS = {
+    'run_duration_seconds': ('gauge', 'Wall time of the last generation run'),
+    'run_success': ('gauge', 'Whether the last generation run succeeded (1) or failed (0)'),
+    'run_timestamp_seconds': ('gauge', 'Unix time the last generation run finished'),
+    'section_duration_seconds': ('histogram', 'Time spent building a section, package pages or links'),
+    'files_scanned': ('counter', 'Repository files indexed'),
+    'files_written': ('counter', 'Output files written because their content changed'),
+    'files_unchanged': ('counter', 'Output files left untouched because their content was unchanged'),
+    'bytes_written': ('counter', 'Bytes of output files written'),
+    'ai_requests': ('counter', 'AI enhancement requests completed'),
+    'ai_request_outcomes': ('counter', 'AI provider calls by outcome'),
+    'ai_request_duration_seconds': ('histogram', 'Latency of AI enhancement requests'),
+    'ai_time_to_first_token_seconds': ('gauge', 'Seconds until the first streamed token of a section'),
+    'ai_tokens': ('counter', 'Tokens streamed back by the AI model'),
+    'cache_lookups': ('counter', 'Generator cache lookups by result'),
+    'cache_hit_ratio': ('gauge', 'Fraction of generator cache lookups that were hits'),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class RunMetrics:
+    """
+    Metric samples of one generation run.
+
+    Only names listed in ``METRICS`` are accepted, so the exported names stay
+    stable. The repository label is added to every sample.
+    """
+
+    def __init__(self, repo: str):
+        """
+        Initialize the metrics.
+
+        Args:
+            repo: Value of the 'repo' label
+        """
+        self.repo = repo
+        # Metric name to label set to value, or to a histogram's bucket counts, sum and count
+        self._values: Dict[str, Dict[Labels, object]] = {}
+
+    def _labels(self, name: str, labels: Dict[str, str]) -> Labels:
+        if name not in METRICS:
+            raise ValueError(f"Unknown metric: {name}")
+        return (('repo', self.repo),) + tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """Set a gauge."""
+        self._values.setdefault(name, {})[self._labels(name, labels)] = value
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """Increase a counter."""
+        samples = self._values.setdefault(name, {})
+        key = self._labels(name, labels)
+        samples[key] = samples.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Add an observation to a histogram."""
+        samples = self._values.setdefault(name, {})
+        key = self._labels(name, labels)
+        histogram = samples.setdefault(key, {'buckets': [0] * len(DURATION_BUCKETS), 'sum': 0.0, 'count': 0})
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                histogram['buckets'][i] += 1
+        histogram['sum'] += value
+        histogram['count'] += 1
+
+    def render(self) -> str:
+        """Render the samples in the OpenMetrics text format."""
+        lines: List[str] = []
+        for short_name, (kind, help_text) in METRICS.items():
+            samples = self._values.get(short_name)
+            if not samples:
+                continue
+            name = f"{METRIC_PREFIX}_{short_name}"
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"# HELP {name} {help_text}")
+            for labels, value in sorted(samples.items()):
+                if kind == 'histogram':
+                    for bound, count in zip(DURATION_BUCKETS, value['buckets']):
+                        lines.append(f"{name}_bucket{_format_labels(labels, [('le', _format_value(bound))])} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {value['count']}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+                elif kind == 'counter':
+                    lines.append(f"{name}_total{_format_labels(labels)} {_format_value(value)}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+def collect_run_metrics(generator, duration: float, success: bool, repo: Optional[str] = None) -> RunMetrics:
+    """
+    Collect the metrics of a finished run.
+
+    Args:
+        generator: The DocusaurusGenerator that ran
+        duration: Wall time of the run in seconds
+        success: Whether the run succeeded
+        repo: Value of the 'repo' label, defaults to the repository directory name
+
+    Returns:
+        The run's metrics
+    """
+    content_generator = generator.content_generator
+    metrics = RunMetrics(repo or os.path.basename(os.path.abspath(generator.repo_path)))
+
+    metrics.set('run_duration_seconds', duration)
+    metrics.set('run_success', 1 if success else 0)
+    metrics.set('run_timestamp_seconds', time.time())
+
+    for section, seconds in content_generator.timings.items():
+        metrics.observe('section_duration_seconds', seconds, section=section)
+
+    metrics.inc('files_scanned', len(content_generator.repo_index.files))
+    writer = generator.writer
+    metrics.inc('files_written', len(writer.written))
+    metrics.inc('files_unchanged', len(writer.skipped))
+    metrics.inc('bytes_written', writer.bytes_written)
+
+    for section, section_metrics in content_generator.ai_metrics.items():
+        metrics.inc('ai_requests', section_metrics['requests'], section=section)
+        metrics.inc('ai_tokens', section_metrics['tokens'], section=section)
+        metrics.set('ai_time_to_first_token_seconds', section_metrics['time_to_first_token'], section=section)
+        for latency in section_metrics.get('latencies', [section_metrics['total_latency']]):
+            metrics.observe('ai_request_duration_seconds', latency, section=section)
+    if content_generator.use_ai:
+        for outcome, count in content_generator.ai_resilience.outcomes.items():
+            metrics.inc('ai_request_outcomes', count, outcome=outcome)
+
+    cache = content_generator.cache
+    for namespace in sorted(set(cache.hits) | set(cache.misses)):
+        metrics.inc('cache_lookups', cache.hits.get(namespace, 0), namespace=namespace, result='hit')
+        metrics.inc('cache_lookups', cache.misses.get(namespace, 0), namespace=namespace, result='miss')
+        metrics.set('cache_hit_ratio', cache.hit_rate(namespace), namespace=namespace)
+
+    return metrics
+
+
+def export_metrics(metrics: RunMetrics, metrics_config: Optional[Dict], logger: logging.Logger) -> None:
+    """
+    Write the metrics to the configured textfile and push them to the configured endpoint.
+
+    Failures are logged as warnings; they never fail the run.
+
+    Args:
+        metrics: The run's metrics
+        metrics_config: The ``metrics`` configuration dictionary
+        logger: Logger instance
+    """
+    metrics_config = metrics_config or {}
+    text = metrics.render()
+
+    textfile = metrics_config.get('textfile')
+    if textfile:
+        try:
+            write_file_atomic(textfile, text)
+            logger.debug(f"Wrote run metrics to {textfile}")
+        except Exception as e:
+            logger.warning(f"Error writing metrics to {textfile}: {str(e)}")
+
+    push_url = metrics_config.get('push_url')
+    if push_url:
+        request = urllib.request.Request(push_url, data=text.encode('utf-8'), method='POST',
+                                         headers={'Content-Type': OPENMETRICS_CONTENT_TYPE})
+        try:
+            with urllib.request.urlopen(request, timeout=metrics_config.get('push_timeout', 10.0)):
+                pass
+            logger.debug(f"Pushed run metrics to {push_url}")
+        except Exception as e:
+            logger.warning(f"Error pushing metrics to {push_url}: {str(e)}")
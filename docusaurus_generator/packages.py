@@ -0,0 +1,114 @@
+"""
+Sub-package detection for monorepos.
+
+A directory below the repository root that holds a package manifest is
+treated as a package and documented in its own subtree. Packages are
+fingerprinted by the files they contain, so a package is only regenerated
+when one of its own files changed.
+"""
+import os
+import re
+import json
+from typing import Dict, Iterable, List, Optional
+
+from .cache import hash_text
+from .repo_index import RepoIndex
+from .testing_inventory import TEST_DIR_NAMES
+
+
+# Manifests that mark a directory as a package
+PACKAGE_MANIFESTS = ('package.json', 'pyproject.toml', 'setup.py', 'pom.xml')
+
+# Sections generated for every package
+PACKAGE_SECTIONS = ('overview', 'installation', 'api')
+
+# Bumped when package page generation changes so cached packages are regenerated
+PACKAGE_FORMAT_VERSION = 2
+
+# Directories whose manifests belong to fixtures or samples rather than packages
+_IGNORED_DIRS = TEST_DIR_NAMES | {'fixtures', 'testdata'}
+
+
+def detect_packages(index: RepoIndex) -> List[str]:
+    """
+    Find the sub-packages of a repository.
+
+    Args:
+        index: Index of the repository
+
+    Returns:
+        Sorted relative directory paths of the packages; the root is never included
+    """
+    packages = set()
+    for path in index.files:
+        directory, _, name = path.rpartition('/')
+        if not directory or name not in PACKAGE_MANIFESTS:
+            continue
+        if any(part.lower() in _IGNORED_DIRS for part in directory.split('/')):
+            continue
+        packages.add(directory)
+    return sorted(packages)
+
+
+def package_of(rel_path: str, packages: Iterable[str]) -> Optional[str]:
+    """Return the innermost package containing a file, or None if it belongs to the root."""
+    owner = None
+    for package in packages:
+        if rel_path.startswith(package + '/') and (owner is None or len(package) > len(owner)):
+            owner = package
+    return owner
+
+
+def package_slug(rel_dir: str) -> str:
+    """Doc path segment for a package directory, e.g. ``packages/ui-kit`` -> ``packages-ui-kit``."""
+    return re.sub(r'[^A-Za-z0-9._-]+', '-', rel_dir).strip('-').lower()
+
+
+def package_slugs(rel_dirs: Iterable[str]) -> Dict[str, str]:
+    """
+    Give every package directory a distinct doc path segment.
+
+    Directories whose slugs collide, e.g. ``packages/ui-kit`` and
+    ``packages-ui/kit``, each get a short hash of their path appended.
+
+    Args:
+        rel_dirs: Relative package directory paths
+
+    Returns:
+        Slug per directory
+    """
+    groups: Dict[str, List[str]] = {}
+    for rel_dir in rel_dirs:
+        groups.setdefault(package_slug(rel_dir), []).append(rel_dir)
+    slugs = {}
+    for slug, dirs in groups.items():
+        for rel_dir in dirs:
+            slugs[rel_dir] = f"{slug}-{hash_text(rel_dir)[:8]}" if len(dirs) > 1 else slug
+    return slugs
+
+
+def package_fingerprint(index: RepoIndex, files: Iterable[str], history: Dict[str, Dict],
+                        config_hash: str) -> str:
+    """
+    Hash the state of a package's files.
+
+    Sizes and modification times stand in for content, so unchanged packages
+    are recognised without reading their files.
+
+    Args:
+        index: Index of the repository
+        files: Relative paths of the package's files
+        history: Last commit per file, relative to the package directory
+        config_hash: Hash of the generator configuration
+
+    Returns:
+        Hex digest that changes when any of the files or their history changes
+    """
+    state = []
+    for path in sorted(files):
+        try:
+            stat = os.stat(index.abspath(path))
+        except OSError:
+            continue
+        state.append((path, stat.st_size, stat.st_mtime_ns))
+    return hash_text(json.dumps([PACKAGE_FORMAT_VERSION, config_hash, state, history], sort_keys=True))
@@ -0,0 +1,220 @@
+"""
+Dry-run planning of a generation run.
+
+The repository is analysed and every page built in memory, exactly as a real
+run would, but through a ``DryRunWriter`` and a read-only cache so nothing is
+written. For each page the plan reports its size, whether it differs from
+what is on disk, and, when AI enhancement is requested, the requests the
+enhancer would send together with estimated tokens, cost and latency.
+"""
+import os
+import heapq
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from .ai_enhancer import configured_model, plan_requests
+from .cache import CACHE_DIR_NAME, GeneratorCache
+from .content_generator import ContentGenerator
+from .writer import DryRunWriter
+
+
+# Fallback when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+# Enhanced text is typically longer than its source
+OUTPUT_EXPANSION = 1.5
+
+# USD per million input and output tokens, streamed output tokens per second
+# and seconds to the first token; override with ``ai.pricing`` in the configuration
+MODEL_PROFILES = {
+    'gpt-4o': {'input_cost': 2.50, 'output_cost': 10.00, 'tokens_per_second': 90.0, 'time_to_first_token': 0.6},
+    'gpt-4o-mini': {'input_cost': 0.15, 'output_cost': 0.60, 'tokens_per_second': 110.0,
+                    'time_to_first_token': 0.4},
+    'gpt-4.1': {'input_cost': 2.00, 'output_cost': 8.00, 'tokens_per_second': 90.0, 'time_to_first_token': 0.6},
+    'gpt-4.1-mini': {'input_cost': 0.40, 'output_cost': 1.60, 'tokens_per_second': 110.0,
+                     'time_to_first_token': 0.4},
+}
+
+# Local models cost nothing but are slower
+OLLAMA_PROFILE = {'input_cost': 0.0, 'output_cost': 0.0, 'tokens_per_second': 25.0, 'time_to_first_token': 1.0}
+
+# Unknown hosted models: timings are guessed and cost is not estimated
+DEFAULT_PROFILE = {'input_cost': None, 'output_cost': None, 'tokens_per_second': 60.0, 'time_to_first_token': 1.0}
+
+
+def model_profile(model: str, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Pricing and speed assumptions for a model.
+
+    Args:
+        model: Model identifier in "provider/model" form
+        overrides: Optional values replacing the built-in ones
+
+    Returns:
+        Dictionary with 'input_cost', 'output_cost' (USD per million tokens,
+        None if unknown), 'tokens_per_second' and 'time_to_first_token'
+    """
+    provider, _, name = model.partition('/')
+    if provider == 'ollama':
+        profile = dict(OLLAMA_PROFILE)
+    else:
+        profile = dict(MODEL_PROFILES.get(name, DEFAULT_PROFILE))
+    profile.update({k: v for k, v in (overrides or {}).items() if v is not None})
+    return profile
+
+
+@lru_cache(maxsize=None)
+def _encoder(model_name: str):
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model(model_name)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Count the tokens of a text for a model.
+
+    tiktoken is used when it is installed and knows the model; otherwise the
+    count is estimated from the text length.
+    """
+    encoder = _encoder(model.partition('/')[2])
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _wall_time(latencies: List[float], concurrency: int) -> float:
+    """Finish time of sections run in order on ``concurrency`` workers."""
+    workers = [0.0] * max(concurrency, 1)
+    for latency in latencies:
+        heapq.heappush(workers, heapq.heappop(workers) + latency)
+    return max(workers)
+
+
+def plan_run(repo_path: str, output_dir: str, config: Optional[Dict], use_ai: Optional[str],
+             logger: logging.Logger) -> Dict[str, Any]:
+    """
+    Plan a generation run without writing anything.
+
+    Args:
+        repo_path: Path to the repository
+        output_dir: Directory documentation would be generated in
+        config: Optional configuration dictionary
+        use_ai: Optional AI model the run would use; defaults to the ``ai`` configuration
+        logger: Logger instance
+
+    Returns:
+        Dictionary with the 'model', one entry per page in 'pages', the other
+        'outputs' that would change and the 'totals'
+    """
+    config = config or {}
+    if use_ai is None:
+        use_ai = configured_model(config)
+    writer = DryRunWriter(output_dir, logger)
+    cache = GeneratorCache(config.get('cache_dir') or os.path.join(output_dir, CACHE_DIR_NAME), logger,
+                           read_only=True)
+    generator = ContentGenerator(repo_path, output_dir, None, logger, config, writer, cache=cache)
+    sections, pages = generator.build_pages()
+
+    ai_config = config.get('ai') or {}
+    profile = model_profile(use_ai, ai_config.get('pricing')) if use_ai else None
+    docs_dir = os.path.join(output_dir, 'docs')
+
+    entries = []
+    for page_id, content in pages.items():
+        path = os.path.join(docs_dir, *f"{page_id}.md".split('/'))
+        changed = writer.write(path, content)
+        entry = {
+            'page': page_id,
+            'bytes': len(content.encode('utf-8')),
+            'status': writer.planned[os.path.relpath(path, output_dir)]['status'],
+            'build_seconds': generator.timings.get(page_id),
+        }
+        # Only sections are enhanced, as in a real run
+        if profile is not None and page_id in sections:
+            requests = plan_requests(content, page_id, use_ai, cache)
+            input_tokens = sum(count_tokens(request, use_ai) for request, _ in requests)
+            output_tokens = sum(int(count_tokens(source, use_ai) * OUTPUT_EXPANSION) for _, source in requests)
+            cost = None
+            if profile['input_cost'] is not None and profile['output_cost'] is not None:
+                cost = (input_tokens * profile['input_cost'] + output_tokens * profile['output_cost']) / 1e6
+            # Requests within a section are sent one after another
+            latency = sum(profile['time_to_first_token']
+                          + int(count_tokens(source, use_ai) * OUTPUT_EXPANSION) / profile['tokens_per_second']
+                          for _, source in requests)
+            if requests and not changed:
+                entry['status'] = 'stale'
+            elif not requests:
+                # The previous enhancement is reused, so only a missing file needs writing
+                entry['status'] = 'new' if not os.path.exists(path) else 'current'
+            entry.update({
+                'requests': len(requests),
+                'input_tokens': input_tokens,
+                'output_tokens': output_tokens,
+                'cost': cost,
+                'latency_seconds': latency,
+            })
+        entries.append(entry)
+
+    doc_paths = {os.path.join('docs', *f"{entry['page']}.md".split('/')) for entry in entries}
+    outputs = [{'path': path, **state} for path, state in sorted(writer.planned.items())
+               if path not in doc_paths and state['status'] != 'current']
+
+    totals: Dict[str, Any] = {
+        'pages': len(entries),
+        'bytes': sum(entry['bytes'] for entry in entries),
+        'stale': sum(1 for entry in entries if entry['status'] != 'current'),
+        'build_seconds': sum(generator.timings.values()),
+    }
+    if profile is not None:
+        enhanced = [entry for entry in entries if 'requests' in entry]
+        costs = [entry['cost'] for entry in enhanced]
+        totals.update({
+            'requests': sum(entry['requests'] for entry in enhanced),
+            'input_tokens': sum(entry['input_tokens'] for entry in enhanced),
+            'output_tokens': sum(entry['output_tokens'] for entry in enhanced),
+            'cost': sum(costs) if None not in costs else None,
+            'latency_seconds': _wall_time([entry['latency_seconds'] for entry in enhanced],
+                                          ai_config.get('concurrency', 2)),
+        })
+
+    return {'model': use_ai, 'pages': entries, 'outputs': outputs, 'totals': totals}
+
+
+def format_plan(plan: Dict[str, Any]) -> str:
+    """Render a plan as a plain-text table."""
+    ai = plan['model'] is not None
+    header = f"{'Page':<32} {'Status':<8} {'Bytes':>9}"
+    if ai:
+        header += f" {'Req':>4} {'In tok':>8} {'Out tok':>8} {'Cost $':>9} {'Time s':>7}"
+    lines = [header, '-' * len(header)]
+
+    def money(value: Optional[float]) -> str:
+        return '?' if value is None else f"{value:.4f}"
+
+    for entry in plan['pages']:
+        line = f"{entry['page']:<32} {entry['status']:<8} {entry['bytes']:>9}"
+        if 'requests' in entry:
+            line += (f" {entry['requests']:>4} {entry['input_tokens']:>8} {entry['output_tokens']:>8}"
+                     f" {money(entry['cost']):>9} {entry['latency_seconds']:>7.1f}")
+        lines.append(line)
+
+    totals = plan['totals']
+    lines.append('-' * len(header))
+    label = f"Total ({totals['stale']} to write)"
+    line = f"{label:<41} {totals['bytes']:>9}"
+    if ai:
+        line += (f" {totals['requests']:>4} {totals['input_tokens']:>8} {totals['output_tokens']:>8}"
+                 f" {money(totals['cost']):>9} {totals['latency_seconds']:>7.1f}")
+    lines.append(line)
+
+    if ai:
+        lines.append(f"\nModel {plan['model']}; the time is the estimated wall time at the configured concurrency.")
+    if plan['outputs']:
+        lines.append("\nOther outputs that would change:")
+        lines.extend(f"  {output['status']:<8} {output['path']}" for output in plan['outputs'])
+    lines.append(f"\nPages built in {totals['build_seconds']:.2f}s; nothing was written.")
+    return '\n'.join(lines)
@@ -0,0 +1,166 @@
+"""
+Project metadata shared by the generators.
+
+Name, description and repository URL are resolved once per run from
+package.json, the README and the git remotes, and cached by the hashes of
+those inputs and the git HEAD so unchanged repositories skip resolution.
+"""
+import os
+import re
+import git
+import json
+import logging
+from typing import Dict, Optional
+
+from .cache import GeneratorCache, hash_file
+
+
+PROJECT_INFO_CACHE_NAMESPACE = 'project_info'
+
+# Files whose content feeds the metadata, relative to the repository root
+SOURCE_FILES = ('package.json', 'README.md', os.path.join('.git', 'config'))
+
+# Bumped when the resolution rules change so stale cache entries are ignored
+RESOLVER_VERSION = 1
+
+_GITHUB_REMOTE = re.compile(r'github\.com[:/]([^/]+)/([^/.]+)')
+
+
+def git_head(repo_path: str) -> Optional[str]:
+    """Read the commit HEAD points to without starting git."""
+    git_dir = os.path.join(repo_path, '.git')
+    try:
+        with open(os.path.join(git_dir, 'HEAD'), 'r') as f:
+            head = f.read().strip()
+        if not head.startswith('ref: '):
+            return head
+        ref = head[5:]
+        ref_path = os.path.join(git_dir, *ref.split('/'))
+        if os.path.exists(ref_path):
+            with open(ref_path, 'r') as f:
+                return f.read().strip()
+        packed_refs = os.path.join(git_dir, 'packed-refs')
+        if os.path.exists(packed_refs):
+            with open(packed_refs, 'r') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == ref:
+                        return parts[0]
+        # A branch without commits yet
+        return None
+    except OSError:
+        return None
+
+
+def _cache_key(repo_path: str) -> str:
+    parts = [f"v{RESOLVER_VERSION}", os.path.abspath(repo_path), git_head(repo_path) or '-']
+    for rel_path in SOURCE_FILES:
+        path = os.path.join(repo_path, rel_path)
+        parts.append(hash_file(path) if os.path.isfile(path) else '-')
+    return ':'.join(parts)
+
+
+def _repo_url_from_package(package_data: Dict) -> str:
+    """Extract the repository URL from package.json data."""
+    repository = package_data.get('repository')
+    if isinstance(repository, str):
+        return repository
+    if isinstance(repository, dict) and 'url' in repository:
+        return repository['url']
+    return ""
+
+
+def _readme_description(readme_path: str) -> Optional[str]:
+    """Return the first prose paragraph after the README's first heading."""
+    with open(readme_path, 'r', encoding='utf-8', errors='replace') as f:
+        content = f.read()
+    match = re.search(r'#.*?\n\n(.*?)(?:\n\n|$)', content, re.DOTALL)
+    if not match:
+        return None
+    rest = content[match.start(1):]
+    for paragraph in rest.split('\n\n'):
+        paragraph = paragraph.strip()
+        # Skip badges, images, HTML and further headings
+        if not paragraph or paragraph.startswith(('[![', '![', '<', '#', '```')):
+            continue
+        return ' '.join(paragraph.split())
+    return None
+
+
+def resolve_project_info(repo_path: str, cache: Optional[GeneratorCache],
+                         logger: logging.Logger) -> Dict[str, str]:
+    """
+    Resolve the project's name, description and repository details.
+
+    Args:
+        repo_path: Path to the repository
+        cache: Optional cache for the resolved metadata
+        logger: Logger instance
+
+    Returns:
+        Dictionary with 'project_name', 'repo_name', 'description', 'repo_url'
+        and 'org_name'
+    """
+    key = None
+    if cache is not None:
+        try:
+            key = _cache_key(repo_path)
+            cached = cache.get(PROJECT_INFO_CACHE_NAMESPACE, key)
+            if cached is not None:
+                return cached
+        except OSError as e:
+            logger.warning(f"Could not hash project metadata sources: {str(e)}")
+
+    project_name = os.path.basename(os.path.abspath(repo_path))
+    repo_name = project_name
+    description = None
+    repo_url = ""
+    org_name = ""
+
+    # Try to find more details in package.json if it exists
+    package_json = os.path.join(repo_path, 'package.json')
+    if os.path.exists(package_json):
+        try:
+            with open(package_json, 'r') as f:
+                package_data = json.load(f)
+            project_name = package_data.get('name') or project_name
+            description = package_data.get('description') or None
+            repo_url = _repo_url_from_package(package_data)
+        except Exception as e:
+            logger.warning(f"Error reading package.json: {str(e)}")
+
+    if not description:
+        readme_path = os.path.join(repo_path, 'README.md')
+        if os.path.exists(readme_path):
+            try:
+                description = _readme_description(readme_path)
+            except OSError as e:
+                logger.warning(f"Error reading README.md: {str(e)}")
+
+    # Extract organization and repo name from git if available
+    if os.path.exists(os.path.join(repo_path, '.git')):
+        try:
+            repo = git.Repo(repo_path)
+            for remote in repo.remotes:
+                match = None
+                for url in remote.urls:
+                    match = _GITHUB_REMOTE.search(url)
+                    if match:
+                        break
+                if match:
+                    org_name, repo_name = match.group(1), match.group(2)
+                    repo_url = f"https://github.com/{org_name}/{repo_name}"
+                    break
+        except Exception as e:
+            logger.warning(f"Error extracting git information: {str(e)}")
+
+    info = {
+        'project_name': project_name,
+        'repo_name': repo_name,
+        'description': description or f"{project_name} documentation",
+        'repo_url': repo_url,
+        'org_name': org_name,
+    }
+    if cache is not None and key is not None:
+        cache.set(PROJECT_INFO_CACHE_NAMESPACE, key, info)
+    return info
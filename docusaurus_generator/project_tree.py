@@ -0,0 +1,152 @@
+"""
+Project structure tree with per-directory aggregates for the Architecture section.
+"""
+from typing import Dict, List, Optional
+
+from .repo_index import RepoIndex
+
+
+class DirectoryNode:
+    """
+    A directory in the project tree.
+
+    ``file_count`` and ``total_size`` cover the directory's whole subtree.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.directories: Dict[str, 'DirectoryNode'] = {}
+        self.files: List[tuple] = []
+        self.file_count = 0
+        self.total_size = 0
+
+    def child(self, name: str) -> 'DirectoryNode':
+        """Return the named subdirectory, creating it if needed."""
+        node = self.directories.get(name)
+        if node is None:
+            node = self.directories[name] = DirectoryNode(name)
+        return node
+
+    def to_dict(self) -> Dict:
+        """Serialize the subtree for the JSON data file."""
+        return {
+            'name': self.name,
+            'files': self.file_count,
+            'size': self.total_size,
+            'children': [
+                self.directories[name].to_dict() for name in sorted(self.directories)
+            ] + [
+                {'name': name, 'size': size} for name, size in self.files
+            ],
+        }
+
+
+def build_tree(index: RepoIndex, root_name: str) -> DirectoryNode:
+    """
+    Build the project tree from a repository index.
+
+    Each file's size is added to every ancestor as it is inserted, so the
+    directory aggregates are complete after a single pass over the index.
+
+    Args:
+        index: Repository index
+        root_name: Name shown for the repository root
+
+    Returns:
+        Root directory node
+    """
+    root = DirectoryNode(root_name)
+
+    for rel_dir in index.directories:
+        node = root
+        for part in rel_dir.split('/') if rel_dir else []:
+            node = node.child(part)
+
+    for rel_path, size in index.files.items():
+        parts = rel_path.split('/')
+        node = root
+        node.file_count += 1
+        node.total_size += size
+        for part in parts[:-1]:
+            node = node.child(part)
+            node.file_count += 1
+            node.total_size += size
+        node.files.append((parts[-1], size))
+
+    return root
+
+
+def format_size(size: int) -> str:
+    """
+    Format a byte count for display.
+
+    Args:
+        size: Size in bytes
+
+    Returns:
+        Human-readable size such as "1.2 MB"
+    """
+    value = float(size)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if value < 1024 or unit == 'GB':
+            return f"{int(value)} {unit}" if unit == 'B' else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+def _summary(file_count: int, size: int, directory_count: Optional[int] = None) -> str:
+    parts = [f"{file_count} file{'s' if file_count != 1 else ''}"]
+    if directory_count:
+        parts.append(f"{directory_count} director{'ies' if directory_count != 1 else 'y'}")
+    parts.append(format_size(size))
+    return ', '.join(parts)
+
+
+def render_tree(root: DirectoryNode, max_depth: int = 4, max_entries: int = 30, indent: str = '    ') -> str:
+    """
+    Render the tree as indented text.
+
+    Directories deeper than ``max_depth`` are collapsed into a single line with
+    their aggregated file count and size. Each directory lists at most
+    ``max_entries`` entries (subdirectories first); the rest are summarized.
+
+    Args:
+        root: Root directory node
+        max_depth: Number of directory levels expanded below the root
+        max_entries: Maximum entries listed per directory
+        indent: Indentation per level
+
+    Returns:
+        Rendered tree
+    """
+    lines = [f"{root.name}/"]
+    _render_directory(root, 1, max_depth, max_entries, indent, lines)
+    return '\n'.join(lines)
+
+
+def _render_directory(node: DirectoryNode, level: int, max_depth: int, max_entries: int,
+                      indent: str, lines: List[str]) -> None:
+    prefix = indent * level
+    entries = [('dir', name) for name in sorted(node.directories)] + \
+              [('file', name, size) for name, size in sorted(node.files)]
+
+    for entry in entries[:max_entries]:
+        if entry[0] == 'dir':
+            child = node.directories[entry[1]]
+            if level >= max_depth and (child.directories or child.files):
+                lines.append(f"{prefix}{child.name}/ ({_summary(child.file_count, child.total_size)})")
+            else:
+                lines.append(f"{prefix}{child.name}/")
+                _render_directory(child, level + 1, max_depth, max_entries, indent, lines)
+        else:
+            lines.append(f"{prefix}{entry[1]}")
+
+    hidden = entries[max_entries:]
+    if hidden:
+        hidden_dirs = [node.directories[e[1]] for e in hidden if e[0] == 'dir']
+        hidden_files = [e for e in hidden if e[0] == 'file']
+        file_count = len(hidden_files) + sum(d.file_count for d in hidden_dirs)
+        size = sum(e[2] for e in hidden_files) + sum(d.total_size for d in hidden_dirs)
+        lines.append(
+            f"{prefix}... {len(hidden)} more entries ({_summary(file_count, size, len(hidden_dirs))})"
+        )
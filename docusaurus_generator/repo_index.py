@@ -0,0 +1,91 @@
+"""
+Single-pass index of the files in a repository.
+"""
+import os
+import logging
+from typing import Dict, Iterable, List, Optional
+
+
+# Directories that never contain documentation-worthy content
+DEFAULT_EXCLUDE_DIRS = {'.git', '__pycache__', 'node_modules', 'build', 'dist', 'venv', 'env'}
+
+
+class RepoIndex:
+    """
+    Index of a repository's files and directories, built with one directory walk.
+
+    Paths are relative to the repository root and always use forward slashes.
+    """
+
+    def __init__(self, repo_path: str, logger: logging.Logger,
+                 exclude_dirs: Optional[Iterable[str]] = None,
+                 exclude_paths: Optional[Iterable[str]] = None):
+        """
+        Initialize the index. The repository is scanned on first access.
+
+        Args:
+            repo_path: Path to the repository
+            logger: Logger instance
+            exclude_dirs: Directory names to skip anywhere in the tree
+            exclude_paths: Absolute paths to skip, e.g. an output directory inside the repository
+        """
+        self.repo_path = repo_path
+        self.logger = logger
+        self.exclude_dirs = set(DEFAULT_EXCLUDE_DIRS if exclude_dirs is None else exclude_dirs)
+        self.exclude_paths = {os.path.abspath(p) for p in (exclude_paths or [])}
+        self._files: Optional[Dict[str, int]] = None
+        self._directories: Optional[List[str]] = None
+
+    def _scan(self) -> None:
+        """Walk the repository once, recording file sizes and directories."""
+        files = {}
+        directories = ['']
+        stack = ['']
+
+        while stack:
+            rel_dir = stack.pop()
+            abs_dir = os.path.join(self.repo_path, rel_dir) if rel_dir else self.repo_path
+            try:
+                entries = list(os.scandir(abs_dir))
+            except OSError as e:
+                self.logger.warning(f"Could not list directory {abs_dir}: {str(e)}")
+                continue
+
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in self.exclude_dirs or os.path.abspath(entry.path) in self.exclude_paths:
+                            continue
+                        directories.append(rel_path)
+                        stack.append(rel_path)
+                    elif entry.is_file():
+                        files[rel_path] = entry.stat().st_size
+                except OSError as e:
+                    self.logger.warning(f"Could not stat {entry.path}: {str(e)}")
+
+        self._files = dict(sorted(files.items()))
+        self._directories = sorted(directories)
+
+    @property
+    def files(self) -> Dict[str, int]:
+        """Mapping of relative file path to size in bytes, sorted by path."""
+        if self._files is None:
+            self._scan()
+        return self._files
+
+    @property
+    def directories(self) -> List[str]:
+        """Relative directory paths, sorted, including '' for the root."""
+        if self._directories is None:
+            self._scan()
+        return self._directories
+
+    def refresh(self) -> None:
+        """Discard the scan so the next access walks the repository again."""
+        self._files = None
+        self._directories = None
+
+    def abspath(self, rel_path: str) -> str:
+        """Return the absolute path of an indexed file."""
+        return os.path.join(self.repo_path, *rel_path.split('/'))
@@ -0,0 +1,386 @@
+"""
+Retry, backoff, adaptive concurrency and circuit breaking for LLM provider calls.
+"""
+import copy
+import time
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised when a provider's circuit breaker is open and calls fail fast."""
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Extract an HTTP status code from a provider exception, if it carries one."""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Classify a provider exception.
+
+    Args:
+        error: Exception raised by a provider call
+
+    Returns:
+        'throttled' for rate limiting, 'transient' for errors worth retrying
+        and 'fatal' for errors that will not go away on retry
+    """
+    status = _status_code(error)
+    if status == 429:
+        return 'throttled'
+    if status is not None:
+        if status >= 500 or status in (408, 409):
+            return 'transient'
+        if 400 <= status < 500:
+            return 'fatal'
+
+    name = type(error).__name__
+    if 'RateLimit' in name:
+        return 'throttled'
+    if isinstance(error, (ImportError, ValueError, TypeError, KeyError, AttributeError)):
+        return 'fatal'
+    return 'transient'
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the server-requested delay from a provider exception's response headers.
+
+    Args:
+        error: Exception raised by a provider call
+
+    Returns:
+        Delay in seconds, or None if the response did not specify one
+    """
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    try:
+        retry_after_ms = headers.get('retry-after-ms')
+        if retry_after_ms is not None:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+
+        retry_after = headers.get('retry-after')
+        if retry_after is None:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except Exception:
+        return None
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 1.0, max_delay: float = 30.0):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts: Total number of attempts, including the first one
+            base_delay: Backoff delay in seconds for the first retry
+            max_delay: Upper bound for a single backoff delay in seconds
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the delay before the next attempt.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+            retry_after: Delay requested by the server, honoured as a minimum
+
+        Returns:
+            Delay in seconds
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            return max(backoff, retry_after)
+        return backoff
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and calls
+    fail fast. Once ``reset_timeout`` seconds have passed a single trial call is
+    let through; its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: 'closed', 'open' or 'half-open'."""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed."""
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit when the threshold is reached."""
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """End a trial call whose failure says nothing about the provider's health, e.g. a rejected request."""
+        with self._lock:
+            self.trial_in_flight = False
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Additive-increase/multiplicative-decrease limit on concurrent provider calls.
+
+    The limit grows by one after a run of successful calls and is halved
+    whenever the provider throttles.
+    """
+
+    def __init__(self, initial: int = 2, minimum: int = 1, maximum: int = 8, increase_after: int = 3):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.increase_after = max(1, increase_after)
+        self.active = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a concurrency slot is free."""
+        with self._condition:
+            while self.active >= self.limit:
+                self._condition.wait()
+            self.active += 1
+
+    def release(self) -> None:
+        """Return a concurrency slot."""
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        """Record a successful call, raising the limit after enough of them."""
+        with self._condition:
+            self._successes += 1
+            if self._successes >= self.increase_after and self.limit < self.maximum:
+                self.limit += 1
+                self._successes = 0
+                self._condition.notify_all()
+
+    def on_throttle(self) -> None:
+        """Halve the limit after the provider throttled a call."""
+        with self._condition:
+            self.limit = max(self.minimum, self.limit // 2)
+            self._successes = 0
+
+    def __enter__(self) -> 'AdaptiveConcurrencyLimiter':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
+
+
+class LLMResilience:
+    """
+    Resilience layer wrapping calls to LLM providers.
+
+    Combines a retry policy, an adaptive concurrency limiter shared by all
+    calls, and one circuit breaker per provider. Only transient failures,
+    and calls that are still throttled once retries are exhausted, count
+    toward a circuit breaker: throttling is handled by backoff and the
+    limiter, and fatal errors such as an oversized request concern one call.
+    Outcomes are counted for the lifetime of the instance, which is one
+    generation run; ``for_run`` shares a long-lived layer between runs.
+    """
+
+    OUTCOMES = ('success', 'retried', 'throttled', 'failed', 'short_circuited')
+
+    def __init__(self, logger: logging.Logger, retry_policy: Optional[RetryPolicy] = None,
+                 limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 failure_threshold: int = 5, reset_timeout: float = 60.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the resilience layer.
+
+        Args:
+            logger: Logger instance
+            retry_policy: Retry policy, defaults to RetryPolicy()
+            limiter: Concurrency limiter, defaults to AdaptiveConcurrencyLimiter()
+            failure_threshold: Consecutive failures before a provider's circuit opens
+            reset_timeout: Seconds before an open circuit lets a trial call through
+            sleep: Sleep function, replaceable for tests
+        """
+        self.logger = logger
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.limiter = limiter or AdaptiveConcurrencyLimiter()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.outcomes = {outcome: 0 for outcome in self.OUTCOMES}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._sleep = sleep
+
+    @classmethod
+    def from_config(cls, ai_config: Optional[Dict], logger: logging.Logger) -> 'LLMResilience':
+        """
+        Build a resilience layer from the ``ai`` block of the configuration.
+
+        Args:
+            ai_config: The ``ai`` configuration dictionary
+            logger: Logger instance
+
+        Returns:
+            Configured LLMResilience instance
+        """
+        ai_config = ai_config or {}
+        return cls(
+            logger,
+            retry_policy=RetryPolicy(
+                max_attempts=ai_config.get('max_attempts', 4),
+                base_delay=ai_config.get('backoff_base', 1.0),
+                max_delay=ai_config.get('backoff_max', 30.0)
+            ),
+            limiter=AdaptiveConcurrencyLimiter(
+                initial=ai_config.get('concurrency', 2),
+                maximum=ai_config.get('max_concurrency', 8)
+            ),
+            failure_threshold=ai_config.get('circuit_breaker_threshold', 5),
+            reset_timeout=ai_config.get('circuit_breaker_reset', 60.0)
+        )
+
+    def for_run(self) -> 'LLMResilience':
+        """A layer sharing this one's breakers and concurrency limit but counting the outcomes of one run."""
+        run = copy.copy(self)
+        run.outcomes = {outcome: 0 for outcome in self.OUTCOMES}
+        return run
+
+    @property
+    def max_concurrency(self) -> int:
+        """Upper bound on concurrent calls."""
+        return self.limiter.maximum
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        """Return the circuit breaker for a provider, creating it on first use."""
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[provider]
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self.outcomes[outcome] += 1
+
+    def call(self, provider: str, func: Callable[[], Any]) -> Any:
+        """
+        Call a provider function with retries, backoff and circuit breaking.
+
+        Args:
+            provider: Provider name used to select the circuit breaker
+            func: Function performing one complete attempt
+
+        Returns:
+            The function's result
+
+        Raises:
+            CircuitOpenError: If the provider's circuit is open
+            Exception: The last error once retries are exhausted or the error is fatal
+        """
+        breaker = self.breaker(provider)
+
+        for attempt in range(self.retry_policy.max_attempts):
+            if not breaker.allow():
+                self._count('short_circuited')
+                raise CircuitOpenError(f"Circuit open for provider {provider}, failing fast")
+
+            try:
+                with self.limiter:
+                    result = func()
+            except Exception as e:
+                kind = classify_error(e)
+                exhausted = attempt == self.retry_policy.max_attempts - 1
+                if kind == 'transient' or (kind == 'throttled' and exhausted):
+                    breaker.record_failure()
+                else:
+                    breaker.release_trial()
+                if kind == 'throttled':
+                    self._count('throttled')
+                    self.limiter.on_throttle()
+
+                if kind == 'fatal' or exhausted:
+                    self._count('failed')
+                    raise
+
+                delay = self.retry_policy.delay(attempt, retry_after_seconds(e))
+                self._count('retried')
+                self.logger.warning(
+                    f"{provider} call failed ({kind}: {str(e)}), "
+                    f"retrying in {delay:.1f}s (attempt {attempt + 2}/{self.retry_policy.max_attempts})"
+                )
+                self._sleep(delay)
+                continue
+
+            breaker.record_success()
+            self.limiter.on_success()
+            self._count('success')
+            return result
+
+    def summary(self) -> str:
+        """Return a one-line summary of the outcomes counted so far."""
+        return ', '.join(f"{outcome}={count}" for outcome, count in self.outcomes.items())
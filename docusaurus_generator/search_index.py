@@ -0,0 +1,205 @@
+"""
+Local full-text search index built from the generated pages.
+
+Each page gets its own shard of an inverted index in ``static/search/``,
+listed in a small manifest that the search component loads first. Shards are
+named after the hash of their page, so pages that did not change keep their
+shard and browsers keep their cached copy.
+"""
+import os
+import re
+import json
+import time
+import logging
+from typing import Any, Dict, List, Tuple
+
+from .block_diff import split_frontmatter
+from .cache import hash_text
+
+
+SEARCH_DIR = os.path.join('static', 'search')
+MANIFEST_NAME = 'manifest.json'
+
+# Bumped when the shard format or tokenizer changes so all shards are rebuilt
+INDEX_VERSION = 1
+
+# Characters of page text kept per entry to show under search results
+SNIPPET_LENGTH = 160
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'if', 'in', 'into', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'will', 'with', 'you', 'your',
+}
+
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9_]*')
+_HEADING = re.compile(r'^(#{1,3})\s+(.*?)\s*#*\s*$')
+_LINK = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+_MARKUP = re.compile(r'<[^>]+>|[*_`>|~]')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms.
+
+    Args:
+        text: Plain or Markdown text
+
+    Returns:
+        Lower-cased terms without stopwords or single characters
+    """
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def heading_anchor(heading: str) -> str:
+    """Anchor Docusaurus generates for a heading."""
+    slug = re.sub(r'[^\w\- ]', '', heading.strip().lower())
+    return re.sub(r'\s', '-', slug)
+
+
+def _plain(text: str) -> str:
+    return ' '.join(_MARKUP.sub(' ', _LINK.sub(r'\1', text)).split())
+
+
+def build_shard(page_id: str, markdown: str, route: str) -> Dict[str, Any]:
+    """
+    Build the inverted index for one page.
+
+    The page is split at its headings (up to ``###``) so results can link to
+    the section of the page that matched.
+
+    Args:
+        page_id: Doc id of the page
+        markdown: Page content, including frontmatter
+        route: URL path of the page relative to the base URL
+
+    Returns:
+        Shard with the page's entries and a term index mapping each term to a
+        flat list of (entry number, term frequency) pairs
+    """
+    frontmatter, body = split_frontmatter(markdown)
+    title_match = re.search(r'^title:\s*(.+)$', frontmatter, re.MULTILINE)
+    page_title = title_match.group(1).strip().strip('"\'') if title_match else page_id.title()
+
+    entries: List[Tuple[str, str, List[str]]] = [(page_title, '', [])]
+    in_fence = False
+    for line in body.splitlines():
+        if line.lstrip().startswith(('```', '~~~')):
+            in_fence = not in_fence
+            continue
+        match = None if in_fence else _HEADING.match(line)
+        if match:
+            heading = _plain(match.group(2))
+            if len(match.group(1)) == 1 and not entries[0][2] and entries[0][1] == '':
+                entries[0] = (heading or page_title, '', [])
+            else:
+                entries.append((heading, heading_anchor(heading), []))
+            continue
+        entries[-1][2].append(line)
+
+    docs = []
+    terms: Dict[str, Dict[int, int]] = {}
+    for title, anchor, lines in entries:
+        text = _plain(' '.join(lines))
+        number = len(docs)
+        docs.append({
+            'title': title,
+            'url': f"{route}#{anchor}" if anchor else route,
+            'snippet': text[:SNIPPET_LENGTH],
+        })
+        # Title terms count for more than body terms
+        for term in tokenize(title) * 3 + tokenize(text):
+            counts = terms.setdefault(term, {})
+            counts[number] = counts.get(number, 0) + 1
+
+    return {
+        'page': page_id,
+        'title': page_title,
+        'docs': docs,
+        'terms': {
+            term: [value for number, count in sorted(counts.items()) for value in (number, count)]
+            for term, counts in sorted(terms.items())
+        },
+    }
+
+
+def update_search_index(output_dir: str, pages: Dict[str, str], writer,
+                        logger: logging.Logger) -> Dict[str, Any]:
+    """
+    Bring the search index in line with the generated pages.
+
+    Pages whose content hash matches the previous manifest keep their shard;
+    only new or changed pages are indexed. Shards of pages that no longer
+    exist are removed.
+
+    Args:
+        output_dir: Directory where documentation is generated
+        pages: Mapping of doc id to page content
+        writer: OutputWriter used for the shards and manifest
+        logger: Logger instance
+
+    Returns:
+        Statistics: 'shards', 'rebuilt', 'bytes' and 'seconds'
+    """
+    start = time.monotonic()
+    search_dir = os.path.join(output_dir, SEARCH_DIR)
+    manifest_path = os.path.join(search_dir, MANIFEST_NAME)
+
+    previous: Dict[str, Any] = {}
+    try:
+        manifest = writer.read(manifest_path)
+        previous = json.loads(manifest.decode('utf-8')) if manifest is not None else {}
+        if previous.get('version') != INDEX_VERSION:
+            previous = {}
+    except ValueError:
+        previous = {}
+    previous_shards = previous.get('shards', {})
+
+    shards = {}
+    rebuilt = 0
+    for page_id, content in sorted(pages.items()):
+        content_hash = hash_text(content)
+        old = previous_shards.get(page_id)
+        if old and old.get('hash') == content_hash and writer.exists(os.path.join(search_dir, old['file'])):
+            shards[page_id] = old
+            writer.record(os.path.join(search_dir, old['file']), False)
+            continue
+
+        route = '/' if page_id == 'index' else f"/{page_id}"
+        shard = build_shard(page_id, content, route)
+        # Package pages have nested ids; shards stay in one flat directory
+        file_name = f"{page_id.replace('/', '--')}.{content_hash[:12]}.json"
+        data = json.dumps(shard, separators=(',', ':'), ensure_ascii=False)
+        writer.write(os.path.join(search_dir, file_name), data)
+        shards[page_id] = {
+            'file': file_name,
+            'hash': content_hash,
+            'title': shard['title'],
+            'docs': len(shard['docs']),
+            'terms': len(shard['terms']),
+            'size': len(data.encode('utf-8')),
+        }
+        rebuilt += 1
+
+    writer.write_json(manifest_path, {'version': INDEX_VERSION, 'shards': shards},
+                      indent=1, sort_keys=True)
+
+    # Remove shards that are no longer referenced
+    current = {entry['file'] for entry in shards.values()} | {MANIFEST_NAME}
+    for name in writer.listdir(search_dir):
+        if name.endswith('.json') and name not in current:
+            try:
+                writer.remove(os.path.join(search_dir, name))
+            except OSError as e:
+                logger.warning(f"Could not remove stale search shard {name}: {str(e)}")
+
+    stats = {
+        'shards': len(shards),
+        'rebuilt': rebuilt,
+        'bytes': sum(entry['size'] for entry in shards.values()),
+        'seconds': time.monotonic() - start,
+    }
+    logger.info(
+        f"Search index: {stats['shards']} shards ({stats['rebuilt']} rebuilt), "
+        f"{stats['bytes']} bytes, built in {stats['seconds']:.2f}s"
+    )
+    return stats
@@ -0,0 +1,520 @@
+"""
+Documentation sections as plugins.
+
+Every page under ``docs/`` is built by a ``SectionPlugin``. A plugin declares
+the repository files it reads as glob patterns, the output files it writes
+besides its page, the sections whose content it needs and where it goes in
+the sidebar. The built-in sections are registered here; other packages add
+sections through the ``docusaurus_generator.sections`` entry point group,
+e.g. in setup.py::
+
+    entry_points={'docusaurus_generator.sections': ['faq = my_package.faq:FaqSection']}
+
+``run_plugins`` generates independent sections concurrently and each section
+after the ones it depends on. A section is only generated again when a
+file matching its inputs, the configuration or one of its dependencies
+changed; otherwise its previous page is reused.
+
+The ``sections`` configuration turns sections off, so they are never
+loaded, and gives each a ``SectionBudget`` of time, files and output bytes.
+"""
+import os
+import re
+import json
+import time
+import logging
+from functools import lru_cache
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from .block_diff import split_frontmatter
+from .cache import hash_text
+from .lockfiles import COMPANION_MANIFESTS, LOCKFILES
+from .manifests import MANIFESTS
+from .packages import PACKAGE_MANIFESTS
+from .symbols import SOURCE_EXTENSIONS
+from .testing_inventory import is_test_file
+
+
+ENTRY_POINT_GROUP = 'docusaurus_generator.sections'
+
+SECTIONS_CACHE_NAMESPACE = 'sections'
+
+# Sidebar position of sections that do not choose one; equal positions are sorted by name
+DEFAULT_POSITION = 100
+
+# Settings of a section in the ``sections`` configuration; the limits are unset by default
+SECTION_DEFAULTS = {
+    'enabled': True,
+    'max_seconds': None,  # Wall time before the section stops reading files
+    'max_files': None,  # Files the section reads, e.g. guides or source files
+    'max_bytes': None,  # Size of the page, beyond which it is cut
+}
+
+BUDGET_LIMITS = ('max_seconds', 'max_files', 'max_bytes')
+
+T = TypeVar('T')
+
+
+def section_settings(config: Optional[Dict], name: str) -> Dict[str, Any]:
+    """
+    Settings of one section.
+
+    A section is configured either with a boolean, ``api: false``, or with a
+    mapping of ``SECTION_DEFAULTS`` keys, ``api: {max_files: 500}``.
+
+    Args:
+        config: Optional configuration dictionary
+        name: Section name
+
+    Returns:
+        The section's settings, with defaults for missing keys
+    """
+    value = ((config or {}).get('sections') or {}).get(name, True)
+    if isinstance(value, dict):
+        return {**SECTION_DEFAULTS, **value}
+    return {**SECTION_DEFAULTS, 'enabled': bool(value)}
+
+
+class SectionBudget:
+    """
+    Time, file-count and output-size limits of one section.
+
+    Sections pass the files they process through ``take``, which stops once
+    the time or file budget is used up, so a slow or huge section yields a
+    partial page instead of holding up the run. ``finish`` cuts the page to
+    the output budget and appends a notice naming every exceeded limit.
+    """
+
+    def __init__(self, max_seconds: Optional[float] = None, max_files: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Initialize the budget; the time budget starts now.
+
+        Args:
+            max_seconds: Optional wall time in seconds
+            max_files: Optional number of files
+            max_bytes: Optional page size in bytes
+        """
+        self.max_seconds = max_seconds
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.started = time.monotonic()
+        self.files = 0
+        # Descriptions of the exceeded limits, e.g. 'max_files: 500'
+        self.exceeded: List[str] = []
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'SectionBudget':
+        """Create the budget of a section from its ``section_settings``."""
+        return cls(settings.get('max_seconds'), settings.get('max_files'), settings.get('max_bytes'))
+
+    @property
+    def timed_out(self) -> bool:
+        """Whether the section stopped early for lack of time, so its page depends on timing."""
+        return any(limit.startswith('max_seconds') for limit in self.exceeded)
+
+    def _exceed(self, limit: str) -> None:
+        if limit not in self.exceeded:
+            self.exceeded.append(limit)
+
+    def include(self, other: 'SectionBudget') -> None:
+        """Note the limits another budget exceeded on this one, e.g. of work shared with other sections."""
+        for limit in other.exceeded:
+            self._exceed(limit)
+
+    def take(self, items: Iterable[T]) -> Iterator[T]:
+        """
+        Yield files, or entries standing for them, while the section is within budget.
+
+        Args:
+            items: Files the section would process, most important first
+
+        Yields:
+            The items, until the file or time budget is exhausted
+        """
+        for item in items:
+            if self.max_files is not None and self.files >= self.max_files:
+                self._exceed(f"max_files: {self.max_files}")
+                return
+            if self.max_seconds is not None and time.monotonic() - self.started > self.max_seconds:
+                self._exceed(f"max_seconds: {self.max_seconds:g}")
+                return
+            self.files += 1
+            yield item
+
+    def finish(self, content: str) -> str:
+        """
+        Cut a page to the output budget and note every exceeded limit on it.
+
+        The page is cut at a line boundary after its frontmatter, and an open
+        code block is closed.
+
+        Args:
+            content: Page content, including frontmatter
+
+        Returns:
+            The page, unchanged if the section stayed within budget
+        """
+        if self.max_bytes is not None and len(content.encode('utf-8')) > self.max_bytes:
+            self._exceed(f"max_bytes: {self.max_bytes}")
+            frontmatter, body = split_frontmatter(content)
+            allowed = max(self.max_bytes - len(frontmatter.encode('utf-8')), 0)
+            body = body.encode('utf-8')[:allowed].decode('utf-8', 'ignore')
+            body = body[:body.rfind('\n') + 1]
+            if sum(1 for line in body.splitlines() if line.lstrip().startswith(('```', '~~~'))) % 2:
+                body += '```\n'
+            content = frontmatter + body
+        if not self.exceeded:
+            return content
+        return (content.rstrip('\n') + "\n\n:::caution Truncated\n\n"
+                f"This page is incomplete: the section exceeded its budget ({', '.join(self.exceeded)}).\n\n"
+                ":::\n")
+
+
+def glob_pattern(pattern: str) -> 're.Pattern':
+    """
+    Compile a glob over repository paths.
+
+    ``*`` and ``?`` stay within one directory, ``**/`` matches any number of
+    leading directories and a trailing ``/**`` everything below a directory.
+
+    Args:
+        pattern: Glob relative to the repository root, with forward slashes
+
+    Returns:
+        Regular expression matching the whole path
+    """
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile(''.join(parts) + r'\Z')
+
+
+class SectionPlugin:
+    """
+    A documentation section, generated into ``docs/<name>.md``.
+
+    Subclasses set the class attributes and implement ``generate``. Sections
+    reading many files pass them through ``generator.budgets[self.name].take``
+    so the section's time and file budgets are honoured; sections that do not
+    leave those limits out of ``limits``.
+    """
+
+    # Page name and doc id
+    name = ''
+    # Sidebar label, defaults to the capitalized name
+    label: Optional[str] = None
+    # Sidebar position; lower comes first
+    position = DEFAULT_POSITION
+    # Globs of the repository files the section reads; None for the whole tree
+    inputs: Optional[Sequence[str]] = None
+    # Files the section writes besides its page, relative to the output directory
+    outputs: Sequence[str] = ()
+    # Sections whose content is passed to ``generate``
+    depends: Sequence[str] = ()
+    # Whether the section reads the commit log, so any new commit changes it
+    git_log = False
+    # Budget limits the section honours; configuring any other is an error
+    limits: Sequence[str] = BUDGET_LIMITS
+    # Bumped when the section's output changes, so reused pages are generated again
+    version = 1
+
+    def title(self) -> str:
+        """Sidebar label of the section."""
+        return self.label or self.name.title()
+
+    def reads(self, path: str) -> bool:
+        """Whether the section reads a repository file, given relative with forward slashes."""
+        if self.inputs is None:
+            return True
+        patterns = self.__dict__.get('_patterns')
+        if patterns is None:
+            patterns = self._patterns = [glob_pattern(pattern) for pattern in self.inputs]
+        return any(pattern.match(path) for pattern in patterns)
+
+    def generate(self, generator, dependencies: Dict[str, Optional[str]]) -> Optional[str]:
+        """
+        Generate the page.
+
+        Args:
+            generator: The ContentGenerator, giving access to the repository
+                index, cache, writer and configuration
+            dependencies: Content of the sections named in ``depends``, None
+                for sections with nothing to show
+
+        Returns:
+            The page content, or None if the repository has nothing for the section
+        """
+        raise NotImplementedError
+
+
+class BuiltinSection(SectionPlugin):
+    """
+    A section built by the ContentGenerator's ``_generate_<name>`` method.
+
+    Only the sections scanning an open-ended set of files take time and
+    file budgets; every page can be cut to its output budget.
+    """
+
+    def __init__(self, name: str, inputs: Optional[Sequence[str]], position: int = DEFAULT_POSITION,
+                 outputs: Sequence[str] = (), git_log: bool = False, limits: Sequence[str] = ('max_bytes',)):
+        self.name = name
+        self.inputs = inputs
+        self.position = position
+        self.outputs = outputs
+        self.git_log = git_log
+        self.limits = limits
+
+    def generate(self, generator, dependencies: Dict[str, Optional[str]]) -> Optional[str]:
+        return getattr(generator, f"_generate_{self.name}")()
+
+
+class TestingSection(BuiltinSection):
+    """The test inventory, which reads every test file besides the testing guide."""
+
+    def reads(self, path: str) -> bool:
+        return super().reads(path) or is_test_file(path)
+
+
+# Symbol references in the README and guides link into the API page, and
+# sub-package manifests decide which sources are left to the package pages
+_SOURCES = tuple(f"**/*{extension}" for extension in SOURCE_EXTENSIONS) \
+    + tuple(f"**/{manifest}" for manifest in PACKAGE_MANIFESTS)
+_INSTALLATION_FILES = tuple(sorted({f for files in MANIFESTS.values() for f in files}
+                                   | {'yarn.lock', 'pnpm-lock.yaml', 'package-lock.json'}))
+_DEPLOYMENT_FILES = ('Dockerfile', 'docker-compose.yml', '.gitlab-ci.yml', 'Jenkinsfile', 'deploy.sh', 'deploy.py',
+                     '.kubernetes/**', 'k8s/**', '.github/workflows/**')
+_SECURITY_FILES = tuple(sorted({'SECURITY.md', '.github/SECURITY.md', 'docs/security.md', '.env.example', '.snyk',
+                                'config/auth.*', '.github/workflows/**'}
+                               | set(LOCKFILES) | set(COMPANION_MANIFESTS.values())))
+
+
+def builtin_plugins() -> List[SectionPlugin]:
+    """The built-in sections, in generation order."""
+    return [
+        BuiltinSection('overview', ('**/README.md',) + _SOURCES, position=0),
+        BuiltinSection('installation', ('**/README.md',) + _INSTALLATION_FILES, position=10),
+        BuiltinSection('api', _SOURCES, position=30, limits=BUDGET_LIMITS),
+        BuiltinSection('guides', ('docs/**', 'doc/**', 'guides/**', 'tutorials/**') + _SOURCES,
+                       limits=BUDGET_LIMITS),
+        BuiltinSection('contributing', ('**/CONTRIBUTING.md',)),
+        BuiltinSection('changelog', ('**/CHANGELOG.md',), git_log=True),
+        BuiltinSection('deployment', _DEPLOYMENT_FILES),
+        BuiltinSection('architecture', None, position=20,
+                       outputs=('static/data/project-tree.json', 'src/components/ProjectTree/index.js')),
+        TestingSection('testing', ('TESTING.md', 'docs/testing.md'), limits=BUDGET_LIMITS),
+        BuiltinSection('security', _SECURITY_FILES),
+    ]
+
+
+@lru_cache(maxsize=None)
+def _entry_point_plugins(group: str) -> Tuple[Tuple[str, object], ...]:
+    """Load the objects registered in an entry point group, or the errors loading them."""
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        # Python < 3.8
+        return ()
+    try:
+        selected = entry_points(group=group)
+    except TypeError:
+        # Python < 3.10
+        selected = entry_points().get(group, [])
+    loaded = []
+    for entry_point in selected:
+        try:
+            loaded.append((entry_point.name, entry_point.load()))
+        except Exception as e:
+            loaded.append((entry_point.name, e))
+    return tuple(loaded)
+
+
+def load_plugins(config: Optional[Dict], logger: logging.Logger) -> Dict[str, SectionPlugin]:
+    """
+    The enabled built-in sections followed by the ones installed through entry points.
+
+    An installed section replaces a built-in one of the same name. Entry
+    points that cannot be loaded or are not sections are logged and ignored.
+    Sections disabled in the ``sections`` configuration are left out, so
+    nothing they would read is ever scanned.
+
+    Args:
+        config: Optional configuration dictionary; ``plugins.discover: false``
+            disables the entry points
+        logger: Logger instance
+
+    Returns:
+        Section name to plugin, in generation order
+
+    Raises:
+        ValueError: If an enabled section is given a setting it does not know
+            or a budget limit it does not honour
+    """
+    plugins = {plugin.name: plugin for plugin in builtin_plugins()}
+    if (config or {}).get('plugins', {}).get('discover', True):
+        plugins.update(_installed_plugins(plugins, logger))
+    enabled = {}
+    for name, plugin in plugins.items():
+        settings = section_settings(config, name)
+        if not settings['enabled']:
+            continue
+        unknown = sorted(key for key in settings if key not in SECTION_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown settings for section {name}: {', '.join(unknown)}")
+        unsupported = [limit for limit in BUDGET_LIMITS if settings[limit] is not None and limit not in plugin.limits]
+        if unsupported:
+            raise ValueError(f"Section {name} does not support {', '.join(unsupported)}; "
+                             f"its limits are {', '.join(plugin.limits) or 'none'}")
+        enabled[name] = plugin
+    return enabled
+
+
+def _installed_plugins(builtin: Dict[str, SectionPlugin], logger: logging.Logger) -> Dict[str, SectionPlugin]:
+    """The sections installed through entry points, by name."""
+    plugins: Dict[str, SectionPlugin] = {}
+    for entry_name, loaded in _entry_point_plugins(ENTRY_POINT_GROUP):
+        if isinstance(loaded, type) and issubclass(loaded, SectionPlugin):
+            loaded = loaded()
+        if isinstance(loaded, Exception):
+            logger.warning(f"Could not load section plugin {entry_name}: {str(loaded)}")
+        elif not isinstance(loaded, SectionPlugin) or not loaded.name:
+            logger.warning(f"Ignoring section plugin {entry_name}: not a named SectionPlugin")
+        else:
+            if loaded.name in builtin:
+                logger.info(f"Section plugin {entry_name} replaces the {loaded.name} section")
+            plugins[loaded.name] = loaded
+    return plugins
+
+
+def plugin_order(plugins: Dict[str, SectionPlugin], logger: logging.Logger) -> List[SectionPlugin]:
+    """
+    Order sections so each comes after the sections it depends on.
+
+    Sections depending on a section that does not exist are left out with a
+    warning; otherwise the given order is kept where dependencies allow.
+
+    Args:
+        plugins: Section name to plugin
+        logger: Logger instance
+
+    Returns:
+        The runnable plugins in dependency order
+
+    Raises:
+        ValueError: If sections depend on each other in a cycle
+    """
+    available = dict(plugins)
+    missing = True
+    while missing:
+        missing = [name for name, plugin in available.items()
+                   if any(dependency not in available for dependency in plugin.depends)]
+        for name in missing:
+            absent = [dependency for dependency in available[name].depends if dependency not in available]
+            logger.warning(f"Skipping section {name}: it depends on missing sections {', '.join(absent)}")
+            del available[name]
+
+    ordered: List[SectionPlugin] = []
+    done = set()
+    while len(ordered) < len(available):
+        ready = [plugin for name, plugin in available.items()
+                 if name not in done and all(dependency in done for dependency in plugin.depends)]
+        if not ready:
+            cycle = sorted(name for name in available if name not in done)
+            raise ValueError(f"Sections depend on each other in a cycle: {', '.join(cycle)}")
+        for plugin in ready:
+            ordered.append(plugin)
+            done.add(plugin.name)
+    return ordered
+
+
+def run_plugins(plugins: Dict[str, SectionPlugin],
+                run: Callable[[SectionPlugin, Dict[str, Optional[str]]], Optional[str]],
+                logger: logging.Logger, workers: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """
+    Run every section once its dependencies are done, independent ones concurrently.
+
+    Args:
+        plugins: Section name to plugin
+        run: Called with a plugin and the content of its dependencies,
+            returning the section's content
+        logger: Logger instance
+        workers: Maximum sections run at once (defaults to the thread pool
+            default); 1 runs them one after another
+
+    Returns:
+        Section name to content, in the order of ``plugins``
+    """
+    ordered = plugin_order(plugins, logger)
+    results: Dict[str, Optional[str]] = {}
+
+    def dependencies(plugin: SectionPlugin) -> Dict[str, Optional[str]]:
+        return {name: results[name] for name in plugin.depends}
+
+    if workers == 1 or len(ordered) < 2:
+        for plugin in ordered:
+            results[plugin.name] = run(plugin, dependencies(plugin))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            waiting = list(ordered)
+            running = {}
+            while waiting or running:
+                for plugin in [plugin for plugin in waiting if all(name in results for name in plugin.depends)]:
+                    waiting.remove(plugin)
+                    running[executor.submit(run, plugin, dependencies(plugin))] = plugin.name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    results[running.pop(future)] = future.result()
+
+    return {name: results[name] for name in plugins if name in results}
+
+
+def input_fingerprint(plugin: SectionPlugin, files: Dict[str, Tuple], history: Dict[str, Dict],
+                      config_hash: str, dependencies: Dict[str, Optional[str]]) -> str:
+    """
+    Hash everything a section's page depends on.
+
+    Args:
+        plugin: The section
+        files: Repository path to a value that changes with the file's content,
+            such as its size and modification time or its blob id
+        history: Last commit per file
+        config_hash: Hash of the generator configuration
+        dependencies: Content of the sections the section depends on
+
+    Returns:
+        Hex digest that changes when any input of the section changes
+    """
+    state = [(path, value, history.get(path)) for path, value in sorted(files.items()) if plugin.reads(path)]
+    if plugin.git_log:
+        state.append(hash_text(json.dumps(history, sort_keys=True)))
+    contents = {name: hash_text(content) if content is not None else None for name, content in dependencies.items()}
+    return hash_text(json.dumps([plugin.name, plugin.version, config_hash, state, contents],
+                                sort_keys=True, default=str))
+
+
+def file_states(index, paths: Sequence[str]) -> Dict[str, Tuple[int, int]]:
+    """Size and modification time of repository files, which stand in for their content."""
+    states = {}
+    for path in paths:
+        try:
+            stat = os.stat(index.abspath(path))
+        except OSError:
+            continue
+        states[path] = (stat.st_size, stat.st_mtime_ns)
+    return states
@@ -0,0 +1,368 @@
+"""
+Long-running generation server.
+
+``JobQueue`` runs generation jobs on a small pool of worker threads and keeps
+the state that makes repeated runs cheap warm in memory: each workspace (a
+repository and output directory) keeps its ``GeneratorCache`` loaded between
+jobs, and one ``LLMResilience`` layer, with its circuit breakers and learned
+concurrency, is shared by all jobs, each counting its own outcomes. Jobs for
+the same workspace never run concurrently, and a job submitted while an
+identical one is still queued is merged into it.
+
+``serve`` exposes the queue as a local HTTP/JSON API:
+
+- ``POST /jobs`` with ``{"repo_path": ..., "output_dir": ..., "use_ai": ..., "versions": [...]}``
+- ``GET /jobs`` and ``GET /jobs/<id>`` for status and timings
+- ``GET /health``
+"""
+import os
+import json
+import time
+import queue
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import CACHE_DIR_NAME, GeneratorCache, hash_text
+from .resilience import LLMResilience
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Largest accepted request body
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class GenerationJob:
+    """
+    A generation job and its progress.
+    """
+
+    def __init__(self, repo_path: str, output_dir: str, use_ai: Optional[str], versions: List[str]):
+        """
+        Initialize a queued job.
+
+        Args:
+            repo_path: Absolute path to the repository
+            output_dir: Absolute path of the output directory
+            use_ai: Optional AI model
+            versions: Git refs to generate versioned docs for
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.repo_path = repo_path
+        self.output_dir = output_dir
+        self.use_ai = use_ai
+        self.versions = versions
+        self.status = 'queued'
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Seconds spent building each section, the packages and the links
+        self.timings: Dict[str, float] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple:
+        """Jobs with the same key produce the same output and are merged while queued."""
+        return (self.repo_path, self.output_dir, self.use_ai, tuple(self.versions))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable status of the job."""
+        queued = (self.started_at or time.time()) - self.submitted_at
+        running = None
+        if self.started_at is not None:
+            running = (self.finished_at or time.time()) - self.started_at
+        return {
+            'id': self.id,
+            'repo_path': self.repo_path,
+            'output_dir': self.output_dir,
+            'use_ai': self.use_ai,
+            'versions': self.versions,
+            'status': self.status,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'queued_seconds': queued,
+            'run_seconds': running,
+            'timings': self.timings,
+            'result': self.result,
+            'error': self.error,
+        }
+
+
+class JobQueue:
+    """
+    Queue of generation jobs run by worker threads with warm caches.
+    """
+
+    def __init__(self, config: Optional[Dict], logger: logging.Logger, workers: int = 2, history: int = 100):
+        """
+        Initialize the queue and start its workers.
+
+        Args:
+            config: Configuration used for every job
+            logger: Logger instance
+            workers: Jobs run concurrently; jobs for one workspace always run one at a time
+            history: Finished jobs kept for status queries
+        """
+        self.config = config or {}
+        self.logger = logger
+        self.history = history
+        self.jobs: 'OrderedDict[str, GenerationJob]' = OrderedDict()
+        self.resilience = LLMResilience.from_config(self.config.get('ai'), logger)
+        self._queue: 'queue.Queue[Optional[GenerationJob]]' = queue.Queue()
+        self._queued: Dict[Tuple, GenerationJob] = {}
+        # Workspace (repository, output directory) to its warm cache and lock
+        self._workspaces: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._workers = [threading.Thread(target=self._work, name=f"generation-worker-{i}", daemon=True)
+                         for i in range(max(workers, 1))]
+        for worker in self._workers:
+            worker.start()
+
+    def default_output_dir(self, repo_path: str) -> str:
+        """Output directory of a repository when the request names none."""
+        root = self.config.get('server', {}).get('output_root') or 'docusaurus-sites'
+        name = os.path.basename(repo_path.rstrip(os.sep)) or 'repo'
+        return os.path.abspath(os.path.join(root, f"{name}-{hash_text(repo_path)[:8]}"))
+
+    def submit(self, repo_path: str, output_dir: Optional[str] = None, use_ai: Optional[str] = None,
+               versions: Optional[List[str]] = None) -> Tuple[GenerationJob, bool]:
+        """
+        Queue a generation job, merging it into an identical job that has not started yet.
+
+        Args:
+            repo_path: Path to the repository
+            output_dir: Optional output directory; derived from the repository path if omitted
+            use_ai: Optional AI model
+            versions: Optional git refs to generate versioned docs for
+
+        Returns:
+            (the job, whether it was merged into an already queued job)
+
+        Raises:
+            ValueError: If an argument has the wrong type or the repository does not exist
+        """
+        if not isinstance(repo_path, str) or not repo_path:
+            raise ValueError('repo_path must be a non-empty string')
+        for name, value in (('output_dir', output_dir), ('use_ai', use_ai)):
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"{name} must be a string or null")
+        if versions is not None and (not isinstance(versions, list)
+                                     or not all(isinstance(ref, str) for ref in versions)):
+            raise ValueError('versions must be a list of strings')
+        repo_path = os.path.abspath(repo_path)
+        if not os.path.isdir(repo_path):
+            raise ValueError(f"Repository not found: {repo_path}")
+        output_dir = os.path.abspath(output_dir) if output_dir else self.default_output_dir(repo_path)
+        job = GenerationJob(repo_path, output_dir, use_ai, list(versions or []))
+
+        with self._lock:
+            queued = self._queued.get(job.key)
+            if queued is not None:
+                return queued, True
+            self._queued[job.key] = job
+            self.jobs[job.id] = job
+            self._trim()
+        self._queue.put(job)
+        self.logger.info(f"Queued job {job.id} for {repo_path}")
+        return job, False
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        """Return a job by id, or None if it is unknown or was forgotten."""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list(self) -> List[GenerationJob]:
+        """All known jobs, oldest first."""
+        with self._lock:
+            return list(self.jobs.values())
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> bool:
+        """Wait until a job has finished; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job.status in ('succeeded', 'failed'):
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+
+    def shutdown(self) -> None:
+        """Stop the workers once the queued jobs are done."""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
+    def _trim(self) -> None:
+        """Forget the oldest finished jobs beyond the history size."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in ('succeeded', 'failed')]
+        for job_id in finished[:max(len(finished) - self.history, 0)]:
+            del self.jobs[job_id]
+
+    def _workspace(self, job: GenerationJob) -> Dict[str, Any]:
+        with self._lock:
+            key = (job.repo_path, job.output_dir)
+            if key not in self._workspaces:
+                cache_dir = os.path.join(job.output_dir, CACHE_DIR_NAME)
+                if self.config.get('cache_dir'):
+                    # Each workspace's cache prunes and rewrites whole namespace files, so they must not share one
+                    workspace_id = hash_text(f"{job.repo_path}\0{job.output_dir}")[:16]
+                    cache_dir = os.path.join(self.config['cache_dir'], workspace_id)
+                self._workspaces[key] = {
+                    'cache': GeneratorCache(cache_dir, self.logger),
+                    'lock': threading.Lock(),
+                }
+            return self._workspaces[key]
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            workspace = self._workspace(job)
+            with workspace['lock']:
+                with self._lock:
+                    # Later submissions are queued again, as the repository may change during the run
+                    self._queued.pop(job.key, None)
+                    job.status = 'running'
+                    job.started_at = time.time()
+                self._run(job, workspace['cache'])
+                with self._lock:
+                    job.finished_at = time.time()
+                    self._trim()
+
+    def _run(self, job: GenerationJob, cache: GeneratorCache) -> None:
+        """Run one job with the workspace's warm cache."""
+        # Imported here as the generator pulls in every section module
+        from .generator import DocusaurusGenerator
+
+        cache.hits.clear()
+        cache.misses.clear()
+        try:
+            generator = DocusaurusGenerator(job.repo_path, job.output_dir, self.config, job.use_ai, job.versions,
+                                            cache=cache, ai_resilience=self.resilience.for_run())
+            success = generator.generate()
+        except Exception as e:
+            self.logger.error(f"Job {job.id} failed: {str(e)}")
+            job.status = 'failed'
+            job.error = str(e)
+            return
+
+        content_generator = generator.content_generator
+        job.timings = dict(content_generator.timings)
+        job.result = {
+            'written': len(generator.writer.written),
+            'unchanged': len(generator.writer.skipped),
+            'bytes_written': generator.writer.bytes_written,
+            'files_scanned': len(content_generator.repo_index.files),
+            'cache_hit_rate': cache.hit_rate(),
+        }
+        job.status = 'succeeded' if success else 'failed'
+        if not success:
+            job.error = 'Documentation generation failed; see the server log'
+        self.logger.info(f"Job {job.id} {job.status}: {generator.writer.summary()}")
+
+
+def _handler(jobs: JobQueue):
+    """Request handler class bound to a job queue."""
+
+    class GenerationRequestHandler(BaseHTTPRequestHandler):
+        server_version = 'DocusaurusGenerator'
+
+        def _send(self, status: int, body: Any) -> None:
+            data = json.dumps(body, indent=2).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            path = self.path.split('?', 1)[0].rstrip('/')
+            if path == '/health':
+                statuses: Dict[str, int] = {}
+                for job in jobs.list():
+                    statuses[job.status] = statuses.get(job.status, 0) + 1
+                self._send(200, {'status': 'ok', 'jobs': statuses})
+            elif path == '/jobs':
+                self._send(200, [job.to_dict() for job in jobs.list()])
+            elif path.startswith('/jobs/'):
+                job = jobs.get(path[len('/jobs/'):])
+                if job is None:
+                    self._send(404, {'error': 'Unknown job'})
+                else:
+                    self._send(200, job.to_dict())
+            else:
+                self._send(404, {'error': 'Not found'})
+
+        def do_POST(self) -> None:
+            if self.path.split('?', 1)[0].rstrip('/') != '/jobs':
+                self._send(404, {'error': 'Not found'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                if length > MAX_REQUEST_BYTES:
+                    raise ValueError('Request body too large')
+                request = json.loads(self.rfile.read(length).decode('utf-8') or '{}')
+                if not isinstance(request, dict) or not request.get('repo_path'):
+                    raise ValueError('repo_path is required')
+                job, merged = jobs.submit(request['repo_path'], request.get('output_dir'),
+                                          request.get('use_ai'), request.get('versions'))
+            except ValueError as e:
+                self._send(400, {'error': str(e)})
+                return
+            self._send(200 if merged else 202, dict(job.to_dict(), merged=merged))
+
+        def log_message(self, format: str, *args) -> None:
+            jobs.logger.debug(f"{self.address_string()} {format % args}")
+
+    return GenerationRequestHandler
+
+
+def create_server(jobs: JobQueue, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """
+    Create the HTTP server for a job queue without starting it.
+
+    Args:
+        jobs: Queue the submitted jobs are run on
+        host: Interface to listen on
+        port: Port to listen on, 0 for any free port
+
+    Returns:
+        The server; call ``serve_forever`` to handle requests
+    """
+    return ThreadingHTTPServer((host, port), _handler(jobs))
+
+
+def serve(config: Optional[Dict], logger: logging.Logger, host: Optional[str] = None,
+          port: Optional[int] = None) -> None:
+    """
+    Run the generation server until interrupted.
+
+    Args:
+        config: Configuration used for every job; the ``server`` block sets
+            the defaults for the arguments below and the worker count
+        logger: Logger instance
+        host: Optional interface to listen on
+        port: Optional port to listen on
+    """
+    server_config = (config or {}).get('server', {})
+    jobs = JobQueue(config, logger, server_config.get('workers', 2), server_config.get('history', 100))
+    server = create_server(jobs, host or server_config.get('host', DEFAULT_HOST),
+                           port if port is not None else server_config.get('port', DEFAULT_PORT))
+    logger.info(f"Generation server listening on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down the generation server")
+    finally:
+        server.server_close()
+        jobs.shutdown()
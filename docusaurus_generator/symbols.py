@@ -0,0 +1,258 @@
+"""
+Cross-reference index of the symbols on the API page.
+
+The index maps fully-qualified symbol names to the page and heading anchor
+that document them. It is kept in the cache per source file and keyed by the
+file's content hash, so only changed files are parsed again. ``link_symbols``
+uses it to turn backticked references in other pages into links.
+"""
+import re
+import logging
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple, Union
+
+from .cache import GeneratorCache, hash_file, hash_text
+from .extractors import EXTRACTORS, extractor_for
+from .search_index import heading_anchor
+
+
+SYMBOL_CACHE_NAMESPACE = 'symbols'
+
+# Source files listed on the API page
+SOURCE_EXTENSIONS = tuple(EXTRACTORS)
+
+# Bumped when extraction changes so cached entries are parsed again
+EXTRACTOR_VERSION = 2
+
+# Below this many files to parse, working in-process is faster than starting workers
+PARALLEL_THRESHOLD = 32
+
+_CLASS = re.compile(r'class\s+(\w+)')
+_FUNCTION = re.compile(r'def\s+(\w+)\s*\(')
+
+# Fenced code blocks are matched as a whole so references inside them are left alone
+_REFERENCE = re.compile(
+    r'(?P<fence>^[ \t]*(?P<marker>```|~~~).*?^[ \t]*(?P=marker)[ \t]*$)'
+    r'|(?<![\[`])`(?P<name>[A-Za-z_][\w.]*)(?P<call>\(\))?`(?![`\]])',
+    re.DOTALL | re.MULTILINE
+)
+
+
+def module_name(rel_path: str) -> str:
+    """Dotted module name of a source file, e.g. ``pkg/mod.py`` -> ``pkg.mod``."""
+    stem = rel_path.rsplit('.', 1)[0]
+    if stem.endswith('/__init__'):
+        stem = stem[:-len('/__init__')]
+    return stem.replace('/', '.')
+
+
+def extract_symbols(rel_path: str, source: str) -> Dict:
+    """
+    Extract the classes and functions of a source file.
+
+    The extractor registered for the file's extension is used (see
+    ``extractors``); files without one are scanned with regular expressions.
+
+    Args:
+        rel_path: Path relative to the repository root, with forward slashes
+        source: File content
+
+    Returns:
+        Dictionary with 'classes', 'functions' and 'types' (names in source
+        order), 'symbols' ([qualified name, kind] pairs) and 'summaries'
+        (name to short description)
+    """
+    module = module_name(rel_path)
+    extractor = extractor_for(rel_path)
+    if extractor is not None:
+        try:
+            return extractor(module, source)
+        except (SyntaxError, ValueError, IndexError):
+            pass
+
+    classes = _CLASS.findall(source)
+    functions = _FUNCTION.findall(source)
+    return {
+        'classes': classes,
+        'functions': functions,
+        'types': [],
+        'symbols': [[f"{module}.{name}", 'class'] for name in classes]
+                   + [[f"{module}.{name}", 'function'] for name in functions],
+        'summaries': {},
+    }
+
+
+def _extract_file(rel_path: str, path: str) -> Optional[Dict]:
+    """Read and extract one source file. Runs in worker processes."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+    except UnicodeDecodeError:
+        return None
+    return extract_symbols(rel_path, source)
+
+
+class SymbolIndex:
+    """
+    Persistent index of the symbols documented on one API page.
+    """
+
+    def __init__(self, cache: Optional[GeneratorCache], page: str, logger: logging.Logger,
+                 cache_key: Optional[str] = None):
+        """
+        Initialize the index.
+
+        Args:
+            cache: Optional cache holding the per-file entries between runs
+            page: Doc id of the API page, e.g. 'api'
+            logger: Logger instance
+            cache_key: Key of the entries in the cache, defaulting to the page;
+                versioned docs use their own so they do not replace the current ones
+        """
+        self.cache = cache
+        self.page = page
+        self.cache_key = cache_key or page
+        self.logger = logger
+        self.files: Dict[str, Dict] = {}
+        self._previous = (cache.get(SYMBOL_CACHE_NAMESPACE, self.cache_key) if cache else None) or {}
+        self._lookup: Optional[Dict[str, Tuple[str, str]]] = None
+
+    def update(self, rel_path: str, source: str) -> Dict:
+        """
+        Add a source file, parsing it only if its content changed.
+
+        Args:
+            rel_path: Path relative to the repository root, with forward slashes
+            source: File content
+
+        Returns:
+            The file's entry (see ``extract_symbols``), plus its 'hash' and 'anchor'
+        """
+        content_hash = f"{EXTRACTOR_VERSION}:{hash_text(source)}"
+        entry = self._previous.get(rel_path)
+        if not entry or entry.get('hash') != content_hash:
+            entry = dict(extract_symbols(rel_path, source), hash=content_hash,
+                         anchor=heading_anchor(rel_path))
+        self.files[rel_path] = entry
+        self._lookup = None
+        return entry
+
+    def build(self, files: Union[Dict[str, str], Iterable[Tuple[str, str]]],
+              max_workers: Optional[int] = None) -> None:
+        """
+        Add source files, parsing those whose content hash is not cached.
+
+        Changed files are parsed on a process pool when there are enough of them.
+
+        Args:
+            files: Mapping of relative path to absolute path, or such pairs, in
+                page order; pairs are consumed one at a time, so a generator can
+                stop the scan early
+            max_workers: Maximum worker processes (defaults to the CPU count)
+        """
+        paths = {}
+        pending = {}
+        for rel_path, path in (files.items() if isinstance(files, dict) else files):
+            paths[rel_path] = path
+            try:
+                content_hash = f"{EXTRACTOR_VERSION}:{hash_file(path)}"
+            except OSError as e:
+                self.logger.warning(f"Could not read file {rel_path}: {str(e)}")
+                continue
+            entry = self._previous.get(rel_path)
+            if entry and entry.get('hash') == content_hash:
+                self.files[rel_path] = entry
+            else:
+                # Keeps the page order; filled in below
+                self.files[rel_path] = None
+                pending[rel_path] = content_hash
+
+        results = None
+        if len(pending) >= PARALLEL_THRESHOLD:
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    results = list(executor.map(_extract_file, list(pending),
+                                                [paths[p] for p in pending], chunksize=16))
+            except Exception as e:
+                self.logger.warning(f"Parallel API extraction unavailable, extracting sequentially: {str(e)}")
+                results = None
+        if results is None:
+            results = [_extract_file(rel_path, paths[rel_path]) for rel_path in pending]
+
+        for (rel_path, content_hash), entry in zip(pending.items(), results):
+            if entry is None:
+                self.logger.warning(f"Could not read file {rel_path} due to encoding issues")
+                continue
+            self.files[rel_path] = dict(entry, hash=content_hash, anchor=heading_anchor(rel_path))
+
+        self._lookup = None
+        self.logger.debug(f"Symbol index: {len(paths)} files, {len(pending)} parsed")
+
+    def save(self) -> None:
+        """Store the entries of the files added since loading, dropping removed files."""
+        if self.cache:
+            self.cache.set(SYMBOL_CACHE_NAMESPACE, self.cache_key, self.files)
+        self._previous = self.files
+
+    @property
+    def lookup(self) -> Dict[str, Tuple[str, str]]:
+        """
+        Mapping of symbol name to (page, anchor).
+
+        Fully-qualified names always resolve. Unqualified names, including
+        ``Class.method``, resolve only when all symbols with that name are
+        documented in the same place.
+        """
+        if self._lookup is None:
+            lookup: Dict[str, Tuple[str, str]] = {}
+            partial: Dict[str, Set[Tuple[str, str]]] = {}
+            for entry in self.files.values():
+                if not entry:
+                    continue
+                target = (self.page, entry['anchor'])
+                for qualified, _ in entry['symbols']:
+                    lookup[qualified] = target
+                    parts = qualified.split('.')
+                    for start in range(1, len(parts)):
+                        partial.setdefault('.'.join(parts[start:]), set()).add(target)
+            for name, targets in partial.items():
+                if name not in lookup and len(targets) == 1:
+                    lookup[name] = next(iter(targets))
+            self._lookup = lookup
+        return self._lookup
+
+    def resolve(self, name: str) -> Optional[Tuple[str, str]]:
+        """Return the (page, anchor) documenting a symbol, or None if unknown or ambiguous."""
+        return self.lookup.get(name)
+
+
+def link_symbols(markdown: str, resolve: Callable[[str], Optional[Tuple[str, str]]], page_id: str) -> str:
+    """
+    Link backticked symbol references, e.g. `` `Cache.flush()` ``, to their documentation.
+
+    The document is scanned once; fenced code blocks, references that are
+    already link text and names that do not resolve are left unchanged.
+
+    Args:
+        markdown: Page content
+        resolve: Function mapping a symbol name to (page, anchor), or None
+        page_id: Doc id of the page being linked, used for relative links
+
+    Returns:
+        The content with resolved references turned into links
+    """
+    directory = posixpath.dirname(page_id)
+
+    def replace(match: re.Match) -> str:
+        if match.group('fence'):
+            return match.group(0)
+        target = resolve(match.group('name'))
+        if target is None:
+            return match.group(0)
+        page, anchor = target
+        if page == page_id:
+            return f"[{match.group(0)}](#{anchor})"
+        return f"[{match.group(0)}]({posixpath.relpath(page + '.md', directory or '.')}#{anchor})"
+
+    return _REFERENCE.sub(replace, markdown)
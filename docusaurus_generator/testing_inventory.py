@@ -0,0 +1,337 @@
+"""
+Test discovery and per-file test counting for the Testing section.
+"""
+import os
+import re
+import ast
+import hashlib
+import logging
+import itertools
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import AbstractSet, Dict, Iterable, Optional, Tuple
+
+from .cache import GeneratorCache
+from .extractors import tokenize_c_like
+from .repo_index import RepoIndex
+
+
+# Directory names (matched against whole path components) that hold tests
+TEST_DIR_NAMES = {'test', 'tests', 'spec', 'specs', '__tests__', 'testing'}
+
+TEST_EXTENSIONS = {'.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.cpp', '.cc', '.go'}
+
+# File names that mark a test file wherever it lives
+TEST_FILE_PATTERN = re.compile(
+    r'(^test_.*\.py$|_test\.(py|go|cpp|cc)$|\.(test|spec)\.[jt]sx?$|Tests?\.java$|^test_.*\.(cpp|cc)$)'
+)
+
+# Namespace of the per-file counts, keyed by content hash
+TEST_CACHE_NAMESPACE = 'test_inventory'
+
+# Below this many test files, reading them in-process is faster than starting workers
+PARALLEL_THRESHOLD = 32
+
+# Matched against the space-joined token stream of the file, so comments and
+# strings are gone and method calls such as ``regex.test(s)`` are excluded
+_JS_CALLEE = r'(?<![.\w$])(?<!\. )'
+_JS_TEST = re.compile(rf'{_JS_CALLEE}(?:it|test)(?: \. (?:only|skip|concurrent))? \(')
+_JS_EACH = re.compile(rf'{_JS_CALLEE}(?:it|test|describe) \. each \(')
+_JS_SUITE = re.compile(rf'{_JS_CALLEE}describe(?: \. (?:only|skip))? \(')
+_JAVA_TEST = re.compile(r'@(?:Test|ParameterizedTest|RepeatedTest)\b')
+_JAVA_PARAMETRIZED = re.compile(r'@ParameterizedTest\b')
+_JAVA_CLASS = re.compile(r'\bclass\s+\w+')
+_CPP_TEST = re.compile(r'^\s*(?:TEST|TEST_F|TEST_P|TYPED_TEST|TEST_CASE|SCENARIO)\s*\(', re.MULTILINE)
+_CPP_PARAMETRIZED = re.compile(r'^\s*(?:INSTANTIATE_TEST_SUITE_P|INSTANTIATE_TEST_CASE_P|TEMPLATE_TEST_CASE)\s*\(', re.MULTILINE)
+_GO_TEST = re.compile(r'^func\s+Test\w*\s*\(', re.MULTILINE)
+_GO_SUBTEST = re.compile(r'\bt\.Run\s*\(')
+_PY_TEST = re.compile(r'^\s*(?:async\s+)?def\s+test\w*\s*\(', re.MULTILINE)
+_PY_CLASS = re.compile(r'^\s*class\s+Test\w*', re.MULTILINE)
+
+
+def is_test_file(rel_path: str) -> bool:
+    """
+    Decide whether a repository file is a test file.
+
+    A file qualifies if it has a source extension and either one of its
+    directories is a test directory (whole component, so ``latest/`` or
+    ``contest/`` do not count) or its name follows a test naming convention.
+
+    Args:
+        rel_path: Path relative to the repository root, with forward slashes
+
+    Returns:
+        True if the file is a test file
+    """
+    parts = rel_path.split('/')
+    name = parts[-1]
+    if os.path.splitext(name)[1] not in TEST_EXTENSIONS:
+        return False
+    if any(part.lower() in TEST_DIR_NAMES for part in parts[:-1]):
+        return True
+    return bool(TEST_FILE_PATTERN.search(name))
+
+
+def _count_python(source: str) -> Dict[str, int]:
+    """Count tests, test classes and parametrized cases in Python source."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return {
+            'tests': len(_PY_TEST.findall(source)),
+            'classes': len(_PY_CLASS.findall(source)),
+            'parametrized': source.count('parametrize('),
+        }
+
+    counts = {'tests': 0, 'classes': 0, 'parametrized': 0}
+
+    def is_test_class(node: ast.ClassDef) -> bool:
+        if node.name.startswith('Test'):
+            return True
+        for base in node.bases:
+            name = base.attr if isinstance(base, ast.Attribute) else getattr(base, 'id', '')
+            if name.endswith('TestCase'):
+                return True
+        return False
+
+    def parametrized_cases(node) -> int:
+        cases = 0
+        for decorator in node.decorator_list:
+            if not isinstance(decorator, ast.Call):
+                continue
+            func = decorator.func
+            name = func.attr if isinstance(func, ast.Attribute) else getattr(func, 'id', '')
+            if name != 'parametrize':
+                continue
+            values = decorator.args[1] if len(decorator.args) > 1 else None
+            if isinstance(values, (ast.List, ast.Tuple)):
+                cases += len(values.elts)
+            else:
+                cases += 1
+        return cases
+
+    def visit(body) -> None:
+        for node in body:
+            if isinstance(node, ast.ClassDef) and is_test_class(node):
+                counts['classes'] += 1
+                visit(node.body)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith('test'):
+                counts['tests'] += 1
+                counts['parametrized'] += parametrized_cases(node)
+
+    visit(tree.body)
+    return counts
+
+
+def count_tests(source: str, extension: str) -> Dict[str, int]:
+    """
+    Count tests in a test file's source.
+
+    Args:
+        source: File content
+        extension: File extension including the dot
+
+    Returns:
+        Dictionary with 'tests', 'classes' (test classes or suites) and
+        'parametrized' (parametrized cases or subtests)
+    """
+    if extension == '.py':
+        return _count_python(source)
+    if extension in ('.js', '.jsx', '.ts', '.tsx'):
+        # A tagged table (test.each`...`) is dropped as a literal, leaving the call's '('
+        code = ' '.join(tokenize_c_like(source))
+        each = len(_JS_EACH.findall(code))
+        return {
+            'tests': len(_JS_TEST.findall(code)) + each,
+            'classes': len(_JS_SUITE.findall(code)),
+            'parametrized': each,
+        }
+    if extension == '.java':
+        tests = len(_JAVA_TEST.findall(source))
+        return {
+            'tests': tests,
+            'classes': len(_JAVA_CLASS.findall(source)) if tests else 0,
+            'parametrized': len(_JAVA_PARAMETRIZED.findall(source)),
+        }
+    if extension in ('.cpp', '.cc'):
+        return {
+            'tests': len(_CPP_TEST.findall(source)),
+            'classes': 0,
+            'parametrized': len(_CPP_PARAMETRIZED.findall(source)),
+        }
+    if extension == '.go':
+        return {
+            'tests': len(_GO_TEST.findall(source)),
+            'classes': 0,
+            'parametrized': len(_GO_SUBTEST.findall(source)),
+        }
+    return {'tests': 0, 'classes': 0, 'parametrized': 0}
+
+
+# Cache keys of the counts the main process already has, set in each worker process
+_known_keys: AbstractSet[str] = frozenset()
+
+
+def _init_worker(known_keys: AbstractSet[str]) -> None:
+    global _known_keys
+    _known_keys = known_keys
+
+
+def _inventory_file(path: str, known_keys: Optional[AbstractSet[str]] = None
+                    ) -> Tuple[str, Optional[Dict[str, int]]]:
+    """
+    Hash one test file and count its tests, reading it once. Runs in worker processes.
+
+    Args:
+        path: Path to the test file
+        known_keys: Cache keys whose counts need not be computed; the
+            worker's keys if omitted
+
+    Returns:
+        The file's cache key and its counts, or None if the key is known
+    """
+    extension = os.path.splitext(path)[1]
+    with open(path, 'rb') as f:
+        data = f.read()
+    key = f"{extension}:{hashlib.sha256(data).hexdigest()}"
+    if key in (_known_keys if known_keys is None else known_keys):
+        return key, None
+    # Newlines are translated as when reading in text mode
+    source = data.decode('utf-8', 'replace').replace('\r\n', '\n').replace('\r', '\n')
+    return key, count_tests(source, extension)
+
+
+def build_test_inventory(index: RepoIndex, cache: Optional[GeneratorCache], logger: logging.Logger,
+                         max_workers: Optional[int] = None,
+                         paths: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Discover test files and count their tests.
+
+    Each file is read once, to hash it and, unless counts for that content
+    hash are cached, to count its tests. With enough files this happens on a
+    process pool, which takes the next file only as a worker frees up.
+
+    Args:
+        index: Repository index
+        cache: Optional cache for per-file counts
+        logger: Logger instance
+        max_workers: Maximum worker processes (defaults to the CPU count)
+        paths: Optional test files to count, read one at a time; every test
+            file in the index if omitted
+
+    Returns:
+        Mapping of relative test file path to its counts, sorted by path
+    """
+    candidates = (rel_path for rel_path in (index.files if paths is None else paths) if is_test_file(rel_path))
+    known = frozenset(cache.keys(TEST_CACHE_NAMESPACE)) if cache else frozenset()
+    scanned: Dict[str, Tuple[str, Optional[Dict[str, int]]]] = {}
+
+    def scan(rel_path: str) -> None:
+        try:
+            scanned[rel_path] = _inventory_file(index.abspath(rel_path), known)
+        except OSError as e:
+            logger.warning(f"Could not read test file {rel_path}: {str(e)}")
+
+    first = list(itertools.islice(candidates, PARALLEL_THRESHOLD))
+    remaining = itertools.chain(first, candidates)
+    if len(first) >= PARALLEL_THRESHOLD:
+        running = {}
+
+        def collect(futures) -> None:
+            for future in futures:
+                rel_path = running[future]
+                try:
+                    scanned[rel_path] = future.result()
+                except OSError as e:
+                    logger.warning(f"Could not read test file {rel_path}: {str(e)}")
+                # Not reached if the pool broke, so the file is read again sequentially
+                del running[future]
+
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(known,)) as executor:
+                # A few files queued per worker keeps them busy without reading past the budget
+                window = (max_workers or os.cpu_count() or 1) * 4
+                for rel_path in remaining:
+                    if len(running) >= window:
+                        collect(wait(running, return_when=FIRST_COMPLETED)[0])
+                    running[executor.submit(_inventory_file, index.abspath(rel_path))] = rel_path
+                collect(list(running))
+        except Exception as e:
+            logger.warning(f"Parallel test parsing unavailable, parsing sequentially: {str(e)}")
+            for rel_path in running.values():
+                scan(rel_path)
+    for rel_path in remaining:
+        scan(rel_path)
+
+    inventory = {}
+    parsed = 0
+    for rel_path, (key, counts) in scanned.items():
+        if counts is None:
+            counts = cache.get(TEST_CACHE_NAMESPACE, key)
+        else:
+            parsed += 1
+            if cache:
+                cache.set(TEST_CACHE_NAMESPACE, key, counts)
+        inventory[rel_path] = counts
+
+    logger.debug(f"Test inventory: {len(inventory)} files, {parsed} parsed, "
+                 f"{len(inventory) - parsed} from cache")
+    return dict(sorted(inventory.items()))
+
+
+def render_test_inventory(inventory: Dict[str, Dict[str, int]], max_rows: int = 50) -> str:
+    """
+    Render the inventory as Markdown tables.
+
+    Args:
+        inventory: Mapping of test file path to counts
+        max_rows: Maximum rows per table
+
+    Returns:
+        Markdown with totals, a per-directory table and the largest test files
+    """
+    directories: Dict[str, Dict[str, int]] = {}
+    totals = {'files': 0, 'tests': 0, 'classes': 0, 'parametrized': 0}
+
+    for rel_path, counts in inventory.items():
+        directory = rel_path.rsplit('/', 1)[0] if '/' in rel_path else '.'
+        row = directories.setdefault(directory, {'files': 0, 'tests': 0, 'classes': 0, 'parametrized': 0})
+        for row_counts in (row, totals):
+            row_counts['files'] += 1
+            for key in ('tests', 'classes', 'parametrized'):
+                row_counts[key] += counts.get(key, 0)
+
+    lines = [
+        f"{totals['tests']} tests in {totals['classes']} test classes or suites across "
+        f"{totals['files']} files ({totals['parametrized']} parametrized cases).",
+        "",
+        "| Directory | Files | Tests | Classes/Suites | Parametrized |",
+        "|---|---:|---:|---:|---:|",
+    ]
+    ordered = sorted(directories.items(), key=lambda item: (-item[1]['tests'], item[0]))
+    for directory, row in ordered[:max_rows]:
+        lines.append(f"| `{directory}/` | {row['files']} | {row['tests']} | {row['classes']} | {row['parametrized']} |")
+    if len(ordered) > max_rows:
+        rest = ordered[max_rows:]
+        lines.append(
+            f"| {len(rest)} more directories | {sum(r['files'] for _, r in rest)} | "
+            f"{sum(r['tests'] for _, r in rest)} | {sum(r['classes'] for _, r in rest)} | "
+            f"{sum(r['parametrized'] for _, r in rest)} |"
+        )
+
+    largest = sorted(inventory.items(), key=lambda item: (-item[1].get('tests', 0), item[0]))[:min(max_rows, 20)]
+    if largest:
+        lines.extend([
+            "",
+            "### Largest Test Files",
+            "",
+            "| File | Tests | Classes/Suites | Parametrized |",
+            "|---|---:|---:|---:|",
+        ])
+        for rel_path, counts in largest:
+            lines.append(
+                f"| `{rel_path}` | {counts.get('tests', 0)} | {counts.get('classes', 0)} | "
+                f"{counts.get('parametrized', 0)} |"
+            )
+
+    return "\n".join(lines)
@@ -5,11 +5,121 @@ import os
 import sys
 import shutil
 import logging
+import uuid
+import filecmp
 import subprocess
-from typing import Optional
+from typing import Callable, Dict, Optional
 
+from .assets import ASSETS_DIR
 
-def copy_static_assets(repo_path: str, output_dir: str, logger: logging.Logger) -> None:
+
+class AtomicFileWriter:
+    """
+    Write a file through a temporary sibling that is renamed into place on commit.
+
+    Readers never observe a partially written file: until ``commit`` is called
+    the destination keeps its previous content, and ``discard`` (or leaving the
+    ``with`` block without committing) removes the temporary file. If the new
+    content is identical to the destination's, the destination is left
+    untouched so its modification time does not change.
+    """
+
+    def __init__(self, path: str, mode: str = 'w', encoding: Optional[str] = 'utf-8',
+                 on_commit: Optional[Callable[[str, bool], None]] = None):
+        """
+        Open a temporary file next to the destination.
+
+        Args:
+            path: Destination file path
+            mode: File mode, 'w' for text or 'wb' for bytes
+            encoding: Text encoding (ignored in binary mode)
+            on_commit: Optional callback receiving the path and whether it changed
+        """
+        self.path = path
+        self.on_commit = on_commit
+        self.changed = False
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Created with the permissions a plain open() would give, i.e. 0o666 less the umask
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+        while True:
+            self.temp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex[:12]}.tmp")
+            try:
+                fd = os.open(self.temp_path, flags, 0o666)
+                break
+            except FileExistsError:
+                continue
+        if 'b' in mode:
+            self._file = os.fdopen(fd, mode)
+        else:
+            self._file = os.fdopen(fd, mode, encoding=encoding)
+        self._closed = False
+
+    def write(self, data) -> None:
+        """Write data to the temporary file and flush it so progress is visible."""
+        self._file.write(data)
+        self._file.flush()
+
+    def commit(self) -> bool:
+        """
+        Atomically replace the destination with the temporary file.
+
+        Returns:
+            True if the destination changed, False if it already had this content
+        """
+        if self._closed:
+            return self.changed
+        self._file.close()
+        self._closed = True
+        if os.path.isfile(self.path) and filecmp.cmp(self.temp_path, self.path, shallow=False):
+            os.remove(self.temp_path)
+            self.changed = False
+        else:
+            os.replace(self.temp_path, self.path)
+            self.changed = True
+        if self.on_commit:
+            self.on_commit(self.path, self.changed)
+        return self.changed
+
+    def discard(self) -> None:
+        """Drop the temporary file, leaving the destination untouched."""
+        if self._closed:
+            return
+        self._file.close()
+        self._closed = True
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
+
+    def __enter__(self) -> 'AtomicFileWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+def write_file_atomic(path: str, content: str) -> bool:
+    """
+    Write text content to a file atomically.
+
+    Args:
+        path: Destination file path
+        content: Text content to write
+
+    Returns:
+        True if the file changed, False if it already had this content
+    """
+    with AtomicFileWriter(path) as f:
+        f.write(content)
+    return f.changed
+
+
+def copy_static_assets(repo_path: str, output_dir: str, logger: logging.Logger, writer=None,
+                       optimizer=None, assets: Optional[Dict[str, str]] = None) -> None:
     """
     Copy static assets from the repository to the output directory.
     
@@ -17,23 +127,48 @@ def copy_static_assets(repo_path: str, output_dir: str, logger: logging.Logger)
         repo_path: Path to the repository
         output_dir: Directory where documentation should be generated
         logger: Logger instance
+        writer: Optional OutputWriter; unchanged assets are then not copied again
+        optimizer: Optional ImageOptimizer the images are passed through instead of copied
+        assets: Optional files the pages reference, by asset name; only these
+            are copied, to ``static/assets/``. Without it every image in the
+            repository is copied to ``static/``
     """
+    # images imports the cache, which needs this module
+    from .images import IMAGE_EXTENSIONS
+    
     static_dir = os.path.join(output_dir, 'static')
-    os.makedirs(static_dir, exist_ok=True)
+    if writer is not None:
+        writer.makedirs(static_dir)
+    else:
+        os.makedirs(static_dir, exist_ok=True)
+    jobs = []
+    
+    if assets is not None:
+        copies = [(source, os.path.join(static_dir, ASSETS_DIR, name)) for name, source in sorted(assets.items())]
+    else:
+        copies = []
+        for root, _, files in os.walk(repo_path):
+            for file in files:
+                if file.lower().endswith(IMAGE_EXTENSIONS):
+                    copies.append((os.path.join(root, file), os.path.join(static_dir, file)))
     
-    for root, _, files in os.walk(repo_path):
-        for file in files:
-            if file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.svg')):
-                try:
-                    source_path = os.path.join(root, file)
-                    target_path = os.path.join(static_dir, file)
-                    
-                    # Only copy if source and target are different
-                    if os.path.abspath(source_path) != os.path.abspath(target_path):
-                        shutil.copy2(source_path, target_path)
-                        
-                except Exception as e:
-                    logger.warning(f"Error copying asset {file}: {str(e)}")
+    for source_path, target_path in copies:
+        try:
+            # Only copy if source and target are different
+            if os.path.abspath(source_path) != os.path.abspath(target_path):
+                if optimizer is not None and source_path.lower().endswith(IMAGE_EXTENSIONS):
+                    jobs.append((source_path, target_path))
+                elif writer is not None:
+                    writer.copy(source_path, target_path)
+                else:
+                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                    shutil.copy2(source_path, target_path)
+                
+        except Exception as e:
+            logger.warning(f"Error copying asset {os.path.basename(source_path)}: {str(e)}")
+    
+    if jobs:
+        optimizer.process(jobs)
 
 
 def run_command(cmd: list, cwd: str, logger: logging.Logger) -> bool:
@@ -150,6 +285,21 @@ def update_package_json(output_dir: str, logger: logging.Logger) -> None:
         logger.warning(f"Error updating package.json: {str(e)}")
 
 
+def build_docusaurus(output_dir: str, logger: logging.Logger) -> bool:
+    """
+    Build the static site into the build directory.
+    
+    Args:
+        output_dir: Directory where documentation was generated
+        logger: Logger instance
+        
+    Returns:
+        True if the build succeeded, False otherwise
+    """
+    logger.info("Building the Docusaurus site...")
+    return run_command(['npm', 'run', 'build'], output_dir, logger)
+
+
 def start_docusaurus_server(output_dir: str, logger: logging.Logger) -> bool:
     """
     Start the Docusaurus development server.
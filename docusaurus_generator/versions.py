@@ -0,0 +1,347 @@
+"""
+Versioned documentation generated from git refs.
+
+Each ref's tree is listed with ``git ls-tree`` and its blobs are read from the
+object database with a single ``git cat-file --batch`` process, so the
+repository's working copy and index are never touched. The section
+generators read files from disk, so a version whose pages cannot all be
+reused gets a snapshot directory: blobs are exported once into a
+content-addressed store and hard-linked into each snapshot. A page is only
+generated when the blobs it can depend on differ from every version
+generated before; otherwise the earlier page is reused.
+
+Versions get no sub-package pages, so package sources are documented on
+each version's API page.
+"""
+import os
+import json
+import shutil
+import logging
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+
+from .assets import ASSETS_DIR
+from .cache import GeneratorCache, hash_text
+from .content_generator import ContentGenerator
+from .git_metadata import file_history_at
+from .repo_index import DEFAULT_EXCLUDE_DIRS
+from .sections import SectionPlugin, input_fingerprint, plugin_order
+from .symbols import SYMBOL_CACHE_NAMESPACE
+from .writer import OutputWriter
+
+
+VERSIONS_CACHE_NAMESPACE = 'versioned_pages'
+
+# Bumped when section generation changes so cached versioned pages are regenerated
+PAGE_FORMAT_VERSION = 6
+
+# git file modes that are not regular files: symlinks and submodules
+_SKIPPED_MODES = {'120000', '160000'}
+
+
+def version_name(ref: str) -> str:
+    """Docusaurus version name for a ref, e.g. ``refs/tags/v1.2`` -> ``v1.2``."""
+    for prefix in ('refs/tags/', 'refs/heads/'):
+        if ref.startswith(prefix):
+            ref = ref[len(prefix):]
+    return ref.replace('/', '-')
+
+
+def _run_git(repo_path: str, *args: str) -> str:
+    result = subprocess.run(['git', '-c', 'core.quotepath=false', *args], cwd=repo_path,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode:
+        raise ValueError(result.stderr.decode('utf-8', 'replace').strip() or f"git {args[0]} failed")
+    return result.stdout.decode('utf-8', 'surrogateescape')
+
+
+def read_blob(repo_path: str, blob: str) -> bytes:
+    """Read one blob's content from the object database."""
+    result = subprocess.run(['git', 'cat-file', 'blob', blob], cwd=repo_path,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode:
+        raise ValueError(result.stderr.decode('utf-8', 'replace').strip() or "git cat-file failed")
+    return result.stdout
+
+
+def resolve_commit(repo_path: str, ref: str) -> str:
+    """
+    Resolve a ref to its commit SHA.
+
+    Raises:
+        ValueError: If the ref does not name a commit
+    """
+    return _run_git(repo_path, 'rev-parse', '--verify', '--quiet', f"{ref}^{{commit}}").strip()
+
+
+def list_tree(repo_path: str, commit: str) -> Dict[str, str]:
+    """
+    List the regular files of a commit's tree.
+
+    Files inside ``DEFAULT_EXCLUDE_DIRS`` are left out, as they are when
+    generating from a working copy.
+
+    Args:
+        repo_path: Path to the repository
+        commit: Commit SHA or ref
+
+    Returns:
+        Mapping of relative file path to blob SHA, sorted by path
+    """
+    output = _run_git(repo_path, 'ls-tree', '-r', '-z', '--full-tree', commit)
+    tree = {}
+    for record in output.split('\0'):
+        if not record:
+            continue
+        meta, _, path = record.partition('\t')
+        mode, object_type, sha = meta.split()
+        if object_type != 'blob' or mode in _SKIPPED_MODES:
+            continue
+        if any(part in DEFAULT_EXCLUDE_DIRS for part in path.split('/')[:-1]):
+            continue
+        tree[path] = sha
+    return dict(sorted(tree.items()))
+
+
+def export_tree(repo_path: str, tree: Dict[str, str], dest: str, blob_dir: str) -> int:
+    """
+    Materialize a tree from the object database without a checkout.
+
+    Blobs missing from the content-addressed store are read through one
+    ``git cat-file --batch`` process; files are then hard-linked from the
+    store, falling back to copies where links are not supported.
+
+    Args:
+        repo_path: Path to the repository
+        tree: Result of ``list_tree``
+        dest: Directory to create the files in
+        blob_dir: Content-addressed blob store shared between versions
+
+    Returns:
+        Number of blobs read from git
+    """
+    missing = sorted({sha for sha in tree.values() if not os.path.exists(os.path.join(blob_dir, sha))})
+    if missing:
+        os.makedirs(blob_dir, exist_ok=True)
+        process = subprocess.Popen(['git', 'cat-file', '--batch'], cwd=repo_path,
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            for sha in missing:
+                process.stdin.write(f"{sha}\n".encode('ascii'))
+                process.stdin.flush()
+                header = process.stdout.readline().split()
+                if len(header) != 3:
+                    raise ValueError(f"Object {sha} is missing from the repository")
+                data = process.stdout.read(int(header[2]))
+                process.stdout.read(1)
+                # Another version may export the same blob concurrently; the rename is atomic
+                fd, temp_path = tempfile.mkstemp(dir=blob_dir)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, os.path.join(blob_dir, sha))
+        finally:
+            process.stdin.close()
+            process.stdout.close()
+            process.wait()
+
+    for path, sha in tree.items():
+        target = os.path.join(dest, *path.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(os.path.join(blob_dir, sha), target)
+        except OSError:
+            shutil.copyfile(os.path.join(blob_dir, sha), target)
+    return len(missing)
+
+
+def section_fingerprint(plugin: SectionPlugin, tree: Dict[str, str], history: Dict[str, Dict], config_hash: str,
+                        dependencies: Optional[Dict[str, Optional[str]]] = None) -> str:
+    """
+    Hash the inputs a section can depend on in one version.
+
+    Args:
+        plugin: The section
+        tree: Result of ``list_tree``
+        history: Last commit per file as of the version
+        config_hash: Hash of the generator configuration
+        dependencies: Content of the sections the section depends on
+
+    Returns:
+        Hex digest that is equal between versions exactly when their inputs are
+    """
+    return input_fingerprint(plugin, tree, history, f"{PAGE_FORMAT_VERSION}:{config_hash}", dependencies or {})
+
+
+class VersionedDocsGenerator:
+    """
+    Generates the Docusaurus ``versioned_docs/`` layout for a list of git refs.
+    """
+
+    def __init__(self, repo_path: str, output_dir: str, config: Dict, logger: logging.Logger,
+                 writer: OutputWriter, cache: GeneratorCache, project_info: Dict[str, str]):
+        """
+        Initialize the versioned docs generator.
+
+        Args:
+            repo_path: Path to the repository
+            output_dir: Directory where documentation is generated
+            config: Configuration dictionary
+            logger: Logger instance
+            writer: Output writer shared with the other generators
+            cache: Cache shared with the other generators
+            project_info: Project metadata resolved for the current version
+        """
+        self.repo_path = repo_path
+        self.output_dir = output_dir
+        self.logger = logger
+        self.writer = writer
+        self.cache = cache
+        self.project_info = project_info
+
+        # Snapshots live outside the output directory, so the project tree must not be emitted there
+        self.config = dict(config)
+        self.config['architecture'] = dict(config.get('architecture') or {}, emit_json=False)
+        # Versioned sidebars have no package pages, so package sources stay on the API page
+        self.config['packages'] = dict(config.get('packages') or {}, enabled=False)
+        self._config_hash = hash_text(json.dumps(self.config, sort_keys=True, default=str))
+        
+        # Names of the assets the versions' pages reference, for removing stale ones
+        self.assets: Set[str] = set()
+
+    def generate(self, refs: List[str]) -> List[str]:
+        """
+        Generate versioned docs and sidebars for the refs, newest first.
+
+        Refs that cannot be resolved, e.g. deleted tags, are logged and left
+        out. Without any version, the versioned docs of earlier runs are
+        removed along with ``versions.json``, as Docusaurus would still build them.
+
+        Args:
+            refs: Tags, branches or commits, listed newest first
+
+        Returns:
+            The version names written to versions.json
+        """
+        commits = {}
+        for ref in refs:
+            try:
+                commits[ref] = resolve_commit(self.repo_path, ref)
+            except ValueError as e:
+                self.logger.warning(f"Skipping version {ref}: it cannot be resolved ({str(e)})")
+        refs = list(commits)
+        names = [version_name(ref) for ref in refs]
+        if not names:
+            self._remove_versions()
+            return names
+        workers = self.config.get('versions', {}).get('workers') or min(len(refs), os.cpu_count() or 1)
+
+        with tempfile.TemporaryDirectory(prefix='docusaurus-versions-') as scratch:
+            blob_dir = os.path.join(scratch, 'blobs')
+            with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+                futures = [executor.submit(self._generate_version, commits[ref], name, scratch, blob_dir)
+                           for ref, name in zip(refs, names)]
+                for future in futures:
+                    future.result()
+
+        self.writer.write_json(os.path.join(self.output_dir, 'versions.json'), names, indent=2)
+        self._remove_stale_versions(names)
+        self.cache.flush()
+        return names
+
+    def _generate_version(self, commit: str, name: str, scratch: str, blob_dir: str) -> None:
+        """Generate one version's pages, reusing pages whose inputs were seen before."""
+        tree = list_tree(self.repo_path, commit)
+        history = {}
+        if self.config.get('git_metadata', {}).get('enabled', True):
+            history = file_history_at(self.repo_path, commit, self.cache, self.logger)
+
+        # The snapshot is named like the repository, as the architecture tree shows its root
+        snapshot = os.path.join(scratch, commit, os.path.basename(os.path.abspath(self.repo_path)))
+        generator = ContentGenerator(snapshot, self.output_dir, None, self.logger, self.config,
+                                     self.writer, self.project_info, self.cache, history)
+        generator.cache_prefix = f"version-{name}/"
+
+        sections: Dict[str, Optional[str]] = {}
+        exported = False
+        reused = 0
+        for plugin in plugin_order(generator.plugins, self.logger):
+            dependencies = {section: sections[section] for section in plugin.depends}
+            key = section_fingerprint(plugin, tree, history, self._config_hash, dependencies)
+            cached = self.cache.get(VERSIONS_CACHE_NAMESPACE, key)
+            if cached is not None:
+                sections[plugin.name] = cached['content']
+                reused += 1
+                continue
+            if not exported:
+                blobs = export_tree(self.repo_path, tree, snapshot, blob_dir)
+                self.logger.debug(f"Exported {len(tree)} files of {name} ({blobs} blobs read from git)")
+                exported = True
+            sections[plugin.name] = generator.generate_section(plugin.name, dependencies)
+            if not generator.budgets[plugin.name].timed_out:
+                self.cache.set(VERSIONS_CACHE_NAMESPACE, key, {'content': sections[plugin.name]})
+
+        version_dir = os.path.join(self.output_dir, 'versioned_docs', f"version-{name}")
+        pages = {section: content for section, content in sections.items() if content}
+        pages['index'] = generator.generate_index(sections)
+        if self.config.get('links', {}).get('enabled', True):
+            pages, link_index = generator.rewrite_links(pages, list(tree), commit, tree)
+            if link_index.broken:
+                self.logger.info(f"Version {name}: {len(link_index.broken)} broken links reduced to plain text")
+            self._write_assets(link_index.assets, tree)
+        for page_id, content in pages.items():
+            self.writer.write(os.path.join(version_dir, f"{page_id}.md"), content)
+        for file_name in self.writer.listdir(version_dir):
+            if file_name.endswith('.md') and file_name[:-len('.md')] not in pages:
+                self.writer.remove(os.path.join(version_dir, file_name))
+
+        self.writer.write_json(
+            os.path.join(self.output_dir, 'versioned_sidebars', f"version-{name}-sidebars.json"),
+            {'docs': generator.sidebar_items(sections)},
+            indent=2
+        )
+        self.logger.info(f"Generated version {name} ({reused} of {len(sections)} sections reused)")
+
+    def _write_assets(self, assets: Dict[str, str], tree: Dict[str, str]) -> None:
+        """Write the referenced assets that no version or the current docs wrote already."""
+        assets_dir = os.path.join(self.output_dir, 'static', ASSETS_DIR)
+        for asset, path in assets.items():
+            self.assets.add(asset)
+            target = os.path.join(assets_dir, asset)
+            # Names are content-addressed, so an existing file is up to date
+            if self.writer.exists(target):
+                self.writer.record(target, False)
+                continue
+            try:
+                self.writer.write(target, read_blob(self.repo_path, tree[path]))
+            except ValueError as e:
+                self.logger.warning(f"Could not read asset {path}: {str(e)}")
+
+    def _remove_versions(self) -> None:
+        """Remove the versioned docs of earlier runs when no version is requested."""
+        for entry in ('versions.json', 'versioned_docs', 'versioned_sidebars'):
+            path = os.path.join(self.output_dir, entry)
+            if self.writer.exists(path):
+                self.writer.remove(path)
+                self.logger.info(f"Removed {entry}: no versions are requested")
+        self._forget_versions([])
+
+    def _remove_stale_versions(self, names: List[str]) -> None:
+        """Remove versions generated by earlier runs that are no longer requested."""
+        for directory, prefix, suffix in (('versioned_docs', 'version-', ''),
+                                          ('versioned_sidebars', 'version-', '-sidebars.json')):
+            path = os.path.join(self.output_dir, directory)
+            current = {f"{prefix}{name}{suffix}" for name in names}
+            for entry in self.writer.listdir(path):
+                if entry.startswith(prefix) and entry.endswith(suffix) and entry not in current:
+                    self.writer.remove(os.path.join(path, entry))
+                    self.logger.info(f"Removed stale version {entry}")
+        self._forget_versions(names)
+
+    def _forget_versions(self, names: List[str]) -> None:
+        """Drop the symbol index entries of versions that are no longer requested."""
+        current = tuple(f"version-{name}/" for name in names)
+        for key in self.cache.keys(SYMBOL_CACHE_NAMESPACE):
+            if key.startswith('version-') and not key.startswith(current):
+                self.cache.delete(SYMBOL_CACHE_NAMESPACE, key)
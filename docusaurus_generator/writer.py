@@ -0,0 +1,400 @@
+"""
+Output writers shared by the generators.
+
+Generators never touch the output directory directly; they write, read,
+list and remove output files through a writer. ``OutputWriter`` targets the
+output directory on disk, ``MemoryWriter`` a virtual filesystem mapping
+relative paths to bytes, so a site can be generated without disk I/O.
+"""
+import os
+import json
+import shutil
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .utils import AtomicFileWriter
+
+
+class OutputWriter:
+    """
+    Writes generated files only when their content changes.
+
+    Unchanged files are not rewritten, so their modification times stay put
+    and the Docusaurus dev server and webpack caches are not invalidated.
+    Changed files are written atomically through a temporary file.
+    """
+
+    # Whether outputs only exist in memory, in which case nothing else should be written to disk
+    in_memory = False
+
+    def __init__(self, output_dir: str, logger: logging.Logger):
+        """
+        Initialize the writer.
+
+        Args:
+            output_dir: Directory where documentation is generated
+            logger: Logger instance
+        """
+        self.output_dir = output_dir
+        self.logger = logger
+        self.written: List[str] = []
+        self.skipped: List[str] = []
+        self.bytes_written = 0
+        # Set to keep the content of written files, so output_files need not read them back
+        self.keep_contents = False
+        self.contents: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, path: str) -> str:
+        """Path relative to the output directory, with forward slashes."""
+        key = os.path.relpath(path, self.output_dir).replace(os.sep, '/')
+        return '' if key == '.' else key
+
+    def record(self, path: str, changed: bool, size: Optional[int] = None) -> None:
+        """Count a file as written or skipped, with the bytes written (read from disk if not given)."""
+        rel_path = os.path.relpath(path, self.output_dir)
+        if not changed:
+            size = 0
+        elif size is None:
+            size = os.path.getsize(path) if os.path.isfile(path) else 0
+        with self._lock:
+            (self.written if changed else self.skipped).append(rel_path)
+            self.bytes_written += size
+            # Kept content is stored again by write; streamed files are read back
+            self.contents.pop(self._key(path), None)
+        if changed:
+            self.logger.debug(f"Wrote {rel_path}")
+
+    def recorded(self, path: str) -> bool:
+        """Whether a file was written, or found unchanged, during this run."""
+        rel_path = os.path.relpath(path, self.output_dir)
+        with self._lock:
+            return rel_path in self.written or rel_path in self.skipped
+
+    def write(self, path: str, content: Union[str, bytes]) -> bool:
+        """
+        Write a file unless it already has this content.
+
+        Args:
+            path: Destination file path
+            content: Text or bytes to write
+
+        Returns:
+            True if the file was written, False if it was unchanged
+        """
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        if self._unchanged(path, data):
+            self.record(path, False)
+            changed = False
+        else:
+            with AtomicFileWriter(path, 'wb', on_commit=self.record) as f:
+                f.write(data)
+            changed = f.changed
+        if self.keep_contents:
+            with self._lock:
+                self.contents[self._key(path)] = data
+        return changed
+
+    @staticmethod
+    def _unchanged(path: str, data: bytes) -> bool:
+        """Whether a file already holds exactly this content."""
+        try:
+            if os.path.getsize(path) == len(data):
+                with open(path, 'rb') as f:
+                    return f.read() == data
+        except OSError:
+            pass
+        return False
+
+    def write_json(self, path: str, data: Any, **kwargs) -> bool:
+        """
+        Serialize data as JSON and write it unless unchanged.
+
+        Args:
+            path: Destination file path
+            data: JSON-serializable data
+            **kwargs: Arguments passed to ``json.dumps``
+
+        Returns:
+            True if the file was written, False if it was unchanged
+        """
+        return self.write(path, json.dumps(data, **kwargs))
+
+    def copy(self, source: str, path: str) -> bool:
+        """
+        Copy a file unless the destination already has the same content.
+
+        Args:
+            source: Source file path
+            path: Destination file path
+
+        Returns:
+            True if the file was written, False if it was unchanged
+        """
+        with open(source, 'rb') as f:
+            return self.write(path, f.read())
+
+    def open(self, path: str, mode: str = 'w') -> AtomicFileWriter:
+        """
+        Open a file for incremental writing, e.g. for streamed content.
+
+        The file is counted when the returned writer is committed.
+
+        Args:
+            path: Destination file path
+            mode: File mode, 'w' for text or 'wb' for bytes
+
+        Returns:
+            Atomic writer for the destination
+        """
+        return AtomicFileWriter(path, mode, on_commit=self.record)
+
+    def remove(self, path: str) -> None:
+        """Remove a generated file or directory that is no longer produced."""
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+        key = self._key(path)
+        with self._lock:
+            for name in [name for name in self.contents if name == key or name.startswith(f"{key}/")]:
+                del self.contents[name]
+
+    def output_files(self) -> Iterator[Tuple[str, bytes]]:
+        """
+        The files this run wrote or found unchanged, sorted by path.
+
+        Yields:
+            (path relative to the output directory with forward slashes, content);
+            files removed after being written are left out
+        """
+        with self._lock:
+            paths = sorted({self._key(os.path.join(self.output_dir, path)) for path in self.written + self.skipped})
+        for rel_path in paths:
+            with self._lock:
+                data = self.contents.get(rel_path)
+            if data is None:
+                data = self.read(os.path.join(self.output_dir, *rel_path.split('/')))
+            if data is not None:
+                yield rel_path, data
+
+    def read(self, path: str) -> Optional[bytes]:
+        """Return the content of an output file, or None if it does not exist."""
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def exists(self, path: str) -> bool:
+        """Whether an output file or directory exists."""
+        return os.path.exists(path)
+
+    def isdir(self, path: str) -> bool:
+        """Whether an output directory exists."""
+        return os.path.isdir(path)
+
+    def size(self, path: str) -> Optional[int]:
+        """Size of an output file in bytes, or None if it does not exist."""
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return None
+
+    def listdir(self, path: str) -> List[str]:
+        """Names of the entries of an output directory, empty if it does not exist."""
+        try:
+            return sorted(os.listdir(path))
+        except OSError:
+            return []
+
+    def makedirs(self, path: str) -> None:
+        """Create an output directory that must exist even when empty."""
+        os.makedirs(path, exist_ok=True)
+
+    def summary(self) -> str:
+        """Describe how many files were written and skipped."""
+        with self._lock:
+            return f"{len(self.written)} written, {len(self.skipped)} unchanged"
+
+
+class DryRunWriter(OutputWriter):
+    """
+    Records what a run would write without touching the output directory.
+
+    Every file is classified against what is on disk: 'new' if it does not
+    exist, 'stale' if its content would change and 'current' otherwise.
+    """
+
+    def __init__(self, output_dir: str, logger: logging.Logger):
+        """
+        Initialize the writer.
+
+        Args:
+            output_dir: Directory where documentation would be generated
+            logger: Logger instance
+        """
+        super().__init__(output_dir, logger)
+        # Relative path to {'status': ..., 'bytes': ...}, or {'status': 'removed'}
+        self.planned: Dict[str, Dict[str, Any]] = {}
+
+    def write(self, path: str, content: Union[str, bytes]) -> bool:
+        """Classify a file instead of writing it; returns whether it would be written."""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        if self._unchanged(path, data):
+            status = 'current'
+        else:
+            status = 'stale' if os.path.exists(path) else 'new'
+        with self._lock:
+            self.planned[os.path.relpath(path, self.output_dir)] = {'status': status, 'bytes': len(data)}
+        self.record(path, status != 'current', len(data))
+        return status != 'current'
+
+    def open(self, path: str, mode: str = 'w') -> AtomicFileWriter:
+        """Streaming writes are not planned; AI enhancement does not run in a dry run."""
+        raise NotImplementedError("DryRunWriter does not stream files")
+
+    def remove(self, path: str) -> None:
+        """Record that a file or directory would be removed."""
+        if os.path.exists(path):
+            with self._lock:
+                self.planned[os.path.relpath(path, self.output_dir)] = {'status': 'removed'}
+
+
+class MemoryFileWriter:
+    """
+    Incremental writer for a file of a ``MemoryWriter``, with the interface of ``AtomicFileWriter``.
+    """
+
+    def __init__(self, writer: 'MemoryWriter', path: str, mode: str = 'w'):
+        """
+        Start collecting a file's content.
+
+        Args:
+            writer: Writer the file is stored in on commit
+            path: Destination file path
+            mode: File mode, 'w' for text or 'wb' for bytes
+        """
+        self.writer = writer
+        self.path = path
+        self.binary = 'b' in mode
+        self.changed = False
+        self._chunks: List[bytes] = []
+        self._closed = False
+
+    def write(self, data) -> None:
+        """Append data to the file."""
+        self._chunks.append(data if self.binary else data.encode('utf-8'))
+
+    def commit(self) -> bool:
+        """
+        Store the collected content.
+
+        Returns:
+            True if the destination changed, False if it already had this content
+        """
+        if not self._closed:
+            self._closed = True
+            self.changed = self.writer.write(self.path, b''.join(self._chunks))
+        return self.changed
+
+    def discard(self) -> None:
+        """Drop the collected content, leaving the destination untouched."""
+        self._closed = True
+        self._chunks = []
+
+    def __enter__(self) -> 'MemoryFileWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+class MemoryWriter(OutputWriter):
+    """
+    Keeps the generated files in memory instead of writing them to disk.
+
+    ``files`` maps paths relative to the output directory, with forward
+    slashes, to their content. It can be seeded with the files of a previous
+    run, so that only changed files count as written.
+    """
+
+    in_memory = True
+
+    def __init__(self, output_dir: str, logger: logging.Logger, files: Optional[Dict[str, bytes]] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            output_dir: Virtual directory the generators write under; nothing is created there
+            logger: Logger instance
+            files: Optional files of a previous run, by relative path
+        """
+        super().__init__(output_dir, logger)
+        self.files: Dict[str, bytes] = dict(files or {})
+
+    def write(self, path: str, content: Union[str, bytes]) -> bool:
+        """Store a file unless it already has this content."""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        key = self._key(path)
+        with self._lock:
+            changed = self.files.get(key) != data
+            if changed:
+                self.files[key] = data
+        self.record(path, changed, len(data))
+        return changed
+
+    def copy(self, source: str, path: str) -> bool:
+        """Copy a repository file, or another output file, unless the destination already has its content."""
+        data = self.read(source) if not self._key(source).startswith('../') else None
+        if data is None:
+            with open(source, 'rb') as f:
+                data = f.read()
+        return self.write(path, data)
+
+    def open(self, path: str, mode: str = 'w') -> MemoryFileWriter:
+        """Open a file for incremental writing; it is stored and counted when committed."""
+        return MemoryFileWriter(self, path, mode)
+
+    def remove(self, path: str) -> None:
+        """Remove a file or directory from the virtual filesystem."""
+        key = self._key(path)
+        prefix = f"{key}/" if key else ''
+        with self._lock:
+            for name in [name for name in self.files if name == key or name.startswith(prefix)]:
+                del self.files[name]
+
+    def read(self, path: str) -> Optional[bytes]:
+        """Return the content of a file, or None if it does not exist."""
+        with self._lock:
+            return self.files.get(self._key(path))
+
+    def exists(self, path: str) -> bool:
+        """Whether a file or directory exists."""
+        return self.read(path) is not None or self.isdir(path)
+
+    def isdir(self, path: str) -> bool:
+        """Whether a directory exists, i.e. holds at least one file."""
+        key = self._key(path)
+        prefix = f"{key}/" if key else ''
+        with self._lock:
+            return any(name.startswith(prefix) for name in self.files)
+
+    def size(self, path: str) -> Optional[int]:
+        """Size of a file in bytes, or None if it does not exist."""
+        data = self.read(path)
+        return None if data is None else len(data)
+
+    def listdir(self, path: str) -> List[str]:
+        """Names of the files and directories directly inside a directory."""
+        key = self._key(path)
+        prefix = f"{key}/" if key else ''
+        with self._lock:
+            return sorted({name[len(prefix):].split('/', 1)[0] for name in self.files if name.startswith(prefix)})
+
+    def makedirs(self, path: str) -> None:
+        """Directories exist implicitly in memory."""
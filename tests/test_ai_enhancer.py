@@ -0,0 +1,108 @@
+"""
+Tests for AI enhancement streaming.
+"""
+import os
+import logging
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from docusaurus_generator.ai_enhancer import configured_model, enhance_with_ai
+from docusaurus_generator.block_diff import MARKER_PATTERN
+from docusaurus_generator.cache import GeneratorCache
+
+
+class TestEnhanceWithAI(unittest.TestCase):
+    """Test cases for enhance_with_ai."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.output_dir = tempfile.mkdtemp()
+        self.output_path = os.path.join(self.output_dir, 'overview.md')
+        self.logger = logging.getLogger(__name__)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        import shutil
+        shutil.rmtree(self.output_dir)
+
+    @patch('docusaurus_generator.cli.stream_content')
+    def test_streams_tokens_to_output_file(self, mock_stream):
+        """Test that streamed tokens end up in the output file with timings recorded."""
+        mock_stream.return_value = iter(['Enhanced ', 'overview'])
+        metrics = {}
+
+        result = enhance_with_ai('original', 'overview', 'openai/gpt-4o', self.logger,
+                                 output_path=self.output_path, metrics=metrics)
+
+        self.assertEqual(result, 'Enhanced overview')
+        with open(self.output_path) as f:
+            self.assertEqual(f.read(), 'Enhanced overview')
+        self.assertEqual(metrics['overview']['tokens'], 2)
+        self.assertIn('time_to_first_token', metrics['overview'])
+        self.assertIn('tokens_per_second', metrics['overview'])
+        self.assertIn('total_latency', metrics['overview'])
+        # No temporary files are left behind
+        self.assertEqual(os.listdir(self.output_dir), ['overview.md'])
+
+    @patch('docusaurus_generator.cli.stream_content')
+    def test_failed_stream_writes_original_content(self, mock_stream):
+        """Test that a failing provider leaves the original content in place."""
+        def failing_stream():
+            yield 'partial'
+            raise RuntimeError('connection reset')
+        mock_stream.return_value = failing_stream()
+
+        result = enhance_with_ai('original', 'overview', 'openai/gpt-4o', self.logger,
+                                 output_path=self.output_path)
+
+        self.assertEqual(result, 'original')
+        with open(self.output_path) as f:
+            self.assertEqual(f.read(), 'original')
+        self.assertEqual(os.listdir(self.output_dir), ['overview.md'])
+
+    @patch('docusaurus_generator.cli.stream_content')
+    def test_only_changed_blocks_are_resubmitted(self, mock_stream):
+        """Test that a second run only sends the changed paragraph to the model."""
+        requests = []
+
+        def fake_stream(prompt, model):
+            requests.append(prompt)
+            # Echo each marked block back in upper case, keeping its marker
+            body = prompt.split('Blocks to enhance:')[-1].split('Context after:')[0]
+            for line in body.splitlines(True):
+                yield line if MARKER_PATTERN.match(line) else line.upper()
+        mock_stream.side_effect = fake_stream
+
+        cache = GeneratorCache(os.path.join(self.output_dir, 'cache'), self.logger)
+        page = "---\nid: overview\n---\n\n{}\n\nSecond paragraph.\n\nThird paragraph.\n"
+
+        enhance_with_ai(page.format('First paragraph.'), 'overview', 'openai/gpt-4o', self.logger,
+                        output_path=self.output_path, cache=cache)
+        result = enhance_with_ai(page.format('First paragraph, revised.'), 'overview', 'openai/gpt-4o',
+                                 self.logger, output_path=self.output_path, cache=cache)
+
+        self.assertEqual(len(requests), 2)
+        self.assertIn('First paragraph, revised.', requests[1])
+        self.assertNotIn('Third paragraph.', requests[1])
+        self.assertTrue(result.startswith("---\nid: overview\n---\n\n"))
+        self.assertIn('FIRST PARAGRAPH, REVISED.', result)
+        self.assertIn('SECOND PARAGRAPH.', result)
+        self.assertIn('THIRD PARAGRAPH.', result)
+        self.assertNotIn('<!-- block:', result)
+
+        # Nothing changed: no request at all
+        enhance_with_ai(page.format('First paragraph, revised.'), 'overview', 'openai/gpt-4o',
+                        self.logger, output_path=self.output_path, cache=cache)
+        self.assertEqual(len(requests), 2)
+
+    def test_configuration_enables_the_model(self):
+        """Test that the ai block selects the model unless it is disabled."""
+        self.assertIsNone(configured_model(None))
+        self.assertIsNone(configured_model({'ai': {'enabled': False, 'model': 'openai/gpt-4o'}}))
+        self.assertEqual(configured_model({'ai': {'enabled': True, 'model': 'ollama/llama3'}}), 'ollama/llama3')
+        self.assertEqual(configured_model({'ai': {'enabled': True}}), 'openai/gpt-4o')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Tests for reproducible site artifacts.
+"""
+import os
+import io
+import shutil
+import tarfile
+import tempfile
+import unittest
+
+from docusaurus_generator import DocusaurusGenerator
+from docusaurus_generator.artifact import artifact_compression, write_artifact
+
+
+class TestArtifact(unittest.TestCase):
+    """Test cases for write_artifact and DocusaurusGenerator artifacts."""
+
+    def setUp(self):
+        """Set up a small repository."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.repo_dir = os.path.join(self.temp_dir, 'repo')
+        os.makedirs(self.repo_dir)
+        with open(os.path.join(self.repo_dir, 'README.md'), 'w') as f:
+            f.write('# Demo\n\nA demo project.\n')
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_artifact_is_reproducible(self):
+        """Test that the artifact holds the generated files in path order and does not change between runs."""
+        output_dir = os.path.join(self.temp_dir, 'output')
+        first = os.path.join(self.temp_dir, 'first.tar.gz')
+        second = os.path.join(self.temp_dir, 'second.tar.gz')
+
+        self.assertTrue(DocusaurusGenerator(self.repo_dir, output_dir).generate(first))
+        self.assertTrue(DocusaurusGenerator(self.repo_dir, output_dir).generate(second))
+
+        with open(first, 'rb') as f1, open(second, 'rb') as f2:
+            self.assertEqual(f1.read(), f2.read())
+        with tarfile.open(first, 'r:gz') as tar:
+            names = tar.getnames()
+            self.assertEqual(names, sorted(names))
+            self.assertIn('docs/overview.md', names)
+            self.assertFalse(any(name.startswith('.docusaurus_generator_cache') for name in names))
+            member = tar.getmember('docs/overview.md')
+            self.assertEqual((member.mtime, member.uid, member.mode), (0, 0, 0o644))
+            with open(os.path.join(output_dir, 'docs', 'overview.md'), 'rb') as f:
+                self.assertEqual(tar.extractfile(member).read(), f.read())
+
+    def test_stream_to_file_object(self):
+        """Test writing an uncompressed tar to a file object."""
+        buffer = io.BytesIO()
+        self.assertEqual(write_artifact(buffer, [('a.md', b'A'), ('b/c.md', b'C')]), 2)
+        with tarfile.open(fileobj=io.BytesIO(buffer.getvalue())) as tar:
+            self.assertEqual(tar.getnames(), ['a.md', 'b/c.md'])
+
+        self.assertEqual(artifact_compression('site.tar.zst'), 'zst')
+        self.assertEqual(artifact_compression('site.tgz'), 'gz')
+        with self.assertRaises(ValueError):
+            artifact_compression('site.zip')
+
+
+if __name__ == '__main__':
+    unittest.main()
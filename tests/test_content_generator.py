@@ -0,0 +1,142 @@
+"""
+Tests for the ContentGenerator section builders.
+"""
+import os
+import shutil
+import logging
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from docusaurus_generator import testing_inventory
+from docusaurus_generator.cache import GeneratorCache
+from docusaurus_generator.content_generator import ContentGenerator
+from docusaurus_generator.repo_index import RepoIndex
+from docusaurus_generator.testing_inventory import TEST_CACHE_NAMESPACE, build_test_inventory, count_tests
+
+
+class TestContentGenerator(unittest.TestCase):
+    """Test cases for ContentGenerator sections."""
+
+    def setUp(self):
+        """Set up a small repository and an output directory."""
+        self.repo_path = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger(__name__)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.repo_path)
+        shutil.rmtree(self.output_dir)
+
+    def _write(self, rel_path, content=''):
+        path = os.path.join(self.repo_path, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def _generator(self, config=None):
+        return ContentGenerator(self.repo_path, self.output_dir, None, self.logger, config)
+
+    def test_architecture_tree_collapses_deep_directories(self):
+        """Test that directories below max_depth are summarized with aggregates."""
+        self._write('src/pkg/deep/a.py', 'x' * 10)
+        self._write('src/pkg/deep/b.py', 'x' * 20)
+        self._write('README.md', '# Project')
+
+        content = self._generator({'architecture': {'max_depth': 2}})._generate_architecture()
+
+        self.assertIn('    src/\n', content)
+        self.assertIn('        pkg/ (2 files, 30 B)', content)
+        self.assertNotIn('a.py', content)
+
+    def test_architecture_tree_caps_entries_per_directory(self):
+        """Test that crowded directories list max_entries entries and summarize the rest."""
+        for i in range(5):
+            self._write(f'data/file{i}.txt', 'x')
+
+        content = self._generator({'architecture': {'max_entries': 2}})._generate_architecture()
+
+        self.assertIn('file0.txt', content)
+        self.assertNotIn('file4.txt', content)
+        self.assertIn('... 3 more entries (3 files, 3 B)', content)
+
+    def test_architecture_tree_excludes_output_dir_inside_repo(self):
+        """Test that an output directory inside the repository is not listed."""
+        self._write('main.py')
+        output_dir = os.path.join(self.repo_path, 'site')
+        self._write('site/docs/index.md')
+
+        generator = ContentGenerator(self.repo_path, output_dir, None, self.logger)
+        content = generator._generate_architecture()
+
+        self.assertIn('main.py', content)
+        self.assertNotIn('site/', content)
+
+    def test_testing_inventory_matches_whole_path_components(self):
+        """Test that only real test directories and files are counted."""
+        self._write('tests/test_core.py', (
+            "import pytest\n\n"
+            "class TestCore:\n"
+            "    def test_a(self):\n        pass\n\n"
+            "    @pytest.mark.parametrize('x', [1, 2, 3])\n"
+            "    def test_b(self, x):\n        pass\n\n"
+            "def test_c():\n    pass\n"
+        ))
+        self._write('src/latest/util.py', 'def test_like_name(): pass\n')
+        self._write('src/contest/scoring.py', 'def test_other(): pass\n')
+        self._write('web/button.test.js', "describe('Button', () => { it('renders', () => {}); });\n")
+
+        content = self._generator()._generate_testing()
+
+        self.assertIn('4 tests in 2 test classes or suites across 2 files (3 parametrized cases).', content)
+        self.assertIn('| `tests/test_core.py` | 3 | 1 | 3 |', content)
+        self.assertNotIn('latest', content)
+        self.assertNotIn('contest', content)
+
+
+    def test_testing_inventory_reuses_counts_of_unchanged_files(self):
+        """Test that only changed test files are counted again, in-process and on the worker pool."""
+        for i in range(3):
+            self._write(f'tests/test_{i}.py', f'def test_{i}():\n    pass\n')
+        cache = GeneratorCache(None, self.logger)
+        for threshold in (testing_inventory.PARALLEL_THRESHOLD, 2):
+            with patch.object(testing_inventory, 'PARALLEL_THRESHOLD', threshold):
+                first = build_test_inventory(RepoIndex(self.repo_path, self.logger), cache, self.logger, max_workers=2)
+                self._write('tests/test_0.py', f'def test_a():\n    pass\n\ndef test_b():\n    pass\n# {threshold}\n')
+                cache.hits.clear()
+                second = build_test_inventory(RepoIndex(self.repo_path, self.logger), cache, self.logger, max_workers=2)
+
+            self.assertEqual(first['tests/test_1.py']['tests'], 1)
+            self.assertEqual(second['tests/test_0.py']['tests'], 2)
+            self.assertEqual(second['tests/test_2.py'], first['tests/test_2.py'])
+            self.assertEqual(cache.hits[TEST_CACHE_NAMESPACE], 2)
+
+    def test_js_test_count_skips_method_calls_comments_and_strings(self):
+        """Test that .test( method calls and tests in comments or strings are not counted."""
+        source = (
+            "describe('parser', () => {\n"
+            "  it('matches', () => { expect(/a/.test(s)).toBe(true); pattern.test(value); });\n"
+            "  // it('is disabled', () => {});\n"
+            "  const label = \"test('not a test')\";\n"
+            "  test.each`\n    a | b\n  `('adds %s', () => {});\n"
+            "});\n"
+        )
+
+        self.assertEqual(count_tests(source, '.ts'), {'tests': 2, 'classes': 1, 'parametrized': 1})
+
+    def test_homepage_components_are_enhanced_as_whole_files(self):
+        """Test that the JSX components are not enhanced block by block, which would insert Markdown markers."""
+        self._write('README.md', '# Demo\n\nA demo project.\n')
+        generator = ContentGenerator(self.repo_path, self.output_dir, 'openai/gpt-4o', self.logger,
+                                     {'git_metadata': {'enabled': False}})
+        with patch('docusaurus_generator.content_generator.enhance_with_ai') as enhance:
+            generator.generate_homepage()
+
+        self.assertEqual([call.args[1] for call in enhance.call_args_list], ['index.js', 'HomepageFeatures'])
+        for call in enhance.call_args_list:
+            self.assertIsNone(call.kwargs.get('cache'))
+
+
+if __name__ == '__main__':
+    unittest.main()
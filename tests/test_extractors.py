@@ -0,0 +1,124 @@
+"""
+Tests for the language extractors used by the API page.
+"""
+import os
+import shutil
+import logging
+import tempfile
+import unittest
+
+from docusaurus_generator.extractors import (
+    extract_c_family, extract_java, extract_javascript, extractor_for, tokenize_c_like
+)
+from docusaurus_generator.symbols import SymbolIndex, extract_symbols
+
+
+class TestExtractors(unittest.TestCase):
+    """Test cases for the extractor registry and the tokenizer-based extractors."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger(__name__)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_tokenizer_skips_comments_and_strings(self):
+        """Test that comments and string contents never become tokens."""
+        tokens = tokenize_c_like('// class Hidden\nconst s = "function fake() {}"; /* export */ run();')
+
+        self.assertNotIn('Hidden', tokens)
+        self.assertNotIn('fake', tokens)
+        self.assertNotIn('export', tokens)
+        self.assertIn('run', tokens)
+
+    def test_javascript_exports(self):
+        """Test that only exported declarations and their public methods are listed."""
+        source = (
+            'export class Engine {\n  start() {}\n  #hidden() {}\n}\n'
+            'export function run(a) {}\n'
+            'export const helper = () => 1;\n'
+            'export interface Options { a: number }\n'
+            'function local() {}\nfunction internal() {}\n'
+            'module.exports = { local };\n'
+        )
+        entry = extract_javascript('src.app', source)
+
+        self.assertEqual(entry['classes'], ['Engine'])
+        self.assertEqual(entry['types'], ['Options'])
+        self.assertEqual(entry['functions'], ['start', 'run', 'helper', 'local'])
+        self.assertIn(['src.app.Engine.start', 'function'], entry['symbols'])
+
+    def test_java_public_members(self):
+        """Test that Java names are package-qualified and private members skipped."""
+        source = (
+            'package com.example;\n'
+            'public class Engine {\n'
+            '  public Engine() {}\n'
+            '  public void start() {}\n'
+            '  private void stop() {}\n'
+            '  public interface Listener { void onStart(); }\n'
+            '}\n'
+        )
+        entry = extract_java('src.Engine', source)
+
+        self.assertEqual(entry['classes'], ['Engine', 'Listener'])
+        self.assertEqual(entry['functions'], ['start', 'onStart'])
+        self.assertIn(['com.example.Engine.Listener.onStart', 'function'], entry['symbols'])
+
+    def test_c_family_declarations(self):
+        """Test namespaces, access specifiers, extern "C" and internal linkage."""
+        source = (
+            '#include <vector>\n'
+            'namespace core {\n'
+            'class Engine {\n public:\n  void start();\n private:\n  void stop();\n};\n'
+            'enum Mode { A, B };\n'
+            '}\n'
+            'extern "C" { int engine_init(void); }\n'
+            'void core::Engine::start() { if (ready()) { go(); } }\n'
+            'static int hidden(void) { return 0; }\n'
+        )
+        entry = extract_c_family('include.engine', source)
+
+        self.assertEqual(entry['classes'], ['Engine'])
+        self.assertEqual(entry['types'], ['Mode'])
+        self.assertEqual(entry['functions'], ['start', 'engine_init'])
+        self.assertEqual(entry['symbols'], [['core.Engine', 'class'], ['core.Engine.start', 'function'],
+                                            ['core.Mode', 'type'], ['engine_init', 'function']])
+
+    def test_registry_dispatch_and_fallback(self):
+        """Test that extensions pick their extractor and unknown files use the regex scan."""
+        self.assertIs(extractor_for('src/app.tsx'), extract_javascript)
+        self.assertIs(extractor_for('include/engine.HPP'), extract_c_family)
+        self.assertIsNone(extractor_for('README.md'))
+
+        entry = extract_symbols('lib/broken.py', 'class Broken(:\n    def run(self):\n')
+        self.assertEqual(entry['classes'], ['Broken'])
+        self.assertEqual(entry['types'], [])
+
+    def test_build_parses_only_changed_files(self):
+        """Test that the index reuses cached entries by content hash."""
+        paths = {}
+        for name in ('a.js', 'b.java'):
+            paths[name] = os.path.join(self.temp_dir, name)
+        with open(paths['a.js'], 'w') as f:
+            f.write('export function run() {}\n')
+        with open(paths['b.java'], 'w') as f:
+            f.write('public class B { public void go() {} }\n')
+
+        index = SymbolIndex(None, 'api', self.logger)
+        index.build(paths)
+        self.assertEqual(index.resolve('run'), ('api', 'ajs'))
+        self.assertEqual(index.resolve('B.go'), ('api', 'bjava'))
+
+        index.save()
+        index.files = {}
+        cached = index._previous['a.js']
+        index.build(paths)
+        self.assertIs(index.files['a.js'], cached)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,8 @@ import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 
-from docusaurus_generator import DocusaurusGenerator
+from docusaurus_generator import DocusaurusGenerator, generate_site
+from docusaurus_generator.generator import MEMORY_OUTPUT_DIR
 
 
 class TestDocusaurusGenerator(unittest.TestCase):
@@ -41,6 +42,14 @@ class TestDocusaurusGenerator(unittest.TestCase):
         self.assertIsNotNone(self.generator.config_generator)
         self.assertIsNotNone(self.generator.content_generator)
     
+    def test_ai_configuration_selects_the_model(self):
+        """Test that the ai block enables enhancement and an explicit model overrides it."""
+        config = {'ai': {'enabled': True, 'model': 'ollama/llama3'}}
+        self.assertIsNone(self.generator.use_ai)
+        self.assertEqual(DocusaurusGenerator(self.repo_path, self.output_dir, config).use_ai, 'ollama/llama3')
+        self.assertEqual(DocusaurusGenerator(self.repo_path, self.output_dir, config, 'openai/gpt-4o').use_ai,
+                         'openai/gpt-4o')
+    
     @patch('docusaurus_generator.content_generator.ContentGenerator.generate_all_sections')
     @patch('docusaurus_generator.content_generator.ContentGenerator.generate_sidebar')
     @patch('docusaurus_generator.config_generator.DocusaurusConfigGenerator.generate_docusaurus_config')
@@ -60,7 +69,10 @@ class TestDocusaurusGenerator(unittest.TestCase):
         mock_gen_sidebar.assert_called_once_with({'overview': 'content'})
         mock_gen_config.assert_called_once()
         mock_gen_homepage.assert_called_once()
-        mock_copy_assets.assert_called_once_with(self.repo_path, self.output_dir, self.generator.logger)
+        mock_copy_assets.assert_called_once_with(self.repo_path, self.output_dir, self.generator.logger,
+                                                 self.generator.writer,
+                                                 self.generator.content_generator.image_optimizer,
+                                                 self.generator.content_generator.assets)
         
         # Assert result is True
         self.assertTrue(result)
@@ -87,5 +99,35 @@ class TestDocusaurusGenerator(unittest.TestCase):
         self.assertTrue(result)
 
 
+class TestGenerateSite(unittest.TestCase):
+    """Test cases for generating a site in memory."""
+    
+    def setUp(self):
+        """Set up a small repository."""
+        self.repo_path = tempfile.mkdtemp()
+        with open(os.path.join(self.repo_path, 'README.md'), 'w') as f:
+            f.write('# Demo\n\nA demo project.\n')
+    
+    def tearDown(self):
+        """Clean up after tests."""
+        import shutil
+        shutil.rmtree(self.repo_path)
+    
+    def test_generate_site_in_memory(self):
+        """Test that the site is returned as files and nothing is written to disk."""
+        files = generate_site(self.repo_path)
+        
+        self.assertIn('docs/overview.md', files)
+        self.assertIn('docusaurus.config.js', files)
+        self.assertIn('sidebars.js', files)
+        self.assertIn(b'A demo project.', files['docs/overview.md'])
+        self.assertEqual(os.listdir(self.repo_path), ['README.md'])
+        self.assertFalse(os.path.exists(MEMORY_OUTPUT_DIR))
+        
+        # Files of a previous run are kept unless stale
+        previous = dict(files, **{'docs/packages/gone/overview.md': b'# Gone\n'})
+        self.assertEqual(generate_site(self.repo_path, previous=previous), files)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
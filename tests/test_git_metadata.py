@@ -0,0 +1,68 @@
+"""
+Tests for per-file git metadata.
+"""
+import os
+import shutil
+import logging
+import tempfile
+import unittest
+import subprocess
+
+from docusaurus_generator.cache import GeneratorCache
+from docusaurus_generator.content_generator import ContentGenerator
+from docusaurus_generator.git_metadata import collect_file_history
+
+
+class TestGitMetadata(unittest.TestCase):
+    """Test cases for the single-pass git history."""
+
+    def setUp(self):
+        """Set up a git repository with commits by two authors."""
+        self.repo_path = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger(__name__)
+        self._git('init', '-q')
+        self._commit('README.md', '# Project\n', 'Ada', 1600000000)
+        self._commit('CONTRIBUTING.md', '# Contributing\n', 'Grace', 1700000000)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.repo_path)
+        shutil.rmtree(self.output_dir)
+
+    def _git(self, *args, env=None):
+        subprocess.run(['git', *args], cwd=self.repo_path, check=True, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def _commit(self, name, content, author, timestamp):
+        with open(os.path.join(self.repo_path, name), 'w') as f:
+            f.write(content)
+        env = dict(os.environ, GIT_AUTHOR_NAME=author, GIT_AUTHOR_EMAIL='a@example.com',
+                   GIT_COMMITTER_NAME=author, GIT_COMMITTER_EMAIL='a@example.com',
+                   GIT_AUTHOR_DATE=f'{timestamp} +0000', GIT_COMMITTER_DATE=f'{timestamp} +0000')
+        self._git('add', name, env=env)
+        self._git('commit', '-q', '-m', f'Update {name}', env=env)
+
+    def test_history_is_extended_with_new_commits(self):
+        """Test that a cached history is updated from the new commits only."""
+        cache = GeneratorCache(os.path.join(self.output_dir, 'cache'), self.logger)
+        history = collect_file_history(self.repo_path, cache, self.logger)
+        self.assertEqual(history['README.md'], {'timestamp': 1600000000, 'author': 'Ada'})
+
+        self._commit('README.md', '# Project\n\nMore.\n', 'Linus', 1750000000)
+        history = collect_file_history(self.repo_path, cache, self.logger)
+
+        self.assertEqual(history['README.md'], {'timestamp': 1750000000, 'author': 'Linus'})
+        self.assertEqual(history['CONTRIBUTING.md'], {'timestamp': 1700000000, 'author': 'Grace'})
+
+    def test_pages_get_last_update_frontmatter(self):
+        """Test that a page's frontmatter carries its source's last commit."""
+        generator = ContentGenerator(self.repo_path, self.output_dir, None, self.logger)
+
+        content = generator._generate_contributing()
+
+        self.assertIn("last_update:\n  author: Grace\n  date: '2023-11-14T22:13:20Z'\n", content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for the image optimization stage.
+"""
+import io
+import os
+import shutil
+import logging
+import tempfile
+import unittest
+import importlib.util
+from unittest.mock import patch
+
+from docusaurus_generator.cache import GeneratorCache
+from docusaurus_generator.images import ImageOptimizer, minify_svg, optimize_image
+from docusaurus_generator.writer import OutputWriter
+
+
+SVG = """<?xml version="1.0"?>
+<!-- Created with an editor -->
+<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10">
+    <metadata>editor data</metadata>
+    <rect   width="10"
+            height="10"/>
+    <text x="1" y="5">two  spaces</text>
+</svg>
+"""
+
+
+class TestImages(unittest.TestCase):
+    """Test cases for image optimization."""
+
+    def setUp(self):
+        """Set up source and output directories."""
+        self.source_dir = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger(__name__)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.source_dir)
+        shutil.rmtree(self.output_dir)
+
+    def _optimizer(self):
+        cache = GeneratorCache(os.path.join(self.output_dir, '.cache'), self.logger)
+        return ImageOptimizer(cache, OutputWriter(self.output_dir, self.logger), self.logger)
+
+    def test_minify_svg_keeps_text(self):
+        """Test that comments, metadata and whitespace are removed but text content is kept."""
+        self.assertEqual(
+            minify_svg(SVG),
+            '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg" width="10" height="10">'
+            '<rect width="10" height="10"/><text x="1" y="5">two  spaces</text></svg>'
+        )
+
+    def test_unchanged_images_are_not_reprocessed(self):
+        """Test that a cached image whose output is in place is skipped on the next run."""
+        source = os.path.join(self.source_dir, 'logo.svg')
+        with open(source, 'w') as f:
+            f.write(SVG)
+        target = os.path.join(self.output_dir, 'static', 'logo.svg')
+
+        optimizer = self._optimizer()
+        optimizer.process([(source, target)])
+        optimizer.cache.flush()
+        self.assertLess(os.path.getsize(target), os.path.getsize(source))
+
+        optimizer = self._optimizer()
+        with patch('docusaurus_generator.images.optimize_image') as mock_optimize:
+            optimizer.process([(source, target)])
+        mock_optimize.assert_not_called()
+        self.assertEqual(optimizer.writer.skipped, [os.path.join('static', 'logo.svg')])
+
+    @unittest.skipUnless(importlib.util.find_spec('PIL'), 'needs Pillow')
+    def test_jpegs_are_copied_unless_recompression_is_requested(self):
+        """Test that JPEGs keep their bytes by default and their metadata when re-encoded."""
+        from PIL import Image
+        exif = Image.Exif()
+        exif[0x010E] = 'caption'
+        source = os.path.join(self.source_dir, 'photo.jpg')
+        Image.new('RGB', (64, 48), (200, 100, 50)).save(source, format='JPEG', quality=100,
+                                                       icc_profile=b'profile', exif=exif.tobytes())
+        with open(source, 'rb') as f:
+            original = f.read()
+
+        self.assertEqual(optimize_image(source, {'responsive_widths': [32]})[0], ('photo.jpg', original))
+        for _, content in optimize_image(source, {'recompress_jpeg': True, 'responsive_widths': [32]}):
+            image = Image.open(io.BytesIO(content))
+            self.assertEqual(image.info.get('icc_profile'), b'profile')
+            self.assertEqual(image.getexif().get(0x010E), 'caption')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Tests for link validation and rewriting, and the assets pages reference.
+"""
+import os
+import json
+import shutil
+import logging
+import tempfile
+import unittest
+
+from docusaurus_generator.assets import git_blob_id
+from docusaurus_generator.content_generator import ContentGenerator
+from docusaurus_generator.generator import DocusaurusGenerator
+from docusaurus_generator.links import LinkIndex, mark_repo_links, page_anchors
+
+
+class TestLinks(unittest.TestCase):
+    """Test cases for mark_repo_links, LinkIndex and the generated link report."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.repo_dir = os.path.join(self.temp_dir, 'repo')
+        self.output_dir = os.path.join(self.temp_dir, 'output')
+        self.logger = logging.getLogger(__name__)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, rel_path, content):
+        path = os.path.join(self.repo_dir, *rel_path.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def _read(self, *parts):
+        with open(os.path.join(self.output_dir, *parts), 'r') as f:
+            return f.read()
+
+    def test_marks_links_relative_to_the_source(self):
+        """Test that relative links are resolved and code, URLs and anchors are left alone."""
+        markdown = ('[up](../README.md#intro) [site](https://example.com) [top](#top)\n'
+                    '![shot](<img/a b.png>) `[code](x.md)`\n[ref]: ./setup.md\n')
+        marked = mark_repo_links(markdown, 'docs/guide.md')
+
+        self.assertIn('[up](repo:README.md?../README.md%23intro#intro)', marked)
+        self.assertIn('[site](https://example.com) [top](#top)', marked)
+        self.assertIn('![shot](repo:docs/img/a%20b.png?%3Cimg/a%20b.png%3E)', marked)
+        self.assertIn('`[code](x.md)`', marked)
+        self.assertIn('[ref]: repo:docs/setup.md?./setup.md', marked)
+
+    def test_anchors_follow_docusaurus(self):
+        """Test that repeated headings are numbered and explicit ids used."""
+        anchors = page_anchors('---\nid: a\n---\n\n## Usage\n\n## Usage\n\n```\n# Not a heading\n```\n'
+                               '## Custom {#my-id}\n')
+
+        self.assertEqual(anchors, {'usage', 'usage-1', 'my-id'})
+
+    def test_rewrite_links_pages_and_reports_broken(self):
+        """Test that marked links point at their pages and broken ones become text."""
+        pages = {
+            'overview': '# Demo\n\n[setup](repo:docs/setup.md#install) [gone](repo:gone.md)\n',
+            'guides': '## docs/setup.md\n\n## Install\n\n[back](repo:README.md) [api](api.md)\n',
+        }
+        locations = {'README.md': ('overview', ''), 'docs/setup.md': ('guides', 'docssetupmd')}
+        index = LinkIndex(pages, ['README.md', 'docs/setup.md', 'LICENSE'], locations)
+
+        self.assertEqual(index.rewrite('overview', pages['overview']),
+                         '# Demo\n\n[setup](guides.md#install) gone\n')
+        self.assertEqual(index.rewrite('guides', pages['guides']),
+                         '## docs/setup.md\n\n## Install\n\n[back](overview.md) api\n')
+        self.assertEqual(index.report()['broken'], [
+            {'page': 'guides', 'line': 5, 'target': 'api.md', 'reason': 'missing-page'},
+            {'page': 'overview', 'line': 3, 'target': 'gone.md', 'reason': 'missing-file'},
+        ])
+
+        # Without a blob URL, links to undocumented files keep their original target
+        self.assertEqual(index.rewrite('guides', '[license](repo:LICENSE?../LICENSE)'), '[license](../LICENSE)')
+        self.assertIn({'page': 'guides', 'line': 1, 'target': 'LICENSE', 'reason': 'undocumented-file'},
+                      index.report()['broken'])
+
+        with_blob = LinkIndex(pages, ['LICENSE'], {}, 'https://github.com/org/repo/blob/HEAD')
+        self.assertEqual(with_blob.rewrite('overview', '[license](repo:LICENSE)'),
+                         '[license](https://github.com/org/repo/blob/HEAD/LICENSE)')
+
+    def test_images_become_content_addressed_assets(self):
+        """Test that images with the same name get distinct asset names and are recorded."""
+        pages = {'overview': '![a](repo:docs/logo.png) <img src="repo:img/logo.png" width="20">\n'
+                             '![gone](repo:img/gone.png) ![remote](https://example.com/x.png)\n'}
+        ids = {'docs/logo.png': 'a' * 40, 'img/logo.png': 'b' * 40}
+        index = LinkIndex(pages, list(ids), {}, asset_id=ids.get)
+
+        self.assertEqual(index.rewrite('overview', pages['overview']),
+                         '![a](/assets/logo-aaaaaaaaaaaa.png) <img src="/assets/logo-bbbbbbbbbbbb.png" width="20">\n'
+                         'gone ![remote](https://example.com/x.png)\n')
+        self.assertEqual(index.assets, {'logo-aaaaaaaaaaaa.png': 'docs/logo.png',
+                                        'logo-bbbbbbbbbbbb.png': 'img/logo.png'})
+
+    def test_only_referenced_assets_are_copied(self):
+        """Test that unreferenced images are not copied and stale assets are removed."""
+        self._write('README.md', '# Demo\n\n![logo](docs/logo.png)\n')
+        self._write('docs/logo.png', 'png')
+        self._write('tests/fixtures/logo.png', 'fixture')
+        os.makedirs(os.path.join(self.output_dir, 'static', 'assets'))
+        with open(os.path.join(self.output_dir, 'static', 'assets', 'old-123456789012.png'), 'w') as f:
+            f.write('old')
+
+        generator = DocusaurusGenerator(self.repo_dir, self.output_dir)
+        self.assertTrue(generator.generate())
+
+        name = 'logo-' + git_blob_id(os.path.join(self.repo_dir, 'docs', 'logo.png'))[:12] + '.png'
+        self.assertEqual(os.listdir(os.path.join(self.output_dir, 'static', 'assets')), [name])
+        self.assertNotIn('logo.png', os.listdir(os.path.join(self.output_dir, 'static')))
+        self.assertIn(f"![logo](/assets/{name})", self._read('docs', 'overview.md'))
+
+    def test_generated_pages_link_each_other(self):
+        """Test that README and guide links are rewritten and reported during generation."""
+        self._write('README.md', '# Demo\n\nSee the [guide](docs/guide.md#setup) and [missing](docs/nope.md).\n')
+        self._write('docs/guide.md', '# Guide\n\n## Setup\n\nBack to the [readme](../README.md), '
+                                     'the [changes](../CHANGELOG.md) and the [license](../LICENSE).\n')
+        self._write('CHANGELOG.md', '# Changelog\n')
+        self._write('LICENSE', 'MIT\n')
+
+        ContentGenerator(self.repo_dir, self.output_dir, None, self.logger).generate_all_sections()
+
+        self.assertIn('[guide](guides.md#setup) and missing.', self._read('docs', 'overview.md'))
+        self.assertIn('[readme](overview.md), the [changes](changelog.md) and the [license](../LICENSE).',
+                      self._read('docs', 'guides.md'))
+        report = json.loads(self._read('link-report.json'))
+        # The index page repeats the README's first paragraph
+        self.assertEqual([(problem['page'], problem['target']) for problem in report['broken']],
+                         [('guides', 'LICENSE'), ('index', 'docs/nope.md'), ('overview', 'docs/nope.md')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Tests for streaming lockfile analysis.
+"""
+import io
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from docusaurus_generator.lockfiles import (
+    analyze_gemfile_lock,
+    analyze_npm_lock,
+    analyze_requirements,
+    iter_json_members,
+)
+
+
+class TestLockfiles(unittest.TestCase):
+    """Test cases for lockfile parsers."""
+
+    def setUp(self):
+        """Set up a temporary directory for lockfiles."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.tmp_dir)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_json_members_survive_tiny_chunks(self):
+        """Test that members are decoded correctly across chunk boundaries."""
+        document = {
+            'name': 'app',
+            'skipped': {'nested': ['a', {'b': 'c}"'}], 'number': 12345},
+            'packages': {'': {'version': '1.0.0'}, 'node_modules/x': {'version': '2.0.0', 'n': 1.5e3}},
+        }
+        members = list(iter_json_members(io.StringIO(json.dumps(document)), ['packages'], chunk_size=3))
+        self.assertEqual(members, [
+            ('packages', '', {'version': '1.0.0'}),
+            ('packages', 'node_modules/x', {'version': '2.0.0', 'n': 1500.0}),
+        ])
+
+    def test_npm_lock_v3_counts_direct_transitive_duplicates_and_licenses(self):
+        """Test the npm summary for a lockfileVersion 3 file."""
+        lock = {
+            'lockfileVersion': 3,
+            'packages': {
+                '': {'dependencies': {'a': '^1.0.0'}, 'devDependencies': {'b': '^2.0.0'}},
+                'node_modules/a': {'version': '1.0.0', 'license': 'MIT'},
+                'node_modules/b': {'version': '2.0.0', 'license': 'ISC', 'dev': True},
+                'node_modules/c': {'version': '3.0.0', 'license': 'MIT'},
+                'node_modules/a/node_modules/c': {'version': '2.5.0', 'license': 'MIT'},
+            },
+            'dependencies': {'ignored': {'version': '0.0.1'}},
+        }
+        summary = analyze_npm_lock(self._write('package-lock.json', json.dumps(lock, indent=2)))
+
+        self.assertEqual(summary['packages'], 4)
+        self.assertEqual(summary['direct'], 2)
+        self.assertEqual(summary['transitive'], 2)
+        self.assertEqual(summary['duplicates'], {'c': ['2.5.0', '3.0.0']})
+        self.assertEqual(summary['licenses'], {'MIT': 3, 'ISC': 1})
+
+    def test_pip_compile_via_annotations(self):
+        """Test that pip-compile annotations separate direct from transitive requirements."""
+        path = self._write('requirements.txt', (
+            "requests==2.31.0\n"
+            "    # via -r requirements.in\n"
+            "urllib3==2.0.7\n"
+            "    # via requests\n"
+            "idna==3.4\n"
+            "    # via\n"
+            "    #   -r requirements.in\n"
+            "    #   requests\n"
+        ))
+        summary = analyze_requirements(path)
+        self.assertEqual((summary['packages'], summary['direct'], summary['transitive']), (3, 2, 1))
+
+    def test_gemfile_lock(self):
+        """Test the Bundler summary."""
+        path = self._write('Gemfile.lock', (
+            "GEM\n"
+            "  remote: https://rubygems.org/\n"
+            "  specs:\n"
+            "    rack (3.0.8)\n"
+            "    rails (7.1.0)\n"
+            "      rack (>= 2.2.4)\n"
+            "\n"
+            "PLATFORMS\n"
+            "  ruby\n"
+            "\n"
+            "DEPENDENCIES\n"
+            "  rails (~> 7.1)\n"
+        ))
+        summary = analyze_gemfile_lock(path)
+        self.assertEqual((summary['packages'], summary['direct'], summary['transitive']), (2, 1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
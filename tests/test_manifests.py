@@ -0,0 +1,112 @@
+"""
+Tests for structured manifest reading.
+"""
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from docusaurus_generator.manifests import (
+    read_package_json,
+    read_pom,
+    read_setup_py,
+    render_manifests,
+)
+
+
+class TestManifests(unittest.TestCase):
+    """Test cases for manifest readers."""
+
+    def setUp(self):
+        """Set up a temporary directory for manifests."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.tmp_dir)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_setup_py_is_read_without_running_it(self):
+        """Test that setup() keywords are read statically, following module-level names."""
+        path = self._write('setup.py', (
+            "import sys\n"
+            "from setuptools import setup\n"
+            "sys.exit('must not run')\n"
+            "REQUIRES = ['requests>=2.0', 'click']\n"
+            "setup(\n"
+            "    name='tool',\n"
+            "    version=open('VERSION').read(),\n"
+            "    python_requires='>=3.8',\n"
+            "    install_requires=REQUIRES,\n"
+            "    extras_require={'yaml': ['pyyaml']},\n"
+            "    entry_points={'console_scripts': ['tool=tool.cli:main']},\n"
+            ")\n"
+        ))
+        manifest = read_setup_py(path)
+
+        self.assertEqual(manifest['name'], 'tool')
+        self.assertIsNone(manifest['version'])
+        self.assertEqual(manifest['runtime'], ['Python >=3.8'])
+        self.assertEqual(manifest['dependencies'], [
+            ('requests', '>=2.0', ''), ('click', '', ''), ('pyyaml', '', 'extra: yaml'),
+        ])
+        self.assertEqual(manifest['commands'], ['tool'])
+
+    def test_pom_reads_project_dependencies_only(self):
+        """Test that managed dependencies and plugins are skipped and properties resolved."""
+        path = self._write('pom.xml', (
+            '<?xml version="1.0"?>\n'
+            '<project xmlns="http://maven.apache.org/POM/4.0.0">\n'
+            '  <parent><artifactId>parent</artifactId><version>9</version></parent>\n'
+            '  <artifactId>app</artifactId>\n'
+            '  <version>1.2.0</version>\n'
+            '  <properties><maven.compiler.release>17</maven.compiler.release>'
+            '<guava.version>33.0</guava.version></properties>\n'
+            '  <dependencyManagement><dependencies><dependency>'
+            '<groupId>org.bom</groupId><artifactId>bom</artifactId></dependency></dependencies>'
+            '</dependencyManagement>\n'
+            '  <dependencies>\n'
+            '    <dependency><groupId>com.google.guava</groupId><artifactId>guava</artifactId>'
+            '<version>${guava.version}</version></dependency>\n'
+            '    <dependency><groupId>junit</groupId><artifactId>junit</artifactId>'
+            '<version>4.13</version><scope>test</scope></dependency>\n'
+            '  </dependencies>\n'
+            '  <build><plugins><plugin><artifactId>maven-jar-plugin</artifactId>'
+            '<dependencies><dependency><artifactId>x</artifactId></dependency></dependencies>'
+            '</plugin></plugins></build>\n'
+            '</project>\n'
+        ))
+        manifest = read_pom(path)
+
+        self.assertEqual((manifest['name'], manifest['version']), ('app', '1.2.0'))
+        self.assertEqual(manifest['runtime'], ['Java 17'])
+        self.assertEqual(manifest['dependencies'], [
+            ('com.google.guava:guava', '33.0', ''), ('junit:junit', '4.13', 'test'),
+        ])
+
+    def test_package_json_renders_compact_table(self):
+        """Test the install command, runtime and dependency table for package.json."""
+        self._write('yarn.lock', '')
+        path = self._write('package.json', json.dumps({
+            'name': 'web',
+            'engines': {'node': '>=18'},
+            'dependencies': {'react': '^18.2.0'},
+            'devDependencies': {'jest': '^29.0.0'},
+            'scripts': {'build': 'webpack', 'test': 'jest'},
+        }))
+        content = render_manifests([read_package_json(path)])
+
+        self.assertIn('```bash\nyarn install\n```', content)
+        self.assertIn('**Requires:** Node.js >=18', content)
+        self.assertIn('| `react` | `^18.2.0` | runtime |', content)
+        self.assertIn('| `jest` | `^29.0.0` | dev |', content)
+
+
+if __name__ == '__main__':
+    unittest.main()
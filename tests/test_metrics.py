@@ -0,0 +1,68 @@
+"""
+Tests for the OpenMetrics export of run metrics.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from docusaurus_generator import DocusaurusGenerator
+from docusaurus_generator.metrics import RunMetrics
+
+
+class TestRunMetrics(unittest.TestCase):
+    """Test cases for RunMetrics and the metrics written by a run."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.repo_dir = os.path.join(self.temp_dir, 'demo')
+        os.makedirs(self.repo_dir)
+        with open(os.path.join(self.repo_dir, 'README.md'), 'w') as f:
+            f.write('# Demo\n\nA demo project.\n')
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_render(self):
+        """Test the OpenMetrics rendering of each metric type."""
+        metrics = RunMetrics('my"repo')
+        metrics.set('run_success', 1)
+        metrics.inc('files_written', 2)
+        metrics.inc('files_written', 3)
+        metrics.observe('section_duration_seconds', 0.3, section='api')
+
+        text = metrics.render()
+
+        self.assertIn('# TYPE docusaurus_generator_files_written counter\n', text)
+        self.assertIn('docusaurus_generator_files_written_total{repo="my\\"repo"} 5\n', text)
+        self.assertIn('docusaurus_generator_run_success{repo="my\\"repo"} 1\n', text)
+        self.assertIn('docusaurus_generator_section_duration_seconds_bucket{repo="my\\"repo",section="api",le="0.25"} 0',
+                      text)
+        self.assertIn('docusaurus_generator_section_duration_seconds_bucket{repo="my\\"repo",section="api",le="0.5"} 1',
+                      text)
+        self.assertIn('docusaurus_generator_section_duration_seconds_count{repo="my\\"repo",section="api"} 1', text)
+        self.assertTrue(text.endswith('# EOF\n'))
+        with self.assertRaises(ValueError):
+            metrics.inc('unknown_metric')
+
+    def test_generate_writes_textfile(self):
+        """Test that a run writes its metrics to the configured textfile."""
+        textfile = os.path.join(self.temp_dir, 'metrics', 'docs.prom')
+        output_dir = os.path.join(self.temp_dir, 'output')
+        generator = DocusaurusGenerator(self.repo_dir, output_dir, {'metrics': {'textfile': textfile}})
+
+        self.assertTrue(generator.generate())
+
+        with open(textfile) as f:
+            text = f.read()
+        self.assertIn('docusaurus_generator_run_success{repo="demo"} 1', text)
+        self.assertIn('docusaurus_generator_section_duration_seconds_count{repo="demo",section="overview"} 1', text)
+        self.assertIn('docusaurus_generator_files_scanned_total{repo="demo"} 1', text)
+        self.assertRegex(text, r'docusaurus_generator_bytes_written_total\{repo="demo"\} [1-9]\d*')
+        self.assertIn('docusaurus_generator_cache_lookups_total{repo="demo",namespace=', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
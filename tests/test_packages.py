@@ -0,0 +1,108 @@
+"""
+Tests for monorepo sub-package documentation.
+"""
+import os
+import json
+import shutil
+import logging
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from docusaurus_generator.content_generator import ContentGenerator
+from docusaurus_generator.packages import detect_packages, package_of, package_slug, package_slugs
+
+
+class TestPackages(unittest.TestCase):
+    """Test cases for sub-package detection and generation."""
+
+    def setUp(self):
+        """Set up a monorepo with two packages and a test fixture."""
+        self.repo_path = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger(__name__)
+        self._write('README.md', '# Monorepo\n\nRoot readme.\n')
+        self._write('tools/build.py', 'def build():\n    pass\n')
+        self._write('packages/ui/package.json', json.dumps({'name': '@acme/ui', 'dependencies': {'react': '^18'}}))
+        self._write('packages/ui/README.md', '# UI\n\nButtons.\n')
+        self._write('packages/ui/index.js', 'export class Button {}\n')
+        self._write('libs/core/pyproject.toml', '[project]\nname = "acme-core"\n')
+        self._write('libs/core/core.py', 'class Engine:\n    pass\n')
+        self._write('tests/fixtures/app/package.json', '{}')
+        self.config = {'git_metadata': {'enabled': False}, 'search': {'enabled': False}}
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.repo_path)
+        shutil.rmtree(self.output_dir)
+
+    def _write(self, rel_path, content):
+        path = os.path.join(self.repo_path, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def _read(self, *parts):
+        with open(os.path.join(self.output_dir, 'docs', *parts), 'r') as f:
+            return f.read()
+
+    def _generator(self):
+        return ContentGenerator(self.repo_path, self.output_dir, None, self.logger, self.config)
+
+    def test_detect_packages(self):
+        """Test that nested manifests outside test directories mark packages."""
+        generator = self._generator()
+
+        self.assertEqual(detect_packages(generator.repo_index), ['libs/core', 'packages/ui'])
+        self.assertEqual(package_of('packages/ui/src/a.js', ['packages', 'packages/ui']), 'packages/ui')
+        self.assertIsNone(package_of('tools/build.py', ['packages/ui']))
+        self.assertEqual(package_slug('packages/ui'), 'packages-ui')
+
+    def test_colliding_slugs_are_disambiguated(self):
+        """Test that directories mapping to the same slug each get a distinct one."""
+        slugs = package_slugs(['packages/ui-kit', 'packages-ui/kit', 'libs/core'])
+
+        self.assertEqual(slugs['libs/core'], 'libs-core')
+        self.assertNotEqual(slugs['packages/ui-kit'], slugs['packages-ui/kit'])
+        for rel_dir in ('packages/ui-kit', 'packages-ui/kit'):
+            self.assertRegex(slugs[rel_dir], r'^packages-ui-kit-[0-9a-f]{8}$')
+
+    def test_packages_get_their_own_pages(self):
+        """Test that packages are documented separately from the root."""
+        generator = self._generator()
+        sections = generator.generate_all_sections()
+
+        self.assertIn('Root readme.', sections['overview'])
+        self.assertIn('tools/build.py', sections['api'])
+        self.assertNotIn('core.py', sections['api'])
+        self.assertIn('Buttons.', self._read('packages', 'packages-ui', 'overview.md'))
+        self.assertIn('`Button`', self._read('packages', 'packages-ui', 'api.md'))
+        self.assertIn('react', self._read('packages', 'packages-ui', 'installation.md'))
+        self.assertIn('`Engine`', self._read('packages', 'libs-core', 'api.md'))
+
+        categories = {item['label']: item['items'] for item in generator.sidebar_items(sections)
+                      if item['type'] == 'category'}
+        self.assertEqual(categories['@acme/ui'], ['packages/packages-ui/overview', 'packages/packages-ui/installation',
+                                                  'packages/packages-ui/api'])
+        self.assertEqual(categories['acme-core'], ['packages/libs-core/installation', 'packages/libs-core/api'])
+
+    def test_only_changed_packages_are_regenerated(self):
+        """Test that a package is regenerated only when its own files change."""
+        generator = self._generator()
+        generator.generate_all_sections()
+        generator.cache.flush()
+
+        self._write('libs/core/core.py', 'class Engine:\n    pass\n\nclass Pump:\n    pass\n')
+        generator = self._generator()
+        with patch.object(ContentGenerator, 'generate_section', autospec=True,
+                          side_effect=ContentGenerator.generate_section) as generate:
+            generator.generate_all_sections()
+
+        package_roots = {os.path.relpath(call.args[0].repo_path, self.repo_path)
+                         for call in generate.call_args_list if call.args[0] is not generator}
+        self.assertEqual(package_roots, {os.path.join('libs', 'core')})
+        self.assertIn('`Pump`', self._read('packages', 'libs-core', 'api.md'))
+
+
+if __name__ == '__main__':
+    unittest.main()
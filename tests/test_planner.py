@@ -0,0 +1,93 @@
+"""
+Tests for dry-run planning.
+"""
+import os
+import shutil
+import logging
+import tempfile
+import unittest
+
+from docusaurus_generator.ai_enhancer import AI_CACHE_NAMESPACE, SECTION_PROMPTS, plan_requests
+from docusaurus_generator.cache import GeneratorCache, hash_text
+from docusaurus_generator.content_generator import ContentGenerator
+from docusaurus_generator.planner import count_tokens, format_plan, model_profile, plan_run
+
+
+class TestPlanner(unittest.TestCase):
+    """Test cases for plan_run and the AI request estimates."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.repo_dir = os.path.join(self.temp_dir, 'repo')
+        self.output_dir = os.path.join(self.temp_dir, 'output')
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(os.path.join(self.repo_dir, 'docs'))
+        with open(os.path.join(self.repo_dir, 'README.md'), 'w') as f:
+            f.write('# Demo\n\nA demo project.\n')
+        with open(os.path.join(self.repo_dir, 'docs', 'guide.md'), 'w') as f:
+            f.write('# Guide\n\nUse it.\n')
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_plan_writes_nothing(self):
+        """Test that planning leaves the output directory untouched and reports new pages."""
+        plan = plan_run(self.repo_dir, self.output_dir, {}, None, self.logger)
+
+        self.assertFalse(os.path.exists(self.output_dir))
+        statuses = {entry['page']: entry['status'] for entry in plan['pages']}
+        self.assertEqual(statuses['overview'], 'new')
+        self.assertEqual(statuses['index'], 'new')
+        self.assertEqual(plan['totals']['stale'], len(plan['pages']))
+        self.assertIn('nothing was written', format_plan(plan))
+
+    def test_plan_detects_stale_pages(self):
+        """Test that only pages differing from the written ones are stale."""
+        ContentGenerator(self.repo_dir, self.output_dir, None, self.logger).generate_all_sections()
+        with open(os.path.join(self.repo_dir, 'docs', 'guide.md'), 'a') as f:
+            f.write('\nMore.\n')
+
+        plan = plan_run(self.repo_dir, self.output_dir, {}, None, self.logger)
+
+        stale = [entry['page'] for entry in plan['pages'] if entry['status'] != 'current']
+        self.assertEqual(stale, ['guides'])
+
+    def test_ai_estimates(self):
+        """Test that tokens, cost and time are estimated for enhanced sections only."""
+        plan = plan_run(self.repo_dir, self.output_dir, {'ai': {'concurrency': 1}}, 'openai/gpt-4o', self.logger)
+
+        overview = next(entry for entry in plan['pages'] if entry['page'] == 'overview')
+        self.assertEqual(overview['requests'], 1)
+        self.assertGreater(overview['input_tokens'], overview['output_tokens'])
+        self.assertGreater(overview['cost'], 0)
+        index = next(entry for entry in plan['pages'] if entry['page'] == 'index')
+        self.assertNotIn('requests', index)
+        latencies = sum(entry['latency_seconds'] for entry in plan['pages'] if 'requests' in entry)
+        self.assertAlmostEqual(plan['totals']['latency_seconds'], latencies)
+
+        self.assertIsNone(model_profile('azure/unknown-model')['input_cost'])
+        self.assertEqual(model_profile('ollama/llama3')['output_cost'], 0.0)
+        self.assertEqual(model_profile('openai/gpt-4o', {'input_cost': 1.0})['input_cost'], 1.0)
+
+    def test_unchanged_sections_need_no_requests(self):
+        """Test that cached enhancements are reused and changed blocks resubmitted."""
+        cache = GeneratorCache(os.path.join(self.temp_dir, 'cache'), self.logger)
+        content = '---\nid: a\n---\n\nFirst block.\n\nSecond block.\n'
+        prompt = hash_text(f"openai/gpt-4o\n{SECTION_PROMPTS['overview']}")
+        cache.set(AI_CACHE_NAMESPACE, 'overview', {
+            'prompt': prompt,
+            'document': 'enhanced',
+            'blocks': [{'hash': hash_text(block), 'source': block, 'enhanced': block.upper()}
+                       for block in ('First block.', 'Second block.')],
+        })
+
+        self.assertEqual(plan_requests(content, 'overview', 'openai/gpt-4o', cache), [])
+        requests = plan_requests(content.replace('Second', 'Changed'), 'overview', 'openai/gpt-4o', cache)
+        self.assertEqual([source for _, source in requests], ['Changed block.'])
+        self.assertEqual(count_tokens('abcdefgh', 'openai/unknown'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
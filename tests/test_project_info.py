@@ -0,0 +1,74 @@
+"""
+Tests for the shared project metadata resolver.
+"""
+import os
+import json
+import shutil
+import logging
+import tempfile
+import unittest
+
+from docusaurus_generator.cache import GeneratorCache
+from docusaurus_generator.project_info import PROJECT_INFO_CACHE_NAMESPACE, resolve_project_info
+
+
+class TestProjectInfo(unittest.TestCase):
+    """Test cases for resolve_project_info."""
+
+    def setUp(self):
+        """Set up a repository directory and a cache."""
+        self.repo_path = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger(__name__)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.repo_path)
+        shutil.rmtree(self.cache_dir)
+
+    def _write(self, name, content):
+        with open(os.path.join(self.repo_path, name), 'w') as f:
+            f.write(content)
+
+    def test_readme_description_skips_badges(self):
+        """Test that the README's first prose paragraph is used when package.json has no description."""
+        self._write('README.md', "# Tool\n\n[![CI](badge.svg)](ci)\n\nA tool that\ndoes things.\n\n## Usage\n")
+        self._write('package.json', json.dumps({'name': 'tool'}))
+
+        info = resolve_project_info(self.repo_path, None, self.logger)
+
+        self.assertEqual(info['project_name'], 'tool')
+        self.assertEqual(info['description'], 'A tool that does things.')
+        self.assertEqual(info['repo_url'], '')
+
+    def test_cached_until_sources_change(self):
+        """Test that metadata is reused from the cache and re-resolved when a source file changes."""
+        self._write('package.json', json.dumps({'name': 'tool', 'description': 'First'}))
+        cache = GeneratorCache(self.cache_dir, self.logger)
+
+        self.assertEqual(resolve_project_info(self.repo_path, cache, self.logger)['description'], 'First')
+        cache.flush()
+
+        cache = GeneratorCache(self.cache_dir, self.logger)
+        self.assertEqual(resolve_project_info(self.repo_path, cache, self.logger)['description'], 'First')
+        self.assertEqual(cache.hits.get(PROJECT_INFO_CACHE_NAMESPACE), 1)
+
+        self._write('package.json', json.dumps({'name': 'tool', 'description': 'Second'}))
+        self.assertEqual(resolve_project_info(self.repo_path, cache, self.logger)['description'], 'Second')
+
+    def test_stale_entries_are_pruned(self):
+        """Test that entries a run did not use are dropped, so the namespace does not grow with every edit."""
+        cache = GeneratorCache(self.cache_dir, self.logger)
+        for description in ('First', 'Second', 'Third'):
+            self._write('package.json', json.dumps({'name': 'tool', 'description': description}))
+            resolve_project_info(self.repo_path, cache, self.logger)
+            cache.prune([PROJECT_INFO_CACHE_NAMESPACE, 'unused'])
+            cache.flush()
+
+        with open(os.path.join(self.cache_dir, f"{PROJECT_INFO_CACHE_NAMESPACE}.json")) as f:
+            entries = json.load(f)
+        self.assertEqual([entry['description'] for entry in entries.values()], ['Third'])
+
+
+if __name__ == '__main__':
+    unittest.main()
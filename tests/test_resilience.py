@@ -0,0 +1,135 @@
+"""
+Tests for the LLM resilience layer.
+"""
+import logging
+import unittest
+
+from docusaurus_generator.resilience import (
+    AdaptiveConcurrencyLimiter,
+    CircuitOpenError,
+    LLMResilience,
+    RetryPolicy,
+    retry_after_seconds,
+)
+
+
+class FakeResponse:
+    """Minimal stand-in for an HTTP response attached to a provider error."""
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeAPIError(Exception):
+    """Provider error carrying an HTTP response."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code, headers)
+
+
+class TestLLMResilience(unittest.TestCase):
+    """Test cases for LLMResilience."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.sleeps = []
+        self.resilience = LLMResilience(
+            logging.getLogger(__name__),
+            retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.1),
+            failure_threshold=3,
+            reset_timeout=60.0,
+            sleep=self.sleeps.append
+        )
+
+    def test_retries_throttled_call_honouring_retry_after(self):
+        """Test that a 429 is retried after at least the Retry-After delay."""
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise FakeAPIError(429, {'retry-after': '2'})
+            return 'ok'
+
+        self.assertEqual(self.resilience.call('openai', flaky), 'ok')
+        self.assertEqual(len(calls), 2)
+        self.assertGreaterEqual(self.sleeps[0], 2.0)
+        self.assertEqual(self.resilience.outcomes['throttled'], 1)
+        self.assertEqual(self.resilience.outcomes['retried'], 1)
+        self.assertEqual(self.resilience.outcomes['success'], 1)
+
+    def test_fatal_errors_are_not_retried(self):
+        """Test that client errors fail immediately."""
+        def unauthorized():
+            raise FakeAPIError(401)
+
+        with self.assertRaises(FakeAPIError):
+            self.resilience.call('openai', unauthorized)
+        self.assertEqual(self.resilience.outcomes['failed'], 1)
+        self.assertEqual(self.sleeps, [])
+
+    def test_circuit_opens_after_repeated_failures(self):
+        """Test that an open circuit fails fast without calling the provider."""
+        calls = []
+
+        def outage():
+            calls.append(1)
+            raise FakeAPIError(503)
+
+        with self.assertRaises(FakeAPIError):
+            self.resilience.call('azure', outage)
+        with self.assertRaises(CircuitOpenError):
+            self.resilience.call('azure', outage)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.resilience.outcomes['short_circuited'], 1)
+        # Other providers are unaffected
+        self.assertEqual(self.resilience.call('ollama', lambda: 'ok'), 'ok')
+
+    def test_only_transient_failures_open_the_circuit(self):
+        """Test that fatal errors and throttling that recovers do not count toward the breaker."""
+        throttled = []
+
+        def too_long():
+            raise FakeAPIError(400)
+
+        def throttled_twice():
+            throttled.append(1)
+            if len(throttled) <= 2:
+                raise FakeAPIError(429)
+            return 'ok'
+
+        for _ in range(3):
+            with self.assertRaises(FakeAPIError):
+                self.resilience.call('openai', too_long)
+        self.assertEqual(self.resilience.call('openai', throttled_twice), 'ok')
+        self.assertEqual(self.resilience.breaker('openai').state, 'closed')
+        self.assertEqual(self.resilience.outcomes['short_circuited'], 0)
+
+    def test_outcomes_are_counted_per_run(self):
+        """Test that runs sharing a layer share its breakers but count their own outcomes."""
+        first, second = self.resilience.for_run(), self.resilience.for_run()
+        first.call('openai', lambda: 'ok')
+
+        self.assertEqual(first.outcomes['success'], 1)
+        self.assertEqual(second.outcomes['success'], 0)
+        self.assertIs(first.breaker('openai'), second.breaker('openai'))
+
+    def test_limiter_halves_on_throttle_and_grows_on_success(self):
+        """Test the additive-increase/multiplicative-decrease limit."""
+        limiter = AdaptiveConcurrencyLimiter(initial=4, maximum=8, increase_after=2)
+        limiter.on_throttle()
+        self.assertEqual(limiter.limit, 2)
+        limiter.on_success()
+        limiter.on_success()
+        self.assertEqual(limiter.limit, 3)
+
+    def test_retry_after_milliseconds_header(self):
+        """Test that retry-after-ms takes precedence over retry-after."""
+        error = FakeAPIError(429, {'retry-after-ms': '1500', 'retry-after': '9'})
+        self.assertEqual(retry_after_seconds(error), 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Tests for the generation-time search index.
+"""
+import os
+import json
+import shutil
+import logging
+import tempfile
+import unittest
+
+from docusaurus_generator.search_index import MANIFEST_NAME, SEARCH_DIR, build_shard, update_search_index
+from docusaurus_generator.writer import OutputWriter
+
+
+PAGE = """---
+title: Installation
+---
+
+# Installation
+
+Install the package with pip.
+
+## Docker Setup
+
+```bash
+# not a heading
+docker run image
+```
+
+Run the container.
+"""
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test cases for the search index."""
+
+    def setUp(self):
+        """Set up a temporary output directory."""
+        self.output_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger(__name__)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.output_dir)
+
+    def test_shard_splits_page_at_headings(self):
+        """Test that entries follow headings outside code fences and terms point at them."""
+        shard = build_shard('installation', PAGE, '/installation')
+
+        self.assertEqual([doc['url'] for doc in shard['docs']], ['/installation', '/installation#docker-setup'])
+        self.assertEqual(shard['terms']['pip'], [0, 1])
+        self.assertEqual(shard['terms']['docker'], [1, 4])
+        self.assertNotIn('the', shard['terms'])
+
+    def test_only_changed_pages_are_reindexed(self):
+        """Test that unchanged pages keep their shard and removed pages lose theirs."""
+        writer = OutputWriter(self.output_dir, self.logger)
+        update_search_index(self.output_dir, {'installation': PAGE, 'api': '# API\n\nCalls.\n'}, writer, self.logger)
+
+        stats = update_search_index(self.output_dir, {'installation': PAGE + '\nMore.\n'}, writer, self.logger)
+
+        self.assertEqual((stats['shards'], stats['rebuilt']), (1, 1))
+        search_dir = os.path.join(self.output_dir, SEARCH_DIR)
+        with open(os.path.join(search_dir, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        self.assertEqual(sorted(os.listdir(search_dir)),
+                         sorted([MANIFEST_NAME, manifest['shards']['installation']['file']]))
+
+        stats = update_search_index(self.output_dir, {'installation': PAGE + '\nMore.\n'}, writer, self.logger)
+        self.assertEqual(stats['rebuilt'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
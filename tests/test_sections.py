@@ -0,0 +1,232 @@
+"""
+Tests for section plugins and their scheduler.
+"""
+import os
+import shutil
+import logging
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from docusaurus_generator.content_generator import ContentGenerator
+from docusaurus_generator.sections import (SectionBudget, SectionPlugin, _entry_point_plugins, builtin_plugins,
+                                           glob_pattern, plugin_order, run_plugins)
+
+
+class FaqSection(SectionPlugin):
+    """A section installed by another package, built from the overview."""
+    name = 'faq'
+    label = 'FAQ'
+    position = 5
+    inputs = ('FAQ.md',)
+    depends = ('overview',)
+
+    def generate(self, generator, dependencies):
+        with open(os.path.join(generator.repo_path, 'FAQ.md'), 'r') as f:
+            faq = f.read()
+        return f"# FAQ\n\n{faq}\n\nOverview available: {dependencies['overview'] is not None}\n"
+
+
+def _plugin(name, depends=(), generate=None):
+    plugin = SectionPlugin()
+    plugin.name = name
+    plugin.depends = depends
+    plugin.generate = generate
+    return plugin
+
+
+class TestSections(unittest.TestCase):
+    """Test cases for section plugins."""
+
+    def setUp(self):
+        """Set up a small repository and an output directory."""
+        self.repo_path = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger(__name__)
+        self._write('README.md', '# Demo\n\nA demo project.\n')
+        self._write('CONTRIBUTING.md', 'Send patches.\n')
+        self._write('src/app.py', 'def run():\n    pass\n')
+        self.config = {'git_metadata': {'enabled': False}, 'search': {'enabled': False}}
+        _entry_point_plugins.cache_clear()
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.repo_path)
+        shutil.rmtree(self.output_dir)
+        _entry_point_plugins.cache_clear()
+
+    def _write(self, rel_path, content):
+        path = os.path.join(self.repo_path, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def _generator(self, config=None):
+        return ContentGenerator(self.repo_path, self.output_dir, None, self.logger, config or self.config)
+
+    def test_globs_match_repository_paths(self):
+        """Test that ``*`` stays within a directory and ``**`` spans them."""
+        self.assertTrue(glob_pattern('**/README.md').match('README.md'))
+        self.assertTrue(glob_pattern('**/README.md').match('docs/intro/README.md'))
+        self.assertTrue(glob_pattern('docs/**').match('docs/a/b.md'))
+        self.assertFalse(glob_pattern('docs/**').match('mydocs/a.md'))
+        self.assertTrue(glob_pattern('config/auth.*').match('config/auth.yml'))
+        self.assertFalse(glob_pattern('config/auth.*').match('config/auth.d/x'))
+
+        plugins = {plugin.name: plugin for plugin in builtin_plugins()}
+        self.assertTrue(plugins['testing'].reads('pkg/tests/test_app.py'))
+        self.assertFalse(plugins['contributing'].reads('src/app.py'))
+        self.assertTrue(plugins['architecture'].reads('anything/at/all'))
+
+    def test_dependent_sections_run_after_their_dependencies(self):
+        """Test that independent sections run concurrently and dependent ones get their results."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def independent(generator, dependencies):
+            # Both independent sections must be running at once to pass the barrier
+            barrier.wait()
+            return 'base'
+
+        plugins = {
+            'summary': _plugin('summary', ('a', 'b'), lambda g, deps: '+'.join(deps[name] for name in ('a', 'b'))),
+            'a': _plugin('a', generate=independent),
+            'b': _plugin('b', generate=independent),
+        }
+        results = run_plugins(plugins, lambda plugin, deps: plugin.generate(None, deps), self.logger, workers=4)
+
+        self.assertEqual(results, {'summary': 'base+base', 'a': 'base', 'b': 'base'})
+        self.assertEqual([plugin.name for plugin in plugin_order(plugins, self.logger)], ['a', 'b', 'summary'])
+
+    def test_missing_and_cyclic_dependencies(self):
+        """Test that sections with missing dependencies are skipped and cycles are rejected."""
+        plugins = {'a': _plugin('a', ('missing',)), 'b': _plugin('b', ('a',)), 'c': _plugin('c')}
+        with self.assertLogs(self.logger, level='WARNING'):
+            self.assertEqual([plugin.name for plugin in plugin_order(plugins, self.logger)], ['c'])
+
+        with self.assertRaises(ValueError):
+            plugin_order({'a': _plugin('a', ('b',)), 'b': _plugin('b', ('a',))}, self.logger)
+
+    def test_unchanged_sections_are_reused(self):
+        """Test that only sections whose declared inputs changed are generated again."""
+        self._generator().generate_all_sections()
+
+        self._write('CONTRIBUTING.md', 'Send patches and tests.\n')
+        generator = self._generator()
+        with patch.object(ContentGenerator, 'generate_section', autospec=True,
+                          side_effect=ContentGenerator.generate_section) as generate:
+            sections = generator.generate_all_sections()
+
+        # The architecture page shows the whole tree
+        self.assertEqual({call.args[1] for call in generate.call_args_list}, {'contributing', 'architecture'})
+        self.assertIn('Send patches and tests.', sections['contributing'])
+        self.assertIn('A demo project.', sections['overview'])
+
+    def test_optional_outputs_do_not_block_reuse(self):
+        """Test that a section is reused without the optional outputs it did not write, but not without those it did."""
+        self._generator().generate_all_sections()
+        with patch.object(ContentGenerator, 'generate_section', autospec=True,
+                          side_effect=ContentGenerator.generate_section) as generate:
+            self._generator().generate_all_sections()
+        generate.assert_not_called()
+
+        config = dict(self.config, architecture={'emit_json': True})
+        self._generator(config).generate_all_sections()
+        os.remove(os.path.join(self.output_dir, 'static', 'data', 'project-tree.json'))
+        with patch.object(ContentGenerator, 'generate_section', autospec=True,
+                          side_effect=ContentGenerator.generate_section) as generate:
+            self._generator(config).generate_all_sections()
+        self.assertEqual({call.args[1] for call in generate.call_args_list}, {'architecture'})
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'static', 'data', 'project-tree.json')))
+
+    def test_installed_sections_are_discovered(self):
+        """Test that sections registered as entry points are generated and placed in the sidebar."""
+        self._write('FAQ.md', 'Why? Because.\n')
+        entry_point = SimpleNamespace(name='faq', load=lambda: FaqSection)
+        broken = SimpleNamespace(name='broken', load=lambda: object())
+        with patch('importlib.metadata.entry_points', return_value=[entry_point, broken]):
+            with self.assertLogs(self.logger, level='WARNING'):
+                generator = self._generator()
+        sections = generator.generate_all_sections()
+
+        self.assertIn('Why? Because.', sections['faq'])
+        self.assertIn('Overview available: True', sections['faq'])
+        with open(os.path.join(self.output_dir, 'docs', 'faq.md'), 'r') as f:
+            self.assertIn('Why? Because.', f.read())
+        labels = [item['label'] for item in generator.sidebar_items(sections)]
+        self.assertEqual(labels[:3], ['Home', 'Overview', 'FAQ'])
+
+    def test_disabled_sections_are_never_run(self):
+        """Test that sections turned off in the configuration are not generated and their pages removed."""
+        self._generator().generate_all_sections()
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'docs', 'api.md')))
+
+        config = dict(self.config, sections={'api': False, 'testing': {'enabled': False}})
+        generator = self._generator(config)
+        with patch('docusaurus_generator.content_generator.build_test_inventory') as inventory, \
+                patch('docusaurus_generator.content_generator.SymbolIndex') as symbols:
+            sections = generator.generate_all_sections()
+
+        inventory.assert_not_called()
+        symbols.assert_not_called()
+        self.assertNotIn('api', sections)
+        self.assertNotIn('testing', sections)
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'docs', 'api.md')))
+        self.assertNotIn('api', [item.get('id') for item in generator.sidebar_items(sections)])
+
+        config = dict(self.config, sections={'overview': False})
+        self.assertNotIn('overview.md', self._generator(config).generate_index({'api': 'API'}))
+        self.assertIn('[Overview](overview.md)', self._generator().generate_index({'overview': 'Overview'}))
+
+    def test_sections_over_budget_are_truncated(self):
+        """Test that a section reading too many files is cut short with a notice."""
+        for i in range(5):
+            self._write(f'docs/guide{i}.md', f'Guide number {i}.\n')
+        config = dict(self.config, sections={'guides': {'max_files': 2}})
+        with self.assertLogs(self.logger, level='WARNING'):
+            content = self._generator(config).generate_section('guides')
+
+        self.assertEqual(content.count('Guide number'), 2)
+        self.assertIn(':::caution Truncated', content)
+        self.assertIn('max_files: 2', content)
+
+    def test_api_budget_bounds_the_source_scan(self):
+        """Test that sources beyond the API file budget are never read into the symbol index."""
+        for i in range(5):
+            self._write(f'src/module{i}.py', f'def function{i}():\n    pass\n')
+        config = dict(self.config, sections={'api': {'max_files': 2}})
+        generator = self._generator(config)
+        with patch('docusaurus_generator.symbols.hash_file', autospec=True,
+                   side_effect=lambda path: path) as hash_file:
+            with self.assertLogs(self.logger, level='WARNING'):
+                content = generator.generate_section('api')
+
+        self.assertEqual(hash_file.call_count, 2)
+        self.assertEqual(len(generator.symbol_index.files), 2)
+        self.assertEqual(content.count('\n## '), 2)
+        self.assertIn('max_files: 2', content)
+
+    def test_unsupported_limits_are_rejected(self):
+        """Test that a budget a section cannot honour is a configuration error."""
+        for sections in ({'deployment': {'max_files': 2}}, {'api': {'max_file': 2}}):
+            with self.assertRaises(ValueError):
+                self._generator(dict(self.config, sections=sections))
+        self._generator(dict(self.config, sections={'deployment': {'enabled': False, 'max_files': 2}}))
+        self._generator(dict(self.config, sections={'deployment': {'max_bytes': 1000}}))
+
+    def test_output_budget_cuts_pages_at_lines(self):
+        """Test that an oversized page is cut after a whole line and keeps its frontmatter."""
+        page = '---\nid: demo\n---\n\n# Demo\n\n```\n' + 'line\n' * 100 + '```\n'
+        content = SectionBudget(max_bytes=80).finish(page)
+
+        self.assertTrue(content.startswith('---\nid: demo\n---\n\n# Demo\n'))
+        body = content.split(':::caution')[0]
+        self.assertLessEqual(len(body.rstrip('\n').encode('utf-8')), 80 + len('```'))
+        self.assertEqual(body.count('```') % 2, 0)
+        self.assertIn('max_bytes: 80', content)
+        self.assertEqual(SectionBudget(max_bytes=len(page)).finish(page), page)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Tests for the generation server.
+"""
+import os
+import json
+import shutil
+import logging
+import tempfile
+import threading
+import unittest
+import urllib.request
+from unittest.mock import patch
+
+from docusaurus_generator.server import JobQueue, create_server
+
+
+class TestJobQueue(unittest.TestCase):
+    """Test cases for JobQueue and its HTTP API."""
+
+    def setUp(self):
+        """Set up a small repository and a queue with one worker."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.repo_dir = os.path.join(self.temp_dir, 'repo')
+        os.makedirs(self.repo_dir)
+        with open(os.path.join(self.repo_dir, 'README.md'), 'w') as f:
+            f.write('# Demo\n\nA demo project.\n')
+        self.config = {'server': {'output_root': os.path.join(self.temp_dir, 'sites')}}
+        self.jobs = JobQueue(self.config, logging.getLogger(__name__), workers=1)
+
+    def tearDown(self):
+        """Stop the workers and clean up."""
+        self.jobs.shutdown()
+        shutil.rmtree(self.temp_dir)
+
+    def test_jobs_are_merged_and_caches_kept_warm(self):
+        """Test that queued duplicates are merged and a second run reuses the warm cache."""
+        started, release = threading.Event(), threading.Event()
+        original_run = JobQueue._run
+
+        def blocked_run(queue, job, cache):
+            started.set()
+            release.wait(5)
+            original_run(queue, job, cache)
+
+        with patch.object(JobQueue, '_run', blocked_run):
+            first, merged = self.jobs.submit(self.repo_dir)
+            self.assertFalse(merged)
+            # Wait for the worker to take the first job, so the next two queue behind it
+            self.assertTrue(started.wait(5))
+            second, merged = self.jobs.submit(self.repo_dir)
+            self.assertFalse(merged)
+            third, merged = self.jobs.submit(self.repo_dir)
+            release.set()
+            self.assertTrue(self.jobs.wait(second.id, 30))
+
+        self.assertTrue(merged)
+        self.assertIsNot(second, first)
+        self.assertIs(third, second)
+        self.assertEqual(second.status, 'succeeded')
+        self.assertTrue(second.output_dir.startswith(os.path.join(self.temp_dir, 'sites')))
+        self.assertTrue(os.path.exists(os.path.join(second.output_dir, 'docs', 'overview.md')))
+        self.assertIn('overview', second.timings)
+        self.assertGreater(second.result['files_scanned'], 0)
+
+        rerun, _ = self.jobs.submit(self.repo_dir)
+        self.assertTrue(self.jobs.wait(rerun.id, 30))
+        self.assertEqual(rerun.result['written'], 0)
+        self.assertGreater(rerun.result['cache_hit_rate'], 0)
+
+    def test_workspaces_get_separate_caches_under_cache_dir(self):
+        """Test that a configured cache directory is split per workspace, so workers do not overwrite each other."""
+        jobs = JobQueue(dict(self.config, cache_dir=os.path.join(self.temp_dir, 'cache')), logging.getLogger(__name__))
+        try:
+            first, _ = jobs.submit(self.repo_dir, os.path.join(self.temp_dir, 'a'))
+            second, _ = jobs.submit(self.repo_dir, os.path.join(self.temp_dir, 'b'))
+            self.assertTrue(jobs.wait(first.id, 30) and jobs.wait(second.id, 30))
+        finally:
+            jobs.shutdown()
+
+        caches = {jobs._workspace(job)['cache'].cache_dir for job in (first, second)}
+        self.assertEqual(len(caches), 2)
+        for cache_dir in caches:
+            self.assertEqual(os.path.dirname(cache_dir), os.path.join(self.temp_dir, 'cache'))
+
+    def test_http_api(self):
+        """Test submitting a job and reading its status over HTTP."""
+        server = create_server(self.jobs, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            request = urllib.request.Request(f"{base}/jobs", method='POST',
+                                             data=json.dumps({'repo_path': self.repo_dir}).encode('utf-8'))
+            with urllib.request.urlopen(request) as response:
+                self.assertEqual(response.status, 202)
+                job = json.loads(response.read())
+            self.assertTrue(self.jobs.wait(job['id'], 30))
+
+            with urllib.request.urlopen(f"{base}/jobs/{job['id']}") as response:
+                status = json.loads(response.read())
+            self.assertEqual(status['status'], 'succeeded')
+            self.assertIsNotNone(status['run_seconds'])
+
+            for body in ({'repo_path': os.path.join(self.temp_dir, 'missing')}, {'repo_path': 123},
+                         {'repo_path': self.repo_dir, 'versions': 'v1.0'},
+                         {'repo_path': self.repo_dir, 'versions': [['a']]},
+                         {'repo_path': self.repo_dir, 'use_ai': {'model': 'x'}}):
+                bad = urllib.request.Request(f"{base}/jobs", method='POST', data=json.dumps(body).encode())
+                with self.assertRaises(urllib.error.HTTPError) as error:
+                    urllib.request.urlopen(bad)
+                self.assertEqual(error.exception.code, 400)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Tests for the symbol index and reference linking.
+"""
+import os
+import shutil
+import logging
+import tempfile
+import unittest
+
+from docusaurus_generator.cache import GeneratorCache
+from docusaurus_generator.content_generator import ContentGenerator
+from docusaurus_generator.symbols import SymbolIndex, extract_symbols, link_symbols, module_name
+
+
+class TestSymbols(unittest.TestCase):
+    """Test cases for SymbolIndex and link_symbols."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger(__name__)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_python_symbols_are_qualified(self):
+        """Test that methods are qualified by their class and docstrings summarized."""
+        source = 'class Cache:\n    """Stores values.\n\n    Details."""\n    def flush(self):\n        pass\n'
+        entry = extract_symbols('pkg/cache.py', source)
+
+        self.assertEqual(entry['classes'], ['Cache'])
+        self.assertEqual(entry['functions'], ['flush'])
+        self.assertEqual(entry['symbols'], [['pkg.cache.Cache', 'class'], ['pkg.cache.Cache.flush', 'function']])
+        self.assertEqual(entry['summaries'], {'Cache': 'Stores values.'})
+        self.assertEqual(module_name('pkg/__init__.py'), 'pkg')
+
+    def test_index_resolves_qualified_and_unique_names(self):
+        """Test that short names resolve only when unambiguous."""
+        index = SymbolIndex(None, 'api', self.logger)
+        index.update('a.py', 'def run():\n    pass\n\ndef start():\n    pass\n')
+        index.update('b.py', 'def run():\n    pass\n')
+
+        self.assertEqual(index.resolve('a.run'), ('api', 'apy'))
+        self.assertEqual(index.resolve('start'), ('api', 'apy'))
+        self.assertIsNone(index.resolve('run'))
+
+    def test_unchanged_files_are_not_parsed_again(self):
+        """Test that the index reuses cached entries for unchanged files."""
+        cache = GeneratorCache(self.temp_dir, self.logger)
+        index = SymbolIndex(cache, 'api', self.logger)
+        index.update('a.py', 'def run():\n    pass\n')
+        index.save()
+
+        reloaded = SymbolIndex(cache, 'api', self.logger)
+        entry = reloaded.update('a.py', 'def run():\n    pass\n')
+
+        self.assertIs(entry, cache.get('symbols', 'api')['a.py'])
+
+    def test_link_symbols(self):
+        """Test that references are linked outside code blocks and existing links."""
+        resolve = {'Cache': ('api', 'cachepy'), 'Cache.flush': ('api', 'cachepy')}.get
+        markdown = ("Use `Cache` and `Cache.flush()`, not `other`.\n\n"
+                    "```python\n`Cache`\n```\n\n[`Cache`](elsewhere.md)\n")
+
+        linked = link_symbols(markdown, resolve, 'packages/core/guides')
+
+        self.assertIn("[`Cache`](../../api.md#cachepy) and [`Cache.flush()`](../../api.md#cachepy)", linked)
+        self.assertIn("not `other`", linked)
+        self.assertIn("```python\n`Cache`\n```", linked)
+        self.assertIn("[`Cache`](elsewhere.md)", linked)
+        self.assertEqual(link_symbols("`Cache`", resolve, 'api'), "[`Cache`](#cachepy)")
+
+    def test_readme_references_link_to_api_page(self):
+        """Test that the overview links symbols documented on the API page."""
+        repo_path = os.path.join(self.temp_dir, 'repo')
+        os.makedirs(os.path.join(repo_path, 'lib'))
+        with open(os.path.join(repo_path, 'README.md'), 'w') as f:
+            f.write("# Project\n\nCall `Engine.start()` to begin.\n")
+        with open(os.path.join(repo_path, 'lib', 'engine.py'), 'w') as f:
+            f.write('class Engine:\n    def start(self):\n        """Start the `Engine`."""\n')
+        generator = ContentGenerator(repo_path, os.path.join(self.temp_dir, 'out'), None, self.logger,
+                                     {'git_metadata': {'enabled': False}})
+
+        self.assertIn("[`Engine.start()`](api.md#libenginepy)", generator._generate_overview())
+        self.assertIn("- `start()`: Start the [`Engine`](#libenginepy).", generator._generate_api())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Tests for versioned docs generated from git refs.
+"""
+import os
+import json
+import shutil
+import logging
+import tempfile
+import unittest
+import subprocess
+from unittest.mock import patch
+
+from docusaurus_generator.cache import GeneratorCache
+from docusaurus_generator.symbols import SYMBOL_CACHE_NAMESPACE
+from docusaurus_generator.versions import VersionedDocsGenerator, list_tree, version_name
+from docusaurus_generator.writer import OutputWriter
+
+
+class TestVersionedDocs(unittest.TestCase):
+    """Test cases for VersionedDocsGenerator."""
+
+    def setUp(self):
+        """Set up a repository with two tagged releases."""
+        self.repo_path = tempfile.mkdtemp()
+        self.output_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger(__name__)
+        self._git('init', '-q')
+        self._commit({'README.md': '# Project\n\nFirst release.\n',
+                      'CONTRIBUTING.md': '# Contributing\n\nSend patches.\n',
+                      'node_modules/dep/index.js': 'module.exports = 1;\n'})
+        self._git('tag', 'v1.0')
+        self._commit({'README.md': '# Project\n\nSecond release.\n'})
+        self._git('tag', 'v2.0')
+        self._commit({'README.md': '# Project\n\nUnreleased.\n'})
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.repo_path)
+        shutil.rmtree(self.output_dir)
+
+    def _git(self, *args):
+        env = dict(os.environ, GIT_AUTHOR_NAME='Ada', GIT_AUTHOR_EMAIL='ada@example.com',
+                   GIT_COMMITTER_NAME='Ada', GIT_COMMITTER_EMAIL='ada@example.com')
+        subprocess.run(['git', *args], cwd=self.repo_path, check=True, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def _commit(self, files):
+        for name, content in files.items():
+            path = os.path.join(self.repo_path, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write(content)
+            self._git('add', name)
+        self._git('commit', '-q', '-m', 'Update')
+
+    def _generator(self):
+        cache = GeneratorCache(os.path.join(self.output_dir, 'cache'), self.logger)
+        project_info = {'project_name': 'project', 'description': 'Project documentation'}
+        return VersionedDocsGenerator(self.repo_path, self.output_dir, {}, self.logger,
+                                      OutputWriter(self.output_dir, self.logger), cache, project_info)
+
+    def _read(self, *parts):
+        with open(os.path.join(self.output_dir, *parts), 'r') as f:
+            return f.read()
+
+    def test_version_name(self):
+        """Test that refs map to Docusaurus version names."""
+        self.assertEqual(version_name('refs/tags/v1.2'), 'v1.2')
+        self.assertEqual(version_name('release/1.x'), 'release-1.x')
+
+    def test_list_tree_skips_excluded_directories(self):
+        """Test that dependency directories are left out of the tree."""
+        self.assertEqual(sorted(list_tree(self.repo_path, 'v1.0')), ['CONTRIBUTING.md', 'README.md'])
+
+    def test_generates_versioned_layout(self):
+        """Test that each tag gets its own docs and sidebar, read from the object database."""
+        names = self._generator().generate(['v2.0', 'v1.0'])
+
+        self.assertEqual(names, ['v2.0', 'v1.0'])
+        self.assertEqual(json.loads(self._read('versions.json')), ['v2.0', 'v1.0'])
+        self.assertIn('Second release.', self._read('versioned_docs', 'version-v2.0', 'overview.md'))
+        self.assertIn('First release.', self._read('versioned_docs', 'version-v1.0', 'overview.md'))
+        self.assertIn('Send patches.', self._read('versioned_docs', 'version-v1.0', 'contributing.md'))
+        sidebar = json.loads(self._read('versioned_sidebars', 'version-v1.0-sidebars.json'))
+        self.assertEqual(sidebar['docs'][0]['id'], 'index')
+
+        # The working copy was never touched
+        with open(os.path.join(self.repo_path, 'README.md'), 'r') as f:
+            self.assertIn('Unreleased.', f.read())
+
+    def test_unchanged_pages_are_reused(self):
+        """Test that pages whose inputs were seen before are not generated again."""
+        self._generator().generate(['v2.0', 'v1.0'])
+
+        with patch('docusaurus_generator.content_generator.ContentGenerator.generate_section') as generate:
+            self._generator().generate(['v1.0'])
+
+        generate.assert_not_called()
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'versioned_docs', 'version-v2.0')))
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'versioned_sidebars',
+                                                     'version-v2.0-sidebars.json')))
+
+    def test_unknown_refs_are_skipped_and_no_versions_removes_them(self):
+        """Test that a deleted tag does not fail the run and that dropping all versions removes their output."""
+        with self.assertLogs(self.logger, level='WARNING'):
+            names = self._generator().generate(['v9.9', 'v1.0'])
+
+        self.assertEqual(names, ['v1.0'])
+        self.assertEqual(json.loads(self._read('versions.json')), ['v1.0'])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'versioned_docs', 'version-v9.9')))
+
+        self.assertEqual(self._generator().generate([]), [])
+        for entry in ('versions.json', 'versioned_docs', 'versioned_sidebars'):
+            self.assertFalse(os.path.exists(os.path.join(self.output_dir, entry)))
+
+    def test_package_sources_stay_on_the_versioned_api_page(self):
+        """Test that versions, which get no package pages, document package sources on their API page."""
+        self._commit({'packages/ui/package.json': json.dumps({'name': '@acme/ui'}),
+                      'packages/ui/index.js': 'export class Button {}\n',
+                      'src/app.py': 'def run():\n    pass\n'})
+        self._git('tag', 'v3.0')
+        self._generator().generate(['v3.0'])
+
+        api = self._read('versioned_docs', 'version-v3.0', 'api.md')
+        self.assertIn('packages/ui/index.js', api)
+        self.assertIn('src/app.py', api)
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'versioned_docs', 'version-v3.0', 'packages')))
+
+    def test_versions_keep_their_own_symbol_index(self):
+        """Test that a version's symbol index does not replace the current docs' one and is dropped with it."""
+        self._commit({'src/app.py': 'def run():\n    pass\n'})
+        self._git('tag', 'v3.0')
+        generator = self._generator()
+        generator.cache.set(SYMBOL_CACHE_NAMESPACE, 'api', {'src/current.py': {}})
+        generator.generate(['v3.0'])
+
+        self.assertEqual(generator.cache.get(SYMBOL_CACHE_NAMESPACE, 'api'), {'src/current.py': {}})
+        self.assertIn('src/app.py', generator.cache.get(SYMBOL_CACHE_NAMESPACE, 'version-v3.0/api'))
+
+        generator.generate(['v1.0'])
+        self.assertEqual(generator.cache.keys(SYMBOL_CACHE_NAMESPACE), {'api', 'version-v1.0/api'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for the write-only-if-changed output writer.
+"""
+import os
+import stat
+import shutil
+import logging
+import tempfile
+import unittest
+
+from docusaurus_generator.writer import MemoryWriter, OutputWriter
+
+
+class TestOutputWriter(unittest.TestCase):
+    """Test cases for OutputWriter."""
+
+    def setUp(self):
+        """Set up a temporary output directory."""
+        self.output_dir = tempfile.mkdtemp()
+        self.writer = OutputWriter(self.output_dir, logging.getLogger(__name__))
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.output_dir)
+
+    def test_identical_content_is_not_rewritten(self):
+        """Test that unchanged files keep their modification time and are counted as skipped."""
+        path = os.path.join(self.output_dir, 'docs', 'overview.md')
+        self.assertTrue(self.writer.write(path, '# Overview\n'))
+        os.utime(path, (1000000000, 1000000000))
+
+        self.assertFalse(self.writer.write(path, '# Overview\n'))
+        self.assertEqual(os.path.getmtime(path), 1000000000)
+
+        self.assertTrue(self.writer.write(path, '# Overview, revised\n'))
+        with open(path) as f:
+            self.assertEqual(f.read(), '# Overview, revised\n')
+        self.assertEqual(self.writer.summary(), '2 written, 1 unchanged')
+        self.assertEqual(os.listdir(os.path.dirname(path)), ['overview.md'])
+
+    def test_written_files_follow_the_umask(self):
+        """Test that atomically written files get the permissions of a plain open, not the temporary file's."""
+        path = os.path.join(self.output_dir, 'docs', 'overview.md')
+        previous = os.umask(0o022)
+        try:
+            self.writer.write(path, '# Overview\n')
+        finally:
+            os.umask(previous)
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o644)
+
+    def test_streamed_file_with_identical_content_is_skipped(self):
+        """Test that a streamed write ending with the same bytes leaves the file alone."""
+        path = os.path.join(self.output_dir, 'sidebars.js')
+        self.writer.write(path, 'module.exports = {};\n')
+        os.utime(path, (1000000000, 1000000000))
+
+        with self.writer.open(path) as f:
+            f.write('module.exports = ')
+            f.write('{};\n')
+
+        self.assertFalse(f.changed)
+        self.assertEqual(os.path.getmtime(path), 1000000000)
+        self.assertEqual(self.writer.skipped, ['sidebars.js'])
+
+
+class TestMemoryWriter(unittest.TestCase):
+    """Test cases for MemoryWriter."""
+
+    def setUp(self):
+        """Set up a writer for a virtual output directory."""
+        self.output_dir = os.path.join(tempfile.gettempdir(), 'virtual-site')
+        self.writer = MemoryWriter(self.output_dir, logging.getLogger(__name__),
+                                   {'docs/overview.md': b'# Overview\n'})
+
+    def test_files_are_kept_in_memory(self):
+        """Test writing, streaming, listing and removing files without touching the disk."""
+        docs_dir = os.path.join(self.output_dir, 'docs')
+        self.assertFalse(self.writer.write(os.path.join(docs_dir, 'overview.md'), '# Overview\n'))
+        self.assertTrue(self.writer.write(os.path.join(docs_dir, 'packages', 'ui', 'api.md'), '# API\n'))
+        with self.writer.open(os.path.join(docs_dir, 'guides.md')) as f:
+            f.write('# Guides')
+            f.write('\n')
+        self.writer.copy(os.path.join(docs_dir, 'guides.md'), os.path.join(self.output_dir, 'copy.md'))
+
+        self.assertFalse(os.path.exists(self.output_dir))
+        self.assertEqual(self.writer.files['docs/guides.md'], b'# Guides\n')
+        self.assertEqual(self.writer.read(os.path.join(self.output_dir, 'copy.md')), b'# Guides\n')
+        self.assertEqual(self.writer.listdir(docs_dir), ['guides.md', 'overview.md', 'packages'])
+        self.assertTrue(self.writer.isdir(os.path.join(docs_dir, 'packages')))
+        self.assertEqual(self.writer.size(os.path.join(docs_dir, 'overview.md')), 11)
+        self.assertEqual(self.writer.summary(), '3 written, 1 unchanged')
+
+        self.writer.remove(os.path.join(docs_dir, 'packages'))
+        self.assertFalse(self.writer.exists(os.path.join(docs_dir, 'packages', 'ui', 'api.md')))
+        self.assertEqual(self.writer.listdir(docs_dir), ['guides.md', 'overview.md'])
+
+
+if __name__ == '__main__':
+    unittest.main()